@@ -0,0 +1,9 @@
+using DreamLuso.Application.Common.Responses;
+using DreamLuso.Application.CQ.Clients.Commands.CreateClient;
+using MediatR;
+
+namespace DreamLuso.Application.CQ.Clients.Commands.BulkCreateClients;
+
+public record BulkCreateClientsCommand(
+    IReadOnlyList<CreateClientCommand> Items
+) : IRequest<Result<BulkCreateResponse, Success, Error>>;
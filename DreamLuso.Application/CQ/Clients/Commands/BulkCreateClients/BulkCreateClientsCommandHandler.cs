@@ -0,0 +1,85 @@
+using MediatR;
+using DreamLuso.Application.Common.Responses;
+using DreamLuso.Domain.Core.Uow;
+using DreamLuso.Domain.Model;
+using Microsoft.Extensions.Logging;
+
+namespace DreamLuso.Application.CQ.Clients.Commands.BulkCreateClients;
+
+public class BulkCreateClientsCommandHandler : IRequestHandler<BulkCreateClientsCommand, Result<BulkCreateResponse, Success, Error>>
+{
+    private readonly IUnitOfWork _unitOfWork;
+    private readonly ILogger<BulkCreateClientsCommandHandler> _logger;
+
+    public BulkCreateClientsCommandHandler(IUnitOfWork unitOfWork, ILogger<BulkCreateClientsCommandHandler> logger)
+    {
+        _unitOfWork = unitOfWork;
+        _logger = logger;
+    }
+
+    public async Task<Result<BulkCreateResponse, Success, Error>> Handle(BulkCreateClientsCommand request, CancellationToken cancellationToken)
+    {
+        var userIds = request.Items.Select(i => i.UserId).Distinct().ToList();
+        var nifs = request.Items
+            .Where(i => !string.IsNullOrWhiteSpace(i.Nif))
+            .Select(i => i.Nif!)
+            .Distinct()
+            .ToList();
+
+        // Uma consulta por verificação para o lote inteiro
+        var users = (await _unitOfWork.UserRepository.FindAsync(u => userIds.Contains(u.Id)))
+            .ToDictionary(u => u.Id);
+        var usersWithClient = (await _unitOfWork.ClientRepository.FindAsync(c => userIds.Contains(c.UserId)))
+            .Select(c => c.UserId)
+            .ToHashSet();
+        var takenNifs = (await _unitOfWork.ClientRepository.FindAsync(c => c.Nif != null && nifs.Contains(c.Nif)))
+            .Select(c => c.Nif!)
+            .ToHashSet();
+
+        var clients = new List<Client>(request.Items.Count);
+        for (var index = 0; index < request.Items.Count; index++)
+        {
+            var item = request.Items[index];
+
+            if (!users.TryGetValue(item.UserId, out var user))
+            {
+                _logger.LogWarning("Lote de clientes: utilizador não encontrado no item {Index}: {UserId}", index, item.UserId);
+                return Error.AtItem(index, Error.UserNotFound);
+            }
+
+            // Os conjuntos crescem com o lote: duplicados dentro do mesmo pedido também falham
+            if (!usersWithClient.Add(item.UserId))
+            {
+                _logger.LogWarning("Lote de clientes: perfil já existe no item {Index}: {UserId}", index, item.UserId);
+                return Error.AtItem(index, Error.ClientExists);
+            }
+
+            if (!string.IsNullOrWhiteSpace(item.Nif) && !takenNifs.Add(item.Nif))
+            {
+                _logger.LogWarning("Lote de clientes: NIF já existe no item {Index}: {Nif}", index, item.Nif);
+                return Error.AtItem(index, Error.NifAlreadyExists);
+            }
+
+            clients.Add(new Client
+            {
+                UserId = item.UserId,
+                User = user,
+                Nif = item.Nif,
+                CitizenCard = item.CitizenCard,
+                Type = item.Type,
+                MinBudget = item.MinBudget,
+                MaxBudget = item.MaxBudget,
+                PreferredContactMethod = item.PreferredContactMethod,
+                IsActive = true
+            });
+        }
+
+        // Um único SaveChanges: o EF agrupa os INSERTs numa transação
+        await _unitOfWork.ClientRepository.SaveRangeAsync(clients);
+        await _unitOfWork.CommitAsync(cancellationToken);
+
+        _logger.LogInformation("Lote de clientes criado com sucesso: {Count} clientes", clients.Count);
+
+        return new BulkCreateResponse(clients.Count, clients.Select(c => c.Id).ToList());
+    }
+}
@@ -0,0 +1,18 @@
+using DreamLuso.Application.Common.Responses;
+using DreamLuso.Application.CQ.Clients.Commands.CreateClient;
+using FluentValidation;
+
+namespace DreamLuso.Application.CQ.Clients.Commands.BulkCreateClients;
+
+public class BulkCreateClientsCommandValidator : AbstractValidator<BulkCreateClientsCommand>
+{
+    public BulkCreateClientsCommandValidator()
+    {
+        RuleFor(x => x.Items)
+            .NotEmpty().WithMessage("O lote deve ter pelo menos um cliente")
+            .Must(items => items.Count <= BulkCreateResponse.MaxItems)
+            .WithMessage($"O lote não pode exceder {BulkCreateResponse.MaxItems} clientes");
+
+        RuleForEach(x => x.Items).SetValidator(new CreateClientCommandValidator());
+    }
+}
@@ -0,0 +1,9 @@
+using DreamLuso.Application.Common.Responses;
+using DreamLuso.Application.CQ.Notifications.Commands.SendNotification;
+using MediatR;
+
+namespace DreamLuso.Application.CQ.Notifications.Commands.BulkSendNotifications;
+
+public record BulkSendNotificationsCommand(
+    IReadOnlyList<SendNotificationCommand> Items
+) : IRequest<Result<BulkCreateResponse, Success, Error>>;
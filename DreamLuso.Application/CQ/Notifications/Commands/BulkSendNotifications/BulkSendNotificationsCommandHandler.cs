@@ -0,0 +1,37 @@
+using DreamLuso.Application.Common.Responses;
+using DreamLuso.Domain.Core.Uow;
+using DreamLuso.Domain.Model;
+using MediatR;
+
+namespace DreamLuso.Application.CQ.Notifications.Commands.BulkSendNotifications;
+
+public class BulkSendNotificationsCommandHandler : IRequestHandler<BulkSendNotificationsCommand, Result<BulkCreateResponse, Success, Error>>
+{
+    private readonly IUnitOfWork _unitOfWork;
+
+    public BulkSendNotificationsCommandHandler(IUnitOfWork unitOfWork)
+    {
+        _unitOfWork = unitOfWork ?? throw new ArgumentNullException(nameof(unitOfWork));
+    }
+
+    public async Task<Result<BulkCreateResponse, Success, Error>> Handle(BulkSendNotificationsCommand request, CancellationToken cancellationToken)
+    {
+        var notifications = request.Items
+            .Select(item => new Notification(
+                item.SenderId,
+                item.RecipientId,
+                item.Message,
+                item.Type,
+                item.Priority,
+                item.ReferenceId,
+                item.ReferenceType,
+                item.IsTransient
+            ))
+            .ToList();
+
+        await _unitOfWork.NotificationRepository.SaveRangeAsync(notifications);
+        await _unitOfWork.CommitAsync(cancellationToken);
+
+        return new BulkCreateResponse(notifications.Count, notifications.Select(n => n.Id).ToList());
+    }
+}
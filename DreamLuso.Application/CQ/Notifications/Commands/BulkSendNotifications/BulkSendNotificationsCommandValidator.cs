@@ -0,0 +1,18 @@
+using DreamLuso.Application.Common.Responses;
+using DreamLuso.Application.CQ.Notifications.Commands.SendNotification;
+using FluentValidation;
+
+namespace DreamLuso.Application.CQ.Notifications.Commands.BulkSendNotifications;
+
+public class BulkSendNotificationsCommandValidator : AbstractValidator<BulkSendNotificationsCommand>
+{
+    public BulkSendNotificationsCommandValidator()
+    {
+        RuleFor(x => x.Items)
+            .NotEmpty().WithMessage("O lote deve ter pelo menos uma notificação")
+            .Must(items => items.Count <= BulkCreateResponse.MaxItems)
+            .WithMessage($"O lote não pode exceder {BulkCreateResponse.MaxItems} notificações");
+
+        RuleForEach(x => x.Items).SetValidator(new SendNotificationCommandValidator());
+    }
+}
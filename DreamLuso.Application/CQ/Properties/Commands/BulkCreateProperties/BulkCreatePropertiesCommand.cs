@@ -0,0 +1,10 @@
+using DreamLuso.Application.Common.Responses;
+using DreamLuso.Application.CQ.Properties.Commands.CreateProperty;
+using MediatR;
+
+namespace DreamLuso.Application.CQ.Properties.Commands.BulkCreateProperties;
+
+// Sem imagens: em lote os imóveis chegam em JSON e as imagens entram depois pelo PUT /properties/{id}
+public record BulkCreatePropertiesCommand(
+    IReadOnlyList<CreatePropertyCommand> Items
+) : IRequest<Result<BulkCreateResponse, Success, Error>>;
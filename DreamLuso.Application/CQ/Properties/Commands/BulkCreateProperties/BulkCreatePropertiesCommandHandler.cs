@@ -0,0 +1,48 @@
+using DreamLuso.Application.Common.Responses;
+using DreamLuso.Application.CQ.Properties.Commands.CreateProperty;
+using DreamLuso.Domain.Core.Uow;
+using DreamLuso.Domain.Model;
+using MediatR;
+using Microsoft.Extensions.Logging;
+
+namespace DreamLuso.Application.CQ.Properties.Commands.BulkCreateProperties;
+
+public class BulkCreatePropertiesCommandHandler : IRequestHandler<BulkCreatePropertiesCommand, Result<BulkCreateResponse, Success, Error>>
+{
+    private readonly IUnitOfWork _unitOfWork;
+    private readonly ILogger<BulkCreatePropertiesCommandHandler> _logger;
+
+    public BulkCreatePropertiesCommandHandler(IUnitOfWork unitOfWork, ILogger<BulkCreatePropertiesCommandHandler> logger)
+    {
+        _unitOfWork = unitOfWork;
+        _logger = logger;
+    }
+
+    public async Task<Result<BulkCreateResponse, Success, Error>> Handle(BulkCreatePropertiesCommand request, CancellationToken cancellationToken)
+    {
+        var agentIds = request.Items.Select(i => i.RealEstateAgentId).Distinct().ToList();
+        var agents = (await _unitOfWork.RealEstateAgentRepository.FindAsync(a => agentIds.Contains(a.Id)))
+            .ToDictionary(a => a.Id);
+
+        var properties = new List<Property>(request.Items.Count);
+        for (var index = 0; index < request.Items.Count; index++)
+        {
+            var item = request.Items[index];
+
+            if (!agents.TryGetValue(item.RealEstateAgentId, out var agent))
+            {
+                _logger.LogWarning("Lote de imóveis: agente não encontrado no item {Index}: {AgentId}", index, item.RealEstateAgentId);
+                return Error.AtItem(index, Error.AgentNotFound);
+            }
+
+            properties.Add(CreatePropertyCommandHandler.BuildProperty(item, agent));
+        }
+
+        await _unitOfWork.PropertyRepository.SaveRangeAsync(properties);
+        await _unitOfWork.CommitAsync(cancellationToken);
+
+        _logger.LogInformation("Lote de imóveis criado com sucesso: {Count} imóveis", properties.Count);
+
+        return new BulkCreateResponse(properties.Count, properties.Select(p => p.Id).ToList());
+    }
+}
@@ -0,0 +1,18 @@
+using DreamLuso.Application.Common.Responses;
+using DreamLuso.Application.CQ.Properties.Commands.CreateProperty;
+using FluentValidation;
+
+namespace DreamLuso.Application.CQ.Properties.Commands.BulkCreateProperties;
+
+public class BulkCreatePropertiesCommandValidator : AbstractValidator<BulkCreatePropertiesCommand>
+{
+    public BulkCreatePropertiesCommandValidator()
+    {
+        RuleFor(x => x.Items)
+            .NotEmpty().WithMessage("O lote deve ter pelo menos um imóvel")
+            .Must(items => items.Count <= BulkCreateResponse.MaxItems)
+            .WithMessage($"O lote não pode exceder {BulkCreateResponse.MaxItems} imóveis");
+
+        RuleForEach(x => x.Items).SetValidator(new CreatePropertyCommandValidator());
+    }
+}
@@ -28,50 +28,7 @@ public class CreatePropertyCommandHandler : IRequestHandler<CreatePropertyComman
             return Error.AgentNotFound;
         }
 
-        // Create address
-        var address = new Address(
-            request.Street,
-            request.Number,
-            request.Parish,
-            request.Municipality,
-            request.District,
-            request.PostalCode,
-            request.Complement
-        );
-
-        // Create property
-        var property = new Property
-        {
-            Title = request.Title,
-            Description = request.Description,
-            RealEstateAgentId = request.RealEstateAgentId,
-            RealEstateAgent = (RealEstateAgent)agent,
-            Address = address,
-            Type = (PropertyType)request.Type,
-            Status = (PropertyStatus)request.Status,
-            TransactionType = (TransactionType)request.TransactionType,
-            Size = request.Size,
-            GrossArea = request.GrossArea,
-            LandArea = request.LandArea,
-            Bedrooms = request.Bedrooms,
-            Bathrooms = request.Bathrooms,
-            WcCount = request.WcCount,
-            Floor = request.Floor,
-            ParkingSpaces = request.ParkingSpaces,
-            Price = request.Price,
-            PricePerSqm = request.Size > 0 ? request.Price / (decimal)request.Size : null,
-            Condominium = request.Condominium,
-            Amenities = request.Amenities,
-            YearBuilt = request.YearBuilt,
-            EnergyRating = request.EnergyRating,
-            Orientation = request.Orientation,
-            HasElevator = request.HasElevator,
-            HasGarage = request.HasGarage,
-            HasPool = request.HasPool,
-            IsFurnished = request.IsFurnished,
-            IsActive = true,
-            DateListed = DateTime.UtcNow
-        };
+        var property = BuildProperty(request, (RealEstateAgent)agent);
 
         // Save images if provided
         if (request.Images != null && request.Images.Count > 0)
@@ -116,5 +73,53 @@ public class CreatePropertyCommandHandler : IRequestHandler<CreatePropertyComman
 
         return response;
     }
-}
 
+    // Partilhado com a criação em lote (BulkCreateProperties)
+    internal static Property BuildProperty(CreatePropertyCommand request, RealEstateAgent agent)
+    {
+        // Create address
+        var address = new Address(
+            request.Street,
+            request.Number,
+            request.Parish,
+            request.Municipality,
+            request.District,
+            request.PostalCode,
+            request.Complement
+        );
+
+        // Create property
+        return new Property
+        {
+            Title = request.Title,
+            Description = request.Description,
+            RealEstateAgentId = request.RealEstateAgentId,
+            RealEstateAgent = agent,
+            Address = address,
+            Type = (PropertyType)request.Type,
+            Status = (PropertyStatus)request.Status,
+            TransactionType = (TransactionType)request.TransactionType,
+            Size = request.Size,
+            GrossArea = request.GrossArea,
+            LandArea = request.LandArea,
+            Bedrooms = request.Bedrooms,
+            Bathrooms = request.Bathrooms,
+            WcCount = request.WcCount,
+            Floor = request.Floor,
+            ParkingSpaces = request.ParkingSpaces,
+            Price = request.Price,
+            PricePerSqm = request.Size > 0 ? request.Price / (decimal)request.Size : null,
+            Condominium = request.Condominium,
+            Amenities = request.Amenities,
+            YearBuilt = request.YearBuilt,
+            EnergyRating = request.EnergyRating,
+            Orientation = request.Orientation,
+            HasElevator = request.HasElevator,
+            HasGarage = request.HasGarage,
+            HasPool = request.HasPool,
+            IsFurnished = request.IsFurnished,
+            IsActive = true,
+            DateListed = DateTime.UtcNow
+        };
+    }
+}
@@ -0,0 +1,9 @@
+using DreamLuso.Application.Common.Responses;
+using DreamLuso.Application.CQ.PropertyProposals.Commands.CreateProposal;
+using MediatR;
+
+namespace DreamLuso.Application.CQ.PropertyProposals.Commands.BulkCreateProposals;
+
+public record BulkCreateProposalsCommand(
+    IReadOnlyList<CreateProposalCommand> Items
+) : IRequest<Result<BulkCreateResponse, Success, Error>>;
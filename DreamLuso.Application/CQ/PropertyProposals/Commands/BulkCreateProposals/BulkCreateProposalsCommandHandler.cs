@@ -0,0 +1,75 @@
+using DreamLuso.Application.Common.Responses;
+using DreamLuso.Domain.Core.Uow;
+using DreamLuso.Domain.Model;
+using MediatR;
+using Microsoft.Extensions.Logging;
+
+namespace DreamLuso.Application.CQ.PropertyProposals.Commands.BulkCreateProposals;
+
+// Criação em lote para carga de dados: as mesmas verificações do CreateProposal,
+// mas sem as notificações ao cliente e ao agente
+public class BulkCreateProposalsCommandHandler : IRequestHandler<BulkCreateProposalsCommand, Result<BulkCreateResponse, Success, Error>>
+{
+    private readonly IUnitOfWork _unitOfWork;
+    private readonly ILogger<BulkCreateProposalsCommandHandler> _logger;
+
+    public BulkCreateProposalsCommandHandler(
+        IUnitOfWork unitOfWork,
+        ILogger<BulkCreateProposalsCommandHandler> logger)
+    {
+        _unitOfWork = unitOfWork ?? throw new ArgumentNullException(nameof(unitOfWork));
+        _logger = logger ?? throw new ArgumentNullException(nameof(logger));
+    }
+
+    public async Task<Result<BulkCreateResponse, Success, Error>> Handle(BulkCreateProposalsCommand request, CancellationToken cancellationToken)
+    {
+        var propertyIds = request.Items.Select(i => i.PropertyId).Distinct().ToList();
+        var clientIds = request.Items.Select(i => i.ClientId).Distinct().ToList();
+
+        var existingProperties = (await _unitOfWork.PropertyRepository.FindAsync(p => propertyIds.Contains(p.Id)))
+            .Select(p => p.Id)
+            .ToHashSet();
+        var existingClients = (await _unitOfWork.ClientRepository.FindAsync(c => clientIds.Contains(c.Id)))
+            .Select(c => c.Id)
+            .ToHashSet();
+
+        // Mesmo critério do HasPendingProposalAsync, para todos os pares do lote de uma vez
+        var pending = (await _unitOfWork.PropertyProposalRepository.FindAsync(p =>
+                clientIds.Contains(p.ClientId) &&
+                propertyIds.Contains(p.PropertyId) &&
+                (p.Status == ProposalStatus.Pending || p.Status == ProposalStatus.InNegotiation)))
+            .Select(p => (p.ClientId, p.PropertyId))
+            .ToHashSet();
+
+        var proposals = new List<PropertyProposal>(request.Items.Count);
+        for (var index = 0; index < request.Items.Count; index++)
+        {
+            var item = request.Items[index];
+
+            if (!existingProperties.Contains(item.PropertyId) || !existingClients.Contains(item.ClientId))
+                return Error.AtItem(index, Error.NotFound);
+
+            if (!pending.Add((item.ClientId, item.PropertyId)))
+                return Error.AtItem(index, new Error("ProposalAlreadyExists", "Já existe uma proposta pendente para este imóvel"));
+
+            proposals.Add(new PropertyProposal(
+                item.PropertyId,
+                item.ClientId,
+                item.ProposedValue,
+                item.Type,
+                item.PaymentMethod,
+                item.IntendedMoveDate
+            )
+            {
+                AdditionalNotes = item.AdditionalNotes
+            });
+        }
+
+        await _unitOfWork.PropertyProposalRepository.SaveRangeAsync(proposals);
+        await _unitOfWork.CommitAsync(cancellationToken);
+
+        _logger.LogInformation("Lote de propostas criado com sucesso: {Count} propostas", proposals.Count);
+
+        return new BulkCreateResponse(proposals.Count, proposals.Select(p => p.Id).ToList());
+    }
+}
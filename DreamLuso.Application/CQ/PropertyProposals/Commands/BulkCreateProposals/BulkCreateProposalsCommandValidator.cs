@@ -0,0 +1,18 @@
+using DreamLuso.Application.Common.Responses;
+using DreamLuso.Application.CQ.PropertyProposals.Commands.CreateProposal;
+using FluentValidation;
+
+namespace DreamLuso.Application.CQ.PropertyProposals.Commands.BulkCreateProposals;
+
+public class BulkCreateProposalsCommandValidator : AbstractValidator<BulkCreateProposalsCommand>
+{
+    public BulkCreateProposalsCommandValidator()
+    {
+        RuleFor(x => x.Items)
+            .NotEmpty().WithMessage("O lote deve ter pelo menos uma proposta")
+            .Must(items => items.Count <= BulkCreateResponse.MaxItems)
+            .WithMessage($"O lote não pode exceder {BulkCreateResponse.MaxItems} propostas");
+
+        RuleForEach(x => x.Items).SetValidator(new CreateProposalCommandValidator());
+    }
+}
@@ -0,0 +1,9 @@
+using DreamLuso.Application.Common.Responses;
+using DreamLuso.Application.CQ.PropertyVisits.Commands.ScheduleVisit;
+using MediatR;
+
+namespace DreamLuso.Application.CQ.PropertyVisits.Commands.BulkScheduleVisits;
+
+public record BulkScheduleVisitsCommand(
+    IReadOnlyList<ScheduleVisitCommand> Items
+) : IRequest<Result<BulkCreateResponse, Success, Error>>;
@@ -0,0 +1,96 @@
+using MediatR;
+using DreamLuso.Application.Common.Responses;
+using DreamLuso.Domain.Core.Uow;
+using DreamLuso.Domain.Model;
+using Microsoft.Extensions.Logging;
+
+namespace DreamLuso.Application.CQ.PropertyVisits.Commands.BulkScheduleVisits;
+
+// Agendamento em lote para carga de dados: as mesmas verificações do ScheduleVisit,
+// mas sem as notificações ao cliente e ao agente
+public class BulkScheduleVisitsCommandHandler : IRequestHandler<BulkScheduleVisitsCommand, Result<BulkCreateResponse, Success, Error>>
+{
+    private readonly IUnitOfWork _unitOfWork;
+    private readonly ILogger<BulkScheduleVisitsCommandHandler> _logger;
+
+    public BulkScheduleVisitsCommandHandler(IUnitOfWork unitOfWork, ILogger<BulkScheduleVisitsCommandHandler> logger)
+    {
+        _unitOfWork = unitOfWork;
+        _logger = logger;
+    }
+
+    public async Task<Result<BulkCreateResponse, Success, Error>> Handle(BulkScheduleVisitsCommand request, CancellationToken cancellationToken)
+    {
+        var propertyIds = request.Items.Select(i => i.PropertyId).Distinct().ToList();
+        var clientIds = request.Items.Select(i => i.ClientId).Distinct().ToList();
+        var agentIds = request.Items.Select(i => i.RealEstateAgentId).Distinct().ToList();
+        var dates = request.Items.Select(i => i.VisitDate).Distinct().ToList();
+
+        var properties = (await _unitOfWork.PropertyRepository.FindAsync(p => propertyIds.Contains(p.Id)))
+            .ToDictionary(p => p.Id);
+        var clients = (await _unitOfWork.ClientRepository.FindAsync(c => clientIds.Contains(c.Id)))
+            .ToDictionary(c => c.Id);
+        var agents = (await _unitOfWork.RealEstateAgentRepository.FindAsync(a => agentIds.Contains(a.Id)))
+            .ToDictionary(a => a.Id);
+
+        // Horários ocupados nos imóveis e datas do lote (mesmo critério do IsTimeSlotAvailableAsync)
+        var occupied = (await _unitOfWork.PropertyVisitRepository.FindAsync(v =>
+                propertyIds.Contains(v.PropertyId) &&
+                dates.Contains(v.VisitDate) &&
+                v.Status != VisitStatus.Cancelled))
+            .Select(v => (v.PropertyId, v.VisitDate, v.TimeSlot))
+            .ToHashSet();
+
+        var visits = new List<PropertyVisit>(request.Items.Count);
+        for (var index = 0; index < request.Items.Count; index++)
+        {
+            var item = request.Items[index];
+
+            if (!properties.TryGetValue(item.PropertyId, out var property))
+            {
+                _logger.LogWarning("Lote de visitas: imóvel não encontrado no item {Index}: {PropertyId}", index, item.PropertyId);
+                return Error.AtItem(index, Error.PropertyNotFound);
+            }
+
+            if (!clients.TryGetValue(item.ClientId, out var client))
+            {
+                _logger.LogWarning("Lote de visitas: cliente não encontrado no item {Index}: {ClientId}", index, item.ClientId);
+                return Error.AtItem(index, Error.ClientNotFound);
+            }
+
+            if (!agents.TryGetValue(item.RealEstateAgentId, out var agent))
+            {
+                _logger.LogWarning("Lote de visitas: agente não encontrado no item {Index}: {AgentId}", index, item.RealEstateAgentId);
+                return Error.AtItem(index, Error.AgentNotFound);
+            }
+
+            if (!occupied.Add((item.PropertyId, item.VisitDate, item.TimeSlot)))
+            {
+                _logger.LogWarning("Lote de visitas: horário não disponível no item {Index}: {PropertyId}, {Date}, {TimeSlot}",
+                    index, item.PropertyId, item.VisitDate, item.TimeSlot);
+                return Error.AtItem(index, Error.TimeSlotUnavailable);
+            }
+
+            visits.Add(new PropertyVisit
+            {
+                PropertyId = item.PropertyId,
+                Property = property,
+                ClientId = item.ClientId,
+                Client = client,
+                RealEstateAgentId = item.RealEstateAgentId,
+                RealEstateAgent = agent,
+                VisitDate = item.VisitDate,
+                TimeSlot = item.TimeSlot,
+                Status = VisitStatus.Pending,
+                Notes = item.Notes
+            });
+        }
+
+        await _unitOfWork.PropertyVisitRepository.SaveRangeAsync(visits);
+        await _unitOfWork.CommitAsync(cancellationToken);
+
+        _logger.LogInformation("Lote de visitas agendado com sucesso: {Count} visitas", visits.Count);
+
+        return new BulkCreateResponse(visits.Count, visits.Select(v => v.Id).ToList());
+    }
+}
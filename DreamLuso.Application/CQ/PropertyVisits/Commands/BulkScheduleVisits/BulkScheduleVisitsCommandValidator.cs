@@ -0,0 +1,18 @@
+using DreamLuso.Application.Common.Responses;
+using DreamLuso.Application.CQ.PropertyVisits.Commands.ScheduleVisit;
+using FluentValidation;
+
+namespace DreamLuso.Application.CQ.PropertyVisits.Commands.BulkScheduleVisits;
+
+public class BulkScheduleVisitsCommandValidator : AbstractValidator<BulkScheduleVisitsCommand>
+{
+    public BulkScheduleVisitsCommandValidator()
+    {
+        RuleFor(x => x.Items)
+            .NotEmpty().WithMessage("O lote deve ter pelo menos uma visita")
+            .Must(items => items.Count <= BulkCreateResponse.MaxItems)
+            .WithMessage($"O lote não pode exceder {BulkCreateResponse.MaxItems} visitas");
+
+        RuleForEach(x => x.Items).SetValidator(new ScheduleVisitCommandValidator());
+    }
+}
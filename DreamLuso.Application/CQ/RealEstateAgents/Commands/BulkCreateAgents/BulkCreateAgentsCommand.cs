@@ -0,0 +1,9 @@
+using DreamLuso.Application.Common.Responses;
+using DreamLuso.Application.CQ.RealEstateAgents.Commands.CreateAgent;
+using MediatR;
+
+namespace DreamLuso.Application.CQ.RealEstateAgents.Commands.BulkCreateAgents;
+
+public record BulkCreateAgentsCommand(
+    IReadOnlyList<CreateAgentCommand> Items
+) : IRequest<Result<BulkCreateResponse, Success, Error>>;
@@ -0,0 +1,85 @@
+using MediatR;
+using DreamLuso.Application.Common.Responses;
+using DreamLuso.Domain.Core.Uow;
+using DreamLuso.Domain.Model;
+using Microsoft.Extensions.Logging;
+
+namespace DreamLuso.Application.CQ.RealEstateAgents.Commands.BulkCreateAgents;
+
+public class BulkCreateAgentsCommandHandler : IRequestHandler<BulkCreateAgentsCommand, Result<BulkCreateResponse, Success, Error>>
+{
+    private readonly IUnitOfWork _unitOfWork;
+    private readonly ILogger<BulkCreateAgentsCommandHandler> _logger;
+
+    public BulkCreateAgentsCommandHandler(IUnitOfWork unitOfWork, ILogger<BulkCreateAgentsCommandHandler> logger)
+    {
+        _unitOfWork = unitOfWork;
+        _logger = logger;
+    }
+
+    public async Task<Result<BulkCreateResponse, Success, Error>> Handle(BulkCreateAgentsCommand request, CancellationToken cancellationToken)
+    {
+        var userIds = request.Items.Select(i => i.UserId).Distinct().ToList();
+        var licenses = request.Items
+            .Where(i => !string.IsNullOrWhiteSpace(i.LicenseNumber))
+            .Select(i => i.LicenseNumber!)
+            .Distinct()
+            .ToList();
+
+        // Uma consulta por verificação para o lote inteiro
+        var users = (await _unitOfWork.UserRepository.FindAsync(u => userIds.Contains(u.Id)))
+            .ToDictionary(u => u.Id);
+        var usersWithAgent = (await _unitOfWork.RealEstateAgentRepository.FindAsync(a => userIds.Contains(a.UserId)))
+            .Select(a => a.UserId)
+            .ToHashSet();
+        var takenLicenses = (await _unitOfWork.RealEstateAgentRepository.FindAsync(a => a.LicenseNumber != null && licenses.Contains(a.LicenseNumber)))
+            .Select(a => a.LicenseNumber!)
+            .ToHashSet();
+
+        var agents = new List<RealEstateAgent>(request.Items.Count);
+        for (var index = 0; index < request.Items.Count; index++)
+        {
+            var item = request.Items[index];
+
+            if (!users.TryGetValue(item.UserId, out var user))
+            {
+                _logger.LogWarning("Lote de agentes: utilizador não encontrado no item {Index}: {UserId}", index, item.UserId);
+                return Error.AtItem(index, Error.UserNotFound);
+            }
+
+            if (!usersWithAgent.Add(item.UserId))
+            {
+                _logger.LogWarning("Lote de agentes: perfil já existe no item {Index}: {UserId}", index, item.UserId);
+                return Error.AtItem(index, Error.AgentExists);
+            }
+
+            if (!string.IsNullOrWhiteSpace(item.LicenseNumber) && !takenLicenses.Add(item.LicenseNumber))
+            {
+                _logger.LogWarning("Lote de agentes: número de licença já existe no item {Index}: {LicenseNumber}", index, item.LicenseNumber);
+                return Error.AtItem(index, Error.InvalidLicense);
+            }
+
+            agents.Add(new RealEstateAgent
+            {
+                UserId = item.UserId,
+                User = user,
+                LicenseNumber = item.LicenseNumber,
+                LicenseExpiry = item.LicenseExpiry,
+                OfficeEmail = item.OfficeEmail,
+                OfficePhone = item.OfficePhone,
+                CommissionRate = item.CommissionRate,
+                Specialization = item.Specialization,
+                Certifications = item.Certifications ?? new List<string>(),
+                LanguagesSpoken = item.LanguagesSpoken ?? new List<Language>(),
+                IsActive = true
+            });
+        }
+
+        await _unitOfWork.RealEstateAgentRepository.SaveRangeAsync(agents);
+        await _unitOfWork.CommitAsync(cancellationToken);
+
+        _logger.LogInformation("Lote de agentes criado com sucesso: {Count} agentes", agents.Count);
+
+        return new BulkCreateResponse(agents.Count, agents.Select(a => a.Id).ToList());
+    }
+}
@@ -0,0 +1,18 @@
+using DreamLuso.Application.Common.Responses;
+using DreamLuso.Application.CQ.RealEstateAgents.Commands.CreateAgent;
+using FluentValidation;
+
+namespace DreamLuso.Application.CQ.RealEstateAgents.Commands.BulkCreateAgents;
+
+public class BulkCreateAgentsCommandValidator : AbstractValidator<BulkCreateAgentsCommand>
+{
+    public BulkCreateAgentsCommandValidator()
+    {
+        RuleFor(x => x.Items)
+            .NotEmpty().WithMessage("O lote deve ter pelo menos um agente")
+            .Must(items => items.Count <= BulkCreateResponse.MaxItems)
+            .WithMessage($"O lote não pode exceder {BulkCreateResponse.MaxItems} agentes");
+
+        RuleForEach(x => x.Items).SetValidator(new CreateAgentCommandValidator());
+    }
+}
@@ -0,0 +1,10 @@
+namespace DreamLuso.Application.Common.Responses;
+
+public record BulkCreateResponse(
+    int Count,
+    IReadOnlyList<Guid> Ids
+)
+{
+    // Limite de itens por pedido de criação em lote
+    public const int MaxItems = 1000;
+}
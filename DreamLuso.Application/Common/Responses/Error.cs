@@ -67,5 +67,8 @@ public sealed record Error(string Code, string Description)
     public static readonly Error ContractAlreadyTerminated = new("ContractAlreadyTerminated", "O contrato já foi terminado");
     public static readonly Error ContractExpired = new("ContractExpired", "O contrato expirou");
     public static readonly Error InvalidContractDates = new("InvalidContractDates", "As datas do contrato são inválidas");
-}
 
+    // Bulk Errors
+    // O índice identifica o item do lote que impediu a gravação; nenhum item é gravado
+    public static Error AtItem(int index, Error error) => new(error.Code, $"Item {index}: {error.Description}");
+}
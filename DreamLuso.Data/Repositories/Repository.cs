@@ -25,6 +25,14 @@ public abstract class Repository<T> : IRepository<T> where T : class
         return entity;
     }
 
+    public virtual async Task SaveRangeAsync(IEnumerable<T> entities)
+    {
+        if (entities == null)
+            throw new ArgumentNullException(nameof(entities));
+
+        await _dbSet.AddRangeAsync(entities);
+    }
+
     public virtual async Task<T?> GetByIdAsync(Guid id)
     {
         if (id == Guid.Empty)
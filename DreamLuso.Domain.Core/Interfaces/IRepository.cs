@@ -6,6 +6,7 @@ public interface IRepository<T> where T : class
 {
     // Métodos básicos
     Task<T> SaveAsync(T entity);
+    Task SaveRangeAsync(IEnumerable<T> entities);
     Task<T?> GetByIdAsync(Guid id);
     Task<IEnumerable<T>> GetAllAsync();
     Task<T> UpdateAsync(T entity);
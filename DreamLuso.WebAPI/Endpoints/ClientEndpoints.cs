@@ -1,5 +1,6 @@
 using DreamLuso.Application.Common.Responses;
 using DreamLuso.Application.CQ.Clients.Commands.CreateClient;
+using DreamLuso.Application.CQ.Clients.Commands.BulkCreateClients;
 using DreamLuso.Application.CQ.Clients.Commands.UpdateClient;
 using DreamLuso.Application.CQ.Clients.Commands.AddFavorite;
 using DreamLuso.Application.CQ.Clients.Commands.RemoveFavorite;
@@ -44,6 +45,12 @@ public static class ClientEndpoints
             .Produces<CreateClientResponse>(201)
             .Produces<Error>(400);
 
+        // POST /api/clients/bulk - Criar clientes em lote (uma transação)
+        clients.MapPost("/bulk", Commands.BulkCreateClients)
+            .WithName("BulkCreateClients")
+            .Produces<BulkCreateResponse>(200)
+            .Produces<Error>(400);
+
         // PUT /api/clients/{id} - Atualizar cliente
         clients.MapPut("/{id:guid}", Commands.UpdateClient)
             .WithName("UpdateClient")
@@ -96,6 +103,30 @@ public static class ClientEndpoints
                 : TypedResults.BadRequest(result.Error!);
         }
 
+        public static async Task<Results<Ok<BulkCreateResponse>, BadRequest<Error>>> BulkCreateClients(
+            [FromServices] ISender sender,
+            [FromBody] List<CreateClientRequest> requests,
+            CancellationToken cancellationToken = default)
+        {
+            var command = new BulkCreateClientsCommand(requests
+                .Select(request => new CreateClientCommand(
+                    request.UserId,
+                    request.Nif,
+                    request.CitizenCard,
+                    (Domain.Model.ClientType)request.Type,
+                    request.MinBudget,
+                    request.MaxBudget,
+                    request.PreferredContactMethod
+                ))
+                .ToList());
+
+            var result = await sender.Send(command, cancellationToken);
+
+            return result.IsSuccess
+                ? TypedResults.Ok(result.Value!)
+                : TypedResults.BadRequest(result.Error!);
+        }
+
         public static async Task<Results<Ok<UpdateClientResponse>, BadRequest<Error>>> UpdateClient(
             [FromServices] ISender sender,
             Guid id,
@@ -1,4 +1,5 @@
 using DreamLuso.Application.CQ.Notifications.Commands.SendNotification;
+using DreamLuso.Application.CQ.Notifications.Commands.BulkSendNotifications;
 using DreamLuso.Application.CQ.Notifications.Commands.MarkNotificationAsRead;
 using DreamLuso.Application.CQ.Notifications.Commands.MarkAllNotificationsAsRead;
 using DreamLuso.Application.CQ.Notifications.Queries.GetUserNotifications;
@@ -30,6 +31,10 @@ public static class NotificationEndpoints
             .WithName("SendNotification")
             .RequireAuthorization();
 
+        notifications.MapPost("/bulk", Commands.BulkSendNotifications)
+            .WithName("BulkSendNotifications")
+            .RequireAuthorization();
+
         notifications.MapPut("/{notificationId:guid}/mark-read", Commands.MarkAsRead)
             .WithName("MarkNotificationAsRead")
             .RequireAuthorization();
@@ -82,6 +87,19 @@ public static class NotificationEndpoints
                 : TypedResults.BadRequest(result.Error!);
         }
 
+        [Authorize]
+        public static async Task<Results<Ok<BulkCreateResponse>, BadRequest<Error>>> BulkSendNotifications(
+            [FromServices] ISender sender,
+            [FromBody] List<SendNotificationCommand> items,
+            CancellationToken cancellationToken = default)
+        {
+            var result = await sender.Send(new BulkSendNotificationsCommand(items), cancellationToken);
+
+            return result.IsSuccess
+                ? TypedResults.Ok(result.Value!)
+                : TypedResults.BadRequest(result.Error!);
+        }
+
         [Authorize]
         public static async Task<Results<Ok<object>, BadRequest<Error>>> MarkAsRead(
             [FromServices] ISender sender,
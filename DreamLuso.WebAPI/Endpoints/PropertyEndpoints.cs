@@ -1,5 +1,6 @@
 using DreamLuso.Application.Common.Responses;
 using DreamLuso.Application.CQ.Properties.Commands.CreateProperty;
+using DreamLuso.Application.CQ.Properties.Commands.BulkCreateProperties;
 using DreamLuso.Application.CQ.Properties.Commands.UpdateProperty;
 using DreamLuso.Application.CQ.Properties.Commands.DeleteProperty;
 using DreamLuso.Application.CQ.Properties.Queries.GetProperties;
@@ -47,6 +48,12 @@ public static class PropertyEndpoints
             .Produces<CreatePropertyResponse>(201)
             .Produces<Error>(400);
 
+        // POST /api/properties/bulk - Criar imóveis em lote (JSON, sem imagens, uma transação)
+        properties.MapPost("/bulk", Commands.BulkCreateProperties)
+            .WithName("BulkCreateProperties")
+            .Produces<BulkCreateResponse>(200)
+            .Produces<Error>(400);
+
         // PUT /api/properties/{id} - Atualizar imóvel
         properties.MapPut("/{id:guid}", Commands.UpdateProperty)
             .WithName("UpdateProperty")
@@ -388,6 +395,18 @@ public static class PropertyEndpoints
                 : TypedResults.BadRequest(result.Error!);
         }
 
+        public static async Task<Results<Ok<BulkCreateResponse>, BadRequest<Error>>> BulkCreateProperties(
+            [FromServices] ISender sender,
+            [FromBody] List<CreatePropertyCommand> items,
+            CancellationToken cancellationToken = default)
+        {
+            var result = await sender.Send(new BulkCreatePropertiesCommand(items), cancellationToken);
+
+            return result.IsSuccess
+                ? TypedResults.Ok(result.Value!)
+                : TypedResults.BadRequest(result.Error!);
+        }
+
         public static async Task<Results<Ok<DeletePropertyResponse>, NotFound<Error>>> DeleteProperty(
             [FromServices] ISender sender,
             Guid id,
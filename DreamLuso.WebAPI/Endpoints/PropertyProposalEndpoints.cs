@@ -1,5 +1,6 @@
 using DreamLuso.Application.CQ.PropertyProposals.Commands.ApproveProposal;
 using DreamLuso.Application.CQ.PropertyProposals.Commands.CreateProposal;
+using DreamLuso.Application.CQ.PropertyProposals.Commands.BulkCreateProposals;
 using DreamLuso.Application.CQ.PropertyProposals.Commands.RejectProposal;
 using DreamLuso.Application.CQ.PropertyProposals.Commands.AddNegotiation;
 using DreamLuso.Application.CQ.PropertyProposals.Commands.UpdateNegotiationStatus;
@@ -36,6 +37,11 @@ public static class PropertyProposalEndpoints
             .WithName("CreateProposal")
             .RequireAuthorization();
 
+        // POST /api/proposals/bulk - Criar propostas em lote (uma transação, sem notificações)
+        proposals.MapPost("/bulk", Commands.BulkCreateProposals)
+            .WithName("BulkCreateProposals")
+            .RequireAuthorization();
+
         // Specific routes must come before generic {proposalId:guid} route
         proposals.MapGet("/client/{clientId:guid}", Commands.GetProposalsByClient)
             .WithName("GetProposalsByClient")
@@ -108,6 +114,18 @@ public static class PropertyProposalEndpoints
                 : TypedResults.BadRequest(result.Error!);
         }
 
+        public static async Task<Results<Ok<BulkCreateResponse>, BadRequest<Error>>> BulkCreateProposals(
+            [FromServices] ISender sender,
+            [FromBody] List<CreateProposalCommand> items,
+            CancellationToken cancellationToken = default)
+        {
+            var result = await sender.Send(new BulkCreateProposalsCommand(items), cancellationToken);
+
+            return result.IsSuccess
+                ? TypedResults.Ok(result.Value!)
+                : TypedResults.BadRequest(result.Error!);
+        }
+
         public static async Task<Results<Ok<PropertyProposalResponse>, NotFound<Error>>> GetProposalById(
             [FromServices] ISender sender,
             [FromRoute] Guid proposalId,
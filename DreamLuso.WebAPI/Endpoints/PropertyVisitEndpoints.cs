@@ -1,5 +1,6 @@
 using DreamLuso.Application.Common.Responses;
 using DreamLuso.Application.CQ.PropertyVisits.Commands.ScheduleVisit;
+using DreamLuso.Application.CQ.PropertyVisits.Commands.BulkScheduleVisits;
 using DreamLuso.Application.CQ.PropertyVisits.Commands.ConfirmVisit;
 using DreamLuso.Application.CQ.PropertyVisits.Commands.CancelVisit;
 using DreamLuso.Application.CQ.PropertyVisits.Queries.GetAvailableTimeSlots;
@@ -42,6 +43,12 @@ public static class PropertyVisitEndpoints
             .Produces<ScheduleVisitResponse>(201)
             .Produces<Error>(400);
 
+        // POST /api/visits/bulk - Agendar visitas em lote (uma transação, sem notificações)
+        visits.MapPost("/bulk", Commands.BulkScheduleVisits)
+            .WithName("BulkScheduleVisits")
+            .Produces<BulkCreateResponse>(200)
+            .Produces<Error>(400);
+
         // PUT /api/visits/confirm - Confirmar visita (por token)
         visits.MapPut("/confirm", Commands.ConfirmVisitByToken)
             .WithName("ConfirmVisitByToken")
@@ -84,6 +91,29 @@ public static class PropertyVisitEndpoints
                 : TypedResults.BadRequest(result.Error!);
         }
 
+        public static async Task<Results<Ok<BulkCreateResponse>, BadRequest<Error>>> BulkScheduleVisits(
+            [FromServices] ISender sender,
+            [FromBody] List<ScheduleVisitRequest> requests,
+            CancellationToken cancellationToken = default)
+        {
+            var command = new BulkScheduleVisitsCommand(requests
+                .Select(request => new ScheduleVisitCommand(
+                    request.PropertyId,
+                    request.ClientId,
+                    request.RealEstateAgentId,
+                    request.VisitDate,
+                    (TimeSlot)request.TimeSlot,
+                    request.Notes
+                ))
+                .ToList());
+
+            var result = await sender.Send(command, cancellationToken);
+
+            return result.IsSuccess
+                ? TypedResults.Ok(result.Value!)
+                : TypedResults.BadRequest(result.Error!);
+        }
+
         public static async Task<Results<Ok<ConfirmVisitResponse>, BadRequest<Error>>> ConfirmVisitByToken(
             [FromServices] ISender sender,
             [FromBody] ConfirmVisitRequest request,
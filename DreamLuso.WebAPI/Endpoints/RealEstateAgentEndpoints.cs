@@ -1,5 +1,6 @@
 using DreamLuso.Application.Common.Responses;
 using DreamLuso.Application.CQ.RealEstateAgents.Commands.CreateAgent;
+using DreamLuso.Application.CQ.RealEstateAgents.Commands.BulkCreateAgents;
 using DreamLuso.Application.CQ.RealEstateAgents.Commands.UpdateAgent;
 using DreamLuso.Application.CQ.RealEstateAgents.Commands.ApproveAgent;
 using DreamLuso.Application.CQ.RealEstateAgents.Queries.GetAgents;
@@ -43,6 +44,12 @@ public static class RealEstateAgentEndpoints
             .Produces<CreateAgentResponse>(201)
             .Produces<Error>(400);
 
+        // POST /api/agents/bulk - Criar agentes em lote (uma transação)
+        agents.MapPost("/bulk", Commands.BulkCreateAgents)
+            .WithName("BulkCreateAgents")
+            .Produces<BulkCreateResponse>(200)
+            .Produces<Error>(400);
+
         // PUT /api/agents/{id} - Atualizar agente
         agents.MapPut("/{id:guid}", Commands.UpdateAgent)
             .WithName("UpdateAgent")
@@ -83,6 +90,32 @@ public static class RealEstateAgentEndpoints
                 : TypedResults.BadRequest(result.Error!);
         }
 
+        public static async Task<Results<Ok<BulkCreateResponse>, BadRequest<Error>>> BulkCreateAgents(
+            [FromServices] ISender sender,
+            [FromBody] List<CreateAgentRequest> requests,
+            CancellationToken cancellationToken = default)
+        {
+            var command = new BulkCreateAgentsCommand(requests
+                .Select(request => new CreateAgentCommand(
+                    request.UserId,
+                    request.LicenseNumber,
+                    request.LicenseExpiry,
+                    request.OfficeEmail,
+                    request.OfficePhone,
+                    request.CommissionRate,
+                    request.Specialization,
+                    request.Certifications,
+                    request.LanguagesSpoken?.Select(l => (Language)l).ToList()
+                ))
+                .ToList());
+
+            var result = await sender.Send(command, cancellationToken);
+
+            return result.IsSuccess
+                ? TypedResults.Ok(result.Value!)
+                : TypedResults.BadRequest(result.Error!);
+        }
+
         public static async Task<Results<Ok<UpdateAgentResponse>, BadRequest<Error>>> UpdateAgent(
             [FromServices] ISender sender,
             Guid id,
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+DreamLuso - Micro-benchmarks dos endpoints usados pelos seeders
+
+    python3 scripts/benchmark_api.py --out benchmarks/baseline.json
+    python3 scripts/benchmark_api.py --baseline benchmarks/baseline.json   # falha se houver regressões
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from dreamluso_tools.benchmark import (BenchCase, build_report, compare, load_report, run_case,
+                                       save_report, start_api, wait_for_api)
+from dreamluso_tools.generator import DatasetGenerator
+from dreamluso_tools.http_client import ApiClient, HttpConfig, add_http_arguments
+from dreamluso_tools.pagination import iter_items
+from dreamluso_tools.payloads import ADMIN_EMAIL, ADMIN_PASSWORD, TIME_SLOTS, login_payload, proposal_payload, visit_payload
+from dreamluso_tools.replay import to_form
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_API_COMMAND = "dotnet run --project DreamLuso.WebAPI -c Release"
+
+
+class BenchmarkContext:
+    """Ids reais necessários aos casos de escrita, preparados uma vez antes das medições"""
+
+    def __init__(self, api: ApiClient):
+        self.api = api
+        self.generator = DatasetGenerator(seed=int(time.time()))
+        self.agent_id: Optional[str] = None
+        self.client_id: Optional[str] = None
+        self.property_id: Optional[str] = None
+        self.proposal_id: Optional[str] = None
+
+    def prepare(self) -> bool:
+        agent = next(iter_items(self.api, "/agents", page_size=1), None)
+        client = next(iter_items(self.api, "/clients", page_size=1), None)
+        if not agent or not client:
+            print("❌ São precisos pelo menos um agente e um cliente (corra o seed primeiro)")
+            return False
+        self.agent_id, self.client_id = agent["id"], client["id"]
+        # Propriedade própria desta execução: as visitas não colidem com execuções anteriores
+        self.property_id = self.create_property(-1)
+        return self.property_id is not None
+
+    def create_property(self, i: int) -> Optional[str]:
+        form = to_form(self.generator.property(abs(i), 1))
+        form.update(realEstateAgentId=self.agent_id, title=f"Benchmark {form['title']} ({i})")
+        response = self.api.post("/properties", data=form)
+        return response.json().get("id") if response.status_code in (200, 201) else None
+
+    def create_proposal(self, i: int) -> int:
+        response = self.api.post("/proposals", json=proposal_payload(
+            self.client_id, self.property_id, 100000 + i, notes="Benchmark"))
+        if response.status_code in (200, 201):
+            body = response.json()
+            self.proposal_id = body if isinstance(body, str) else body.get("id")
+        return response.status_code
+
+    def cancel_proposal(self, i: int) -> None:
+        """
+        A API recusa uma segunda proposta Pending/InNegotiation do mesmo
+        cliente para o mesmo imóvel: cancelar depois de cada iteração deixa o
+        par livre para a seguinte
+        """
+        if self.proposal_id:
+            proposal_id, self.proposal_id = self.proposal_id, None
+            self.api.put(f"/proposals/{proposal_id}/cancel")
+
+    def cases(self) -> List[BenchCase]:
+        api = self.api
+        start_day = date.today() + timedelta(days=30)
+        return [
+            BenchCase("accounts.login", lambda i: api.post(
+                "/accounts/login", auth=False, json=login_payload()).status_code),
+            BenchCase("clients.list", lambda i: api.get(
+                "/clients", params={"pageNumber": 1, "pageSize": 20}).status_code),
+            BenchCase("agents.list", lambda i: api.get(
+                "/agents", params={"pageNumber": 1, "pageSize": 20}).status_code),
+            BenchCase("properties.list", lambda i: api.get(
+                "/properties", params={"pageNumber": 1, "pageSize": 20}).status_code),
+            BenchCase("properties.create", lambda i: api.post(
+                "/properties", data={**to_form(self.generator.property(i, 1)),
+                                     "realEstateAgentId": self.agent_id}).status_code),
+            BenchCase("proposals.create", self.create_proposal, after=self.cancel_proposal),
+            # Um par (dia, horário) diferente por iteração para não medir conflitos
+            BenchCase("visits.schedule", lambda i: api.post("/visits", json=visit_payload(
+                self.property_id, self.client_id, self.agent_id,
+                start_day + timedelta(days=i // len(TIME_SLOTS)), i % len(TIME_SLOTS),
+                notes="Benchmark")).status_code),
+            BenchCase("dashboard.stats", lambda i: api.get("/dashboard/stats").status_code),
+        ]
+
+
+def print_results(report: Dict) -> None:
+    print("\n" + "━" * 78)
+    print("⏱️  RESULTADOS")
+    print("━" * 78)
+    print(f"   {'caso':<20} {'n':>5} {'erros':>6} {'mediana ms':>11} {'MAD ms':>8} {'p95 ms':>9} {'mín ms':>8}")
+    for name, s in report["cases"].items():
+        print(f"   {name:<20} {s['n']:>5} {s['errors']:>6} {s['medianMs']:>11.2f} "
+              f"{s['madMs']:>8.2f} {s['p95Ms']:>9.2f} {s['minMs']:>8.2f}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks da API DreamLuso")
+    add_http_arguments(parser)
+    parser.set_defaults(retries=0)
+    parser.add_argument("--warmup", type=int, default=5, help="Iterações descartadas por caso (default: %(default)s)")
+    parser.add_argument("--samples", type=int, default=30, help="Iterações medidas por caso (default: %(default)s)")
+    parser.add_argument("--only", action="append", default=[], metavar="CASO", help="Corre só estes casos")
+    parser.add_argument("--out", help="Guarda os resultados como baseline JSON")
+    parser.add_argument("--baseline", help="Compara com esta baseline e falha em regressões")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Aumento mínimo da mediana para contar como regressão (default: %(default)s)")
+    parser.add_argument("--alpha", type=float, default=0.01,
+                        help="Nível de significância do teste Mann-Whitney (default: %(default)s)")
+    parser.add_argument("--start-api", action="store_true", help="Arranca a API localmente antes de medir")
+    parser.add_argument("--api-command", default=DEFAULT_API_COMMAND,
+                        help="Comando usado por --start-api (default: %(default)s)")
+    return parser.parse_args(argv)
+
+
+def main() -> int:
+    args = parse_args()
+    config = HttpConfig.from_args(args)
+    process = None
+    if args.start_api:
+        print(f"🚀 A arrancar a API: {args.api_command}")
+        process = start_api(args.api_command, cwd=REPO_ROOT)
+        if not wait_for_api(config.base_url):
+            print("❌ A API não respondeu em /health")
+            process.terminate()
+            return 1
+
+    try:
+        with ApiClient(config) as api:
+            response = api.post("/accounts/login", auth=False,
+                                json=login_payload(ADMIN_EMAIL, ADMIN_PASSWORD))
+            if response.status_code != 200:
+                print(f"❌ Erro no login: {response.status_code}")
+                return 1
+            api.token = response.json().get("accessToken")
+
+            context = BenchmarkContext(api)
+            if not context.prepare():
+                return 1
+
+            cases = [c for c in context.cases() if not args.only or c.name in args.only]
+            results = []
+            for case in cases:
+                print(f"   ▶ {case.name} (warmup {args.warmup}, {args.samples} amostras)")
+                results.append(run_case(case, args.warmup, args.samples))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+
+    report = build_report(results, config.base_url, args.warmup)
+    print_results(report)
+    # Um caso sem amostras não entra na comparação: o gate passaria sem o medir
+    empty = [name for name, stats in report["cases"].items() if not stats["n"]]
+    if empty:
+        print(f"\n❌ Casos sem nenhuma amostra válida: {', '.join(empty)}")
+        return 1
+
+    if args.out:
+        save_report(report, args.out)
+        print(f"\n💾 Baseline guardada em {args.out}")
+
+    if not args.baseline:
+        return 0
+
+    comparisons = compare(load_report(args.baseline), report, args.threshold, args.alpha)
+    print("\n" + "━" * 78)
+    print(f"📈 COMPARAÇÃO COM {args.baseline}")
+    print("━" * 78)
+    for c in comparisons:
+        mark = "❌ REGRESSÃO" if c.regression else ("✅ melhoria" if c.improvement else "  =")
+        print(f"   {c.name:<20} {c.baseline_ms:>9.2f} → {c.current_ms:>9.2f} ms "
+              f"({c.change * 100:+6.1f}%, p={c.p_value:.4f})  {mark}")
+    regressions = [c for c in comparisons if c.regression]
+    if regressions:
+        print(f"\n❌ {len(regressions)} regressões acima de {args.threshold:.0%} (p < {args.alpha})")
+        return 1
+    print("\n✅ Sem regressões significativas")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
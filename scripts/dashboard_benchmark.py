@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+DreamLuso - Benchmark dos dashboards por tamanho de dataset
+
+Para cada perfil faz o seed (seed_dataset.py replay --profile), mede as
+variantes de /dashboard com muitos ids de agentes e clientes do mapa de ids
+em paralelo e junta o resultado aos perfis anteriores, para ver como cada
+agregado cresce com o número de linhas.
+
+    python3 scripts/dashboard_benchmark.py --profiles small,medium,large --api-url http://localhost:5149/api
+    python3 scripts/dashboard_benchmark.py --profiles xl --skip-seed --plot benchmarks/dashboards.png
+"""
+
+import argparse
+import os
+import random
+import shlex
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+from dreamluso_tools.auth import ADMIN, AuthError, TokenManager
+from dreamluso_tools.dashboards import (
+    DASHBOARD_VARIANTS,
+    ID_KINDS,
+    load_results,
+    measure_variant,
+    plot_scaling,
+    print_scaling,
+    save_results,
+    variant_paths,
+)
+from dreamluso_tools.http_client import ApiClient, HttpConfig, add_http_arguments
+from dreamluso_tools.ndjson_io import IdMap
+from dreamluso_tools.payloads import ADMIN_EMAIL, ADMIN_PASSWORD
+from dreamluso_tools.profiles import PROFILES, read_manifest
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark dos dashboards DreamLuso por tamanho de dataset")
+    add_http_arguments(parser)
+    parser.add_argument("--profiles", default="small,medium",
+                        help=f"Perfis a medir, por ordem ({', '.join(PROFILES)}) (default: %(default)s)")
+    parser.add_argument("--data-dir", default="data",
+                        help="Diretório com um dataset por perfil, <data-dir>/<perfil> (default: %(default)s)")
+    parser.add_argument("--skip-seed", action="store_true",
+                        help="Não faz o seed: mede o que já estiver na base de dados")
+    parser.add_argument("--reset-command",
+                        help="Comando que deixa a base de dados vazia, corrido antes do seed de cada perfil; "
+                             "sem ele os perfis acumulam-se na mesma base de dados")
+    parser.add_argument("--seed-concurrency", type=int, default=16,
+                        help="Concorrência do seed de cada perfil (default: %(default)s)")
+    parser.add_argument("--variants", default=",".join(DASHBOARD_VARIANTS),
+                        help="Variantes a medir (default: %(default)s)")
+    parser.add_argument("--requests", type=int, default=200,
+                        help="Pedidos medidos por variante e perfil (default: %(default)s)")
+    parser.add_argument("--warmup", type=int, default=10,
+                        help="Pedidos descartados antes de cada variante (default: %(default)s)")
+    parser.add_argument("--concurrency", type=int, default=16,
+                        help="Pedidos em paralelo durante a medição (default: %(default)s)")
+    parser.add_argument("--ids", type=int, default=100,
+                        help="Agentes/clientes distintos por variante (default: %(default)s)")
+    parser.add_argument("--results", default="benchmarks/dashboards.json",
+                        help="JSON acumulado por perfil (default: %(default)s)")
+    parser.add_argument("--plot", help="Grava o gráfico log-log em PNG (precisa de matplotlib)")
+    parser.add_argument("--email", default=ADMIN_EMAIL)
+    parser.add_argument("--password", default=ADMIN_PASSWORD)
+    args = parser.parse_args(argv)
+    args.profiles = [name.strip() for name in args.profiles.split(",") if name.strip()]
+    args.variants = [name.strip() for name in args.variants.split(",") if name.strip()]
+    for name in args.profiles:
+        if name not in PROFILES:
+            parser.error(f"perfil desconhecido: {name}")
+    for name in args.variants:
+        if name not in DASHBOARD_VARIANTS:
+            parser.error(f"variante desconhecida: {name}")
+    return args
+
+
+def seed_profile(args: argparse.Namespace, name: str, directory: str) -> bool:
+    """Reset opcional e seed do perfil num subprocesso (o seed reutiliza o mapa de ids)"""
+    if args.reset_command:
+        print(f"🧹 {args.reset_command}")
+        if subprocess.run(shlex.split(args.reset_command)).returncode != 0:
+            print("❌ O comando de reset falhou")
+            return False
+        # Base de dados nova: os ids antigos já não existem
+        ids_dir = os.path.join(directory, "ids")
+        if os.path.isdir(ids_dir):
+            for entry in os.listdir(ids_dir):
+                os.remove(os.path.join(ids_dir, entry))
+    command = [sys.executable, os.path.join(SCRIPTS_DIR, "seed_dataset.py"), "replay", directory,
+               "--profile", name, "--api-url", args.api_url, "--concurrency", str(args.seed_concurrency)]
+    print(f"🌱 Seed do perfil {name}...")
+    started = time.monotonic()
+    code = subprocess.run(command).returncode
+    print(f"   seed em {time.monotonic() - started:.0f}s")
+    return code == 0
+
+
+def load_ids(directory: str) -> Dict[str, List[str]]:
+    id_map = IdMap(os.path.join(directory, "ids"))
+    try:
+        return {kind: [guid for _, guid in id_map.items(kind)] for kind in ID_KINDS.values()}
+    finally:
+        id_map.close()
+
+
+def measure_profile(args: argparse.Namespace, api: ApiClient, name: str, directory: str) -> Optional[dict]:
+    manifest = read_manifest(directory)
+    if manifest is None:
+        print(f"❌ {directory} não tem manifesto: corra sem --skip-seed ou export --profile {name}")
+        return None
+    ids = load_ids(directory)
+    rng = random.Random(PROFILES[name].seed)
+    counts = manifest["counts"]
+    result = {"profile": f"{name}@v{manifest.get('profileVersion')}", "counts": counts,
+              "rows": sum(counts.values()), "variants": {}}
+    print(f"\n📏 Perfil {name}: {result['rows']:,} linhas, "
+          f"{len(ids['agent'])} agentes e {len(ids['client'])} clientes no mapa de ids")
+    for variant in args.variants:
+        paths = variant_paths(variant, ids, args.ids, rng)
+        if not paths:
+            print(f"   ⚠️  {variant}: sem ids no mapa, ignorado")
+            continue
+        stats = measure_variant(api, paths, args.requests, args.concurrency, args.warmup)
+        result["variants"][variant] = stats
+        print(f"   {variant:<7} p50 {stats['p50Ms']:>8.1f} ms  p95 {stats['p95Ms']:>8.1f} ms  "
+              f"p99 {stats['p99Ms']:>8.1f} ms  {stats.get('throughput', 0):>7.1f} req/s  "
+              f"erros {stats['errorRate'] * 100:.1f}%  ({len(paths)} ids)")
+    return result
+
+
+def main() -> int:
+    args = parse_args()
+    results = load_results(args.results)
+    config = HttpConfig.from_args(args)
+    config.pool_maxsize = max(config.pool_maxsize, args.concurrency)
+
+    if not args.reset_command and not args.skip_seed and len(args.profiles) > 1:
+        print("⚠️  Sem --reset-command os perfis acumulam-se: o tamanho real é maior do que o do perfil")
+
+    with ApiClient(config) as api:
+        tokens = TokenManager(api)
+        tokens.register_admin(args.email, args.password)
+        try:
+            for name in args.profiles:
+                directory = os.path.join(args.data_dir, name)
+                if not args.skip_seed and not seed_profile(args, name, directory):
+                    return 1
+                if args.reset_command:
+                    # O reset recriou o admin: o token anterior já não serve
+                    tokens.invalidate(ADMIN)
+                try:
+                    tokens.state(ADMIN)
+                except AuthError as e:
+                    print(f"❌ Erro no login: {e}")
+                    return 1
+                tokens.attach(api, ADMIN)
+                result = measure_profile(args, api, name, directory)
+                if result is None:
+                    return 1
+                results["profiles"][name] = result
+                save_results(results, args.results)
+        finally:
+            tokens.close()
+
+    print_scaling(results)
+    print(f"💾 Resultados em {args.results}")
+    if args.plot:
+        if plot_scaling(results, args.plot):
+            print(f"🖼️  Gráfico em {args.plot}")
+        else:
+            print("⚠️  matplotlib não está instalado: gráfico só no terminal")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
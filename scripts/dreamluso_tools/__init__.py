@@ -0,0 +1,3 @@
+"""
+DreamLuso - Ferramentas partilhadas pelos scripts de seed e população
+"""
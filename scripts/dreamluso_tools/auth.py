@@ -0,0 +1,210 @@
+"""
+Gestão de tokens JWT por identidade: cache, refresh proativo via
+/accounts/refresh-token e logins em paralelo
+"""
+
+import base64
+import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import requests
+
+from .http_client import ApiClient
+from .payloads import ADMIN_EMAIL, ADMIN_PASSWORD, login_payload
+
+ADMIN = "admin"
+
+
+class AuthError(RuntimeError):
+    """Login ou refresh recusados pela API"""
+
+
+def jwt_expiry(token: str) -> Optional[float]:
+    """Lê o claim exp (epoch) do payload do JWT, sem validar a assinatura"""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (IndexError, KeyError, ValueError, TypeError):
+        return None
+
+
+def parse_expires_at(value: Optional[str]) -> Optional[float]:
+    """expiresAt vem em UTC, com ou sem 'Z' e com até 7 casas decimais"""
+    if not value:
+        return None
+    text = value.rstrip("Z")
+    if "." in text:
+        head, frac = text.split(".", 1)
+        text = f"{head}.{frac[:6]}"
+    try:
+        moment = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+@dataclass
+class TokenState:
+    access_token: str
+    refresh_token: Optional[str]
+    expires_at: float
+    user_id: Optional[str] = None
+    client_id: Optional[str] = None
+    agent_id: Optional[str] = None
+    role: Optional[str] = None
+
+    @classmethod
+    def from_response(cls, data: Dict[str, Any], previous: Optional["TokenState"] = None) -> "TokenState":
+        access = data["accessToken"]
+        expires = jwt_expiry(access) or parse_expires_at(data.get("expiresAt")) or time.time() + 3600
+        base = previous or cls(access, None, expires)
+        return cls(
+            access_token=access,
+            refresh_token=data.get("refreshToken") or base.refresh_token,
+            expires_at=expires,
+            user_id=data.get("userId") or base.user_id,
+            client_id=data.get("clientId") or base.client_id,
+            agent_id=data.get("agentId") or base.agent_id,
+            role=data.get("role") or base.role,
+        )
+
+    def remaining(self) -> float:
+        return self.expires_at - time.time()
+
+
+class TokenManager:
+    """
+    Cache de tokens por identidade (admin, cada agente, cada cliente). Um
+    token a menos de refresh_margin segundos de expirar é renovado em
+    segundo plano enquanto os pedidos continuam a usar o atual; só um token
+    já expirado obriga a esperar. Há no máximo um login/refresh em curso por
+    identidade.
+    """
+
+    def __init__(self, api: ApiClient, refresh_margin: float = 120.0, workers: int = 8):
+        self.api = api
+        self.refresh_margin = refresh_margin
+        self._credentials: Dict[str, Tuple[str, str]] = {}
+        self._states: Dict[str, TokenState] = {}
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="auth")
+
+    def register(self, identity: str, email: str, password: str) -> str:
+        with self._lock:
+            self._credentials[identity] = (email, password)
+        return identity
+
+    def register_admin(self, email: str = ADMIN_EMAIL, password: str = ADMIN_PASSWORD) -> str:
+        return self.register(ADMIN, email, password)
+
+    # ── Pedidos à API ────────────────────────────────────────────────────
+
+    def _login(self, identity: str) -> TokenState:
+        email, password = self._credentials[identity]
+        response = self.api.post("/accounts/login", auth=False, json=login_payload(email, password))
+        if response.status_code != 200:
+            raise AuthError(f"login de {email} falhou: {response.status_code}")
+        return TokenState.from_response(response.json())
+
+    def _refresh(self, identity: str, state: TokenState) -> TokenState:
+        if state.refresh_token:
+            response = self.api.post("/accounts/refresh-token", auth=False, json={
+                "accessToken": state.access_token,
+                "refreshToken": state.refresh_token,
+            })
+            data = response.json() if response.status_code == 200 else {}
+            if data.get("accessToken"):
+                return TokenState.from_response(data, previous=state)
+        # Refresh token expirado ou revogado: novo login
+        return self._login(identity)
+
+    def _renew(self, identity: str) -> TokenState:
+        state = self._states.get(identity)
+        try:
+            new_state = self._refresh(identity, state) if state else self._login(identity)
+            with self._lock:
+                self._states[identity] = new_state
+            return new_state
+        finally:
+            with self._lock:
+                self._inflight.pop(identity, None)
+
+    def _schedule(self, identity: str) -> Future:
+        """Single-flight: reutiliza o login/refresh já em curso para a identidade"""
+        with self._lock:
+            if identity not in self._credentials:
+                raise KeyError(f"identidade desconhecida: {identity}")
+            future = self._inflight.get(identity)
+            if future is None:
+                future = self._executor.submit(self._renew, identity)
+                self._inflight[identity] = future
+            return future
+
+    # ── API pública ──────────────────────────────────────────────────────
+
+    def state(self, identity: str) -> TokenState:
+        """Estado atual da identidade, fazendo login/refresh se preciso"""
+        state = self._states.get(identity)
+        if state is None or state.remaining() <= 5:
+            return self._schedule(identity).result()
+        if state.remaining() <= self.refresh_margin:
+            self._schedule(identity)
+        return state
+
+    def token(self, identity: str) -> str:
+        return self.state(identity).access_token
+
+    def invalidate(self, identity: str) -> None:
+        """Esquece o token (ex.: após um 401); o próximo pedido faz login"""
+        with self._lock:
+            self._states.pop(identity, None)
+
+    def login_many(self, identities: Iterable[str]) -> Dict[str, Optional[TokenState]]:
+        """
+        Autentica várias identidades em paralelo (até workers logins em
+        simultâneo); as que falham ficam a None
+        """
+        results: Dict[str, Optional[TokenState]] = {}
+        futures: Dict[str, Future] = {}
+        for identity in identities:
+            state = self._states.get(identity)
+            if state is not None and state.remaining() > self.refresh_margin:
+                results[identity] = state
+            else:
+                futures[identity] = self._schedule(identity)
+        for identity, future in futures.items():
+            try:
+                results[identity] = future.result()
+            except (AuthError, requests.RequestException):
+                results[identity] = None
+        return results
+
+    def attach(self, api: ApiClient, identity: str) -> ApiClient:
+        """Faz api autenticar-se como identity, com renovação automática e repetição após 401"""
+        api.token_provider = lambda: self.token(identity)
+        api.on_unauthorized = lambda: self.invalidate(identity)
+        return api
+
+    def client(self, identity: str) -> ApiClient:
+        """ApiClient que partilha a sessão HTTP (tracer e throttle incluídos) do gestor e se autentica como identity"""
+        client = ApiClient(self.api.config, self.api.session)
+        client.tracer = self.api.tracer
+        client.throttle = self.api.throttle
+        return self.attach(client, identity)
+
+    def identities(self) -> List[str]:
+        with self._lock:
+            return list(self._credentials)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
@@ -0,0 +1,223 @@
+"""
+Micro-benchmarks de endpoints: warmup, amostras repetidas, baselines em JSON
+e comparação estatística entre execuções
+"""
+
+import json
+import math
+import os
+import platform
+import shlex
+import statistics
+import subprocess
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import requests
+
+from .metrics import percentile
+
+BASELINE_VERSION = 1
+
+
+@dataclass
+class BenchCase:
+    """
+    fn(i) faz um pedido e devolve o status HTTP; i é o número da iteração.
+    after(i), se definido, corre depois de cada iteração, fora da medição
+    (ex.: desfazer o que fn criou para a iteração seguinte não colidir)
+    """
+    name: str
+    fn: Callable[[int], int]
+    after: Optional[Callable[[int], None]] = None
+
+
+@dataclass
+class CaseResult:
+    name: str
+    samples: List[float]
+    errors: int
+
+    def stats(self) -> Dict[str, Any]:
+        values = sorted(self.samples)
+        median = statistics.median(values) if values else 0.0
+        mad = statistics.median([abs(v - median) for v in values]) if values else 0.0
+        return {
+            "n": len(values),
+            "errors": self.errors,
+            "medianMs": median * 1000,
+            "madMs": mad * 1000,
+            "meanMs": (statistics.fmean(values) if values else 0.0) * 1000,
+            "p95Ms": percentile(values, 95) * 1000,
+            "minMs": (values[0] if values else 0.0) * 1000,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**self.stats(), "samples": [round(v, 6) for v in self.samples]}
+
+
+def _call(fn: Callable[[int], int], i: int) -> int:
+    """Status da iteração; 0 em falha de transporte"""
+    try:
+        return fn(i)
+    except requests.RequestException:
+        return 0
+
+
+def _cleanup(case: BenchCase, i: int) -> None:
+    if case.after is None:
+        return
+    try:
+        case.after(i)
+    except requests.RequestException:
+        pass
+
+
+def run_case(case: BenchCase, warmup: int, samples: int, pause: float = 0.0) -> CaseResult:
+    """Corre warmup iterações descartadas e depois samples iterações cronometradas, em série"""
+    for i in range(warmup):
+        _call(case.fn, i)
+        _cleanup(case, i)
+    timings: List[float] = []
+    errors = 0
+    for i in range(warmup, warmup + samples):
+        started = time.perf_counter()
+        status = _call(case.fn, i)
+        elapsed = time.perf_counter() - started
+        _cleanup(case, i)
+        if status == 0 or status >= 400:
+            errors += 1
+        else:
+            timings.append(elapsed)
+        if pause:
+            time.sleep(pause)
+    return CaseResult(case.name, timings, errors)
+
+
+# ── Comparação ───────────────────────────────────────────────────────────
+
+def mann_whitney_u(a: Sequence[float], b: Sequence[float]) -> Tuple[float, float]:
+    """
+    Teste U de Mann-Whitney bilateral com aproximação normal e correção de
+    empates; devolve (U de a, p-value). Adequado para n >= ~10 por amostra.
+    """
+    n1, n2 = len(a), len(b)
+    if n1 == 0 or n2 == 0:
+        return 0.0, 1.0
+    combined = sorted([(v, 0) for v in a] + [(v, 1) for v in b])
+    ranks = [0.0] * len(combined)
+    tie_term = 0.0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        rank = (i + j) / 2 + 1
+        for k in range(i, j + 1):
+            ranks[k] = rank
+        ties = j - i + 1
+        tie_term += ties ** 3 - ties
+        i = j + 1
+
+    rank_sum_a = sum(r for r, (_, group) in zip(ranks, combined) if group == 0)
+    u1 = rank_sum_a - n1 * (n1 + 1) / 2
+    mean_u = n1 * n2 / 2
+    n = n1 + n2
+    var_u = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if var_u <= 0:
+        return u1, 1.0
+    z = (abs(u1 - mean_u) - 0.5) / math.sqrt(var_u)
+    p = math.erfc(max(z, 0.0) / math.sqrt(2))
+    return u1, p
+
+
+@dataclass
+class Comparison:
+    name: str
+    baseline_ms: float
+    current_ms: float
+    change: float
+    p_value: float
+    regression: bool
+    improvement: bool
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any],
+            threshold: float = 0.10, alpha: float = 0.01) -> List[Comparison]:
+    """
+    Compara medianas caso a caso. Só é regressão se a mediana piorar mais do
+    que threshold e a diferença for significativa (p < alpha): ruído sozinho
+    não falha o gate, nem diferenças significativas mas irrelevantes.
+    """
+    results = []
+    for name, cur in current["cases"].items():
+        base = baseline.get("cases", {}).get(name)
+        if not base or not base.get("samples") or not cur.get("samples"):
+            continue
+        _, p_value = mann_whitney_u(cur["samples"], base["samples"])
+        change = cur["medianMs"] / base["medianMs"] - 1 if base["medianMs"] else 0.0
+        significant = p_value < alpha
+        results.append(Comparison(name, base["medianMs"], cur["medianMs"], change, p_value,
+                                  regression=significant and change > threshold,
+                                  improvement=significant and change < -threshold))
+    return results
+
+
+# ── Baselines ────────────────────────────────────────────────────────────
+
+def build_report(results: List[CaseResult], api_url: str, warmup: int) -> Dict[str, Any]:
+    return {
+        "version": BASELINE_VERSION,
+        "createdAt": datetime.now(timezone.utc).isoformat(),
+        "apiUrl": api_url,
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "warmup": warmup,
+        "cases": {result.name: result.to_dict() for result in results},
+    }
+
+
+def save_report(report: Dict[str, Any], path: str) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+
+
+def load_report(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as handle:
+        report = json.load(handle)
+    if report.get("version") != BASELINE_VERSION:
+        raise ValueError(f"{path}: versão de baseline {report.get('version')} não suportada")
+    return report
+
+
+# ── API local ────────────────────────────────────────────────────────────
+
+def health_url(api_url: str) -> str:
+    """/health está mapeado na raiz, fora do prefixo /api"""
+    root = api_url.rstrip("/")
+    if root.endswith("/api"):
+        root = root[:-4]
+    return f"{root}/health"
+
+
+def wait_for_api(api_url: str, timeout: float = 120.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(health_url(api_url), timeout=2).status_code == 200:
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(1.0)
+    return False
+
+
+def start_api(command: str, cwd: Optional[str] = None) -> subprocess.Popen:
+    """Arranca a API como subprocesso; a saída vai para api-benchmark.log"""
+    log = open(os.path.join(cwd or ".", "api-benchmark.log"), "w")
+    return subprocess.Popen(shlex.split(command), cwd=cwd, stdout=log, stderr=subprocess.STDOUT)
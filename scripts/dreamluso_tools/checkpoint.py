@@ -0,0 +1,86 @@
+"""
+Checkpoints do seed em SQLite: cada entidade criada fica registada pela sua
+chave natural (email, NIF, licença, título+morada) com o id devolvido pela API
+"""
+
+import argparse
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+DEFAULT_CHECKPOINT = ".seed-checkpoint.db"
+
+
+def add_checkpoint_arguments(parser: argparse.ArgumentParser) -> None:
+    """Regista as opções de checkpoint/retoma"""
+    group = parser.add_argument_group("Checkpoints")
+    group.add_argument("--checkpoint", default=os.environ.get("DREAMLUSO_CHECKPOINT", DEFAULT_CHECKPOINT),
+                       help="Ficheiro SQLite com o progresso do seed (default: %(default)s)")
+    group.add_argument("--fresh", action="store_true",
+                       help="Ignora o progresso guardado e recomeça do zero")
+
+
+def property_key(title: str, address: Mapping[str, Any]) -> str:
+    """Chave natural de uma propriedade: título + morada"""
+    return "|".join(str(address.get(part, "")) for part in ("street", "number", "postalCode")) + f"|{title}"
+
+
+class CheckpointStore:
+    """
+    Tabela (kind, natural_key) -> entity_id. As linhas são carregadas para um
+    dict na abertura, pelo que get() é O(1) sem ida à base de dados; put()
+    escreve e faz commit de imediato (WAL), para que uma falha a meio do seed
+    não perca o trabalho já feito.
+    """
+
+    def __init__(self, path: str = DEFAULT_CHECKPOINT):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints ("
+            " kind TEXT NOT NULL,"
+            " natural_key TEXT NOT NULL,"
+            " entity_id TEXT NOT NULL,"
+            " created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,"
+            " PRIMARY KEY (kind, natural_key))"
+        )
+        self._cache: Dict[Tuple[str, str], str] = {
+            (kind, key): entity_id
+            for kind, key, entity_id in self._conn.execute(
+                "SELECT kind, natural_key, entity_id FROM checkpoints")
+        }
+
+    def get(self, kind: str, key: str) -> Optional[str]:
+        return self._cache.get((kind, key))
+
+    def put(self, kind: str, key: str, entity_id: str) -> None:
+        with self._lock:
+            if self._cache.get((kind, key)) == entity_id:
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (kind, natural_key, entity_id) VALUES (?, ?, ?)",
+                (kind, key, entity_id))
+            self._cache[(kind, key)] = entity_id
+
+    def count(self, kind: Optional[str] = None) -> int:
+        if kind is None:
+            return len(self._cache)
+        return sum(1 for k, _ in self._cache if k == kind)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM checkpoints")
+            self._cache.clear()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "CheckpointStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
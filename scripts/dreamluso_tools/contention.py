@@ -0,0 +1,340 @@
+"""
+Carga de agendamento de visitas concentrada em poucos agentes e imóveis:
+consulta de horários livres, marcações concorrentes, confirmação e
+cancelamento, com taxas de conflito e auditoria de marcações duplicadas
+"""
+
+import argparse
+import random
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import requests
+
+from .http_client import ApiClient
+from .loadgen import LoadSession, Scenario
+from .metrics import LatencyRecorder
+from .payloads import TIME_SLOTS, slot_index, visit_payload
+from .workloads import WorkloadData
+
+CONTENTION_WEIGHTS = {
+    "book": 70,
+    "confirm": 20,
+    "cancel": 10,
+}
+
+# Resultados de uma tentativa de marcação
+BOOKED = "booked"
+CONFLICT = "conflict"      # TimeSlotUnavailable: o horário foi ocupado entre a consulta e o POST
+SOLD_OUT = "soldOut"       # available-slots já não tinha nenhum horário
+REJECTED = "rejected"      # Outro 400 (validação, entidades inexistentes)
+FAILED = "failed"          # 5xx ou falha de transporte
+OUTCOMES = (BOOKED, CONFLICT, SOLD_OUT, REJECTED, FAILED)
+
+
+def add_contention_arguments(parser: argparse.ArgumentParser) -> None:
+    """Regista as opções do conjunto disputado e da fase de corrida"""
+    group = parser.add_argument_group("Contenção")
+    group.add_argument("--hot-agents", type=int, default=3,
+                       help="Agentes (os com mais imóveis) que recebem toda a procura (default: %(default)s)")
+    group.add_argument("--hot-properties", type=int, default=4,
+                       help="Imóveis por agente no conjunto disputado (default: %(default)s)")
+    group.add_argument("--days", type=int, default=3,
+                       help="Dias a partir de amanhã em que se marcam visitas (default: %(default)s)")
+    group.add_argument("--race-rounds", type=int, default=0, metavar="N",
+                       help="Rondas em que --racers clientes marcam o mesmo horário em simultâneo")
+    group.add_argument("--racers", type=int, default=8,
+                       help="Clientes por ronda de corrida (default: %(default)s)")
+    group.add_argument("--cleanup", action="store_true",
+                       help="No fim cancela as visitas criadas que continuem ativas")
+
+
+@dataclass(frozen=True)
+class HotTarget:
+    property_id: str
+    agent_id: str
+
+
+@dataclass
+class BookedVisit:
+    visit_id: str
+    token: str
+    target: HotTarget
+    visit_date: date
+    slot: str
+
+
+@dataclass
+class ContentionStats:
+    """Contadores por resultado; seguros entre threads"""
+    outcomes: Counter = field(default_factory=Counter)
+    errors: Counter = field(default_factory=Counter)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, outcome: str, code: Optional[str] = None) -> None:
+        with self.lock:
+            self.outcomes[outcome] += 1
+            if code:
+                self.errors[code] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self.lock:
+            attempts = sum(self.outcomes[o] for o in (BOOKED, CONFLICT, REJECTED, FAILED))
+            counts = {outcome: self.outcomes[outcome] for outcome in OUTCOMES}
+            errors = dict(self.errors)
+        return {
+            "attempts": attempts,
+            **counts,
+            # Conflitos sobre tentativas que chegaram a fazer POST
+            "conflictRate": counts[CONFLICT] / attempts if attempts else 0.0,
+            "rejectionRate": (counts[CONFLICT] + counts[REJECTED]) / attempts if attempts else 0.0,
+            "errorCodes": errors,
+        }
+
+
+def _error_code(response: requests.Response) -> Optional[str]:
+    try:
+        body = response.json()
+    except ValueError:
+        return None
+    return body.get("code") if isinstance(body, dict) else None
+
+
+def pick_hot_targets(data: WorkloadData, agents: int, per_agent: int) -> List[HotTarget]:
+    """Os agentes com mais imóveis e, de cada um, os primeiros per_agent imóveis"""
+    by_agent: Dict[str, List[str]] = defaultdict(list)
+    for prop in data.properties:
+        if prop.get("agentId"):
+            by_agent[prop["agentId"]].append(prop["id"])
+    ranked = sorted(by_agent.items(), key=lambda item: (-len(item[1]), item[0]))[:agents]
+    return [HotTarget(property_id, agent_id)
+            for agent_id, properties in ranked for property_id in properties[:per_agent]]
+
+
+class VisitContentionWorkload:
+    """
+    Cenários book/confirm/cancel para o OpenLoopRunner, todos sobre o mesmo
+    conjunto pequeno de (imóvel, dia): com hot_targets × days × 5 horários
+    e algumas dezenas de marcações por segundo os clientes disputam os
+    mesmos horários. As visitas marcadas ficam numa fila de onde confirm e
+    cancel as retiram; cancelar liberta o horário e mantém a disputa viva.
+    """
+
+    def __init__(self, data: WorkloadData, targets: List[HotTarget], days: int = 3,
+                 start: Optional[date] = None):
+        if not targets:
+            raise ValueError("nenhum imóvel com agente para disputar")
+        self.data = data
+        self.targets = targets
+        self.dates = [(start or date.today()) + timedelta(days=offset) for offset in range(1, days + 1)]
+        self.stats = ContentionStats()
+        self.pending: Deque[BookedVisit] = deque()
+        self.confirmed: Deque[BookedVisit] = deque()
+        self.created: List[BookedVisit] = []
+        self.transitions: Counter = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def slot_count(self) -> int:
+        return len(self.targets) * len(self.dates) * len(TIME_SLOTS)
+
+    def scenarios(self, weights: Optional[Dict[str, float]] = None) -> List[Scenario]:
+        weights = {**CONTENTION_WEIGHTS, **(weights or {})}
+        unknown = set(weights) - set(CONTENTION_WEIGHTS)
+        if unknown:
+            raise ValueError(f"cenários desconhecidos: {', '.join(sorted(unknown))}")
+        return [Scenario(name, weight, getattr(self, name)) for name, weight in weights.items()]
+
+    def as_client(self, rng: random.Random) -> Tuple[Optional[ApiClient], Optional[str]]:
+        if self.data.clients:
+            client, state = rng.choice(self.data.clients)
+            return client, state.client_id
+        return None, rng.choice(self.data.client_ids) if self.data.client_ids else None
+
+    # ── Marcação ────────────────────────────────────────────────────────
+
+    def available_slots(self, s: LoadSession, target: HotTarget, visit_date: date,
+                        client: Optional[ApiClient] = None) -> Optional[List[str]]:
+        response = s.call("GET /visits/available-slots", "GET", "/visits/available-slots", client=client,
+                          params={"propertyId": target.property_id, "visitDate": visit_date.isoformat()})
+        if response is None or response.status_code != 200:
+            return None
+        return [slot for slot in response.json().get("availableSlots") or [] if slot in TIME_SLOTS]
+
+    def post_visit(self, s: LoadSession, target: HotTarget, visit_date: date, slot: str,
+                   client: Optional[ApiClient], client_id: str) -> Tuple[str, Optional[BookedVisit]]:
+        """POST /visits; devolve o resultado e, se marcou, a visita"""
+        started = time.perf_counter()
+        response = s.call("POST /visits", "POST", "/visits", expect=(200, 201, 400), client=client,
+                          json=visit_payload(target.property_id, client_id, target.agent_id, visit_date,
+                                             slot_index(slot), notes="Teste de contenção"))
+        latency = time.perf_counter() - started
+        if response is None or response.status_code >= 500:
+            outcome, code = FAILED, None
+        elif response.status_code == 400:
+            code = _error_code(response)
+            outcome = CONFLICT if code == "TimeSlotUnavailable" else REJECTED
+        else:
+            outcome, code = BOOKED, None
+        # Latência da marcação separada pelo resultado: um conflito custa o mesmo
+        # caminho de validação que uma marcação, menos a escrita e as notificações
+        s.recorder.record(f"book:{outcome}", latency, error=outcome in (REJECTED, FAILED))
+        self.stats.add(outcome, code)
+        if outcome != BOOKED:
+            return outcome, None
+        body = response.json()
+        visit = BookedVisit(body.get("visitId"), body.get("confirmationToken"), target, visit_date, slot)
+        with self._lock:
+            self.pending.append(visit)
+            self.created.append(visit)
+        return outcome, visit
+
+    def book(self, s: LoadSession) -> None:
+        """Consulta os horários livres de um (imóvel, dia) disputado e marca um deles"""
+        client, client_id = self.as_client(s.rng)
+        if not client_id:
+            return
+        target = s.rng.choice(self.targets)
+        visit_date = s.rng.choice(self.dates)
+        slots = self.available_slots(s, target, visit_date, client)
+        if slots is None:
+            self.stats.add(FAILED)
+            return
+        if not slots:
+            self.stats.add(SOLD_OUT)
+            return
+        self.post_visit(s, target, visit_date, s.rng.choice(slots), client, client_id)
+
+    # ── Confirmação e cancelamento ──────────────────────────────────────
+
+    def _take(self, queue: Deque[BookedVisit]) -> Optional[BookedVisit]:
+        with self._lock:
+            return queue.popleft() if queue else None
+
+    def confirm(self, s: LoadSession) -> None:
+        visit = self._take(self.pending)
+        if visit is None:
+            return
+        response = s.call("PUT /visits/confirm", "PUT", "/visits/confirm",
+                          json={"confirmationToken": visit.token})
+        if response is not None and response.status_code == 200:
+            with self._lock:
+                self.confirmed.append(visit)
+                self.transitions["Pending→Confirmed"] += 1
+
+    def cancel(self, s: LoadSession) -> None:
+        """Cancela uma visita confirmada ou pendente (metade das vezes cada)"""
+        source = self.confirmed if s.rng.random() < 0.5 else self.pending
+        visit = self._take(source) or self._take(self.pending) or self._take(self.confirmed)
+        if visit is None:
+            return
+        previous = "Confirmed" if source is self.confirmed else "Pending"
+        response = s.call("PUT /visits/{id}/cancel", "PUT", f"/visits/{visit.visit_id}/cancel",
+                          json={"cancellationReason": "Teste de contenção"})
+        if response is not None and response.status_code == 200:
+            with self._lock:
+                self.transitions[f"{previous}→Cancelled"] += 1
+
+    # ── Corrida ─────────────────────────────────────────────────────────
+
+    def race(self, api: ApiClient, recorder: LatencyRecorder, rounds: int, racers: int,
+             seed: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Em cada ronda escolhe um horário livre e solta racers marcações desse
+        mesmo horário ao mesmo tempo (threading.Barrier). Só uma deveria
+        passar; mais do que uma é uma marcação duplicada.
+        """
+        rng = random.Random(seed)
+        winners: Counter = Counter()
+        session = LoadSession(api, recorder, rng)
+        with ThreadPoolExecutor(max_workers=racers, thread_name_prefix="race") as executor:
+            for _ in range(rounds):
+                target = rng.choice(self.targets)
+                visit_date = rng.choice(self.dates)
+                slots = self.available_slots(session, target, visit_date)
+                if not slots:
+                    winners["soldOut"] += 1
+                    continue
+                slot = rng.choice(slots)
+                barrier = threading.Barrier(racers)
+                clients = [self.as_client(random.Random(rng.getrandbits(32))) for _ in range(racers)]
+
+                def run(client: Optional[ApiClient], client_id: str) -> str:
+                    barrier.wait()
+                    return self.post_visit(LoadSession(api, recorder, random.Random()), target,
+                                           visit_date, slot, client, client_id)[0]
+
+                outcomes = list(executor.map(lambda pair: run(*pair), clients))
+                winners[outcomes.count(BOOKED)] += 1
+        sold_out = winners.pop("soldOut", 0)
+        played = rounds - sold_out
+        doubles = sum(count for booked, count in winners.items() if booked > 1)
+        return {
+            "rounds": played,
+            "racers": racers,
+            "soldOutRounds": sold_out,
+            "winnersPerRound": {str(booked): count for booked, count in sorted(winners.items())},
+            "doubleBookedRounds": doubles,
+            "doubleBookingRate": doubles / played if played else 0.0,
+        }
+
+    # ── Auditoria ───────────────────────────────────────────────────────
+
+    def audit(self, api: ApiClient) -> Dict[str, Any]:
+        """
+        Lê as visitas dos agentes disputados e conta os horários com mais de
+        uma visita não cancelada no mesmo imóvel e dia
+        """
+        properties = {target.property_id for target in self.targets}
+        days = {d.isoformat() for d in self.dates}
+        occupied: Counter = Counter()
+        for agent_id in sorted({target.agent_id for target in self.targets}):
+            response = api.get(f"/visits/agent/{agent_id}")
+            if response.status_code != 200:
+                continue
+            for visit in response.json().get("visits") or []:
+                if (visit.get("propertyId") in properties and visit.get("visitDate") in days
+                        and visit.get("status") != "Cancelled"):
+                    occupied[(visit["propertyId"], visit["visitDate"], visit.get("timeSlot"))] += 1
+        duplicates = {key: n for key, n in occupied.items() if n > 1}
+        return {
+            "occupiedSlots": len(occupied),
+            "totalSlots": self.slot_count,
+            "occupancy": len(occupied) / self.slot_count if self.slot_count else 0.0,
+            "duplicateSlots": len(duplicates),
+            "duplicateVisits": sum(n - 1 for n in duplicates.values()),
+            "examples": [f"{p} {d} {slot} ×{n}" for (p, d, slot), n in list(duplicates.items())[:5]],
+        }
+
+    def cleanup(self, api: ApiClient) -> int:
+        """Cancela as visitas criadas por esta execução que ainda estejam ativas"""
+        cancelled = 0
+        with self._lock:
+            active = list(self.pending) + list(self.confirmed)
+            self.pending.clear()
+            self.confirmed.clear()
+        for visit in active:
+            response = api.put(f"/visits/{visit.visit_id}/cancel",
+                               json={"cancellationReason": "Limpeza do teste de contenção"})
+            cancelled += response.status_code == 200
+        return cancelled
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            transitions = dict(self.transitions)
+            created = len(self.created)
+        return {
+            "targets": len(self.targets),
+            "agents": len({target.agent_id for target in self.targets}),
+            "dates": [d.isoformat() for d in self.dates],
+            "slots": self.slot_count,
+            "created": created,
+            "booking": self.stats.to_dict(),
+            "transitions": transitions,
+        }
+
@@ -0,0 +1,192 @@
+"""
+Benchmark dos dashboards por tamanho de dataset: latência concorrente de
+cada variante por perfil e expoente de crescimento com o número de linhas
+"""
+
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import requests
+
+from .http_client import ApiClient
+from .metrics import LatencyRecorder
+
+try:  # matplotlib é opcional: sem ele o gráfico fica só no terminal
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+except ImportError:  # pragma: no cover - depende do ambiente
+    plt = None
+
+RESULTS_VERSION = 1
+
+# Variante -> template do caminho; {id} vem do mapa de ids do seed
+DASHBOARD_VARIANTS = {
+    "stats": "/dashboard/stats",
+    "admin": "/dashboard/admin",
+    "agent": "/dashboard/agent/{id}",
+    "client": "/dashboard/client/{id}",
+}
+# Variante -> tipo no IdMap do replay (ficheiros agent.ids, client.ids)
+ID_KINDS = {"agent": "agent", "client": "client"}
+
+
+def measure_variant(api: ApiClient, paths: Sequence[str], requests_count: int, concurrency: int,
+                    warmup: int = 0) -> Dict[str, Any]:
+    """
+    requests_count pedidos com concurrency em paralelo, a percorrer paths em
+    ciclo (um caminho por id). O warmup corre antes, em série, e não conta.
+    """
+    for i in range(warmup):
+        api.get(paths[i % len(paths)])
+    recorder = LatencyRecorder()
+
+    def one(i: int) -> None:
+        started = time.perf_counter()
+        try:
+            response = api.get(paths[i % len(paths)])
+            status, size = response.status_code, len(response.content)
+        except requests.RequestException:
+            status, size = 0, 0
+        recorder.record("dashboard", time.perf_counter() - started, status, size=size)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="dashboard") as executor:
+        list(executor.map(one, range(requests_count)))
+    elapsed = time.perf_counter() - started
+    stats = recorder.summary(elapsed).get("dashboard", {})
+    stats["ids"] = len(paths)
+    stats["meanBytes"] = stats.get("bytes", 0) / stats["count"] if stats.get("count") else 0
+    return stats
+
+
+def variant_paths(variant: str, ids: Dict[str, List[str]], sample: int,
+                  rng: random.Random) -> List[str]:
+    template = DASHBOARD_VARIANTS[variant]
+    kind = ID_KINDS.get(variant)
+    if kind is None:
+        return [template]
+    pool = ids.get(kind) or []
+    chosen = rng.sample(pool, min(sample, len(pool)))
+    return [template.format(id=guid) for guid in chosen]
+
+
+# ── Escala ───────────────────────────────────────────────────────────────
+
+def scaling_exponent(points: Sequence[Tuple[float, float]]) -> Optional[float]:
+    """
+    Declive da reta de mínimos quadrados em log-log (latência ~ linhas^k).
+    k≈0 constante, k≈1 linear, k>1 pior do que linear. None com menos de
+    dois tamanhos distintos.
+    """
+    logs = [(math.log(x), math.log(y)) for x, y in points if x > 0 and y > 0]
+    if len({x for x, _ in logs}) < 2:
+        return None
+    mean_x = sum(x for x, _ in logs) / len(logs)
+    mean_y = sum(y for _, y in logs) / len(logs)
+    sxx = sum((x - mean_x) ** 2 for x, _ in logs)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in logs)
+    return sxy / sxx
+
+
+def classify(exponent: Optional[float]) -> str:
+    if exponent is None:
+        return "sem dados"
+    if exponent < 0.2:
+        return "constante"
+    if exponent < 0.8:
+        return "sublinear"
+    if exponent < 1.2:
+        return "linear"
+    return "superlinear"
+
+
+def scaling_report(results: Dict[str, Any], metric: str = "p50Ms") -> Dict[str, Dict[str, Any]]:
+    """Por variante: pontos (linhas, latência), expoente e classificação"""
+    report = {}
+    profiles = sorted(results["profiles"].values(), key=lambda p: p["rows"])
+    for variant in DASHBOARD_VARIANTS:
+        points = [(p["rows"], p["variants"][variant][metric]) for p in profiles
+                  if variant in p["variants"] and p["variants"][variant].get("count")]
+        exponent = scaling_exponent(points)
+        report[variant] = {"points": points, "exponent": exponent, "class": classify(exponent)}
+    return report
+
+
+# ── Resultados ───────────────────────────────────────────────────────────
+
+def load_results(path: str) -> Dict[str, Any]:
+    """Resultados anteriores (um perfil por execução também funciona) ou vazio"""
+    if not os.path.exists(path):
+        return {"version": RESULTS_VERSION, "profiles": {}}
+    with open(path, encoding="utf-8") as handle:
+        results = json.load(handle)
+    if results.get("version") != RESULTS_VERSION:
+        raise ValueError(f"{path}: versão {results.get('version')} não suportada")
+    return results
+
+
+def save_results(results: Dict[str, Any], path: str) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(results, handle, indent=2)
+
+
+def print_scaling(results: Dict[str, Any], metric: str = "p50Ms") -> None:
+    """Tabela latência × perfil por variante, com barras e o expoente"""
+    profiles = sorted(results["profiles"].items(), key=lambda item: item[1]["rows"])
+    if not profiles:
+        return
+    report = scaling_report(results, metric)
+    peak = max((p["variants"][v][metric] for _, p in profiles for v in p["variants"]), default=0) or 1
+    print("\n" + "━" * 78)
+    print(f"📈 DASHBOARDS × TAMANHO DO DATASET ({metric})")
+    print("━" * 78)
+    for variant, scaling in report.items():
+        exponent = scaling["exponent"]
+        label = f"k={exponent:.2f} {scaling['class']}" if exponent is not None else scaling["class"]
+        print(f"   {variant}  ({label})")
+        for name, profile in profiles:
+            stats = profile["variants"].get(variant)
+            if not stats or not stats.get("count"):
+                continue
+            bar = "█" * max(1, round(stats[metric] / peak * 40))
+            print(f"      {name:<10} {profile['rows']:>10,} linhas {stats[metric]:>9.1f} ms "
+                  f"{stats['errorRate'] * 100:>5.1f}% erro  {bar}")
+    growing = [variant for variant, scaling in report.items()
+               if scaling["exponent"] is not None and scaling["exponent"] >= 0.8]
+    if growing:
+        # Agregados que crescem com o total de linhas não ficam rápidos só com índices
+        print(f"   ⚠️  Candidatos a cache/pré-agregação: {', '.join(growing)}")
+    print("━" * 78)
+
+
+def plot_scaling(results: Dict[str, Any], path: str, metric: str = "p50Ms") -> bool:
+    """Gráfico log-log em PNG; False se o matplotlib não estiver instalado"""
+    if plt is None:
+        return False
+    figure, axis = plt.subplots(figsize=(8, 5))
+    for variant, scaling in scaling_report(results, metric).items():
+        if not scaling["points"]:
+            continue
+        xs, ys = zip(*scaling["points"])
+        k = scaling["exponent"]
+        axis.plot(xs, ys, marker="o", label=f"{variant} (k={k:.2f})" if k is not None else variant)
+    axis.set_xscale("log")
+    axis.set_yscale("log")
+    axis.set_xlabel("linhas no dataset")
+    axis.set_ylabel(f"{metric}")
+    axis.set_title("Dashboards DreamLuso por tamanho de dataset")
+    axis.grid(True, which="both", alpha=0.3)
+    axis.legend()
+    figure.tight_layout()
+    figure.savefig(path)
+    plt.close(figure)
+    return True
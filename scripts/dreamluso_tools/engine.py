@@ -0,0 +1,99 @@
+"""
+Motor asyncio para o seed: executa chamadas à API em paralelo com limite de concorrência
+"""
+
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_CONCURRENCY = 8
+
+
+def add_engine_arguments(parser: argparse.ArgumentParser) -> None:
+    """Regista as opções do motor de concorrência"""
+    group = parser.add_argument_group("Concorrência")
+    group.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                       help="Número máximo de pedidos em paralelo (default: %(default)s)")
+
+
+class SeedEngine:
+    """
+    Corre as funções bloqueantes dos seeders num pool de threads, limitado por
+    um semáforo asyncio. As dependências entre entidades exprimem-se com await:
+    uma propriedade só é criada depois de o id do seu agente estar resolvido.
+    """
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY):
+        if concurrency < 1:
+            raise ValueError("concurrency deve ser >= 1")
+        self.concurrency = concurrency
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="seed")
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # Criado de forma preguiçosa para ficar associado ao loop em execução
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+    async def call(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Executa uma chamada bloqueante respeitando o limite de concorrência"""
+        async with self.semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+
+    async def map(self, fn: Callable[..., T], jobs: Sequence[Tuple[Any, ...]]) -> List[T]:
+        """Executa fn(*job) para cada job em paralelo; devolve os resultados pela ordem dos jobs"""
+        return list(await asyncio.gather(*(self.call(fn, *job) for job in jobs)))
+
+    async def stream(self, fn: Callable[..., T],
+                     jobs: Iterable[Tuple[Any, ...]]) -> AsyncIterator[Tuple[Tuple[Any, ...], T]]:
+        """
+        Versão em streaming de map: consome jobs de forma preguiçosa, mantém no
+        máximo 2x concurrency pedidos pendentes e produz (job, resultado) pela
+        ordem de conclusão.
+        """
+        window = self.concurrency * 2
+        pending = set()
+        iterator = iter(jobs)
+        exhausted = False
+
+        while pending or not exhausted:
+            while not exhausted and len(pending) < window:
+                try:
+                    job = next(iterator)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending.add(asyncio.ensure_future(self._tagged(fn, job)))
+
+            if not pending:
+                break
+
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+
+    async def _tagged(self, fn: Callable[..., T], job: Tuple[Any, ...]) -> Tuple[Tuple[Any, ...], T]:
+        return job, await self.call(fn, *job)
+
+    def run(self, main: Awaitable[T]) -> T:
+        """Executa a corrotina principal num novo event loop"""
+        async def runner() -> T:
+            self._semaphore = None
+            return await main
+        return asyncio.run(runner())
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "SeedEngine":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
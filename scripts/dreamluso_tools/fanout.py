@@ -0,0 +1,376 @@
+"""
+Carga de notificações: backlogs de milhares de notificações por utilizador
+e frontends abertos a fazer polling do contador de não lidas a intervalos
+realistas, enquanto outros utilizadores marcam tudo como lido e continuam a
+chegar notificações novas
+"""
+
+import argparse
+import heapq
+import itertools
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import requests
+
+from .generator import NOTIFICATION_PRIORITIES, NOTIFICATION_TYPES
+from .http_client import ApiClient
+from .loadgen import OK_STATUSES
+from .metrics import LatencyRecorder, percentile
+from .pagination import iter_items
+from .schema import JSON_HEADERS, NotificationPayload, join_array
+
+UNREAD = "GET /notifications/unread-count/{userId}"
+# O mesmo pedido, feito enquanto um mark-all-read está a correr na API
+UNREAD_DURING_MARK_ALL = UNREAD + " [durante mark-all-read]"
+LIST = "GET /notifications/{userId}"
+MARK_READ = "PUT /notifications/{notificationId}/mark-read"
+MARK_ALL = "PUT /notifications/{userId}/mark-all-read"
+# O primeiro mark-all-read de um utilizador percorre o backlog inteiro; os seguintes só o que chegou depois
+MARK_ALL_BACKLOG = MARK_ALL + " [backlog]"
+SEND = "POST /notifications"
+BULK = "POST /notifications/bulk"
+
+# BulkCreateResponse.MaxItems
+MAX_BATCH = 1000
+
+# Ações agendadas durante o polling
+POLL = "poll"
+MARK_ALL_ACTION = "mark-all"
+SEND_ACTION = "send"
+
+
+def add_fanout_arguments(parser: argparse.ArgumentParser) -> None:
+    """Regista as opções do backlog e dos frontends simulados"""
+    group = parser.add_argument_group("Notificações")
+    group.add_argument("--users", type=int, default=50,
+                       help="Utilizadores que recebem backlog e são observados pelos frontends (default: %(default)s)")
+    group.add_argument("--backlog", type=int, default=2000,
+                       help="Notificações criadas por utilizador antes do polling; 0 para saltar (default: %(default)s)")
+    group.add_argument("--batch-size", type=int, default=MAX_BATCH,
+                       help=f"Notificações por POST /notifications/bulk, até {MAX_BATCH} (default: %(default)s)")
+    group.add_argument("--frontends", type=int, default=200,
+                       help="Frontends abertos, distribuídos pelos utilizadores (default: %(default)s)")
+    group.add_argument("--poll-interval", type=float, default=15.0, metavar="S",
+                       help="Intervalo médio de polling de cada frontend, em segundos (default: %(default)s)")
+    group.add_argument("--jitter", type=float, default=0.2,
+                       help="Variação relativa do intervalo de polling (default: %(default)s)")
+    group.add_argument("--duration", type=float, default=60.0,
+                       help="Duração do polling em segundos (default: %(default)s)")
+    group.add_argument("--list-probability", type=float, default=0.05,
+                       help="Probabilidade de um poll abrir a lista de notificações (default: %(default)s)")
+    group.add_argument("--mark-read-probability", type=float, default=0.5,
+                       help="Probabilidade de marcar uma como lida depois de abrir a lista (default: %(default)s)")
+    group.add_argument("--mark-all-interval", type=float, default=2.0, metavar="S",
+                       help="Segundos entre mark-all-read, um utilizador de cada vez; 0 desliga (default: %(default)s)")
+    group.add_argument("--send-rps", type=float, default=5.0,
+                       help="Notificações novas por segundo durante o polling; 0 desliga (default: %(default)s)")
+    group.add_argument("--max-inflight", type=int, default=256,
+                       help="Pedidos em curso antes de descartar ações (default: %(default)s)")
+    group.add_argument("--window", type=float, default=5.0, metavar="S",
+                       help="Janela da série temporal de QPS e p99 (default: %(default)s)")
+    group.add_argument("--slo-ms", type=float, default=100.0,
+                       help="p99 aceitável do contador de não lidas, em ms (default: %(default)s)")
+
+
+@dataclass
+class FanoutUser:
+    """Destinatário observado; client é a sessão do próprio utilizador (None = como admin)"""
+    user_id: str
+    client: Optional[ApiClient] = None
+
+
+def collect_users(api: ApiClient, limit: int) -> List[FanoutUser]:
+    """userId dos primeiros clientes e agentes, sem repetir"""
+    seen: Dict[str, FanoutUser] = {}
+    for path in ("/clients", "/agents"):
+        for item in iter_items(api, path):
+            if len(seen) >= limit:
+                break
+            user_id = item.get("userId")
+            if user_id and user_id not in seen:
+                seen[user_id] = FanoutUser(user_id)
+    return list(seen.values())
+
+
+def notification_body(rng: random.Random, recipient_id: str, index: int) -> bytes:
+    """Corpo de SendNotificationCommand com tipo e prioridade pelos pesos do gerador"""
+    kind = rng.choices(list(NOTIFICATION_TYPES), weights=list(NOTIFICATION_TYPES.values()))[0]
+    priority = rng.choices(list(NOTIFICATION_PRIORITIES), weights=list(NOTIFICATION_PRIORITIES.values()))[0]
+    return NotificationPayload(recipient_id=recipient_id, message=f"Teste de fan-out (#{index})",
+                               type=kind, priority=priority).to_bytes()
+
+
+class FanoutWorkload:
+    """
+    Duas fases. backlog_jobs/send_backlog enchem a caixa de cada utilizador
+    por lotes. run() agenda depois cada frontend no seu intervalo (com
+    jitter e arranque desfasado), mark-all-read a ritmo fixo e notificações
+    novas em chegadas de Poisson, tudo em malha aberta: uma ação que chega
+    acima de max_inflight é descartada e contada, e a latência de cada poll
+    conta a partir do instante agendado.
+    """
+
+    def __init__(self, api: ApiClient, users: Sequence[FanoutUser], frontends: int = 200,
+                 poll_interval: float = 15.0, jitter: float = 0.2, list_probability: float = 0.05,
+                 mark_read_probability: float = 0.5, mark_all_interval: float = 2.0,
+                 send_rps: float = 5.0, max_inflight: int = 256, window: float = 5.0,
+                 seed: Optional[int] = None):
+        if not users:
+            raise ValueError("nenhum utilizador para receber notificações")
+        if poll_interval <= 0 or window <= 0:
+            raise ValueError("--poll-interval e --window devem ser > 0")
+        if not 0 <= jitter < 1:
+            raise ValueError("--jitter deve estar em [0, 1)")
+        self.api = api
+        self.users = list(users)
+        # Cada frontend é um separador aberto de um utilizador; vários podem observar o mesmo
+        self.frontends = [self.users[i % len(self.users)] for i in range(frontends)]
+        self.poll_interval = poll_interval
+        self.jitter = jitter
+        self.list_probability = list_probability
+        self.mark_read_probability = mark_read_probability
+        self.mark_all_interval = mark_all_interval
+        self.send_rps = send_rps
+        self.max_inflight = max_inflight
+        self.window = window
+        self.rng = random.Random(seed)
+        self.recorder = LatencyRecorder()
+        self.dropped: Counter = Counter()
+        self.backlog_created = 0
+        self.backlog_failed = 0
+        self._lock = threading.Lock()
+        self._inflight = 0
+        self._marking_all = 0
+        self._cleared: set = set()
+        self._mark_all_order = self.rng.sample(self.users, len(self.users))
+        self._mark_all_turn = itertools.count()
+        # Instante de arranque do polling; None durante o backlog, que não entra na série
+        self._started: Optional[float] = None
+        # Janela -> pedidos concluídos e latências do contador
+        self._window_requests: Dict[int, int] = defaultdict(int)
+        self._window_unread: Dict[int, List[float]] = defaultdict(list)
+        self._unread_latencies: List[float] = []
+        self._counts_seen: List[int] = []
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace, api: ApiClient,
+                  users: Sequence[FanoutUser]) -> "FanoutWorkload":
+        return cls(api, users, frontends=args.frontends, poll_interval=args.poll_interval,
+                   jitter=args.jitter, list_probability=args.list_probability,
+                   mark_read_probability=args.mark_read_probability,
+                   mark_all_interval=args.mark_all_interval, send_rps=args.send_rps,
+                   max_inflight=args.max_inflight, window=args.window, seed=args.seed)
+
+    @property
+    def offered_poll_rate(self) -> float:
+        return len(self.frontends) / self.poll_interval
+
+    def _call(self, endpoint: str, method: str, path: str, client: Optional[ApiClient] = None,
+              expect: Sequence[int] = OK_STATUSES, **kwargs: Any) -> Optional[requests.Response]:
+        """Pedido cronometrado no recorder e na janela em que terminou"""
+        started = time.perf_counter()
+        try:
+            response = (client or self.api).request(method, path, **kwargs)
+        except requests.RequestException:
+            response = None
+        finished = time.perf_counter()
+        latency = finished - started
+        status = response.status_code if response is not None else 0
+        self.recorder.record(endpoint, latency, status, error=status not in expect,
+                             size=len(response.content) if response is not None else 0)
+        if self._started is None:
+            return response
+        slot = int((finished - self._started) / self.window)
+        with self._lock:
+            self._window_requests[slot] += 1
+            if endpoint in (UNREAD, UNREAD_DURING_MARK_ALL):
+                self._window_unread[slot].append(latency)
+                self._unread_latencies.append(latency)
+        return response
+
+    # ── Backlog ─────────────────────────────────────────────────────────
+
+    def backlog_jobs(self, per_user: int, batch_size: int) -> Iterator[Tuple[str, int, int]]:
+        """
+        (userId, quantidade, seed) por lote, alternando os utilizadores para
+        que as escritas não fiquem todas seguidas no mesmo destinatário
+        """
+        batch_size = max(1, min(batch_size, MAX_BATCH))
+        for offset in range(0, per_user, batch_size):
+            for user in self.users:
+                yield user.user_id, min(batch_size, per_user - offset), self.rng.getrandbits(32)
+
+    def send_backlog(self, user_id: str, count: int, seed: int) -> int:
+        """Um POST /notifications/bulk; devolve quantas notificações criou"""
+        rng = random.Random(seed)
+        body = join_array([notification_body(rng, user_id, i) for i in range(count)])
+        response = self._call(BULK, "POST", "/notifications/bulk", data=body, headers=JSON_HEADERS)
+        ids = response.json().get("ids") if response is not None and response.status_code == 200 else None
+        created = len(ids) if ids else 0
+        with self._lock:
+            self.backlog_created += created
+            self.backlog_failed += count - created
+        return created
+
+    # ── Ações dos frontends ─────────────────────────────────────────────
+
+    def poll(self, user: FanoutUser, rng: random.Random) -> None:
+        """Contador de não lidas; às vezes abre a lista e marca uma como lida"""
+        endpoint = UNREAD_DURING_MARK_ALL if self._marking_all else UNREAD
+        response = self._call(endpoint, "GET", f"/notifications/unread-count/{user.user_id}", user.client)
+        if response is None or response.status_code != 200:
+            return
+        count = response.json().get("unreadCount")
+        if isinstance(count, int):
+            with self._lock:
+                self._counts_seen.append(count)
+        if rng.random() >= self.list_probability:
+            return
+        response = self._call(LIST, "GET", f"/notifications/{user.user_id}", user.client)
+        if response is None or response.status_code != 200 or rng.random() >= self.mark_read_probability:
+            return
+        unread = [item["id"] for item in response.json() or [] if item.get("status") == "Unread"]
+        if unread:
+            self._call(MARK_READ, "PUT", f"/notifications/{rng.choice(unread)}/mark-read", user.client)
+
+    def mark_all(self) -> None:
+        """mark-all-read dos utilizadores por uma ordem fixa: cada backlog é limpo uma vez antes de repetir"""
+        with self._lock:
+            user = self._mark_all_order[next(self._mark_all_turn) % len(self._mark_all_order)]
+            first = user.user_id not in self._cleared
+            self._cleared.add(user.user_id)
+            self._marking_all += 1
+        try:
+            self._call(MARK_ALL_BACKLOG if first else MARK_ALL, "PUT",
+                       f"/notifications/{user.user_id}/mark-all-read", user.client)
+        finally:
+            with self._lock:
+                self._marking_all -= 1
+
+    def send(self, rng: random.Random) -> None:
+        user = rng.choice(self.users)
+        self._call(SEND, "POST", "/notifications", data=notification_body(rng, user.user_id, rng.getrandbits(20)),
+                   headers=JSON_HEADERS)
+
+    def _job(self, action: str, user: Optional[FanoutUser], scheduled: float, seed: int) -> None:
+        rng = random.Random(seed)
+        failed = False
+        try:
+            if action == POLL:
+                self.poll(user, rng)
+            elif action == MARK_ALL_ACTION:
+                self.mark_all()
+            else:
+                self.send(rng)
+        except Exception:
+            failed = True
+        finally:
+            # Desde o instante agendado: a fila de espera do cliente também conta
+            self.recorder.record(f"frontend:{action}", time.perf_counter() - scheduled, error=failed)
+            with self._lock:
+                self._inflight -= 1
+
+    def _next_poll(self) -> float:
+        return self.poll_interval * self.rng.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def run(self, duration: float) -> float:
+        """Polling durante duration segundos; devolve o tempo decorrido"""
+        # (instante, sequência, ação, utilizador do frontend); a sequência desempata sem comparar utilizadores
+        sequence = itertools.count()
+        heap: List[Tuple[float, int, str, Optional[FanoutUser]]] = [
+            (self.rng.uniform(0, self.poll_interval), next(sequence), POLL, user)
+            for user in self.frontends
+        ]
+        if self.mark_all_interval > 0:
+            heap.append((self.mark_all_interval, next(sequence), MARK_ALL_ACTION, None))
+        if self.send_rps > 0:
+            heap.append((self.rng.expovariate(self.send_rps), next(sequence), SEND_ACTION, None))
+        heapq.heapify(heap)
+
+        executor = ThreadPoolExecutor(max_workers=self.max_inflight, thread_name_prefix="fanout")
+        self._started = time.perf_counter()
+        try:
+            while heap and heap[0][0] < duration:
+                offset, _, action, user = heapq.heappop(heap)
+                if action == POLL:
+                    following = offset + self._next_poll()
+                elif action == MARK_ALL_ACTION:
+                    following = offset + self.mark_all_interval
+                else:
+                    following = offset + self.rng.expovariate(self.send_rps)
+                heapq.heappush(heap, (following, next(sequence), action, user))
+
+                scheduled = self._started + offset
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                with self._lock:
+                    if self._inflight >= self.max_inflight:
+                        self.dropped[action] += 1
+                        continue
+                    self._inflight += 1
+                executor.submit(self._job, action, user, scheduled, self.rng.getrandbits(32))
+        finally:
+            executor.shutdown(wait=True)
+        return time.perf_counter() - self._started
+
+    # ── Relatório ───────────────────────────────────────────────────────
+
+    def series(self, elapsed: float) -> List[Dict[str, Any]]:
+        """QPS e p99 do contador por janela; a última, incompleta, fica de fora"""
+        with self._lock:
+            full = int(elapsed / self.window)
+            rows = []
+            for slot in range(full):
+                latencies = sorted(self._window_unread.get(slot, ()))
+                rows.append({
+                    "start": slot * self.window,
+                    "qps": self._window_requests.get(slot, 0) / self.window,
+                    "unreadQps": len(latencies) / self.window,
+                    "unreadP99Ms": percentile(latencies, 99) * 1000,
+                })
+        return rows
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        series = self.series(elapsed)
+        # A primeira janela ainda tem os frontends a arrancar de forma desfasada
+        steady = series[1:] if len(series) > 2 else series
+        qps = sorted(row["qps"] for row in steady)
+        with self._lock:
+            latencies = sorted(self._unread_latencies)
+            counts = list(self._counts_seen)
+            cleared = len(self._cleared)
+        unread = {
+            "count": len(latencies),
+            "p50Ms": percentile(latencies, 50) * 1000,
+            "p95Ms": percentile(latencies, 95) * 1000,
+            "p99Ms": percentile(latencies, 99) * 1000,
+            "p999Ms": percentile(latencies, 99.9) * 1000,
+            "maxMs": (latencies[-1] if latencies else 0.0) * 1000,
+            "worstWindowP99Ms": max((row["unreadP99Ms"] for row in steady), default=0.0),
+            "meanCountSeen": sum(counts) / len(counts) if counts else 0.0,
+            "maxCountSeen": max(counts, default=0),
+        }
+        return {
+            "users": len(self.users),
+            "frontends": len(self.frontends),
+            "pollInterval": self.poll_interval,
+            "offeredPollRate": self.offered_poll_rate,
+            "backlog": {"created": self.backlog_created, "failed": self.backlog_failed},
+            "sustainedQps": {
+                "median": percentile(qps, 50),
+                "min": qps[0] if qps else 0.0,
+                "max": qps[-1] if qps else 0.0,
+            },
+            "unread": unread,
+            "dropped": dict(self.dropped),
+            "markAllCleared": cleared,
+            "series": series,
+            "endpoints": self.recorder.summary(elapsed),
+        }
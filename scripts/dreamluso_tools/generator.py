@@ -0,0 +1,377 @@
+"""
+Gerador determinístico de dados sintéticos para testes de escala
+
+Cada registo é gerado a partir de (seed, tipo, índice), pelo que o registo i é
+sempre o mesmo independentemente de quantos se pedem, e tudo é produzido por
+geradores: um milhão de propriedades nunca está em memória ao mesmo tempo.
+As referências entre entidades usam chaves locais (por ex. "agent:000042"),
+resolvidas para GUIDs do servidor durante o replay.
+"""
+
+import random
+import unicodedata
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, List, Tuple
+
+# Aumentar sempre que a mesma (seed, tipo, índice) passe a gerar outro registo
+GENERATOR_VERSION = 1
+
+# Enums do domínio (DreamLuso.Domain/Model)
+PROPERTY_TYPES = {
+    "House": 0, "Apartment": 1, "Condo": 2, "Townhouse": 3, "Land": 4, "Commercial": 5,
+    "Office": 6, "Warehouse": 7, "Farm": 8, "Villa": 9, "Studio": 10, "Penthouse": 11,
+}
+TRANSACTION_TYPES = {"Sale": 0, "Rent": 1, "Both": 2}
+PROPOSAL_TYPES = {"Purchase": 0, "Rent": 1}
+TIME_SLOTS = 5  # Morning_9AM_11AM .. Evening_6PM_8PM
+# NotificationType/NotificationPriority vão como texto (JsonStringEnumConverter)
+NOTIFICATION_TYPES = {
+    "Proposal": 30, "Visit": 25, "NewListing": 15, "PriceChange": 10,
+    "Message": 12, "PropertyUpdate": 5, "SystemAlert": 3,
+}
+NOTIFICATION_PRIORITIES = {"Low": 30, "Medium": 55, "High": 15}
+
+# (distrito, concelho, prefixos postais, freguesias, peso populacional, multiplicador de preço)
+MUNICIPALITIES: List[Tuple[str, str, Tuple[int, int], Tuple[str, ...], int, float]] = [
+    ("Lisboa", "Lisboa", (1000, 1998), ("Alvalade", "Santo António", "Parque das Nações", "Estrela", "Arroios", "Belém"), 30, 1.70),
+    ("Lisboa", "Cascais", (2750, 2769), ("Cascais", "Estoril", "Parede", "Carcavelos"), 10, 1.55),
+    ("Lisboa", "Oeiras", (2760, 2799), ("Oeiras", "Algés", "Paço de Arcos"), 9, 1.35),
+    ("Lisboa", "Sintra", (2705, 2749), ("Agualva", "Queluz", "Rio de Mouro", "Sintra"), 14, 0.90),
+    ("Lisboa", "Amadora", (2700, 2724), ("Venteira", "Falagueira", "Alfragide"), 8, 0.95),
+    ("Lisboa", "Loures", (2660, 2699), ("Sacavém", "Moscavide", "Loures"), 8, 0.90),
+    ("Porto", "Porto", (4000, 4369), ("Foz do Douro", "Cedofeita", "Bonfim", "Paranhos", "Campanhã"), 20, 1.25),
+    ("Porto", "Vila Nova de Gaia", (4400, 4439), ("Mafamude", "Canidelo", "Oliveira do Douro"), 12, 0.95),
+    ("Porto", "Matosinhos", (4450, 4469), ("Matosinhos", "Leça da Palmeira", "Senhora da Hora"), 8, 1.05),
+    ("Porto", "Maia", (4470, 4479), ("Maia", "Águas Santas", "Moreira"), 6, 0.85),
+    ("Braga", "Braga", (4700, 4719), ("Braga (Maximinos)", "São Vicente", "Nogueiró"), 9, 0.75),
+    ("Braga", "Guimarães", (4800, 4839), ("Oliveira do Castelo", "Azurém", "Creixomil"), 7, 0.65),
+    ("Coimbra", "Coimbra", (3000, 3049), ("Coimbra (Sé Nova)", "Santo António dos Olivais", "Eiras"), 8, 0.70),
+    ("Aveiro", "Aveiro", (3800, 3814), ("Glória", "Esgueira", "Aradas"), 5, 0.75),
+    ("Leiria", "Leiria", (2400, 2424), ("Leiria", "Marrazes", "Parceiros"), 5, 0.60),
+    ("Setúbal", "Setúbal", (2900, 2914), ("São Sebastião", "São Julião", "Azeitão"), 6, 0.80),
+    ("Setúbal", "Almada", (2800, 2829), ("Almada", "Costa da Caparica", "Laranjeiro"), 7, 0.95),
+    ("Évora", "Évora", (7000, 7014), ("Bacelo", "Malagueira", "Horta das Figueiras"), 3, 0.60),
+    ("Faro", "Faro", (8000, 8014), ("Sé", "São Pedro", "Montenegro"), 4, 1.00),
+    ("Faro", "Albufeira", (8200, 8201), ("Albufeira", "Olhos de Água", "Guia"), 4, 1.15),
+    ("Faro", "Lagos", (8600, 8601), ("São Gonçalo de Lagos", "Luz", "Odiáxere"), 3, 1.20),
+    ("Madeira", "Funchal", (9000, 9064), ("Sé", "São Martinho", "Santa Maria Maior"), 5, 0.95),
+]
+MUNICIPALITY_WEIGHTS = [m[4] for m in MUNICIPALITIES]
+
+STREET_NAMES = (
+    "Rua de Santa Catarina", "Avenida da República", "Rua do Ouro", "Avenida da Liberdade",
+    "Rua Augusta", "Avenida Marginal", "Rua da Sofia", "Rua do Souto", "Rua das Flores",
+    "Alameda dos Oceanos", "Avenida dos Aliados", "Rua Direita", "Largo do Rossio",
+    "Rua 25 de Abril", "Avenida 5 de Outubro", "Rua da Boavista", "Travessa do Carmo",
+    "Rua Miguel Bombarda", "Avenida Fontes Pereira de Melo", "Rua de Cedofeita",
+)
+FIRST_NAMES = (
+    "João", "Maria", "Pedro", "Ana", "Carlos", "Sofia", "Miguel", "Beatriz", "Ricardo", "Inês",
+    "Tiago", "Mariana", "Rui", "Catarina", "Francisco", "Joana", "Diogo", "Rita", "André", "Marta",
+)
+LAST_NAMES = (
+    "Silva", "Santos", "Ferreira", "Pereira", "Oliveira", "Costa", "Rodrigues", "Martins",
+    "Sousa", "Fernandes", "Gonçalves", "Gomes", "Lopes", "Marques", "Almeida", "Ribeiro",
+)
+SPECIALIZATIONS = ("Residencial", "Luxury", "Comercial", "Arrendamento", "Investimento")
+AMENITIES = ("Aquecimento Central", "Ar Condicionado", "Cozinha Equipada", "Varanda",
+             "Terraço", "Jardim", "Piscina", "Lareira", "Arrecadação", "Painéis Solares")
+ENERGY_RATINGS = ("A+", "A", "B", "B-", "C", "D", "E", "F")
+PAYMENT_METHODS = ("Pronto Pagamento", "Financiamento Bancário", "Transferência Bancária")
+
+# Tipo: (peso, nome em português, (quartos possíveis), (pesos dos quartos))
+TYPE_PROFILES: Dict[str, Tuple[int, str, Tuple[int, ...], Tuple[int, ...]]] = {
+    "Apartment":  (50, "Apartamento", (0, 1, 2, 3, 4, 5), (4, 18, 35, 28, 11, 4)),
+    "House":      (15, "Moradia", (2, 3, 4, 5, 6), (10, 35, 35, 15, 5)),
+    "Villa":      (3, "Vivenda", (3, 4, 5, 6), (25, 40, 25, 10)),
+    "Townhouse":  (4, "Casa Geminada", (2, 3, 4), (30, 50, 20)),
+    "Penthouse":  (2, "Penthouse", (2, 3, 4, 5), (15, 40, 35, 10)),
+    "Studio":     (6, "Estúdio", (0, 1), (70, 30)),
+    "Condo":      (3, "Condomínio", (1, 2, 3, 4), (15, 40, 35, 10)),
+    "Commercial": (7, "Loja Comercial", (0,), (1,)),
+    "Office":     (5, "Escritório", (0,), (1,)),
+    "Warehouse":  (2, "Armazém", (0,), (1,)),
+    "Land":       (2, "Terreno", (0,), (1,)),
+    "Farm":       (1, "Quinta", (3, 4, 5), (40, 40, 20)),
+}
+TYPE_NAMES = list(TYPE_PROFILES)
+TYPE_WEIGHTS = [TYPE_PROFILES[t][0] for t in TYPE_NAMES]
+
+# Preço base por m² (€) e multiplicadores por tipo
+SALE_PRICE_PER_M2 = 2600.0
+RENT_PRICE_PER_M2 = 13.0
+TYPE_PRICE_FACTOR = {
+    "Apartment": 1.0, "House": 0.9, "Villa": 1.3, "Townhouse": 0.85, "Penthouse": 1.6,
+    "Studio": 1.15, "Condo": 1.05, "Commercial": 0.8, "Office": 0.85, "Warehouse": 0.3,
+    "Land": 0.08, "Farm": 0.35,
+}
+
+
+def ascii_slug(text: str) -> str:
+    """Remove acentos e espaços para usar em emails"""
+    normalized = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    return normalized.lower().replace(" ", "")
+
+
+def nif_check_digit(body: str) -> int:
+    """Dígito de controlo de um NIF português (módulo 11)"""
+    total = sum(int(d) * w for d, w in zip(body, range(9, 1, -1)))
+    check = 11 - total % 11
+    return 0 if check >= 10 else check
+
+
+def make_nif(index: int) -> str:
+    """NIF válido e único por índice (pessoa singular: começa por 1, 2 ou 3)"""
+    body = f"{1 + (index // 10_000_000) % 3}{index % 10_000_000:07d}"
+    return body + str(nif_check_digit(body))
+
+
+def entity_key(kind: str, index: int) -> str:
+    return f"{kind}:{index:06d}"
+
+
+@dataclass(frozen=True)
+class DatasetCounts:
+    """Cardinalidades do dataset a gerar"""
+    clients: int = 100
+    agents: int = 10
+    properties: int = 500
+    proposals: int = 200
+    visits: int = 200
+    notifications: int = 0
+
+    def validate(self) -> None:
+        """Recusa combinações que deixam registos sem entidade a que ligar"""
+        needs = {
+            "properties": ("agents",),
+            "proposals": ("clients", "properties", "agents"),
+            "visits": ("clients", "properties", "agents"),
+        }
+        for kind, sources in needs.items():
+            missing = [source for source in sources if getattr(self, kind) and not getattr(self, source)]
+            if missing:
+                raise ValueError(f"--{kind} {getattr(self, kind)} exige --{'/--'.join(missing)} > 0")
+        if self.notifications and not (self.clients or self.agents):
+            raise ValueError(f"--notifications {self.notifications} exige --clients ou --agents > 0")
+
+
+class DatasetGenerator:
+    """Produz utilizadores, clientes, agentes, propriedades, propostas e visitas"""
+
+    def __init__(self, seed: int = 42, email_domain: str = "seed.dreamluso.pt"):
+        self.seed = seed
+        self.email_domain = email_domain
+
+    def rng(self, kind: str, index: int) -> random.Random:
+        # Semente textual: estável entre execuções e versões do Python
+        return random.Random(f"{self.seed}:{kind}:{index}")
+
+    # ── Pessoas ──────────────────────────────────────────────────────────
+
+    def user(self, role: str, index: int) -> Dict[str, Any]:
+        rng = self.rng(f"user:{role}", index)
+        first = rng.choice(FIRST_NAMES)
+        last = rng.choice(LAST_NAMES)
+        prefix = "agent" if role == "RealEstateAgent" else "client"
+        return {
+            "key": entity_key(f"user:{prefix}", index),
+            "firstName": first,
+            "lastName": last,
+            "email": f"{ascii_slug(first)}.{ascii_slug(last)}.{prefix}{index}@{self.email_domain}",
+            "password": "Seed123!" if role == "Client" else "Agent123!",
+            "phone": f"+351 9{rng.choice('1236')} {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+            "role": role,
+        }
+
+    def clients(self, count: int) -> Iterator[Dict[str, Any]]:
+        for i in range(count):
+            rng = self.rng("client", i)
+            min_budget = round(rng.lognormvariate(12.2, 0.5), -4)
+            yield {
+                "key": entity_key("client", i),
+                "user": self.user("Client", i),
+                "nif": make_nif(i),
+                "citizenCard": f"{make_nif(i)}CC",
+                "type": 0 if rng.random() < 0.95 else 1,  # Individual / Company
+                "minBudget": min_budget,
+                "maxBudget": round(min_budget * rng.uniform(1.4, 2.5), -4),
+                "preferredContactMethod": rng.choice(("Email", "Email", "Phone", "SMS")),
+            }
+
+    def agents(self, count: int) -> Iterator[Dict[str, Any]]:
+        for i in range(count):
+            rng = self.rng("agent", i)
+            user = self.user("RealEstateAgent", i)
+            yield {
+                "key": entity_key("agent", i),
+                "user": user,
+                "licenseNumber": f"AMI-{10000 + i}",
+                "licenseExpiry": (date(2027, 1, 1) + timedelta(days=rng.randint(0, 1460))).isoformat() + "T00:00:00",
+                "officeEmail": user["email"],
+                "officePhone": f"+351 2{rng.randint(1, 9)} {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+                "commissionRate": round(rng.uniform(2.5, 5.0), 1),
+                "specialization": rng.choice(SPECIALIZATIONS),
+                "certifications": ["AMI", "Certificado Profissional"],
+                "languagesSpoken": [0] + rng.sample(range(1, 6), rng.randint(0, 2)),
+            }
+
+    # ── Imóveis ──────────────────────────────────────────────────────────
+
+    def property(self, index: int, agent_count: int) -> Dict[str, Any]:
+        rng = self.rng("property", index)
+        district, municipality, postal, parishes, _, price_mult = rng.choices(
+            MUNICIPALITIES, weights=MUNICIPALITY_WEIGHTS)[0]
+        type_name = rng.choices(TYPE_NAMES, weights=TYPE_WEIGHTS)[0]
+        _, label, bedroom_options, bedroom_weights = TYPE_PROFILES[type_name]
+        bedrooms = rng.choices(bedroom_options, weights=bedroom_weights)[0]
+
+        # Área correlacionada com a tipologia
+        if type_name == "Land":
+            size = rng.uniform(300, 5000)
+        elif type_name in ("Commercial", "Office", "Warehouse"):
+            size = rng.lognormvariate(4.6, 0.6) * (3 if type_name == "Warehouse" else 1)
+        else:
+            per_room = 32 if type_name in ("Apartment", "Studio", "Condo", "Penthouse") else 45
+            size = max(25.0, 30 + bedrooms * per_room * rng.uniform(0.8, 1.3))
+        size = round(size, 1)
+
+        transaction = rng.choices(("Sale", "Rent", "Both"), weights=(65, 30, 5))[0]
+        noise = rng.lognormvariate(0, 0.18)
+        factor = TYPE_PRICE_FACTOR[type_name] * price_mult * noise
+        if transaction == "Rent":
+            price = round(size * RENT_PRICE_PER_M2 * factor, -1)
+        else:
+            price = round(size * SALE_PRICE_PER_M2 * factor, -3)
+
+        if bedrooms:
+            title = f"{label} {'V' if type_name in ('House', 'Villa', 'Farm') else 'T'}{bedrooms} em {municipality}"
+        else:
+            title = f"{label} em {municipality}"
+        if transaction == "Rent":
+            title = f"{title} para Arrendamento"
+
+        year_built = rng.randint(1950, 2025)
+        return {
+            "key": entity_key("property", index),
+            "agentKey": entity_key("agent", index % agent_count),
+            "title": f"{title} #{index}",
+            "description": (f"{label} com {size:.0f}m² em {rng.choice(parishes)}, {municipality}. "
+                            f"Imóvel de {year_built} em {rng.choice(('ótimo', 'bom', 'excelente'))} estado."),
+            "type": PROPERTY_TYPES[type_name],
+            "status": 0,
+            "transactionType": TRANSACTION_TYPES[transaction],
+            "price": price,
+            "size": size,
+            "bedrooms": bedrooms,
+            "bathrooms": max(1, bedrooms - rng.randint(0, 1)) if bedrooms else rng.randint(0, 2),
+            "street": rng.choice(STREET_NAMES),
+            "number": str(rng.randint(1, 400)),
+            "parish": rng.choice(parishes),
+            "municipality": municipality,
+            "district": district,
+            "postalCode": f"{rng.randint(*postal)}-{rng.randint(1, 999):03d}",
+            "grossArea": round(size * rng.uniform(1.05, 1.25), 1),
+            "floor": rng.randint(0, 12) if type_name in ("Apartment", "Penthouse", "Studio", "Condo") else None,
+            "parkingSpaces": rng.choices((0, 1, 2, 3), weights=(35, 40, 20, 5))[0],
+            "hasElevator": type_name in ("Apartment", "Penthouse", "Condo") and rng.random() < 0.7,
+            "hasGarage": bedrooms >= 2 and rng.random() < 0.5,
+            "hasPool": type_name in ("Villa", "House", "Farm") and rng.random() < 0.35,
+            "isFurnished": transaction == "Rent" and rng.random() < 0.6,
+            "energyRating": rng.choice(ENERGY_RATINGS),
+            "yearBuilt": year_built,
+            "amenities": ", ".join(rng.sample(AMENITIES, rng.randint(1, 4))),
+        }
+
+    def properties(self, count: int, agent_count: int) -> Iterator[Dict[str, Any]]:
+        for i in range(count):
+            yield self.property(i, agent_count)
+
+    # ── Propostas e visitas ──────────────────────────────────────────────
+
+    def proposals(self, count: int, client_count: int, property_count: int,
+                  agent_count: int) -> Iterator[Dict[str, Any]]:
+        for i in range(count):
+            rng = self.rng("proposal", i)
+            property_index = rng.randrange(property_count)
+            prop = self.property(property_index, agent_count)
+            is_rent = prop["transactionType"] == TRANSACTION_TYPES["Rent"]
+            yield {
+                "key": entity_key("proposal", i),
+                "clientKey": entity_key("client", rng.randrange(client_count)),
+                "propertyKey": prop["key"],
+                "proposedValue": round(prop["price"] * rng.uniform(0.85, 1.0), -1 if is_rent else -3),
+                "type": PROPOSAL_TYPES["Rent" if is_rent else "Purchase"],
+                "paymentMethod": rng.choice(PAYMENT_METHODS),
+                "additionalNotes": "Proposta gerada para testes de escala",
+            }
+
+    def visits(self, count: int, client_count: int, property_count: int,
+               agent_count: int) -> Iterator[Dict[str, Any]]:
+        for i in range(count):
+            rng = self.rng("visit", i)
+            property_index = rng.randrange(property_count)
+            yield {
+                "key": entity_key("visit", i),
+                "clientKey": entity_key("client", rng.randrange(client_count)),
+                "propertyKey": entity_key("property", property_index),
+                "agentKey": entity_key("agent", property_index % agent_count),
+                "daysAhead": rng.randint(1, 60),
+                "timeSlot": rng.randrange(TIME_SLOTS),
+                "notes": "Visita gerada para testes de escala",
+            }
+
+    # ── Notificações ─────────────────────────────────────────────────────
+
+    def notification(self, index: int, counts: DatasetCounts) -> Dict[str, Any]:
+        """Notificação para o utilizador de um cliente (80%) ou de um agente"""
+        rng = self.rng("notification", index)
+        if counts.agents and (not counts.clients or rng.random() < 0.2):
+            recipient = entity_key("user:agent", rng.randrange(counts.agents))
+        else:
+            recipient = entity_key("user:client", rng.randrange(counts.clients))
+        kind = rng.choices(list(NOTIFICATION_TYPES), weights=list(NOTIFICATION_TYPES.values()))[0]
+        reference = None
+        if kind == "Proposal" and counts.proposals:
+            reference = entity_key("proposal", rng.randrange(counts.proposals))
+            message = "Recebeu uma atualização numa proposta"
+        elif kind == "Visit" and counts.visits:
+            reference = entity_key("visit", rng.randrange(counts.visits))
+            message = "Tem uma visita agendada"
+        elif kind in ("NewListing", "PriceChange", "PropertyUpdate") and counts.properties:
+            reference = entity_key("property", rng.randrange(counts.properties))
+            message = {"NewListing": "Novo imóvel que corresponde à sua pesquisa",
+                       "PriceChange": "O preço de um imóvel que segue foi alterado",
+                       "PropertyUpdate": "Um imóvel que segue foi atualizado"}[kind]
+        else:
+            kind = rng.choice(("Message", "SystemAlert"))
+            message = "Tem uma nova mensagem" if kind == "Message" else "Manutenção programada da plataforma"
+        return {
+            "key": entity_key("notification", index),
+            "recipientKey": recipient,
+            "type": kind,
+            "priority": rng.choices(list(NOTIFICATION_PRIORITIES),
+                                    weights=list(NOTIFICATION_PRIORITIES.values()))[0],
+            "message": f"{message} (#{index})",
+            "referenceKey": reference,
+            "referenceType": reference.split(":")[0].capitalize() if reference else None,
+        }
+
+    def notifications(self, counts: DatasetCounts) -> Iterator[Dict[str, Any]]:
+        for i in range(counts.notifications):
+            yield self.notification(i, counts)
+
+    def stream(self, counts: DatasetCounts) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Produz (tipo, registo) por ordem de dependência"""
+        for record in self.clients(counts.clients):
+            yield "clients", record
+        for record in self.agents(counts.agents):
+            yield "agents", record
+        for record in self.properties(counts.properties, counts.agents):
+            yield "properties", record
+        for record in self.proposals(counts.proposals, counts.clients, counts.properties, counts.agents):
+            yield "proposals", record
+        for record in self.visits(counts.visits, counts.clients, counts.properties, counts.agents):
+            yield "visits", record
+        for record in self.notifications(counts):
+            yield "notifications", record
@@ -0,0 +1,188 @@
+"""
+Camada HTTP partilhada: sessão com pool de ligações, keep-alive e retries
+"""
+
+import argparse
+import os
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_API_URL = "http://localhost:5149/api"
+# Métodos repetidos também após timeout de leitura e 5xx. Os PUT desta API não
+# são todos idempotentes (o PUT multipart de uma propriedade acrescenta imagens)
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "DELETE"})
+# Respostas em que a API não chegou a processar o pedido: seguras para qualquer método
+NOT_PROCESSED_STATUSES = frozenset({429, 503})
+
+
+@dataclass
+class HttpConfig:
+    """Configuração da sessão HTTP usada pelos seeders"""
+    base_url: str = DEFAULT_API_URL
+    pool_connections: int = 4
+    pool_maxsize: int = 16
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    retries: int = 3
+    backoff_factor: float = 0.5
+    retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        return (self.connect_timeout, self.read_timeout)
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace) -> "HttpConfig":
+        """Constrói a configuração a partir dos argumentos de linha de comando"""
+        return cls(
+            base_url=args.api_url.rstrip("/"),
+            pool_maxsize=args.pool_size,
+            connect_timeout=args.connect_timeout,
+            read_timeout=args.timeout,
+            retries=args.retries,
+            backoff_factor=args.backoff,
+        )
+
+
+def add_http_arguments(parser: argparse.ArgumentParser) -> None:
+    """Regista as opções HTTP comuns a todos os scripts"""
+    group = parser.add_argument_group("HTTP")
+    group.add_argument("--api-url", default=os.environ.get("DREAMLUSO_API_URL", DEFAULT_API_URL),
+                       help="URL base da API (default: %(default)s)")
+    group.add_argument("--pool-size", type=int, default=16,
+                       help="Ligações keep-alive mantidas no pool (default: %(default)s)")
+    group.add_argument("--connect-timeout", type=float, default=5.0,
+                       help="Timeout de ligação em segundos (default: %(default)s)")
+    group.add_argument("--timeout", type=float, default=30.0,
+                       help="Timeout de leitura em segundos (default: %(default)s)")
+    group.add_argument("--retries", type=int, default=3,
+                       help="Tentativas extra em 429/5xx; POST/PUT só em 429/503 e erros de ligação (default: %(default)s)")
+    group.add_argument("--backoff", type=float, default=0.5,
+                       help="Fator de backoff exponencial entre tentativas (default: %(default)s)")
+
+
+class SafeRetry(Retry):
+    """
+    Retry que não duplica escritas: POST/PUT/PATCH só se repetem em erros de
+    ligação (o pedido não saiu) e em 429/503 (a API recusou-o sem o
+    processar). Um timeout de leitura ou um 500/502/504 num POST pode chegar
+    depois de a escrita ter sido gravada, e repeti-lo criaria duplicados;
+    esses só se repetem nos métodos de IDEMPOTENT_METHODS.
+    """
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if not self._is_method_retryable(method):
+            return status_code in NOT_PROCESSED_STATUSES and status_code in (self.status_forcelist or ())
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+def create_session(config: HttpConfig) -> requests.Session:
+    """Cria uma sessão com pool de ligações e retries com backoff"""
+    retry = SafeRetry(
+        total=config.retries,
+        connect=config.retries,
+        read=config.retries,
+        status=config.retries,
+        backoff_factor=config.backoff_factor,
+        status_forcelist=config.retry_statuses,
+        allowed_methods=IDEMPOTENT_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=config.pool_connections,
+        pool_maxsize=config.pool_maxsize,
+        max_retries=retry,
+        pool_block=True,
+    )
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Connection": "keep-alive"})
+    return session
+
+
+class ApiClient:
+    """
+    Cliente da API DreamLuso sobre uma sessão partilhada. O token vem de
+    token_provider, se definido (ver auth.TokenManager), ou do atributo token;
+    on_unauthorized é chamado após um 401 e o pedido é repetido uma vez.
+    Com tracer (ver tracing.Tracer) cada pedido fica registado; com throttle
+    (ver throttle.Throttle) espera pela sua vez antes de sair, e o tempo de
+    espera não entra no trace.
+    """
+
+    def __init__(self, config: Optional[HttpConfig] = None,
+                 session: Optional[requests.Session] = None):
+        self.config = config or HttpConfig()
+        self._owns_session = session is None
+        self.session = session or create_session(self.config)
+        self.token: Optional[str] = None
+        self.token_provider: Optional[Callable[[], Optional[str]]] = None
+        self.on_unauthorized: Optional[Callable[[], None]] = None
+        self.tracer: Optional[Any] = None
+        self.throttle: Optional[Any] = None
+
+    def url(self, path: str) -> str:
+        return f"{self.config.base_url}{path}"
+
+    def headers(self, auth: bool = True) -> Dict[str, str]:
+        """Retorna headers com autenticação, se houver token"""
+        headers: Dict[str, str] = {}
+        token = self.token_provider() if (auth and self.token_provider) else self.token
+        if auth and token:
+            headers["Authorization"] = f"Bearer {token}"
+        return headers
+
+    def request(self, method: str, path: str, auth: bool = True, **kwargs: Any) -> requests.Response:
+        extra = kwargs.pop("headers", None) or {}
+        kwargs.setdefault("timeout", self.config.timeout)
+
+        # Um corpo em stream (ex.: images.MultipartBody) já foi lido no primeiro envio;
+        # sem voltar à posição inicial o reenvio após 401 sairia com Content-Length 0
+        body = kwargs.get("data")
+        rewind = body.tell() if hasattr(body, "seek") and hasattr(body, "tell") else None
+
+        def send() -> requests.Response:
+            response = self.session.request(method, self.url(path), headers={**self.headers(auth), **extra}, **kwargs)
+            if auth and response.status_code == 401 and self.on_unauthorized is not None:
+                self.on_unauthorized()
+                if rewind is not None:
+                    body.seek(rewind)
+                response = self.session.request(method, self.url(path), headers={**self.headers(auth), **extra}, **kwargs)
+            return response
+
+        call: Callable[[], requests.Response] = send
+        if self.tracer is not None:
+            call = partial(self.tracer.call, method, path, send)
+        if self.throttle is not None:
+            return self.throttle.call(method, path, call)
+        return call()
+
+    def get(self, path: str, **kwargs: Any) -> requests.Response:
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path: str, **kwargs: Any) -> requests.Response:
+        return self.request("PUT", path, **kwargs)
+
+    def delete(self, path: str, **kwargs: Any) -> requests.Response:
+        return self.request("DELETE", path, **kwargs)
+
+    def close(self) -> None:
+        if self._owns_session:
+            self.session.close()
+
+    def __enter__(self) -> "ApiClient":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
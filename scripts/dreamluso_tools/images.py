@@ -0,0 +1,270 @@
+"""
+Pool de imagens sintéticas e uploads multipart em streaming a partir de
+ficheiros mapeados em memória (mmap)
+"""
+
+import argparse
+import bisect
+import mmap
+import os
+import random
+import struct
+import uuid
+import zlib
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+from .http_client import ApiClient
+
+try:  # Pillow é opcional: sem ele o pool gera PNG só com a biblioteca padrão
+    from PIL import Image
+except ImportError:  # pragma: no cover - depende do ambiente
+    Image = None
+
+# Limites do ImageUploadEndpoints / FileStorageService
+ALLOWED_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".webp")
+MAX_UPLOAD_BYTES = 5 * 1024 * 1024
+CONTENT_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+}
+PILLOW_FORMATS = {"jpg": "JPEG", "webp": "WEBP"}
+DEFAULT_IMAGE_DIR = ".seed-images"
+
+
+def available_formats() -> Tuple[str, ...]:
+    return ("jpg", "webp", "png") if Image is not None else ("png",)
+
+
+def add_image_arguments(parser: argparse.ArgumentParser, per_property_default: int = 0) -> None:
+    """Regista as opções do pool de imagens"""
+    group = parser.add_argument_group("Imagens")
+    group.add_argument("--images", type=int, default=per_property_default, metavar="N",
+                       help="Imagens por propriedade (default: %(default)s)")
+    group.add_argument("--image-dir", default=DEFAULT_IMAGE_DIR,
+                       help="Pool de imagens a reutilizar/gerar (default: %(default)s)")
+    group.add_argument("--image-count", type=int, default=24,
+                       help="Tamanho mínimo do pool (default: %(default)s)")
+    group.add_argument("--image-format", choices=("jpg", "webp", "png"), default="jpg",
+                       help="Formato das imagens geradas; sem Pillow usa png (default: %(default)s)")
+
+
+def _png_chunk(tag: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+
+def write_png(path: str, width: int, height: int, rng: random.Random, detail: float = 0.3) -> None:
+    """
+    PNG RGB válido escrito linha a linha: um gradiente com uma fração detail
+    de linhas de ruído, para o ficheiro ter um tamanho próximo de uma foto
+    """
+    base = [rng.randrange(256) for _ in range(3)]
+    compressor = zlib.compressobj(1)
+    with open(path, "wb") as handle:
+        handle.write(b"\x89PNG\r\n\x1a\n")
+        handle.write(_png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        idat = bytearray()
+        for y in range(height):
+            if rng.random() < detail:
+                row = rng.randbytes(width * 3)
+            else:
+                shade = bytes((c + y * 255 // height) % 256 for c in base)
+                row = shade * width
+            idat += compressor.compress(b"\x00" + row)
+            if len(idat) >= 1 << 20:
+                handle.write(_png_chunk(b"IDAT", bytes(idat)))
+                idat.clear()
+        idat += compressor.flush()
+        handle.write(_png_chunk(b"IDAT", bytes(idat)))
+        handle.write(_png_chunk(b"IEND", b""))
+
+
+def write_pillow(path: str, fmt: str, width: int, height: int, rng: random.Random) -> None:
+    """JPEG/WEBP com gradiente e ruído gaussiano, comprimidos como uma foto real"""
+    gradient = Image.linear_gradient("L").resize((width, height))
+    noise = Image.effect_noise((width, height), rng.uniform(40, 90))
+    image = Image.merge("RGB", (gradient, noise, gradient.rotate(rng.choice((90, 180, 270)))))
+    image.save(path, PILLOW_FORMATS[fmt], quality=85)
+
+
+@dataclass
+class MappedImage:
+    """Ficheiro de imagem aberto com mmap só de leitura; partilhável entre threads"""
+    path: str
+    data: mmap.mmap
+
+    @property
+    def filename(self) -> str:
+        return os.path.basename(self.path)
+
+    @property
+    def content_type(self) -> str:
+        return CONTENT_TYPES[os.path.splitext(self.path)[1].lower()]
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+
+class MultipartBody:
+    """
+    Corpo multipart/form-data lido por blocos: os cabeçalhos das partes ficam
+    em bytes e o conteúdo dos ficheiros é fatiado diretamente do mmap, pelo
+    que cada pedido só copia para Python o bloco que o socket está a enviar.
+    Expõe __len__/tell/seek para o requests enviar Content-Length e o urllib3
+    poder rebobinar o corpo num retry. Cada pedido precisa da sua instância.
+    """
+
+    def __init__(self, fields: Iterable[Tuple[str, str]] = (),
+                 files: Iterable[Tuple[str, MappedImage]] = ()):
+        self.boundary = uuid.uuid4().hex
+        dash = f"--{self.boundary}\r\n".encode()
+        parts: List[Any] = []
+        for name, value in fields:
+            parts.append(dash + f'Content-Disposition: form-data; name="{name}"\r\n\r\n'.encode()
+                         + str(value).encode("utf-8") + b"\r\n")
+        for name, image in files:
+            parts.append(dash + (f'Content-Disposition: form-data; name="{name}"; '
+                                 f'filename="{image.filename}"\r\n'
+                                 f"Content-Type: {image.content_type}\r\n\r\n").encode())
+            parts.append(image.data)
+            parts.append(b"\r\n")
+        parts.append(f"--{self.boundary}--\r\n".encode())
+        self._parts = parts
+        self._starts: List[int] = []
+        total = 0
+        for part in parts:
+            self._starts.append(total)
+            total += len(part)
+        self._length = total
+        self._position = 0
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return self._length
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        base = {os.SEEK_SET: 0, os.SEEK_CUR: self._position, os.SEEK_END: self._length}[whence]
+        self._position = max(0, min(self._length, base + offset))
+        return self._position
+
+    def read(self, size: int = -1) -> bytes:
+        end = self._length if size is None or size < 0 else min(self._length, self._position + size)
+        chunks = []
+        index = bisect.bisect_right(self._starts, self._position) - 1
+        while self._position < end:
+            part, start = self._parts[index], self._starts[index]
+            stop = min(len(part), end - start)
+            chunks.append(part[self._position - start:stop])
+            self._position = start + stop
+            index += 1
+        return b"".join(chunks)
+
+
+class ImagePool:
+    """
+    Diretório de imagens reutilizadas pelo seed. Usa as que lá estiverem
+    (fotos reais incluídas) e gera sintéticas até ter count; na abertura faz
+    mmap de todas, e cada propriedade recebe sempre as mesmas imagens.
+    """
+
+    def __init__(self, directory: str, count: int = 24, fmt: str = "jpg",
+                 width: int = 1280, height: int = 960, seed: int = 7):
+        if fmt not in ("jpg", "webp", "png"):
+            raise ValueError(f"formato não suportado: {fmt}")
+        self.directory = directory
+        self.count = count
+        # JPEG/WEBP precisam de Pillow; o servidor só valida extensão e tamanho
+        self.format = fmt if fmt in available_formats() else "png"
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.images: List[MappedImage] = []
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace) -> "ImagePool":
+        return cls(args.image_dir, count=args.image_count, fmt=args.image_format)
+
+    def _existing(self) -> List[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(
+            os.path.join(self.directory, name) for name in os.listdir(self.directory)
+            if os.path.splitext(name)[1].lower() in ALLOWED_EXTENSIONS
+            and 0 < os.path.getsize(os.path.join(self.directory, name)) <= MAX_UPLOAD_BYTES
+        )
+
+    def ensure(self) -> int:
+        """Gera as imagens em falta; devolve quantas foram criadas"""
+        os.makedirs(self.directory, exist_ok=True)
+        created = 0
+        index = 0
+        while len(self._existing()) < self.count:
+            path = os.path.join(self.directory, f"synthetic_{index:04d}.{self.format}")
+            index += 1
+            if os.path.exists(path):
+                continue
+            rng = random.Random(self.seed * 100003 + index)
+            if self.format == "png":
+                write_png(path, self.width, self.height, rng)
+            else:
+                write_pillow(path, self.format, self.width, self.height, rng)
+            created += 1
+        return created
+
+    def open(self) -> "ImagePool":
+        self.close()
+        for path in self._existing():
+            with open(path, "rb") as handle:
+                # O mmap mantém a própria referência ao ficheiro
+                self.images.append(MappedImage(path, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)))
+        if not self.images:
+            raise ValueError(f"nenhuma imagem em {self.directory}")
+        return self
+
+    def pick(self, key: str, n: int) -> List[MappedImage]:
+        """n imagens distintas (se houver) escolhidas de forma estável pela chave"""
+        if n <= 0:
+            return []
+        offset = zlib.crc32(key.encode())
+        return [self.images[(offset + i) % len(self.images)] for i in range(min(n, len(self.images)))]
+
+    def total_bytes(self) -> int:
+        return sum(len(image) for image in self.images)
+
+    def close(self) -> None:
+        for image in self.images:
+            image.data.close()
+        self.images = []
+
+    def __enter__(self) -> "ImagePool":
+        return self.open()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def post_multipart(api: ApiClient, method: str, path: str, body: MultipartBody, **kwargs: Any):
+    return api.request(method, path, data=body, headers={"Content-Type": body.content_type}, **kwargs)
+
+
+def upload_images(api: ApiClient, images: Sequence[MappedImage]) -> Tuple[int, List[str]]:
+    """Envia um lote para /images/upload; devolve (status, urls)"""
+    response = post_multipart(api, "POST", "/images/upload",
+                              MultipartBody(files=[("files", image) for image in images]))
+    if response.status_code != 200:
+        return response.status_code, []
+    return response.status_code, list(response.json().get("urls") or [])
+
+
+def property_body(form: dict, images: Optional[Sequence[MappedImage]] = None) -> MultipartBody:
+    """Form de criação/edição de propriedade com as imagens no campo images"""
+    return MultipartBody(form.items(), [("images", image) for image in images or ()])
@@ -0,0 +1,75 @@
+"""
+Índices em memória para juntar registos da API com os dados de seed em tempo linear
+"""
+
+from typing import Callable, Dict, Generic, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+S = TypeVar("S")
+
+
+def normalize_email(email: Optional[str]) -> str:
+    return (email or "").strip().lower()
+
+
+class RecordIndex(Generic[T]):
+    """
+    Indexa registos por uma chave única (por omissão o email) e particiona-os
+    por um campo (por omissão o role). Construído uma vez em O(n); get() e
+    partition() são O(1). As chaves passam por normalize tanto na construção
+    como na consulta.
+    """
+
+    def __init__(self, records: Iterable[T],
+                 key: Callable[[T], Optional[str]] = lambda r: r.get("email"),  # type: ignore[attr-defined]
+                 partition: Optional[Callable[[T], str]] = lambda r: r.get("role"),  # type: ignore[attr-defined]
+                 normalize: Callable[[Optional[str]], str] = normalize_email):
+        self._normalize = normalize
+        self._key = lambda record: normalize(key(record))
+        self.records: List[T] = []
+        self.by_key: Dict[str, T] = {}
+        self.partitions: Dict[str, List[T]] = {}
+        for record in records:
+            self.records.append(record)
+            self.by_key.setdefault(self._key(record), record)
+            if partition is not None:
+                self.partitions.setdefault(partition(record), []).append(record)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __contains__(self, key: str) -> bool:
+        return self._normalize(key) in self.by_key
+
+    def get(self, key: str) -> Optional[T]:
+        return self.by_key.get(self._normalize(key))
+
+    def partition(self, name: str) -> List[T]:
+        """Vista dos registos de uma partição (ex.: role "Client"), pela ordem original"""
+        return self.partitions.get(name, [])
+
+    def pick(self, key: str, fallback: int) -> T:
+        """
+        Registo com a chave dada ou, se não existir, o registo na posição
+        fallback (módulo o tamanho). Lança IndexError se o índice estiver vazio.
+        """
+        record = self.get(key)
+        if record is not None:
+            return record
+        if not self.records:
+            raise IndexError("índice vazio")
+        return self.records[fallback % len(self.records)]
+
+    def join(self, specs: Dict[str, S], partition: Optional[str] = None) -> Iterator[Tuple[T, S]]:
+        """Emparelha registos com specs indexadas pela mesma chave, em O(len(registos))"""
+        records = self.partition(partition) if partition is not None else self.records
+        for record in records:
+            spec = specs.get(self._key(record))
+            if spec is not None:
+                yield record, spec
+
+
+def index_specs(specs: Iterable[S], key: Callable[[S], str],
+                normalize: Callable[[Optional[str]], str] = normalize_email) -> Dict[str, S]:
+    """Indexa dados de seed (tuplos ou dicts) pela chave normalizada, para usar com RecordIndex.join"""
+    return {normalize(key(spec)): spec for spec in specs}
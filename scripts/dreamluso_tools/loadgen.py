@@ -0,0 +1,177 @@
+"""
+Gerador de carga em malha aberta: as chegadas seguem o ritmo alvo,
+independentemente do tempo de resposta da API
+"""
+
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import requests
+
+from .http_client import ApiClient
+from .metrics import LatencyRecorder
+
+OK_STATUSES = (200, 201, 204)
+
+
+def add_load_arguments(parser: argparse.ArgumentParser) -> None:
+    """Regista as opções do gerador de carga"""
+    group = parser.add_argument_group("Carga")
+    group.add_argument("--rps", type=float, default=20.0,
+                       help="Chegadas de cenários por segundo (default: %(default)s)")
+    group.add_argument("--duration", type=float, default=30.0,
+                       help="Duração do teste em segundos (default: %(default)s)")
+    group.add_argument("--arrival", choices=("poisson", "uniform"), default="poisson",
+                       help="Modelo de chegadas (default: %(default)s)")
+    group.add_argument("--max-inflight", type=int, default=128,
+                       help="Cenários em execução simultânea antes de descartar chegadas (default: %(default)s)")
+    group.add_argument("--seed", type=int, default=None,
+                       help="Semente do RNG, para reproduzir a sequência de cenários")
+
+
+@dataclass
+class Scenario:
+    """Fluxo de utilizador com peso relativo na mistura"""
+    name: str
+    weight: float
+    run: Callable[["LoadSession"], Any]
+
+
+class LoadSession:
+    """Contexto de um cenário: pedidos cronometrados e registados por endpoint"""
+
+    def __init__(self, api: ApiClient, recorder: LatencyRecorder, rng: random.Random):
+        self.api = api
+        self.recorder = recorder
+        self.rng = rng
+
+    def call(self, endpoint: str, method: str, path: str,
+             expect: Sequence[int] = OK_STATUSES, client: Optional[ApiClient] = None,
+             **kwargs: Any) -> Optional[requests.Response]:
+        """
+        Faz um pedido e regista-o em endpoint (o template da rota, ex.:
+        "GET /properties/{id}"). client permite agir como outra identidade
+        (ver TokenManager.client). Devolve None em falha de transporte.
+        """
+        started = time.perf_counter()
+        try:
+            response = (client or self.api).request(method, path, **kwargs)
+        except requests.RequestException:
+            self.recorder.record(endpoint, time.perf_counter() - started, 0)
+            return None
+        self.recorder.record(endpoint, time.perf_counter() - started, response.status_code,
+                             error=response.status_code not in expect, size=len(response.content))
+        return response
+
+
+@dataclass
+class LoadReport:
+    recorder: LatencyRecorder
+    elapsed: float
+    offered: int
+    dropped: int
+    target_rps: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "targetRps": self.target_rps,
+            "elapsed": self.elapsed,
+            "offered": self.offered,
+            "dropped": self.dropped,
+            "achievedRps": (self.offered - self.dropped) / self.elapsed if self.elapsed else 0.0,
+            "endpoints": self.recorder.summary(self.elapsed),
+        }
+
+
+class OpenLoopRunner:
+    """
+    Agenda chegadas a rps por segundo durante duration segundos e escolhe o
+    cenário de cada chegada pelos pesos. As chegadas não esperam pelas
+    respostas anteriores (malha aberta); a latência de cada cenário conta a
+    partir do instante agendado, para que a fila de espera não fique
+    escondida (coordinated omission). Acima de max_inflight as chegadas são
+    descartadas e contadas.
+    """
+
+    def __init__(self, api: ApiClient, scenarios: List[Scenario], rps: float, duration: float,
+                 max_inflight: int = 128, arrival: str = "poisson", seed: Optional[int] = None):
+        if rps <= 0:
+            raise ValueError("rps deve ser > 0")
+        self.api = api
+        self.scenarios = [s for s in scenarios if s.weight > 0]
+        if not self.scenarios:
+            raise ValueError("nenhum cenário com peso > 0")
+        self.rps = rps
+        self.duration = duration
+        self.max_inflight = max_inflight
+        self.arrival = arrival
+        self.rng = random.Random(seed)
+        self.recorder = LatencyRecorder()
+        self._inflight = 0
+        self._lock = threading.Lock()
+
+    def _interarrival(self) -> float:
+        if self.arrival == "poisson":
+            return self.rng.expovariate(self.rps)
+        return 1.0 / self.rps
+
+    def _job(self, scenario: Scenario, scheduled: float, seed: int) -> None:
+        session = LoadSession(self.api, self.recorder, random.Random(seed))
+        failed = False
+        try:
+            scenario.run(session)
+        except Exception:
+            failed = True
+        finally:
+            self.recorder.record(f"scenario:{scenario.name}", time.perf_counter() - scheduled,
+                                 error=failed)
+            with self._lock:
+                self._inflight -= 1
+
+    def schedule(self) -> List[Tuple[float, Scenario]]:
+        """Sequência (offset, cenário) das chegadas; determinística com seed"""
+        weights = [s.weight for s in self.scenarios]
+        arrivals = []
+        offset = self._interarrival()
+        while offset < self.duration:
+            arrivals.append((offset, self.rng.choices(self.scenarios, weights=weights)[0]))
+            offset += self._interarrival()
+        return arrivals
+
+    def run(self) -> LoadReport:
+        arrivals = self.schedule()
+        dropped = 0
+        executor = ThreadPoolExecutor(max_workers=self.max_inflight, thread_name_prefix="load")
+        started = time.perf_counter()
+        try:
+            for seq, (offset, scenario) in enumerate(arrivals):
+                scheduled = started + offset
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                with self._lock:
+                    if self._inflight >= self.max_inflight:
+                        dropped += 1
+                        continue
+                    self._inflight += 1
+                executor.submit(self._job, scenario, scheduled, self.rng.getrandbits(32) ^ seq)
+        finally:
+            executor.shutdown(wait=True)
+        elapsed = time.perf_counter() - started
+        return LoadReport(self.recorder, elapsed, len(arrivals), dropped, self.rps)
+
+
+def parse_weights(specs: Sequence[str]) -> Dict[str, float]:
+    """["browse=5", "proposal=1"] -> {"browse": 5.0, "proposal": 1.0}"""
+    weights = {}
+    for spec in specs:
+        name, sep, value = spec.partition("=")
+        if not sep:
+            raise argparse.ArgumentTypeError(f"peso inválido: {spec} (esperado nome=peso)")
+        weights[name.strip()] = float(value)
+    return weights
@@ -0,0 +1,86 @@
+"""
+Recolha de latências por endpoint e cálculo de percentis
+"""
+
+import math
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Percentil pelo método nearest-rank sobre valores já ordenados"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+@dataclass
+class EndpointStats:
+    """Amostras de um endpoint; latências em segundos"""
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    statuses: Dict[int, int] = field(default_factory=dict)
+    bytes_received: int = 0
+
+    @property
+    def count(self) -> int:
+        return len(self.latencies)
+
+    def summary(self, elapsed: Optional[float] = None) -> Dict[str, Any]:
+        values = sorted(self.latencies)
+        result = {
+            "count": self.count,
+            "errors": self.errors,
+            "errorRate": self.errors / self.count if self.count else 0.0,
+            "p50Ms": percentile(values, 50) * 1000,
+            "p95Ms": percentile(values, 95) * 1000,
+            "p99Ms": percentile(values, 99) * 1000,
+            "maxMs": (values[-1] if values else 0.0) * 1000,
+            "meanMs": (sum(values) / len(values) if values else 0.0) * 1000,
+            "statuses": {str(code): n for code, n in sorted(self.statuses.items())},
+            "bytes": self.bytes_received,
+        }
+        if elapsed:
+            result["throughput"] = self.count / elapsed
+        return result
+
+
+class LatencyRecorder:
+    """Recolhe amostras de várias threads, agrupadas pelo nome do endpoint"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.endpoints: Dict[str, EndpointStats] = {}
+
+    def record(self, endpoint: str, latency: float, status: int = 200,
+               error: Optional[bool] = None, size: int = 0) -> None:
+        """status 0 = falha de transporte (timeout, ligação recusada)"""
+        failed = error if error is not None else (status == 0 or status >= 400)
+        with self._lock:
+            stats = self.endpoints.get(endpoint)
+            if stats is None:
+                stats = self.endpoints[endpoint] = EndpointStats()
+            stats.latencies.append(latency)
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            stats.bytes_received += size
+            if failed:
+                stats.errors += 1
+
+    def summary(self, elapsed: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: stats.summary(elapsed) for name, stats in sorted(self.endpoints.items())}
+
+    def print_table(self, elapsed: Optional[float] = None, title: str = "📊 LATÊNCIA POR ENDPOINT") -> None:
+        summary = self.summary(elapsed)
+        width = max([len(name) for name in summary] + [8])
+        print("\n" + "━" * (width + 66))
+        print(title)
+        print("━" * (width + 66))
+        print(f"   {'endpoint':<{width}} {'n':>7} {'req/s':>8} {'erros':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+        for name, s in summary.items():
+            print(f"   {name:<{width}} {s['count']:>7} {s.get('throughput', 0):>8.1f} "
+                  f"{s['errorRate'] * 100:>6.1f}% {s['p50Ms']:>9.1f} {s['p95Ms']:>9.1f} "
+                  f"{s['p99Ms']:>9.1f} {s['maxMs']:>9.1f}")
+        print("━" * (width + 66))
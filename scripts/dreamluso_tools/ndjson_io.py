@@ -0,0 +1,133 @@
+"""
+Leitura/escrita em streaming de payloads NDJSON e mapa compacto de ids
+"""
+
+import gzip
+import io
+import json
+import os
+import uuid
+from typing import Any, Dict, IO, Iterable, Iterator, Optional, Tuple
+
+EMPTY_GUID = bytes(16)
+
+
+def open_text(path: str, mode: str) -> IO[str]:
+    """Abre um ficheiro de texto, com gzip transparente para .gz"""
+    if path.endswith(".gz"):
+        # mtime fixo: o mesmo conteúdo dá sempre os mesmos bytes comprimidos
+        return io.TextIOWrapper(gzip.GzipFile(path, mode + "b", mtime=0), encoding="utf-8")
+    return open(path, mode, encoding="utf-8", buffering=1024 * 1024)
+
+
+def write_ndjson(path: str, records: Iterable[Dict[str, Any]], digest: Optional[Any] = None) -> int:
+    """
+    Escreve um registo JSON por linha; devolve o número de linhas escritas.
+    digest (ex.: hashlib.sha256()) recebe as linhas, antes de comprimidas.
+    """
+    count = 0
+    with open_text(path, "w") as handle:
+        for record in records:
+            line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+            handle.write(line)
+            if digest is not None:
+                digest.update(line.encode("utf-8"))
+            count += 1
+    return count
+
+
+def read_ndjson(path: str) -> Iterator[Dict[str, Any]]:
+    """Lê um ficheiro NDJSON linha a linha, sem o carregar todo"""
+    with open_text(path, "r") as handle:
+        for line in handle:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def count_records(path: str) -> int:
+    """Conta as linhas não vazias em blocos de 1 MB, sem fazer parse do JSON"""
+    opener = gzip.open if path.endswith(".gz") else open
+    count = 0
+    last = b"\n"
+    with opener(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1024 * 1024), b""):
+            count += block.count(b"\n")
+            last = block[-1:]
+    return count + (last != b"\n")
+
+
+def split_key(key: str) -> Tuple[str, int]:
+    """'property:000042' -> ('property', 42)"""
+    kind, _, index = key.rpartition(":")
+    return kind, int(index)
+
+
+class IdMap:
+    """
+    Mapa chave local -> GUID do servidor. Há um ficheiro binário por tipo
+    (<tipo>.ids) com 16 bytes por índice, pelo que o registo i está no offset
+    i * 16: escritas e leituras são O(1) com pwrite/pread, a memória não cresce
+    com o dataset e qualquer fase posterior pode fazer mmap do ficheiro.
+    Posições a zero significam "ainda não criado".
+    """
+
+    RECORD_SIZE = 16
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._fds: Dict[str, int] = {}
+
+    def path(self, kind: str) -> str:
+        return os.path.join(self.directory, kind.replace(":", "_") + ".ids")
+
+    def _fd(self, kind: str) -> int:
+        fd = self._fds.get(kind)
+        if fd is None:
+            fd = os.open(self.path(kind), os.O_RDWR | os.O_CREAT, 0o644)
+            # setdefault evita fugas se duas threads abrirem o mesmo tipo em simultâneo
+            existing = self._fds.setdefault(kind, fd)
+            if existing != fd:
+                os.close(fd)
+                fd = existing
+        return fd
+
+    def set(self, key: str, guid: str) -> None:
+        kind, index = split_key(key)
+        os.pwrite(self._fd(kind), uuid.UUID(guid).bytes, index * self.RECORD_SIZE)
+
+    def get(self, key: str) -> Optional[str]:
+        kind, index = split_key(key)
+        raw = os.pread(self._fd(kind), self.RECORD_SIZE, index * self.RECORD_SIZE)
+        if len(raw) < self.RECORD_SIZE or raw == EMPTY_GUID:
+            return None
+        return str(uuid.UUID(bytes=raw))
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def items(self, kind: str) -> Iterator[Tuple[str, str]]:
+        """Percorre em streaming todos os ids resolvidos de um tipo"""
+        if not os.path.exists(self.path(kind)):
+            return
+        with open(self.path(kind), "rb") as handle:
+            index = 0
+            while True:
+                raw = handle.read(self.RECORD_SIZE)
+                if len(raw) < self.RECORD_SIZE:
+                    break
+                if raw != EMPTY_GUID:
+                    yield f"{kind}:{index:06d}", str(uuid.UUID(bytes=raw))
+                index += 1
+
+    def close(self) -> None:
+        for fd in self._fds.values():
+            os.close(fd)
+        self._fds.clear()
+
+    def __enter__(self) -> "IdMap":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
@@ -0,0 +1,302 @@
+"""
+Carga de negociação de propostas: cada proposta percorre uma máquina de
+estados (análise, rondas de contraproposta, aprovação/rejeição/cancelamento)
+com probabilidades de ramificação configuráveis, e cada transição é
+cronometrada
+"""
+
+import argparse
+import itertools
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .http_client import ApiClient
+from .loadgen import parse_weights
+from .metrics import LatencyRecorder
+from .pagination import iter_items
+from .payloads import proposal_payload
+
+# Estados de PropertyProposal (ProposalStatus) que o fluxo atravessa
+PENDING = "Pending"
+UNDER_ANALYSIS = "UnderAnalysis"
+IN_NEGOTIATION = "InNegotiation"
+APPROVED = "Approved"
+REJECTED = "Rejected"
+CANCELLED = "Cancelled"
+TERMINAL = (APPROVED, REJECTED, CANCELLED)
+
+# Ações possíveis e o estado a que levam
+ACTIONS = {
+    "analyse": UNDER_ANALYSIS,
+    "negotiate": IN_NEGOTIATION,
+    "approve": APPROVED,
+    "reject": REJECTED,
+    "cancel": CANCELLED,
+}
+
+# Pesos relativos das ações em cada estado (não precisam de somar 1)
+DEFAULT_BRANCHES: Dict[str, Dict[str, float]] = {
+    PENDING: {"analyse": 0.75, "negotiate": 0.15, "cancel": 0.07, "reject": 0.03},
+    UNDER_ANALYSIS: {"negotiate": 0.65, "approve": 0.10, "reject": 0.15, "cancel": 0.10},
+    IN_NEGOTIATION: {"negotiate": 0.70, "approve": 0.10, "reject": 0.10, "cancel": 0.10},
+}
+
+# Abreviaturas aceites em --branch (pending.cancel=0.2)
+STATE_ALIASES = {"pending": PENDING, "analysis": UNDER_ANALYSIS, "negotiation": IN_NEGOTIATION}
+
+UNAVAILABLE_PROPERTY_STATUSES = ("Sold", "Rented", "Reserved", "UnderContract")
+
+
+def add_negotiation_arguments(parser: argparse.ArgumentParser) -> None:
+    """Regista as opções da máquina de estados das propostas"""
+    group = parser.add_argument_group("Negociação")
+    group.add_argument("--proposals", type=int, default=200,
+                       help="Propostas a criar e levar até um estado final (default: %(default)s)")
+    group.add_argument("--max-rounds", type=int, default=6,
+                       help="Rondas de contraproposta antes de forçar uma decisão (default: %(default)s)")
+    group.add_argument("--branch", action="append", default=[], metavar="ESTADO.ACAO=PESO",
+                       help="Altera um peso da máquina de estados, ex.: pending.cancel=0.2, "
+                            "negotiation.approve=0 (estados: pending, analysis, negotiation)")
+    group.add_argument("--view-probability", type=float, default=0.8,
+                       help="Probabilidade de a outra parte marcar cada mensagem como vista (default: %(default)s)")
+    group.add_argument("--think-time", type=float, default=0.0, metavar="S",
+                       help="Pausa média entre passos de uma proposta, em segundos (default: %(default)s)")
+
+
+def parse_branches(specs: List[str]) -> Dict[str, Dict[str, float]]:
+    """["pending.cancel=0.2"] aplicado por cima de DEFAULT_BRANCHES"""
+    branches = {state: dict(actions) for state, actions in DEFAULT_BRANCHES.items()}
+    for key, weight in parse_weights(specs).items():
+        state_name, _, action = key.partition(".")
+        state = STATE_ALIASES.get(state_name)
+        if state is None or action not in branches[state]:
+            raise ValueError(f"ramo desconhecido: {key}")
+        branches[state][action] = weight
+    for state, actions in branches.items():
+        if sum(actions.values()) <= 0:
+            raise ValueError(f"nenhuma ação possível em {state}")
+    return branches
+
+
+@dataclass
+class NegotiationData:
+    """Imóveis disponíveis, clientes e userId dos agentes, recolhidos antes da carga"""
+    properties: List[Dict[str, Any]] = field(default_factory=list)
+    clients: List[Dict[str, Any]] = field(default_factory=list)
+    agent_users: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def collect(cls, api: ApiClient, limit: int = 5000) -> "NegotiationData":
+        properties = [
+            {"id": p["id"], "agentId": p.get("agentId"), "price": float(p.get("price") or 0),
+             "transactionType": p.get("transactionType")}
+            for p in itertools.islice(iter_items(api, "/properties"), limit)
+            if p.get("status") not in UNAVAILABLE_PROPERTY_STATUSES and p.get("price")
+        ]
+        clients = [{"id": c["id"], "userId": c.get("userId")}
+                   for c in itertools.islice(iter_items(api, "/clients"), limit)]
+        agent_users = {a["id"]: a.get("userId") for a in itertools.islice(iter_items(api, "/agents"), limit)}
+        return cls(properties, clients, agent_users)
+
+    def pairs(self, rng: random.Random) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Pares (cliente, imóvel) sem repetição enquanto houver: a API recusa
+        uma segunda proposta pendente do mesmo cliente para o mesmo imóvel
+        """
+        seen = set()
+        total = len(self.clients) * len(self.properties)
+        while len(seen) < total:
+            client = rng.choice(self.clients)
+            prop = rng.choice(self.properties)
+            if (client["id"], prop["id"]) in seen:
+                continue
+            seen.add((client["id"], prop["id"]))
+            yield client, prop
+
+
+@dataclass
+class ProposalRun:
+    """Percurso de uma proposta pela máquina de estados"""
+    proposal_id: Optional[str] = None
+    state: str = PENDING
+    rounds: int = 0
+    views: int = 0
+    last_negotiation: Optional[str] = None
+    path: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+class NegotiationWorkload:
+    """
+    Leva cada proposta do POST /proposals até Approved/Rejected/Cancelled.
+    Em cada estado a próxima ação é sorteada pelos pesos de branches; as
+    rondas alternam cliente e agente com contrapropostas que convergem para
+    o preço pedido, e a outra parte marca a mensagem como vista (e a última
+    como aceite ou rejeitada). Cada transição fica no recorder como
+    "Origem→Destino" e cada pedido como o template da rota.
+    """
+
+    def __init__(self, api: ApiClient, data: NegotiationData,
+                 branches: Optional[Dict[str, Dict[str, float]]] = None, max_rounds: int = 6,
+                 view_probability: float = 0.8, think_time: float = 0.0):
+        self.api = api
+        self.data = data
+        self.branches = branches or DEFAULT_BRANCHES
+        self.max_rounds = max_rounds
+        self.view_probability = view_probability
+        self.think_time = think_time
+        self.recorder = LatencyRecorder()
+        self.finals: Counter = Counter()
+        self.rounds: Counter = Counter()
+        self.errors: Counter = Counter()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace, api: ApiClient, data: NegotiationData) -> "NegotiationWorkload":
+        return cls(api, data, parse_branches(args.branch), args.max_rounds,
+                   args.view_probability, args.think_time)
+
+    # ── Pedidos ─────────────────────────────────────────────────────────
+
+    def _call(self, endpoint: str, method: str, path: str, **kwargs: Any) -> Tuple[float, Any]:
+        started = time.perf_counter()
+        response = self.api.request(method, path, **kwargs)
+        latency = time.perf_counter() - started
+        self.recorder.record(endpoint, latency, response.status_code, size=len(response.content))
+        return latency, response
+
+    def _error(self, run: ProposalRun, action: str, response: Any) -> None:
+        try:
+            code = response.json().get("code")
+        except (ValueError, AttributeError):
+            code = None
+        run.error = f"{action}:{code or response.status_code}"
+        with self._lock:
+            self.errors[run.error] += 1
+
+    def _pause(self, rng: random.Random) -> None:
+        if self.think_time > 0:
+            time.sleep(rng.expovariate(1 / self.think_time))
+
+    # ── Máquina de estados ──────────────────────────────────────────────
+
+    def next_action(self, run: ProposalRun, rng: random.Random) -> str:
+        actions = dict(self.branches[run.state])
+        if run.rounds >= self.max_rounds:
+            # Depois da última ronda só resta decidir
+            actions.pop("negotiate", None)
+            if not any(actions.values()):
+                actions = {"reject": 1.0}
+        names = list(actions)
+        return rng.choices(names, weights=[actions[n] for n in names])[0]
+
+    def create(self, run: ProposalRun, client: Dict[str, Any], prop: Dict[str, Any],
+               rng: random.Random) -> bool:
+        is_rent = prop.get("transactionType") == "Rent"
+        latency, response = self._call("POST /proposals", "POST", "/proposals", json=proposal_payload(
+            client["id"], prop["id"], round(prop["price"] * rng.uniform(0.80, 0.95), 2),
+            proposal_type="Rent" if is_rent else "Purchase",
+            payment_method=rng.choice(("Cash", "Mortgage", "BankTransfer")),
+            notes="Teste de negociação"))
+        self.recorder.record(f"∅→{PENDING}", latency, response.status_code)
+        if response.status_code not in (200, 201):
+            self._error(run, "create", response)
+            return False
+        body = response.json()
+        run.proposal_id = body if isinstance(body, str) else body.get("id")
+        run.path.append(PENDING)
+        return True
+
+    def negotiate(self, run: ProposalRun, client: Dict[str, Any], prop: Dict[str, Any],
+                  rng: random.Random) -> Any:
+        """
+        Uma ronda: rondas pares são do agente, ímpares do cliente. A
+        contraproposta fecha uma fração da distância ao preço pedido.
+        """
+        from_agent = run.rounds % 2 == 0
+        sender = self.data.agent_users.get(prop.get("agentId")) if from_agent else client.get("userId")
+        offer = prop["price"] * (0.80 + 0.20 * (1 - 0.6 ** (run.rounds + 1)))
+        message = ("Podemos baixar para" if from_agent else "Proponho") + f" €{offer:,.0f}"
+        latency, response = self._call("POST /proposals/{id}/negotiate", "POST",
+                                       f"/proposals/{run.proposal_id}/negotiate",
+                                       json={"proposalId": run.proposal_id, "senderId": sender,
+                                             "message": message, "counterOffer": round(offer, 2)})
+        if response.status_code == 200:
+            run.last_negotiation = response.json()
+            if rng.random() < self.view_probability:
+                self._pause(rng)
+                run.views += self.mark(run.last_negotiation, "Viewed")
+        return latency, response
+
+    def mark(self, negotiation_id: str, status: str) -> bool:
+        """PUT /proposals/negotiations/{id}/status (Viewed, Accepted ou Rejected)"""
+        _, response = self._call("PUT /proposals/negotiations/{id}/status", "PUT",
+                                 f"/proposals/negotiations/{negotiation_id}/status",
+                                 json={"status": status})
+        return response.status_code == 200
+
+    def act(self, run: ProposalRun, action: str, client: Dict[str, Any], prop: Dict[str, Any],
+            rng: random.Random) -> bool:
+        """Executa a ação e regista a transição; False se a API a recusou"""
+        path = f"/proposals/{run.proposal_id}"
+        if action == "analyse":
+            latency, response = self._call("PUT /proposals/{id}/start-analysis", "PUT", f"{path}/start-analysis")
+        elif action == "negotiate":
+            latency, response = self.negotiate(run, client, prop, rng)
+        elif action == "approve":
+            latency, response = self._call("PUT /proposals/{id}/approve", "PUT", f"{path}/approve")
+        elif action == "reject":
+            latency, response = self._call("PUT /proposals/{id}/reject", "PUT", f"{path}/reject",
+                                           json={"proposalId": run.proposal_id,
+                                                 "rejectionReason": "Valor abaixo do pretendido"})
+        else:
+            latency, response = self._call("PUT /proposals/{id}/cancel", "PUT", f"{path}/cancel")
+        target = ACTIONS[action]
+        self.recorder.record(f"{run.state}→{target}", latency, response.status_code)
+        if response.status_code != 200:
+            self._error(run, action, response)
+            return False
+        if action == "negotiate":
+            run.rounds += 1
+        elif action in ("approve", "reject") and run.last_negotiation:
+            # A decisão fecha também a última contraproposta
+            self.mark(run.last_negotiation, "Accepted" if action == "approve" else "Rejected")
+        run.state = target
+        run.path.append(target)
+        return True
+
+    def walk(self, client: Dict[str, Any], prop: Dict[str, Any], seed: int) -> ProposalRun:
+        """Cria uma proposta e leva-a até um estado final (ou ao primeiro erro)"""
+        rng = random.Random(seed)
+        run = ProposalRun()
+        started = time.perf_counter()
+        if self.create(run, client, prop, rng):
+            while run.state not in TERMINAL:
+                self._pause(rng)
+                if not self.act(run, self.next_action(run, rng), client, prop, rng):
+                    break
+        self.recorder.record("proposal:lifecycle", time.perf_counter() - started,
+                             error=run.error is not None)
+        with self._lock:
+            self.finals[run.state if run.error is None else f"erro em {run.state}"] += 1
+            self.rounds[run.rounds] += 1
+        return run
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            finals = dict(self.finals)
+            rounds = dict(sorted(self.rounds.items()))
+            errors = dict(self.errors.most_common())
+        endpoints = self.recorder.summary()
+        return {
+            "finalStates": finals,
+            "roundsHistogram": {str(k): v for k, v in rounds.items()},
+            "negotiations": sum(k * v for k, v in rounds.items()),
+            "errors": errors,
+            "transitions": {name: s for name, s in endpoints.items() if "→" in name},
+            "endpoints": {name: s for name, s in endpoints.items() if "→" not in name},
+        }
@@ -0,0 +1,99 @@
+"""
+Iteração preguiçosa sobre endpoints de listagem paginados, com prefetch da página seguinte
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+
+from .http_client import ApiClient
+
+DEFAULT_PAGE_SIZE = 100
+
+# Campo da resposta paginada que contém os itens, por endpoint
+ITEMS_KEYS = {
+    "/properties": "properties",
+    "/clients": "clients",
+    "/agents": "agents",
+    "/proposals": "proposals",
+    "/contracts": "contracts",
+}
+
+
+class PageError(RuntimeError):
+    """Uma página devolveu um status diferente de 200"""
+
+
+def _items_key(path: str) -> str:
+    return ITEMS_KEYS.get(path.rstrip("/"), path.rstrip("/").rsplit("/", 1)[-1])
+
+
+def _fetch(api: ApiClient, path: str, params: Dict[str, Any]) -> Any:
+    response = api.get(path, params=params)
+    if response.status_code != 200:
+        raise PageError(f"GET {path} página {params.get('pageNumber')}: {response.status_code}")
+    return response.json()
+
+
+def iter_pages(api: ApiClient, path: str, params: Optional[Dict[str, Any]] = None,
+               page_size: int = DEFAULT_PAGE_SIZE, items_key: Optional[str] = None,
+               prefetch: bool = True) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Produz as páginas de um endpoint de listagem, uma lista de itens de cada
+    vez. Enquanto o consumidor processa a página N, a N+1 já está a ser pedida
+    numa thread à parte, pelo que no máximo duas páginas estão em memória.
+
+    O fim é detetado por totalPages, por totalCount ou por uma página
+    incompleta. Endpoints sem paginação (ex.: /users, que devolve um array)
+    produzem uma única página.
+    """
+    key = items_key or _items_key(path)
+    base = dict(params or {})
+    base["pageSize"] = page_size
+
+    def request(page: int) -> Any:
+        return _fetch(api, path, {**base, "pageNumber": page})
+
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="page") if prefetch else None
+    try:
+        page = 1
+        pending: Optional[Future] = None
+        data = request(page)
+        seen = 0
+        while True:
+            if isinstance(data, list):
+                yield data
+                return
+
+            items = data.get(key) or []
+            seen += len(items)
+            total_pages = data.get("totalPages")
+            total_count = data.get("totalCount")
+            if total_pages is not None:
+                has_next = page < total_pages
+            elif total_count is not None:
+                has_next = seen < total_count
+            else:
+                has_next = len(items) >= page_size
+            has_next = has_next and bool(items)
+
+            if has_next and executor is not None:
+                pending = executor.submit(request, page + 1)
+
+            yield items
+
+            if not has_next:
+                return
+            page += 1
+            data = pending.result() if pending is not None else request(page)
+            pending = None
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_items(api: ApiClient, path: str, params: Optional[Dict[str, Any]] = None,
+               page_size: int = DEFAULT_PAGE_SIZE, items_key: Optional[str] = None,
+               prefetch: bool = True) -> Iterator[Dict[str, Any]]:
+    """Achata iter_pages: produz os itens à medida que cada página chega"""
+    for items in iter_pages(api, path, params, page_size, items_key, prefetch):
+        yield from items
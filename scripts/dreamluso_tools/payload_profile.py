@@ -0,0 +1,353 @@
+"""
+Perfil do tamanho das respostas dos endpoints de listagem: bytes, estrutura
+do JSON (profundidade, campos por item, peso de cada campo), compressão
+negociada com o servidor e estimada localmente, e tempo de parse no cliente
+"""
+
+import gzip
+import json
+import statistics
+import time
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .http_client import ApiClient
+from .pagination import ITEMS_KEYS
+from .schema import dumps
+
+try:  # brotli é opcional: sem ele a estimativa local fica só com gzip
+    import brotli
+except ImportError:  # pragma: no cover - depende do ambiente
+    brotli = None
+
+try:  # orjson é opcional: mede-se também o parse com ele, se instalado
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+# Endpoint -> campo com os itens; None = a resposta é o próprio array, sem paginação
+LIST_ENDPOINTS: Dict[str, Optional[str]] = {
+    **ITEMS_KEYS,
+    "/users": None,
+}
+DEFAULT_PAGE_SIZES = (10, 50, 100)
+# Níveis próximos dos que o ASP.NET Core usa com CompressionLevel.Fastest/Optimal
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+# Encodings pedidos ao servidor em Accept-Encoding
+NEGOTIATED = ("gzip", "br")
+
+# Limiares das recomendações
+MIN_COMPRESSIBLE_BYTES = 4096
+MIN_COMPRESSION_SAVING = 0.5      # gzip tem de cortar pelo menos metade
+MIN_NESTED_SHARE = 0.3            # objetos/arrays aninhados ≥ 30% dos bytes de cada item
+MIN_HEAVY_SHARE = 0.5             # os 3 campos mais pesados ≥ 50% dos bytes de cada item
+MIN_ITEM_BYTES = 256              # abaixo disto os itens já são pequenos para projeção/seleção
+MIN_SAVING_BYTES = 1024           # poupanças por pedido abaixo de 1 KiB não entram no relatório
+DEEP_JSON = 4                     # item > objeto > objeto > campo
+
+
+@dataclass
+class Shape:
+    """Estrutura dos itens de uma resposta"""
+    items: int = 0
+    depth: int = 0                      # profundidade dentro de cada item (item plano = 2)
+    nodes: int = 0                      # nós JSON da resposta inteira
+    fields_per_item: float = 0.0        # campos folha por item, contando os aninhados
+    top_fields_per_item: float = 0.0    # chaves de primeiro nível por item
+    bytes_per_item: float = 0.0
+    nested_share: float = 0.0           # fração dos bytes dos itens em objetos/arrays aninhados
+    heavy_fields: List[Tuple[str, float]] = field(default_factory=list)  # (campo, fração dos bytes)
+
+
+@dataclass
+class Profile:
+    """Uma combinação endpoint × tamanho de página"""
+    endpoint: str
+    page_size: Optional[int]
+    status: int = 0
+    bytes: int = 0
+    latency_ms: float = 0.0
+    gzip_bytes: int = 0
+    brotli_bytes: Optional[int] = None
+    gzip_ms: float = 0.0
+    gunzip_ms: float = 0.0
+    # Content-Encoding e bytes na rede quando se pede cada encoding ao servidor
+    server: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    parse_ms: float = 0.0
+    orjson_parse_ms: Optional[float] = None
+    shape: Shape = field(default_factory=Shape)
+
+    @property
+    def label(self) -> str:
+        return f"{self.endpoint}?pageSize={self.page_size}" if self.page_size else self.endpoint
+
+    @property
+    def gzip_ratio(self) -> float:
+        return self.gzip_bytes / self.bytes if self.bytes else 1.0
+
+    @property
+    def brotli_ratio(self) -> Optional[float]:
+        return self.brotli_bytes / self.bytes if self.bytes and self.brotli_bytes is not None else None
+
+    @property
+    def server_compresses(self) -> bool:
+        return any(result.get("encoding") not in (None, "identity") for result in self.server.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        shape = self.shape
+        return {
+            "endpoint": self.endpoint,
+            "pageSize": self.page_size,
+            "status": self.status,
+            "bytes": self.bytes,
+            "latencyMs": self.latency_ms,
+            "items": shape.items,
+            "depth": shape.depth,
+            "nodes": shape.nodes,
+            "fieldsPerItem": shape.fields_per_item,
+            "topFieldsPerItem": shape.top_fields_per_item,
+            "bytesPerItem": shape.bytes_per_item,
+            "nestedShare": shape.nested_share,
+            "heavyFields": dict(shape.heavy_fields),
+            "gzipBytes": self.gzip_bytes,
+            "gzipRatio": self.gzip_ratio,
+            "brotliBytes": self.brotli_bytes,
+            "brotliRatio": self.brotli_ratio,
+            "gzipMs": self.gzip_ms,
+            "gunzipMs": self.gunzip_ms,
+            "server": self.server,
+            "serverCompresses": self.server_compresses,
+            "parseMs": self.parse_ms,
+            "orjsonParseMs": self.orjson_parse_ms,
+        }
+
+
+# ── Estrutura ────────────────────────────────────────────────────────────
+
+def json_depth(value: Any) -> Tuple[int, int]:
+    """(profundidade máxima, número de nós), sem recursão"""
+    depth, nodes = 0, 0
+    stack = [(value, 1)]
+    while stack:
+        current, level = stack.pop()
+        nodes += 1
+        depth = max(depth, level)
+        if isinstance(current, dict):
+            stack.extend((child, level + 1) for child in current.values())
+        elif isinstance(current, list):
+            stack.extend((child, level + 1) for child in current)
+    return depth, nodes
+
+
+def leaf_fields(value: Any) -> int:
+    """Campos folha de um item; os itens de um array contam todos"""
+    if isinstance(value, dict):
+        return sum(leaf_fields(child) for child in value.values()) or 1
+    if isinstance(value, list):
+        return sum(leaf_fields(child) for child in value)
+    return 1
+
+
+def analyse_items(body: Any, items: List[Any], top: int = 5) -> Shape:
+    shape = Shape(items=len(items), depth=max((json_depth(item)[0] for item in items), default=0),
+                  nodes=json_depth(body)[1])
+    dicts = [item for item in items if isinstance(item, dict)]
+    if not dicts:
+        return shape
+    field_bytes: Dict[str, int] = defaultdict(int)
+    nested = total = leaves = keys = 0
+    for item in dicts:
+        keys += len(item)
+        leaves += leaf_fields(item)
+        total += len(dumps(item))
+        for name, value in item.items():
+            # nome, aspas, dois pontos e vírgula contam para o campo
+            size = len(dumps(value)) + len(name) + 4
+            field_bytes[name] += size
+            if isinstance(value, (dict, list)) and value:
+                nested += size
+    shape.fields_per_item = leaves / len(dicts)
+    shape.top_fields_per_item = keys / len(dicts)
+    shape.bytes_per_item = total / len(dicts)
+    shape.nested_share = nested / total if total else 0.0
+    heaviest = sorted(field_bytes.items(), key=lambda item: -item[1])[:top]
+    shape.heavy_fields = [(name, size / total) for name, size in heaviest]
+    return shape
+
+
+# ── Medição ──────────────────────────────────────────────────────────────
+
+def _best_ms(fn: Any, repeat: int) -> float:
+    """Melhor de repeat execuções, em ms: o mínimo é o valor menos ruidoso para CPU local"""
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def wire_size(api: ApiClient, path: str, params: Dict[str, Any], encoding: str) -> Dict[str, Any]:
+    """Bytes na rede e Content-Encoding devolvido quando se pede encoding"""
+    response = api.get(path, params=params, headers={"Accept-Encoding": encoding}, stream=True)
+    try:
+        # decode_content=False: o tamanho do corpo tal como veio, ainda comprimido
+        raw = response.raw.read(decode_content=False)
+    finally:
+        response.close()
+    return {"encoding": response.headers.get("Content-Encoding"), "bytes": len(raw),
+            "status": response.status_code}
+
+
+def profile_endpoint(api: ApiClient, path: str, page_size: Optional[int], repeat: int = 3) -> Profile:
+    """
+    Pede o endpoint sem compressão (repeat vezes, fica a mediana da
+    latência), analisa o corpo e mede localmente gzip, brotli e parse; depois
+    repete o pedido com cada encoding em NEGOTIATED para ver o que o servidor
+    faz de facto.
+    """
+    params = {"pageNumber": 1, "pageSize": page_size} if page_size else {}
+    profile = Profile(path, page_size)
+    latencies, content = [], b""
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        response = api.get(path, params=params, headers={"Accept-Encoding": "identity"})
+        latencies.append(time.perf_counter() - started)
+        profile.status, content = response.status_code, response.content
+    profile.latency_ms = statistics.median(latencies) * 1000
+    profile.bytes = len(content)
+    if profile.status != 200 or not content:
+        return profile
+
+    body = json.loads(content)
+    if isinstance(body, list):
+        items = body
+    else:
+        items = body.get(LIST_ENDPOINTS.get(path) or "") or [] if isinstance(body, dict) else []
+    profile.shape = analyse_items(body, items)
+
+    profile.parse_ms = _best_ms(lambda: json.loads(content), repeat)
+    if orjson is not None:
+        profile.orjson_parse_ms = _best_ms(lambda: orjson.loads(content), repeat)
+    compressed = gzip.compress(content, compresslevel=GZIP_LEVEL)
+    profile.gzip_bytes = len(compressed)
+    profile.gzip_ms = _best_ms(lambda: gzip.compress(content, compresslevel=GZIP_LEVEL), repeat)
+    profile.gunzip_ms = _best_ms(lambda: zlib.decompress(compressed, wbits=31), repeat)
+    if brotli is not None:
+        profile.brotli_bytes = len(brotli.compress(content, quality=BROTLI_QUALITY))
+
+    for encoding in NEGOTIATED:
+        profile.server[encoding] = wire_size(api, path, params, encoding)
+    return profile
+
+
+def profile_all(api: ApiClient, endpoints: Sequence[str], page_sizes: Sequence[int],
+                repeat: int = 3) -> List[Profile]:
+    """Cada endpoint paginado em cada tamanho de página; /users uma vez só"""
+    profiles = []
+    for path in endpoints:
+        sizes: Sequence[Optional[int]] = page_sizes if LIST_ENDPOINTS.get(path) is not None else (None,)
+        for page_size in sizes:
+            profiles.append(profile_endpoint(api, path, page_size, repeat))
+    return profiles
+
+
+# ── Recomendações ────────────────────────────────────────────────────────
+
+def recommend(profiles: Sequence[Profile]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Por remédio, os endpoints que mais ganham, ordenados pelos bytes poupados
+    por pedido. Cada endpoint conta pela maior página medida:
+    - compressão: corpo ≥ 4 KiB que o gzip reduz a menos de metade e que o
+      servidor não comprime;
+    - projeção (DTO): itens com JSON fundo ou ≥ 30% dos bytes em objetos e
+      arrays aninhados, que um DTO de listagem achataria ou deixaria de fora;
+    - seleção de campos: os 3 campos mais pesados fazem ≥ 50% de cada item;
+    - paginação: endpoints sem páginas com mais itens do que a maior página.
+    Projeção e seleção só contam com itens de pelo menos 256 B, e nenhum
+    remédio entra com menos de 1 KiB poupado por pedido.
+    """
+    largest: Dict[str, Profile] = {}
+    for profile in profiles:
+        if profile.status != 200 or not profile.shape.items:
+            continue
+        current = largest.get(profile.endpoint)
+        if current is None or profile.bytes > current.bytes:
+            largest[profile.endpoint] = profile
+
+    compression, projection, selection = [], [], []
+    for profile in largest.values():
+        shape = profile.shape
+        if (profile.bytes >= MIN_COMPRESSIBLE_BYTES and profile.gzip_ratio <= 1 - MIN_COMPRESSION_SAVING
+                and not profile.server_compresses):
+            compression.append({"label": profile.label, "saving": profile.bytes - profile.gzip_bytes,
+                                "detail": f"gzip {profile.gzip_ratio * 100:.0f}% do original"})
+        if shape.bytes_per_item < MIN_ITEM_BYTES:
+            continue
+        if shape.depth >= DEEP_JSON or shape.nested_share >= MIN_NESTED_SHARE:
+            projection.append({"label": profile.label, "saving": int(profile.bytes * shape.nested_share),
+                               "detail": f"profundidade {shape.depth}, {shape.nested_share * 100:.0f}% aninhado, "
+                                         f"{shape.fields_per_item:.0f} campos/item"})
+        heavy = shape.heavy_fields[:3]
+        heavy_share = sum(share for _, share in heavy)
+        if heavy_share >= MIN_HEAVY_SHARE:
+            selection.append({"label": profile.label, "saving": int(profile.bytes * heavy_share),
+                              "detail": ", ".join(f"{name} {share * 100:.0f}%" for name, share in heavy)})
+    # Endpoints sem paginação (ex.: /users) comparados com a maior página dos paginados
+    page_limit = max((p.page_size for p in profiles if p.page_size), default=max(DEFAULT_PAGE_SIZES))
+    pagination = [
+        {"label": p.label, "saving": int(p.bytes - p.shape.bytes_per_item * page_limit),
+         "detail": f"{p.shape.items} itens num só pedido, sem paginação"}
+        for p in largest.values() if p.page_size is None and p.shape.items > page_limit
+    ]
+    remedies = (("compression", compression), ("projection", projection), ("fieldSelection", selection),
+                ("pagination", pagination))
+    return {remedy: sorted((row for row in rows if row["saving"] >= MIN_SAVING_BYTES),
+                           key=lambda row: -row["saving"])
+            for remedy, rows in remedies}
+
+
+def _kib(size: Optional[float]) -> str:
+    return "-" if size is None else f"{size / 1024:.1f}"
+
+
+def print_profiles(profiles: Sequence[Profile]) -> None:
+    width = max([len(p.label) for p in profiles] + [10])
+    print("\n" + "━" * (width + 86))
+    print("📦 TAMANHO DAS RESPOSTAS")
+    print("━" * (width + 86))
+    print(f"   {'endpoint':<{width}} {'itens':>6} {'KiB':>8} {'B/item':>7} {'prof':>5} {'campos':>7} "
+          f"{'gzip':>6} {'br':>6} {'servidor':>9} {'ms':>7} {'parse ms':>9}")
+    for p in profiles:
+        if p.status != 200:
+            print(f"   {p.label:<{width}} ❌ HTTP {p.status}")
+            continue
+        s = p.shape
+        brotli_ratio = p.brotli_ratio
+        server = ",".join(sorted({r["encoding"] for r in p.server.values() if r.get("encoding")})) or "nenhuma"
+        print(f"   {p.label:<{width}} {s.items:>6} {_kib(p.bytes):>8} {s.bytes_per_item:>7.0f} {s.depth:>5} "
+              f"{s.fields_per_item:>7.1f} {p.gzip_ratio * 100:>5.0f}% "
+              f"{'-' if brotli_ratio is None else f'{brotli_ratio * 100:.0f}%':>6} {server:>9} "
+              f"{p.latency_ms:>7.1f} {p.parse_ms:>9.2f}")
+    print("━" * (width + 86))
+    if brotli is None:
+        print("   ℹ️  brotli não instalado: coluna br sem estimativa local (pip install brotli)")
+
+
+def print_recommendations(recommendations: Dict[str, List[Dict[str, Any]]]) -> None:
+    titles = {
+        "compression": "🗜️  Compressão de resposta",
+        "projection": "🧩 DTOs de projeção",
+        "fieldSelection": "✂️  Seleção de campos",
+        "pagination": "📄 Paginação",
+    }
+    print("\n💡 ONDE HÁ MAIS A GANHAR (bytes poupados por pedido, na maior página)")
+    for remedy, rows in recommendations.items():
+        print(f"   {titles[remedy]}:")
+        if not rows:
+            print("      -")
+        for row in rows:
+            print(f"      {row['label']}: ~{_kib(row['saving'])} KiB ({row['detail']})")
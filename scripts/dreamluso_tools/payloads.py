@@ -0,0 +1,55 @@
+"""
+Construtores dos corpos de pedido partilhados por seeders e testes de carga.
+Os enums são enviados pelo nome: a API usa JsonStringEnumConverter sem inteiros
+"""
+
+from datetime import date
+from typing import Any, Dict, Optional
+
+ADMIN_EMAIL = "admin@gmail.com"
+ADMIN_PASSWORD = "Admin123!"
+
+# Ordem de DreamLuso.Domain.Model.TimeSlot; ScheduleVisitRequest recebe o índice
+TIME_SLOTS = [
+    "Morning_9AM_11AM",
+    "Morning_11AM_1PM",
+    "Afternoon_2PM_4PM",
+    "Afternoon_4PM_6PM",
+    "Evening_6PM_8PM",
+]
+
+
+def login_payload(email: str = ADMIN_EMAIL, password: str = ADMIN_PASSWORD) -> Dict[str, Any]:
+    return {"email": email, "password": password}
+
+
+def proposal_payload(client_id: str, property_id: str, value: float,
+                     proposal_type: str = "Purchase", payment_method: Optional[str] = "Cash",
+                     notes: Optional[str] = None) -> Dict[str, Any]:
+    """Corpo de POST /proposals (CreateProposalCommand)"""
+    return {
+        "clientId": client_id,
+        "propertyId": property_id,
+        "proposedValue": value,
+        "type": proposal_type,
+        "paymentMethod": payment_method,
+        "additionalNotes": notes,
+    }
+
+
+def visit_payload(property_id: str, client_id: str, agent_id: str, visit_date: date,
+                  time_slot: int, notes: Optional[str] = None) -> Dict[str, Any]:
+    """Corpo de POST /visits (ScheduleVisitRequest)"""
+    return {
+        "propertyId": property_id,
+        "clientId": client_id,
+        "realEstateAgentId": agent_id,
+        "visitDate": visit_date.isoformat(),
+        "timeSlot": time_slot,
+        "notes": notes,
+    }
+
+
+def slot_index(name: str) -> int:
+    """Converte o nome devolvido por /visits/available-slots no índice esperado por POST /visits"""
+    return TIME_SLOTS.index(name)
@@ -0,0 +1,104 @@
+"""
+Perfis de seed com nome e versão: seed do RNG fixa e cardinalidades
+derivadas de rácios declarados, para comparar medições entre builds
+"""
+
+import json
+import os
+from dataclasses import asdict, dataclass
+from datetime import date
+from typing import Any, Dict, Optional
+
+from .generator import GENERATOR_VERSION, DatasetCounts
+
+MANIFEST_NAME = "profile.json"
+
+
+@dataclass(frozen=True)
+class SeedProfile:
+    """
+    Tamanho do dataset a partir do número de agentes. Mudar um rácio ou a
+    seed de um perfil obriga a subir version: resultados de versões
+    diferentes não são comparáveis.
+    """
+    name: str
+    version: int
+    seed: int
+    agents: int
+    clients_per_agent: float
+    properties_per_agent: float
+    proposals_per_property: float
+    visits_per_property: float
+    notifications_per_client: float
+
+    @property
+    def label(self) -> str:
+        return f"{self.name}@v{self.version}"
+
+    def counts(self) -> DatasetCounts:
+        clients = round(self.agents * self.clients_per_agent)
+        properties = round(self.agents * self.properties_per_agent)
+        return DatasetCounts(
+            clients=clients,
+            agents=self.agents,
+            properties=properties,
+            proposals=round(properties * self.proposals_per_property),
+            visits=round(properties * self.visits_per_property),
+            notifications=round(clients * self.notifications_per_client),
+        )
+
+
+PROFILES: Dict[str, SeedProfile] = {
+    profile.name: profile
+    for profile in (
+        SeedProfile("small", 1, seed=1001, agents=5, clients_per_agent=10,
+                    properties_per_agent=10, proposals_per_property=2,
+                    visits_per_property=1, notifications_per_client=5),
+        SeedProfile("medium", 1, seed=1002, agents=50, clients_per_agent=20,
+                    properties_per_agent=40, proposals_per_property=4,
+                    visits_per_property=2, notifications_per_client=20),
+        SeedProfile("large", 1, seed=1003, agents=500, clients_per_agent=50,
+                    properties_per_agent=100, proposals_per_property=5,
+                    visits_per_property=2.5, notifications_per_client=50),
+        SeedProfile("xl", 1, seed=1004, agents=2000, clients_per_agent=50,
+                    properties_per_agent=100, proposals_per_property=5,
+                    visits_per_property=2.5, notifications_per_client=50),
+    )
+}
+
+
+def get_profile(name: str) -> SeedProfile:
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"perfil desconhecido: {name} (disponíveis: {', '.join(PROFILES)})") from None
+
+
+def write_manifest(directory: str, seed: int, counts: DatasetCounts, anchor: date,
+                   checksums: Dict[str, str], profile: Optional[SeedProfile] = None) -> str:
+    """
+    Grava profile.json ao lado do dataset: o que o gerou (perfil, versão do
+    gerador, seed), a data base das visitas e o sha256 do NDJSON de cada tipo
+    """
+    manifest = {
+        "profile": profile.name if profile else None,
+        "profileVersion": profile.version if profile else None,
+        "generatorVersion": GENERATOR_VERSION,
+        "seed": seed,
+        "counts": asdict(counts),
+        "anchorDate": anchor.isoformat(),
+        "sha256": checksums,
+    }
+    path = os.path.join(directory, MANIFEST_NAME)
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, indent=2)
+        handle.write("\n")
+    return path
+
+
+def read_manifest(directory: str) -> Optional[Dict[str, Any]]:
+    path = os.path.join(directory, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
@@ -0,0 +1,250 @@
+"""
+Progresso dos seeds: contadores por fase, ritmo móvel, ETA e erros, com
+escrita no terminal limitada no tempo
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, IO, List, Optional, Tuple
+
+MODES = ("items", "quiet", "json")
+RATE_WINDOW = 10.0
+MAX_ERROR_SAMPLES = 5
+
+
+def add_progress_arguments(parser: argparse.ArgumentParser, default: str = "items") -> None:
+    """Regista --quiet/--json-progress; default é o modo sem nenhuma das duas"""
+    group = parser.add_argument_group("Progresso")
+    modes = group.add_mutually_exclusive_group()
+    modes.add_argument("--quiet", dest="progress", action="store_const", const="quiet",
+                       help="Sem uma linha por entidade: só contadores, ritmo e ETA por fase")
+    modes.add_argument("--json-progress", dest="progress", action="store_const", const="json",
+                       help="Progresso em JSON (um objeto por linha) no stdout")
+    group.add_argument("--progress-interval", type=float, default=1.0,
+                       help="Segundos mínimos entre atualizações do progresso (default: %(default)s)")
+    parser.set_defaults(progress=default)
+
+
+@dataclass
+class StageProgress:
+    name: str
+    total: Optional[int] = None
+    done: int = 0
+    skipped: int = 0
+    failed: int = 0
+    started: float = field(default_factory=time.monotonic)
+    finished: Optional[float] = None
+    errors: Dict[int, int] = field(default_factory=dict)
+    samples: List[str] = field(default_factory=list)
+    # (instante, concluídos) para o ritmo móvel
+    window: Deque[Tuple[float, int]] = field(default_factory=deque)
+
+    @property
+    def processed(self) -> int:
+        return self.done + self.skipped + self.failed
+
+    def rate(self, now: float) -> float:
+        """Entidades/s nos últimos RATE_WINDOW segundos (média global no fim)"""
+        if self.finished is not None:
+            elapsed = self.finished - self.started
+            return self.processed / elapsed if elapsed > 0 else 0.0
+        while len(self.window) > 1 and now - self.window[0][0] > RATE_WINDOW:
+            self.window.popleft()
+        if not self.window:
+            return 0.0
+        since, count = self.window[0]
+        if now - since <= 0:
+            return 0.0
+        return (self.processed - count) / (now - since)
+
+    def eta(self, now: float) -> Optional[float]:
+        if self.total is None or self.finished is not None:
+            return None
+        rate = self.rate(now)
+        return max(0, self.total - self.processed) / rate if rate > 0 else None
+
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        eta = self.eta(now)
+        return {
+            "total": self.total,
+            "done": self.done,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "rate": round(self.rate(now), 2),
+            "eta": round(eta, 1) if eta is not None else None,
+            "elapsed": round((self.finished or now) - self.started, 2),
+            "finished": self.finished is not None,
+            "errors": {str(code): n for code, n in sorted(self.errors.items())},
+        }
+
+
+def _format_duration(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "--"
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+class Progress:
+    """
+    Ponto único de saída dos create_* dos seeders. No modo items cada
+    entidade continua a ter a sua linha; em quiet só há uma linha de
+    estado (no máximo uma por interval) e em json um objeto por atualização.
+    Os erros são sempre contados por status; em quiet/json guardam-se as
+    primeiras mensagens para o resumo final. Seguro entre threads.
+    """
+
+    def __init__(self, mode: str = "items", interval: float = 1.0,
+                 stream: Optional[IO[str]] = None, out: Optional[IO[str]] = None):
+        if mode not in MODES:
+            raise ValueError(f"modo de progresso desconhecido: {mode}")
+        self.mode = mode
+        self.interval = interval
+        self.stream = stream or sys.stderr
+        self.out = out or sys.stdout
+        self.stages: Dict[str, StageProgress] = {}
+        self._lock = threading.Lock()
+        self._last_render = 0.0
+        self._tty = hasattr(self.stream, "isatty") and self.stream.isatty()
+        self._line_open = False
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace) -> "Progress":
+        return cls(getattr(args, "progress", "items"), getattr(args, "progress_interval", 1.0))
+
+    @property
+    def verbose(self) -> bool:
+        return self.mode == "items"
+
+    def stage(self, name: str, total: Optional[int] = None) -> StageProgress:
+        """Regista (ou atualiza o total de) uma fase"""
+        with self._lock:
+            stage = self.stages.get(name)
+            if stage is None:
+                stage = self.stages[name] = StageProgress(name, total)
+                stage.window.append((stage.started, 0))
+            elif total is not None:
+                stage.total = total
+            return stage
+
+    def _stage(self, name: str) -> StageProgress:
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = StageProgress(name)
+            stage.window.append((stage.started, 0))
+        return stage
+
+    def _update(self, name: str, outcome: str, message: Optional[str],
+                status: Optional[int] = None) -> None:
+        now = time.monotonic()
+        with self._lock:
+            stage = self._stage(name)
+            setattr(stage, outcome, getattr(stage, outcome) + 1)
+            if outcome == "failed":
+                code = status or 0
+                stage.errors[code] = stage.errors.get(code, 0) + 1
+                if message and len(stage.samples) < MAX_ERROR_SAMPLES:
+                    stage.samples.append(message)
+            stage.window.append((now, stage.processed))
+            if self.verbose:
+                if message:
+                    self._write_line(f"   {message}")
+                return
+            if now - self._last_render >= self.interval:
+                self._render(now)
+
+    def ok(self, stage: str, message: Optional[str] = None) -> None:
+        self._update(stage, "done", message)
+
+    def skip(self, stage: str, message: Optional[str] = None) -> None:
+        """Entidade que já existia (checkpoint, IdMap)"""
+        self._update(stage, "skipped", message)
+
+    def fail(self, stage: str, message: Optional[str] = None, status: Optional[int] = None) -> None:
+        self._update(stage, "failed", message, status)
+
+    def info(self, message: str) -> None:
+        """Mensagem de contexto: só no modo items"""
+        if self.verbose:
+            with self._lock:
+                self._write_line(message)
+
+    def finish(self, name: str) -> None:
+        with self._lock:
+            stage = self._stage(name)
+            if stage.finished is None:
+                stage.finished = time.monotonic()
+            if not self.verbose:
+                self._render(time.monotonic())
+
+    # ── Escrita ─────────────────────────────────────────────────────────
+
+    def _write_line(self, text: str) -> None:
+        if self._line_open:
+            self.stream.write("\n")
+            self._line_open = False
+        print(text, file=self.out, flush=True)
+
+    def _status_line(self, now: float) -> str:
+        parts = []
+        for stage in self.stages.values():
+            count = f"{stage.processed}/{stage.total}" if stage.total is not None else f"{stage.processed}"
+            text = f"{stage.name} {count} {stage.rate(now):.0f}/s"
+            if stage.finished is not None:
+                text += " ✓"
+            elif stage.total is not None:
+                text += f" ETA {_format_duration(stage.eta(now))}"
+            if stage.failed:
+                text += f" ✖{stage.failed}"
+            parts.append(text)
+        return "⏳ " + " | ".join(parts)
+
+    def _render(self, now: float, final: bool = False) -> None:
+        self._last_render = now
+        if self.mode == "json":
+            snapshot = {"ts": round(time.time(), 3), "final": final,
+                        "stages": {name: s.to_dict(now) for name, s in self.stages.items()}}
+            self.out.write(json.dumps(snapshot, separators=(",", ":")) + "\n")
+            self.out.flush()
+            return
+        line = self._status_line(now)
+        if self._tty:
+            self.stream.write("\r\x1b[2K" + line)
+            self._line_open = True
+        else:
+            self.stream.write(line + "\n")
+        self.stream.flush()
+
+    def close(self) -> None:
+        """Última atualização e, fora do modo items, as primeiras mensagens de erro"""
+        with self._lock:
+            if not self.stages:
+                return
+            if not self.verbose:
+                self._render(time.monotonic(), final=True)
+            if self._line_open:
+                self.stream.write("\n")
+                self._line_open = False
+            if self.mode == "quiet":
+                for stage in self.stages.values():
+                    for message in stage.samples:
+                        self.stream.write(f"   {stage.name}: {message}\n")
+                    hidden = stage.failed - len(stage.samples)
+                    if hidden > 0:
+                        self.stream.write(f"   {stage.name}: ... mais {hidden} erros\n")
+            self.stream.flush()
+
+    def __enter__(self) -> "Progress":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
@@ -0,0 +1,592 @@
+"""
+Replay de datasets NDJSON contra a API, linha a linha, com registo dos ids criados
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .engine import SeedEngine
+from .generator import DatasetCounts, DatasetGenerator, entity_key
+from .http_client import ApiClient
+from .images import ImagePool, post_multipart, property_body, upload_images
+from .ndjson_io import IdMap, count_records, read_ndjson, split_key, write_ndjson
+from .progress import Progress
+from .schema import INVALID, JSON_HEADERS, Payload, PayloadError, join_array, validate
+
+KINDS = ("clients", "agents", "properties", "proposals", "visits", "notifications")
+# Endpoints de criação em lote: uma transação por pedido, ids pela ordem do lote
+BULK_PATHS = {
+    "clients": "/clients/bulk",
+    "agents": "/agents/bulk",
+    "properties": "/properties/bulk",
+    "proposals": "/proposals/bulk",
+    "visits": "/visits/bulk",
+    "notifications": "/notifications/bulk",
+}
+# BulkCreateResponse.MaxItems na API
+MAX_BATCH_SIZE = 1000
+IMAGES = "images"
+# Marcadores no IdMap: propriedades que já receberam imagens / lotes já enviados / agentes aprovados
+ATTACHED_KIND = "photos"
+UPLOADED_KIND = "uploads"
+APPROVED_KIND = "approvals"
+FORM_SKIP = ("key", "agentKey")
+
+
+def dataset_path(directory: str, kind: str, compress: bool = False) -> str:
+    return os.path.join(directory, f"{kind}.ndjson" + (".gz" if compress else ""))
+
+
+def find_dataset_file(directory: str, kind: str) -> Optional[str]:
+    for compress in (False, True):
+        path = dataset_path(directory, kind, compress)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def export_dataset(generator: DatasetGenerator, counts: DatasetCounts, directory: str,
+                   compress: bool = False, checksums: Optional[Dict[str, str]] = None) -> Dict[str, int]:
+    """
+    Escreve um ficheiro NDJSON por tipo sem materializar o dataset em
+    memória; checksums, se dado, recebe o sha256 do conteúdo de cada tipo
+    """
+    os.makedirs(directory, exist_ok=True)
+    streams = {
+        "clients": generator.clients(counts.clients),
+        "agents": generator.agents(counts.agents),
+        "properties": generator.properties(counts.properties, counts.agents),
+        "proposals": generator.proposals(counts.proposals, counts.clients, counts.properties, counts.agents),
+        "visits": generator.visits(counts.visits, counts.clients, counts.properties, counts.agents),
+        "notifications": generator.notifications(counts),
+    }
+    written = {}
+    for kind, records in streams.items():
+        digest = hashlib.sha256()
+        written[kind] = write_ndjson(dataset_path(directory, kind, compress), records, digest)
+        if checksums is not None:
+            checksums[kind] = digest.hexdigest()
+    return written
+
+
+def to_form(record: Dict[str, Any]) -> Dict[str, str]:
+    """O endpoint de propriedades lê form fields: valores em texto, booleanos em minúsculas"""
+    form = {}
+    for name, value in record.items():
+        if name in FORM_SKIP or value is None:
+            continue
+        form[name] = ("true" if value else "false") if isinstance(value, bool) else str(value)
+    return form
+
+
+@dataclass
+class StageStats:
+    created: int = 0
+    skipped: int = 0
+    failed: int = 0
+    errors: Dict[int, int] = field(default_factory=dict)
+    batches: int = 0
+    # Lotes recusados pela API e reenviados item a item
+    fallbacks: int = 0
+
+
+class DatasetReplayer:
+    """
+    Lê os ficheiros do dataset em streaming e cria cada registo na API. Os
+    GUIDs devolvidos ficam no IdMap, de onde as fases seguintes resolvem as
+    chaves locais (agentKey, clientKey, propertyKey).
+    """
+
+    def __init__(self, api: ApiClient, engine: SeedEngine, id_map: IdMap,
+                 images: Optional[ImagePool] = None, images_per_property: int = 0,
+                 progress: Optional[Progress] = None, anchor: Optional[date] = None,
+                 batch_size: int = 0):
+        self.api = api
+        # > 0: registos enviados em lotes para os endpoints /bulk
+        self.batch_size = batch_size
+        # Data base das visitas: fixa para que o mesmo dataset gere os mesmos payloads
+        self.anchor = anchor or date.today()
+        self.progress = progress or Progress("quiet")
+        self.engine = engine
+        self.id_map = id_map
+        self.images = images
+        self.images_per_property = images_per_property if images is not None else 0
+        self.stats: Dict[str, StageStats] = {kind: StageStats() for kind in KINDS + (IMAGES,)}
+        self._lock = threading.Lock()
+
+    def _count(self, kind: str, outcome: str) -> None:
+        with self._lock:
+            stats = self.stats[kind]
+            setattr(stats, outcome, getattr(stats, outcome) + 1)
+        if outcome == "skipped":
+            self.progress.skip(kind)
+        else:
+            self.progress.ok(kind)
+
+    def _fail(self, kind: str, status: int, message: Optional[str] = None) -> None:
+        """status 0 = dependência por resolver no IdMap, INVALID = recusado pelo schema"""
+        with self._lock:
+            stats = self.stats[kind]
+            stats.failed += 1
+            stats.errors[status] = stats.errors.get(status, 0) + 1
+        self.progress.fail(kind, message, status)
+
+    def _validated(self, kind: str, payload: Optional[Dict[str, Any]]) -> Optional[Payload]:
+        """Modelo do payload, ou None (falha contada) se faltar uma dependência ou for inválido"""
+        if payload is None:
+            return None
+        try:
+            return validate(kind, payload)
+        except PayloadError as e:
+            self._fail(kind, INVALID, f"❌ {e}")
+            return None
+
+    def _encode(self, kind: str, payload: Optional[Dict[str, Any]]) -> Optional[bytes]:
+        model = self._validated(kind, payload)
+        return model.to_bytes() if model is not None else None
+
+    def _created_id(self, response: Any, *names: str) -> Optional[str]:
+        if response.status_code not in (200, 201):
+            return None
+        data = response.json()
+        if isinstance(data, str):
+            return data
+        for name in names:
+            if data.get(name):
+                return data[name]
+        return None
+
+    def register_user(self, kind: str, user: Dict[str, Any]) -> Optional[str]:
+        user_id = self.id_map.get(user["key"])
+        if user_id:
+            return user_id
+        response = self.api.post("/accounts/register", auth=False, json={
+            "firstName": user["firstName"],
+            "lastName": user["lastName"],
+            "email": user["email"],
+            "password": user["password"],
+            "phone": user["phone"],
+            "role": user["role"],
+        })
+        user_id = self._created_id(response, "userId")
+        if not user_id:
+            self._fail(kind, response.status_code)
+            return None
+        self.id_map.set(user["key"], user_id)
+        return user_id
+
+    # ── Payloads: None se faltar uma dependência (falha já contada) ─────
+
+    def client_payload(self, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        user_id = self.register_user("clients", record["user"])
+        if not user_id:
+            return None
+        payload = {k: v for k, v in record.items() if k not in ("key", "user")}
+        return {"userId": user_id, **payload}
+
+    def agent_payload(self, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        user_id = self.register_user("agents", record["user"])
+        if not user_id:
+            return None
+        payload = {k: v for k, v in record.items() if k not in ("key", "user")}
+        return {"userId": user_id, **payload}
+
+    def property_payload(self, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Versão JSON do form, para o endpoint em lote"""
+        agent_id = self.id_map.get(record["agentKey"])
+        if not agent_id:
+            self._fail("properties", 0)
+            return None
+        payload = {k: v for k, v in record.items() if k not in FORM_SKIP and v is not None}
+        return {**payload, "realEstateAgentId": agent_id}
+
+    def proposal_payload(self, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        client_id = self.id_map.get(record["clientKey"])
+        property_id = self.id_map.get(record["propertyKey"])
+        if not client_id or not property_id:
+            self._fail("proposals", 0)
+            return None
+        return {
+            "propertyId": property_id,
+            "clientId": client_id,
+            "proposedValue": record["proposedValue"],
+            # Inteiro no dataset; o schema converte no nome que o JsonStringEnumConverter aceita
+            "type": record["type"],
+            "paymentMethod": record.get("paymentMethod"),
+            "additionalNotes": record.get("additionalNotes"),
+        }
+
+    def visit_payload(self, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        ids = [self.id_map.get(record[k]) for k in ("clientKey", "propertyKey", "agentKey")]
+        if not all(ids):
+            self._fail("visits", 0)
+            return None
+        client_id, property_id, agent_id = ids
+        return {
+            "propertyId": property_id,
+            "clientId": client_id,
+            "realEstateAgentId": agent_id,
+            "visitDate": (self.anchor + timedelta(days=record["daysAhead"])).isoformat(),
+            "timeSlot": record["timeSlot"],
+            "notes": record.get("notes"),
+        }
+
+    def notification_payload(self, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        recipient_id = self.id_map.get(record["recipientKey"])
+        reference_key = record.get("referenceKey")
+        reference_id = self.id_map.get(reference_key) if reference_key else None
+        if not recipient_id or (reference_key and not reference_id):
+            self._fail("notifications", 0)
+            return None
+        return {
+            "senderId": None,
+            "recipientId": recipient_id,
+            "message": record["message"],
+            "type": record["type"],
+            "priority": record["priority"],
+            "referenceId": reference_id,
+            "referenceType": record.get("referenceType"),
+            "isTransient": False,
+        }
+
+    def approve_agent(self, agent_id: str) -> bool:
+        approval = self.api.put(f"/agents/{agent_id}/approve",
+                                json={"isApproved": True, "rejectionReason": None})
+        if approval.status_code not in (200, 204):
+            self._fail("agents", approval.status_code)
+            return False
+        return True
+
+    def ensure_approved(self, record: Dict[str, Any], agent_id: str) -> bool:
+        """
+        Aprovação com marcador próprio: o agente entra no IdMap logo que é
+        criado, e uma aprovação falhada repete-se na execução seguinte em
+        vez de deixar o agente criado mas fora do mapa
+        """
+        marker = self._marker(APPROVED_KIND, record)
+        if marker in self.id_map:
+            return True
+        if not self.approve_agent(agent_id):
+            return False
+        self.id_map.set(marker, agent_id)
+        return True
+
+    # ── Um método por tipo; correm nas threads do motor ─────────────────
+
+    def _create(self, kind: str, path: str, payload: Optional[Dict[str, Any]], record: Dict[str, Any],
+                *names: str) -> Optional[str]:
+        body = self._encode(kind, payload)
+        if body is None:
+            return None
+        response = self.api.post(path, data=body, headers=JSON_HEADERS)
+        created_id = self._created_id(response, *names)
+        if not created_id:
+            self._fail(kind, response.status_code)
+            return None
+        self.id_map.set(record["key"], created_id)
+        self._count(kind, "created")
+        return created_id
+
+    def replay_client(self, record: Dict[str, Any]) -> Optional[str]:
+        if record["key"] in self.id_map:
+            self._count("clients", "skipped")
+            return self.id_map.get(record["key"])
+        return self._create("clients", "/clients", self.client_payload(record), record, "clientId", "id")
+
+    def replay_agent(self, record: Dict[str, Any]) -> Optional[str]:
+        if record["key"] in self.id_map:
+            agent_id = self.id_map.get(record["key"])
+            if not self.ensure_approved(record, agent_id):
+                return None
+            self._count("agents", "skipped")
+            return agent_id
+        body = self._encode("agents", self.agent_payload(record))
+        if body is None:
+            return None
+        response = self.api.post("/agents", data=body, headers=JSON_HEADERS)
+        agent_id = self._created_id(response, "agentId", "id")
+        if not agent_id:
+            self._fail("agents", response.status_code)
+            return None
+        self.id_map.set(record["key"], agent_id)
+        if not self.ensure_approved(record, agent_id):
+            return None
+        self._count("agents", "created")
+        return agent_id
+
+    def replay_property(self, record: Dict[str, Any]) -> Optional[str]:
+        if record["key"] in self.id_map:
+            self._count("properties", "skipped")
+            return self.id_map.get(record["key"])
+        model = self._validated("properties", self.property_payload(record))
+        if model is None:
+            return None
+        form = model.to_form()
+        if self.images_per_property:
+            photos = self.images.pick(record["key"], self.images_per_property)
+            response = post_multipart(self.api, "POST", "/properties", property_body(form, photos))
+        else:
+            response = self.api.post("/properties", data=form)
+        property_id = self._created_id(response, "id", "propertyId")
+        if not property_id:
+            self._fail("properties", response.status_code)
+            return None
+        self.id_map.set(record["key"], property_id)
+        if self.images_per_property:
+            self.id_map.set(self._marker(ATTACHED_KIND, record), property_id)
+        self._count("properties", "created")
+        return property_id
+
+    def replay_proposal(self, record: Dict[str, Any]) -> Optional[str]:
+        if record["key"] in self.id_map:
+            self._count("proposals", "skipped")
+            return self.id_map.get(record["key"])
+        return self._create("proposals", "/proposals", self.proposal_payload(record), record, "id", "proposalId")
+
+    def replay_visit(self, record: Dict[str, Any]) -> Optional[str]:
+        if record["key"] in self.id_map:
+            self._count("visits", "skipped")
+            return self.id_map.get(record["key"])
+        return self._create("visits", "/visits", self.visit_payload(record), record, "visitId", "id")
+
+    def replay_notification(self, record: Dict[str, Any]) -> Optional[str]:
+        if record["key"] in self.id_map:
+            self._count("notifications", "skipped")
+            return self.id_map.get(record["key"])
+        return self._create("notifications", "/notifications", self.notification_payload(record), record,
+                            "id", "notificationId")
+
+    # ── Lotes: um pedido /bulk por batch_size registos ──────────────────
+
+    def replay_batch(self, kind: str, records: List[Dict[str, Any]]) -> int:
+        """
+        Um POST /<tipo>/bulk com os registos ainda por criar. A API grava o
+        lote inteiro ou nada: se o recusar, os registos seguem um a um pelo
+        endpoint normal, para que cada falha fique contada com o seu status.
+        Devolve quantos registos o lote criou.
+        """
+        build = getattr(self, f"{self._singular(kind)}_payload")
+        pending, bodies = [], []
+        for record in records:
+            if record["key"] in self.id_map:
+                if kind == "agents":
+                    # Já criado: replay_agent repete a aprovação se ainda não tiver o marcador
+                    self.replay_agent(record)
+                else:
+                    self._count(kind, "skipped")
+                continue
+            # Registos inválidos ficam de fora aqui: um só recusaria o lote inteiro na API
+            body = self._encode(kind, build(record))
+            if body is not None:
+                pending.append(record)
+                bodies.append(body)
+        if not bodies:
+            return 0
+
+        response = self.api.post(BULK_PATHS[kind], data=join_array(bodies), headers=JSON_HEADERS)
+        ids = response.json().get("ids") if response.status_code == 200 else None
+        with self._lock:
+            self.stats[kind].batches += 1
+            if not ids or len(ids) != len(pending):
+                self.stats[kind].fallbacks += 1
+        if not ids or len(ids) != len(pending):
+            handler = self._handler(kind)
+            for record in pending:
+                handler(record)
+            return 0
+
+        for record, created_id in zip(pending, ids):
+            self.id_map.set(record["key"], created_id)
+            # A aprovação não tem versão em lote e ativa o utilizador do agente
+            if kind == "agents" and not self.ensure_approved(record, created_id):
+                continue
+            self._count(kind, "created")
+        return len(ids)
+
+    # ── Imagens de propriedades já criadas ──────────────────────────────
+
+    @staticmethod
+    def _marker(kind: str, record: Dict[str, Any]) -> str:
+        return entity_key(kind, split_key(record["key"])[1])
+
+    def attach_images(self, record: Dict[str, Any]) -> Optional[str]:
+        """
+        A API não associa URLs já carregados a uma propriedade: as imagens
+        entram como ficheiros no form do PUT /properties/{id}, que exige os
+        restantes campos, reenviados a partir do registo do dataset
+        """
+        property_id = self.id_map.get(record["key"])
+        if not property_id:
+            self._fail(IMAGES, 0)
+            return None
+        marker = self._marker(ATTACHED_KIND, record)
+        if marker in self.id_map:
+            self._count(IMAGES, "skipped")
+            return property_id
+        photos = self.images.pick(record["key"], self.images_per_property)
+        response = post_multipart(self.api, "PUT", f"/properties/{property_id}",
+                                  property_body(to_form(record), photos))
+        if response.status_code != 200:
+            self._fail(IMAGES, response.status_code)
+            return None
+        self.id_map.set(marker, property_id)
+        self._count(IMAGES, "created")
+        return property_id
+
+    def upload_batch(self, record: Dict[str, Any], manifest: Any) -> Optional[str]:
+        """Envia as imagens da propriedade para /images/upload e regista os URLs no manifesto"""
+        property_id = self.id_map.get(record["key"])
+        marker = self._marker(UPLOADED_KIND, record)
+        if property_id and marker in self.id_map:
+            self._count(IMAGES, "skipped")
+            return property_id
+        status, urls = upload_images(self.api, self.images.pick(record["key"], self.images_per_property))
+        if not urls:
+            self._fail(IMAGES, status)
+            return None
+        line = json.dumps({"propertyKey": record["key"], "propertyId": property_id, "urls": urls})
+        with self._lock:
+            manifest.write(line + "\n")
+        if property_id:
+            self.id_map.set(marker, property_id)
+        self._count(IMAGES, "created")
+        return property_id
+
+    async def replay_images(self, directory: str, upload_only: bool = False,
+                            manifest_path: Optional[str] = None) -> StageStats:
+        """
+        Um pedido multipart por propriedade do dataset, em paralelo pelo
+        motor. upload_only usa /images/upload (só armazenamento) e escreve
+        {propertyKey, propertyId, urls} em manifest_path.
+        """
+        if not self.images_per_property:
+            raise ValueError("replay_images precisa de um ImagePool e images_per_property > 0")
+        if not upload_only:
+            async for _ in self.engine.stream(self.attach_images, self._jobs(directory, "properties", IMAGES)):
+                pass
+        else:
+            with open(manifest_path or os.path.join(directory, "image_urls.ndjson"), "a",
+                      encoding="utf-8") as manifest:
+                jobs = ((record, manifest) for (record,) in self._jobs(directory, "properties", IMAGES))
+                async for _ in self.engine.stream(self.upload_batch, jobs):
+                    pass
+        self.progress.finish(IMAGES)
+        return self.stats[IMAGES]
+
+    # ── Orquestração ────────────────────────────────────────────────────
+
+    def _jobs(self, directory: str, kind: str, stage: Optional[str] = None) -> Iterator[Tuple[Dict[str, Any]]]:
+        path = find_dataset_file(directory, kind)
+        if path is None:
+            return
+        # Uma passagem rápida pelo ficheiro dá o total para o ETA
+        self.progress.stage(stage or kind, count_records(path))
+        for record in read_ndjson(path):
+            yield (record,)
+
+    def _batches(self, directory: str, kind: str) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        batch = []
+        for (record,) in self._jobs(directory, kind):
+            batch.append(record)
+            if len(batch) >= self.batch_size:
+                yield (kind, batch)
+                batch = []
+        if batch:
+            yield (kind, batch)
+
+    @staticmethod
+    def _singular(kind: str) -> str:
+        return "property" if kind == "properties" else kind[:-1]
+
+    def _handler(self, kind: str) -> Any:
+        return getattr(self, f"replay_{self._singular(kind)}")
+
+    async def replay_kind(self, directory: str, kind: str) -> StageStats:
+        if self.batch_size > 0:
+            async for _ in self.engine.stream(self.replay_batch, self._batches(directory, kind)):
+                pass
+        else:
+            async for _ in self.engine.stream(self._handler(kind), self._jobs(directory, kind)):
+                pass
+        self.progress.finish(kind)
+        return self.stats[kind]
+
+    async def replay(self, directory: str, sync: Optional[Callable[[int], None]] = None) -> Dict[str, StageStats]:
+        """
+        Clientes em paralelo com agentes -> propriedades; propostas e visitas
+        só depois de ambos os ramos terminarem, e as notificações (que as
+        referenciam) no fim. sync(fase), se dado, é chamado no fim de cada
+        fase (ver sharding: espera pelos outros workers).
+        """
+        async def agents_then_properties() -> None:
+            await self.replay_kind(directory, "agents")
+            await self.replay_kind(directory, "properties")
+            if self.batch_size > 0 and self.images_per_property:
+                # O endpoint em lote só aceita JSON: as imagens seguem pelo PUT de cada imóvel
+                await self.replay_images(directory)
+
+        phases = (
+            lambda: asyncio.gather(self.replay_kind(directory, "clients"), agents_then_properties()),
+            lambda: asyncio.gather(self.replay_kind(directory, "proposals"),
+                                   self.replay_kind(directory, "visits")),
+            lambda: self.replay_kind(directory, "notifications"),
+        )
+        for phase, run in enumerate(phases, 1):
+            await run()
+            if sync is not None:
+                sync(phase)
+        return self.stats
+
+
+# ── Validação offline ───────────────────────────────────────────────────
+
+class PlaceholderIds:
+    """
+    IdMap da validação offline: nada existe ainda e cada chave resolve para
+    um GUID determinístico, pelo que os payloads são construídos sem rede
+    """
+
+    def __contains__(self, key: str) -> bool:
+        return False
+
+    def get(self, key: str) -> str:
+        return str(uuid.uuid5(uuid.NAMESPACE_URL, key))
+
+
+def validate_dataset(directory: str, anchor: Optional[date] = None,
+                     samples: int = 5) -> Dict[str, Dict[str, Any]]:
+    """
+    Constrói, valida e serializa cada registo do dataset como o replay faria,
+    sem pedidos. Por tipo: registos, inválidos por campo, exemplos de erro,
+    bytes serializados e o tempo por registo (sem a leitura do NDJSON).
+    """
+    replayer = DatasetReplayer(None, None, PlaceholderIds(), anchor=anchor)  # type: ignore[arg-type]
+    report: Dict[str, Dict[str, Any]] = {}
+    for kind in KINDS:
+        path = find_dataset_file(directory, kind)
+        if path is None:
+            continue
+        build = getattr(replayer, f"{DatasetReplayer._singular(kind)}_payload")
+        result: Dict[str, Any] = {"records": 0, "invalid": 0, "fields": {}, "examples": [],
+                                  "bytes": 0, "seconds": 0.0}
+        for record in read_ndjson(path):
+            started = time.perf_counter()
+            try:
+                result["bytes"] += len(validate(kind, build(record)).to_bytes())
+            except PayloadError as e:
+                result["invalid"] += 1
+                result["fields"][e.field] = result["fields"].get(e.field, 0) + 1
+                if len(result["examples"]) < samples:
+                    result["examples"].append(f"{record.get('key')}: {e}")
+            result["seconds"] += time.perf_counter() - started
+            result["records"] += 1
+        report[kind] = result
+    return report
@@ -0,0 +1,137 @@
+"""
+Escalonador de tarefas em grafo (DAG) para o seed: cada tarefa arranca assim
+que os ids de que depende estiverem resolvidos
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Union
+
+from .engine import SeedEngine
+
+
+@dataclass(frozen=True)
+class Edge:
+    """Liga o resultado de uma tarefa a um argumento de outra; select extrai o id"""
+    source: str
+    select: Optional[Callable[[Any], Any]] = None
+
+    def resolve(self, value: Any) -> Any:
+        return self.select(value) if self.select else value
+
+
+@dataclass
+class Task:
+    """Nó do grafo: fn(*args, **kwargs, **inputs) corre no motor quando as arestas resolvem"""
+    name: str
+    fn: Callable[..., Any]
+    inputs: Dict[str, Edge] = field(default_factory=dict)
+    after: Tuple[str, ...] = ()
+    args: Tuple[Any, ...] = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    ready: Optional[Callable[[Any], bool]] = None
+    ready_timeout: float = 10.0
+
+
+async def wait_until(probe: Callable[[], Awaitable[bool]], timeout: float,
+                     interval: float = 0.05, max_interval: float = 1.0) -> bool:
+    """Faz polling de probe com intervalo crescente até devolver True ou esgotar o timeout"""
+    deadline = time.monotonic() + timeout
+    while True:
+        if await probe():
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        await asyncio.sleep(min(interval, remaining))
+        interval = min(interval * 2, max_interval)
+
+
+class TaskGraph:
+    """
+    Grafo de tarefas do seed. As dependências têm de ser registadas antes das
+    tarefas que as usam, o que garante que o grafo é acíclico. Uma tarefa cujo
+    input não resolve (falha a montante ou None) é ignorada e devolve None; uma
+    tarefa que lança exceção é registada e também devolve None.
+    """
+
+    def __init__(self, engine: SeedEngine):
+        self.engine = engine
+        self.tasks: Dict[str, Task] = {}
+        self.results: Dict[str, Any] = {}
+        self.timings: Dict[str, Tuple[float, float]] = {}
+        self._started = time.monotonic()
+
+    def add(self, name: str, fn: Callable[..., Any], *args: Any,
+            inputs: Optional[Dict[str, Union[str, Edge]]] = None,
+            after: Tuple[str, ...] = (),
+            ready: Optional[Callable[[Any], bool]] = None,
+            ready_timeout: float = 10.0, **kwargs: Any) -> str:
+        """
+        Regista uma tarefa. inputs mapeia nome do argumento -> tarefa (ou Edge);
+        after lista tarefas que só têm de concluir com sucesso, sem passar valor.
+        """
+        if name in self.tasks:
+            raise ValueError(f"Tarefa duplicada: {name}")
+
+        edges = {arg: edge if isinstance(edge, Edge) else Edge(edge)
+                 for arg, edge in (inputs or {}).items()}
+        for source in [edge.source for edge in edges.values()] + list(after):
+            if source not in self.tasks:
+                raise ValueError(f"{name} depende de tarefa desconhecida: {source}")
+
+        self.tasks[name] = Task(name, fn, edges, tuple(after), args, kwargs, ready, ready_timeout)
+        return name
+
+    async def run(self) -> Dict[str, Any]:
+        """Executa todas as tarefas; devolve os resultados por nome"""
+        self._started = time.monotonic()
+        futures: Dict[str, asyncio.Task] = {}
+        for name, task in self.tasks.items():
+            futures[name] = asyncio.ensure_future(self._run_task(task, futures))
+        await asyncio.gather(*futures.values())
+        return self.results
+
+    async def _run_task(self, task: Task, futures: Dict[str, "asyncio.Task"]) -> Any:
+        for source in task.after:
+            if not await futures[source]:
+                self.results[task.name] = None
+                return None
+
+        inputs = {}
+        for arg, edge in task.inputs.items():
+            upstream = await futures[edge.source]
+            try:
+                value = edge.resolve(upstream) if upstream is not None else None
+            except (IndexError, KeyError, TypeError):
+                value = None
+            if value is None:
+                self.results[task.name] = None
+                return None
+            inputs[arg] = value
+
+        start = time.monotonic() - self._started
+        # Uma exceção falha só este nó: com gather a subir o erro, todos os outros parariam
+        try:
+            result = await self.engine.call(task.fn, *task.args, **task.kwargs, **inputs)
+        except Exception as e:
+            print(f"   ⚠️  {task.name}: {type(e).__name__}: {e}")
+            result = None
+
+        if result is not None and task.ready is not None:
+            async def probe() -> bool:
+                return bool(await self.engine.call(task.ready, result))
+            try:
+                ready = await wait_until(probe, task.ready_timeout)
+            except Exception as e:
+                print(f"   ⚠️  {task.name}: verificação de prontidão falhou: {type(e).__name__}: {e}")
+                result = None
+            else:
+                if not ready:
+                    print(f"   ⚠️  {task.name}: não ficou pronto em {task.ready_timeout:.0f}s")
+                    result = None
+
+        self.timings[task.name] = (start, time.monotonic() - self._started)
+        self.results[task.name] = result
+        return result
@@ -0,0 +1,438 @@
+"""
+Validação e normalização local dos payloads antes da rede. Cada modelo
+replica as regras do validador FluentValidation do comando correspondente,
+aceita as variantes que os seeders produzem (morada aninhada ou plana, enums
+por nome ou por inteiro) e devolve o formato que a API espera, já
+serializado em bytes reutilizáveis para o pedido individual e para o lote.
+"""
+
+import json
+import re
+import uuid
+from dataclasses import MISSING, dataclass, fields
+from datetime import date, datetime, timezone
+from typing import Any, ClassVar, Dict, List, Optional, Sequence, Tuple
+
+from .generator import PROPERTY_TYPES, PROPOSAL_TYPES, TRANSACTION_TYPES
+from .payloads import TIME_SLOTS
+
+try:  # orjson é opcional: sem ele a serialização usa o json da biblioteca padrão
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+# Status nas estatísticas de falha para payloads recusados localmente (0 = dependência)
+INVALID = -1
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Enums do domínio que a API lê como inteiro (campos int nos comandos)
+PROPERTY_STATUSES = {
+    "Available": 0, "Reserved": 1, "UnderContract": 2, "Sold": 3, "Rented": 4,
+    "Unavailable": 5, "InNegotiation": 6,
+}
+CLIENT_TYPES = {"Individual": 0, "Company": 1}
+# Enums que vão como texto (JsonStringEnumConverter sem inteiros), pela ordem do domínio
+PROPOSAL_TYPE_NAMES = tuple(sorted(PROPOSAL_TYPES, key=PROPOSAL_TYPES.get))
+NOTIFICATION_TYPE_NAMES = (
+    "Payment", "Contract", "ContractUpdate", "PropertyUpdate", "PropertyViewing", "NewListing",
+    "PriceChange", "DocumentUpload", "SystemAlert", "Message", "Favorite", "Visit", "Proposal",
+    "Negotiation", "ProposalAccepted", "PropertyReactivated",
+)
+NOTIFICATION_PRIORITY_NAMES = ("Low", "Medium", "High")
+
+POSTAL_CODE = re.compile(r"^\d{4}-\d{3}$")
+NIF = re.compile(r"^\d{9}$")
+EMAIL = re.compile(r"^[^@\s]+@[^@\s]+$")
+ADDRESS_FIELDS = ("street", "number", "parish", "municipality", "district", "postalCode", "complement")
+
+_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def dumps(obj: Any) -> bytes:
+    """JSON compacto em UTF-8 (orjson, se instalado)"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return _ENCODER.encode(obj).encode("utf-8")
+
+
+def join_array(buffers: Sequence[bytes]) -> bytes:
+    """Corpo de um lote a partir dos bytes de cada item, sem voltar a serializar"""
+    return b"[" + b",".join(buffers) + b"]"
+
+
+class PayloadError(ValueError):
+    """Payload recusado antes de chegar à API"""
+
+    def __init__(self, kind: str, field_name: str, message: str):
+        super().__init__(f"{kind}.{field_name}: {message}")
+        self.kind = kind
+        self.field = field_name
+        self.message = message
+
+
+def camel_case(name: str) -> str:
+    head, *rest = name.split("_")
+    return head + "".join(part.title() for part in rest)
+
+
+# ── Regras ───────────────────────────────────────────────────────────────
+
+def check_guid(kind: str, name: str, value: Any, required: bool = True) -> Optional[str]:
+    if value is None or value == "":
+        if required:
+            raise PayloadError(kind, name, "obrigatório")
+        return None
+    try:
+        guid = uuid.UUID(str(value))
+    except ValueError:
+        raise PayloadError(kind, name, f"GUID inválido: {value!r}") from None
+    if guid.int == 0:
+        raise PayloadError(kind, name, "GUID vazio")
+    return str(guid)
+
+
+def check_text(kind: str, name: str, value: Any, max_length: int, required: bool = False) -> Optional[str]:
+    if value is None or (isinstance(value, str) and not value.strip()):
+        if required:
+            raise PayloadError(kind, name, "obrigatório")
+        return None if value is None else value
+    if not isinstance(value, str):
+        raise PayloadError(kind, name, f"esperado texto, recebido {type(value).__name__}")
+    if len(value) > max_length:
+        raise PayloadError(kind, name, f"excede {max_length} caracteres")
+    return value
+
+
+def check_number(kind: str, name: str, value: Any, minimum: Optional[float] = None,
+                 maximum: Optional[float] = None, exclusive: bool = False,
+                 integer: bool = False) -> Any:
+    """Limites como no validador; exclusive para GreaterThan/LessThan"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise PayloadError(kind, name, f"esperado número, recebido {value!r}")
+    if integer and value != int(value):
+        raise PayloadError(kind, name, f"esperado inteiro, recebido {value!r}")
+    if minimum is not None and (value <= minimum if exclusive else value < minimum):
+        raise PayloadError(kind, name, f"deve ser {'>' if exclusive else '≥'} {minimum:g}")
+    if maximum is not None and (value >= maximum if exclusive else value > maximum):
+        raise PayloadError(kind, name, f"deve ser {'<' if exclusive else '≤'} {maximum:g}")
+    return int(value) if integer else value
+
+
+def enum_value(kind: str, name: str, value: Any, names: Dict[str, int]) -> int:
+    """Enum lido como inteiro pela API: aceita o nome ou o inteiro"""
+    if isinstance(value, str):
+        if value in names:
+            return names[value]
+        if value.isdigit():
+            value = int(value)
+    if isinstance(value, int) and not isinstance(value, bool) and value in names.values():
+        return value
+    raise PayloadError(kind, name, f"valor {value!r} fora de {', '.join(names)}")
+
+
+def enum_name(kind: str, name: str, value: Any, names: Sequence[str]) -> str:
+    """Enum lido como texto pela API: aceita o nome ou o índice"""
+    if isinstance(value, str) and value in names:
+        return value
+    if isinstance(value, int) and not isinstance(value, bool) and 0 <= value < len(names):
+        return names[value]
+    raise PayloadError(kind, name, f"valor {value!r} fora de {', '.join(names)}")
+
+
+# ── Modelos ──────────────────────────────────────────────────────────────
+
+class Payload:
+    """
+    Base dos modelos: from_record mapeia as chaves camelCase para os campos,
+    recusa campos desconhecidos (fora de IGNORED) e __post_init__ de cada
+    modelo normaliza e valida. to_json devolve o corpo com os nomes da API.
+    """
+    __slots__ = ()
+    KIND: ClassVar[str] = ""
+    # Chaves dos registos que a API não lê (chaves locais do dataset, etc.)
+    IGNORED: ClassVar[Tuple[str, ...]] = ("key",)
+    _wire_cache: ClassVar[Dict[type, Tuple[Tuple[Tuple[str, str], ...], Dict[str, str], Tuple[str, ...]]]] = {}
+
+    @classmethod
+    def _wire(cls) -> Tuple[Tuple[Tuple[str, str], ...], Dict[str, str], Tuple[str, ...]]:
+        """(atributo, nome na API), nome na API -> atributo e atributos obrigatórios"""
+        cached = Payload._wire_cache.get(cls)
+        if cached is None:
+            pairs = tuple((f.name, camel_case(f.name)) for f in fields(cls))
+            required = tuple(f.name for f in fields(cls)
+                             if f.default is MISSING and f.default_factory is MISSING)
+            cached = Payload._wire_cache[cls] = (pairs, {wire: attr for attr, wire in pairs}, required)
+        return cached
+
+    @classmethod
+    def prepare(cls, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Ajusta a forma do registo antes do mapeamento (por omissão, nada)"""
+        return record
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any], **values: Any) -> "Payload":
+        """values (por atributo) sobrepõem-se ao registo, por ex. ids já resolvidos"""
+        _, by_wire, required = cls._wire()
+        for key, value in cls.prepare(record).items():
+            attr = by_wire.get(key)
+            if attr is None:
+                if key in cls.IGNORED:
+                    continue
+                raise PayloadError(cls.KIND, key, "campo desconhecido")
+            values.setdefault(attr, value)
+        for attr in required:
+            if attr not in values:
+                raise PayloadError(cls.KIND, camel_case(attr), "obrigatório")
+        return cls(**values)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {wire: getattr(self, attr) for attr, wire in self._wire()[0]}
+
+    def to_bytes(self) -> bytes:
+        return dumps(self.to_json())
+
+
+@dataclass(slots=True)
+class ClientPayload(Payload):
+    """POST /clients (CreateClientRequest)"""
+    KIND: ClassVar[str] = "clients"
+    IGNORED: ClassVar[Tuple[str, ...]] = ("key", "user")
+
+    user_id: str
+    type: Any = 0
+    nif: Optional[str] = None
+    citizen_card: Optional[str] = None
+    min_budget: Optional[float] = None
+    max_budget: Optional[float] = None
+    preferred_contact_method: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        kind = self.KIND
+        self.user_id = check_guid(kind, "userId", self.user_id)
+        self.type = enum_value(kind, "type", self.type, CLIENT_TYPES)
+        if self.nif and not NIF.match(self.nif):
+            raise PayloadError(kind, "nif", "deve ter exatamente 9 dígitos")
+        if self.min_budget is not None:
+            check_number(kind, "minBudget", self.min_budget, 0, exclusive=True)
+        if self.max_budget is not None:
+            check_number(kind, "maxBudget", self.max_budget, 0, exclusive=True)
+            if self.min_budget is not None and self.max_budget < self.min_budget:
+                raise PayloadError(kind, "maxBudget", "menor do que minBudget")
+
+
+@dataclass(slots=True)
+class AgentPayload(Payload):
+    """POST /agents (CreateAgentRequest)"""
+    KIND: ClassVar[str] = "agents"
+    IGNORED: ClassVar[Tuple[str, ...]] = ("key", "user")
+
+    user_id: str
+    license_number: Optional[str] = None
+    license_expiry: Optional[str] = None
+    office_email: Optional[str] = None
+    office_phone: Optional[str] = None
+    commission_rate: Optional[float] = None
+    specialization: Optional[str] = None
+    certifications: Optional[List[str]] = None
+    languages_spoken: Optional[List[int]] = None
+
+    def __post_init__(self) -> None:
+        kind = self.KIND
+        self.user_id = check_guid(kind, "userId", self.user_id)
+        check_text(kind, "licenseNumber", self.license_number, 50)
+        if isinstance(self.license_expiry, (date, datetime)):
+            self.license_expiry = self.license_expiry.isoformat()
+        if check_text(kind, "officeEmail", self.office_email, 255) and not EMAIL.match(self.office_email):
+            raise PayloadError(kind, "officeEmail", f"email inválido: {self.office_email!r}")
+        check_text(kind, "officePhone", self.office_phone, 20)
+        if self.commission_rate is not None:
+            check_number(kind, "commissionRate", self.commission_rate, 0, 100)
+        if self.languages_spoken is not None:
+            self.languages_spoken = [check_number(kind, "languagesSpoken", language, 0, integer=True)
+                                     for language in self.languages_spoken]
+
+
+@dataclass(slots=True)
+class PropertyPayload(Payload):
+    """
+    POST /properties (form) e /properties/bulk (JSON) com CreatePropertyCommand.
+    type/status/transactionType são int no comando: um nome mandado tal como
+    está seria lido como 0 pelo int.TryParse do form, por isso é convertido.
+    """
+    KIND: ClassVar[str] = "properties"
+    # isActive/isFeatured vêm do seed_database e o endpoint não os lê
+    IGNORED: ClassVar[Tuple[str, ...]] = ("key", "agentKey", "isActive", "isFeatured")
+
+    title: str
+    description: str
+    real_estate_agent_id: str
+    price: float
+    size: float
+    street: str
+    number: str
+    parish: str
+    municipality: str
+    district: str
+    postal_code: str
+    type: Any = 0
+    status: Any = 0
+    transaction_type: Any = 0
+    bedrooms: int = 0
+    bathrooms: int = 0
+    complement: Optional[str] = None
+    gross_area: Optional[float] = None
+    land_area: Optional[float] = None
+    wc_count: Optional[int] = None
+    floor: Optional[int] = None
+    parking_spaces: Optional[int] = None
+    condominium: Optional[float] = None
+    amenities: Any = None
+    year_built: Optional[int] = None
+    energy_rating: Optional[str] = None
+    orientation: Optional[str] = None
+    has_elevator: bool = False
+    has_garage: bool = False
+    has_pool: bool = False
+    is_furnished: bool = False
+
+    @classmethod
+    def prepare(cls, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Aceita a morada aninhada em "address" (seed_database) ou plana (dataset, populate)"""
+        address = record.get("address")
+        if isinstance(address, dict):
+            unknown = set(address) - set(ADDRESS_FIELDS)
+            if unknown:
+                raise PayloadError(cls.KIND, f"address.{min(unknown)}", "campo desconhecido")
+            record = {**{k: v for k, v in record.items() if k != "address"}, **address}
+        return record
+
+    def __post_init__(self) -> None:
+        kind = self.KIND
+        check_text(kind, "title", self.title, 200, required=True)
+        check_text(kind, "description", self.description, 2000, required=True)
+        self.real_estate_agent_id = check_guid(kind, "realEstateAgentId", self.real_estate_agent_id)
+        check_number(kind, "price", self.price, 0, exclusive=True)
+        check_number(kind, "size", self.size, 0, exclusive=True)
+        self.bedrooms = check_number(kind, "bedrooms", self.bedrooms, 0, integer=True)
+        self.bathrooms = check_number(kind, "bathrooms", self.bathrooms, 0, integer=True)
+        self.type = enum_value(kind, "type", self.type, PROPERTY_TYPES)
+        self.status = enum_value(kind, "status", self.status, PROPERTY_STATUSES)
+        self.transaction_type = enum_value(kind, "transactionType", self.transaction_type, TRANSACTION_TYPES)
+        check_text(kind, "street", self.street, 200, required=True)
+        if isinstance(self.number, int):
+            self.number = str(self.number)
+        check_text(kind, "number", self.number, 20, required=True)
+        check_text(kind, "parish", self.parish, 100, required=True)
+        check_text(kind, "municipality", self.municipality, 100, required=True)
+        check_text(kind, "district", self.district, 100, required=True)
+        if not isinstance(self.postal_code, str) or not POSTAL_CODE.match(self.postal_code):
+            raise PayloadError(kind, "postalCode", f"formato XXXX-XXX, recebido {self.postal_code!r}")
+        # Amenities é texto no comando; o seed_database manda uma lista
+        if isinstance(self.amenities, (list, tuple)):
+            self.amenities = ", ".join(self.amenities)
+
+    def to_form(self) -> Dict[str, str]:
+        """O endpoint individual lê form fields: texto, booleanos em minúsculas, nulos omitidos"""
+        form = {}
+        for attr, wire in self._wire()[0]:
+            value = getattr(self, attr)
+            if value is not None:
+                form[wire] = ("true" if value else "false") if isinstance(value, bool) else str(value)
+        return form
+
+
+@dataclass(slots=True)
+class ProposalPayload(Payload):
+    """POST /proposals (CreateProposalCommand)"""
+    KIND: ClassVar[str] = "proposals"
+
+    property_id: str
+    client_id: str
+    proposed_value: float
+    type: Any = "Purchase"
+    payment_method: Optional[str] = None
+    intended_move_date: Optional[str] = None
+    additional_notes: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        kind = self.KIND
+        self.property_id = check_guid(kind, "propertyId", self.property_id)
+        self.client_id = check_guid(kind, "clientId", self.client_id)
+        check_number(kind, "proposedValue", self.proposed_value, 0, 100_000_000, exclusive=True)
+        self.type = enum_name(kind, "type", self.type, PROPOSAL_TYPE_NAMES)
+        check_text(kind, "paymentMethod", self.payment_method, 100)
+        if isinstance(self.intended_move_date, (date, datetime)):
+            self.intended_move_date = self.intended_move_date.isoformat()
+        check_text(kind, "additionalNotes", self.additional_notes, 2000)
+
+
+@dataclass(slots=True)
+class VisitPayload(Payload):
+    """POST /visits (ScheduleVisitRequest); timeSlot é o índice de TIME_SLOTS"""
+    KIND: ClassVar[str] = "visits"
+
+    property_id: str
+    client_id: str
+    real_estate_agent_id: str
+    visit_date: Any
+    time_slot: Any
+    notes: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        kind = self.KIND
+        self.property_id = check_guid(kind, "propertyId", self.property_id)
+        self.client_id = check_guid(kind, "clientId", self.client_id)
+        self.real_estate_agent_id = check_guid(kind, "realEstateAgentId", self.real_estate_agent_id)
+        visit_date = self.visit_date
+        if isinstance(visit_date, str):
+            try:
+                visit_date = date.fromisoformat(visit_date)
+            except ValueError:
+                raise PayloadError(kind, "visitDate", f"data inválida: {visit_date!r}") from None
+        if not isinstance(visit_date, date):
+            raise PayloadError(kind, "visitDate", f"esperada data, recebido {visit_date!r}")
+        # O validador compara com a data UTC do servidor
+        if visit_date < datetime.now(timezone.utc).date():
+            raise PayloadError(kind, "visitDate", f"{visit_date} já passou")
+        self.visit_date = visit_date.isoformat()
+        if isinstance(self.time_slot, str) and self.time_slot in TIME_SLOTS:
+            self.time_slot = TIME_SLOTS.index(self.time_slot)
+        self.time_slot = check_number(kind, "timeSlot", self.time_slot, 0, len(TIME_SLOTS) - 1, integer=True)
+        check_text(kind, "notes", self.notes, 1000)
+
+
+@dataclass(slots=True)
+class NotificationPayload(Payload):
+    """POST /notifications (SendNotificationCommand)"""
+    KIND: ClassVar[str] = "notifications"
+
+    recipient_id: str
+    message: str
+    type: Any
+    priority: Any = "Medium"
+    sender_id: Optional[str] = None
+    reference_id: Optional[str] = None
+    reference_type: Optional[str] = None
+    is_transient: bool = False
+
+    def __post_init__(self) -> None:
+        kind = self.KIND
+        self.recipient_id = check_guid(kind, "recipientId", self.recipient_id)
+        self.sender_id = check_guid(kind, "senderId", self.sender_id, required=False)
+        check_text(kind, "message", self.message, 1000, required=True)
+        self.type = enum_name(kind, "type", self.type, NOTIFICATION_TYPE_NAMES)
+        self.priority = enum_name(kind, "priority", self.priority, NOTIFICATION_PRIORITY_NAMES)
+        self.reference_id = check_guid(kind, "referenceId", self.reference_id, required=False)
+
+
+# Tipo do dataset -> modelo
+MODELS: Dict[str, type] = {
+    model.KIND: model
+    for model in (ClientPayload, AgentPayload, PropertyPayload, ProposalPayload, VisitPayload,
+                  NotificationPayload)
+}
+
+
+def validate(kind: str, payload: Dict[str, Any]) -> Payload:
+    """Modelo validado e normalizado do payload; PayloadError se for recusado"""
+    return MODELS[kind].from_record(payload)
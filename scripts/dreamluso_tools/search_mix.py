@@ -0,0 +1,404 @@
+"""
+Mistura de pesquisas de imóveis: gera consultas realistas a partir do
+dataset de seed (concelhos com distribuição Zipf, faixas de preço, cauda de
+páginas profundas), mede-as em paralelo e ordena as combinações de filtros
+pela latência
+"""
+
+import argparse
+import bisect
+import itertools
+import math
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import requests
+
+from .generator import DatasetGenerator
+from .http_client import ApiClient
+from .loadgen import parse_weights
+from .metrics import LatencyRecorder
+from .ndjson_io import IdMap, read_ndjson
+from .replay import find_dataset_file
+
+# Filtros de GET /properties, pela ordem da assinatura de uma combinação
+FILTERS = ("searchTerm", "type", "status", "minPrice", "maxPrice", "municipality", "minBedrooms",
+           "minBathrooms", "featuredOnly", "transactionType", "agentId")
+NO_FILTERS = "(sem filtros)"
+
+# Probabilidade de cada filtro entrar numa pesquisa; "price" gera minPrice e/ou maxPrice
+DEFAULT_RATES: Dict[str, float] = {
+    "municipality": 0.55, "transactionType": 0.45, "price": 0.40, "minBedrooms": 0.30,
+    "type": 0.25, "searchTerm": 0.12, "minBathrooms": 0.08, "status": 0.05,
+    "featuredOnly": 0.04, "agentId": 0.03,
+}
+# Forma da faixa de preço quando "price" é escolhido: (ambos, só máximo, só mínimo)
+PRICE_SHAPES = (("both", 0.60), ("max", 0.25), ("min", 0.15))
+# Páginas rasas: a maioria fica na primeira
+SHALLOW_PAGES = ((1, 0.70), (2, 0.14), (3, 0.07), (4, 0.03), (5, 0.02), (6, 0.015),
+                 (7, 0.01), (8, 0.008), (9, 0.004), (10, 0.003))
+PAGE_BUCKETS = ((1, "1"), (3, "2-3"), (10, "4-10"), (100, "11-100"), (1000, "101-1000"))
+# Estados que a listagem pública devolve (Available, Unavailable, InNegotiation)
+PUBLIC_STATUSES = (0, 5, 6)
+PRICE_SAMPLE = 20000
+STOP_WORDS = {"em", "para", "de", "do", "da", "com"}
+
+
+def add_search_arguments(parser: argparse.ArgumentParser) -> None:
+    """Regista as opções da mistura de pesquisas"""
+    group = parser.add_argument_group("Mistura de pesquisas")
+    group.add_argument("--queries", type=int, default=2000,
+                       help="Pesquisas da mistura (default: %(default)s)")
+    group.add_argument("--zipf", type=float, default=1.1,
+                       help="Expoente Zipf dos concelhos e termos, por frequência no dataset (default: %(default)s)")
+    group.add_argument("--rate", action="append", default=[], metavar="FILTRO=P",
+                       help=f"Probabilidade de um filtro entrar numa pesquisa ({', '.join(DEFAULT_RATES)})")
+    group.add_argument("--page-size", type=int, default=20, help="pageSize das pesquisas (default: %(default)s)")
+    group.add_argument("--deep-share", type=float, default=0.02,
+                       help="Fração da mistura com páginas profundas, log-uniforme até --max-page (default: %(default)s)")
+    group.add_argument("--max-page", type=int, default=5000, help="Página mais funda da cauda (default: %(default)s)")
+    group.add_argument("--deep-pages", default="1,10,100,1000,5000",
+                       help="Páginas medidas à parte para as combinações mais comuns (default: %(default)s)")
+    group.add_argument("--deep-combos", type=int, default=3,
+                       help="Combinações mais frequentes (mais a sem filtros) na varredura de páginas (default: %(default)s)")
+    group.add_argument("--repeats", type=int, default=10,
+                       help="Pedidos por página na varredura e por filtro isolado (default: %(default)s)")
+    group.add_argument("--min-samples", type=int, default=10,
+                       help="Amostras mínimas para uma combinação entrar no ranking (default: %(default)s)")
+    group.add_argument("--slow-ms", type=float, default=250.0,
+                       help="p95 a partir do qual uma combinação é candidata a índice (default: %(default)s)")
+    group.add_argument("--keyset-ratio", type=float, default=2.0,
+                       help="p50 da página / p50 da página 1 a partir do qual se sugere keyset (default: %(default)s)")
+
+
+def parse_rates(specs: List[str]) -> Dict[str, float]:
+    """["featuredOnly=0.2"] aplicado por cima de DEFAULT_RATES"""
+    rates = dict(DEFAULT_RATES)
+    for name, rate in parse_weights(specs).items():
+        if name not in rates:
+            raise ValueError(f"filtro desconhecido: {name}")
+        if not 0 <= rate <= 1:
+            raise ValueError(f"{name}: a probabilidade deve estar entre 0 e 1")
+        rates[name] = rate
+    return rates
+
+
+def signature(params: Dict[str, Any]) -> str:
+    """Combinação de filtros de uma pesquisa, sem a paginação"""
+    return "+".join(name for name in FILTERS if name in params) or NO_FILTERS
+
+
+def page_bucket(page: int) -> str:
+    for limit, label in PAGE_BUCKETS:
+        if page <= limit:
+            return label
+    return f">{PAGE_BUCKETS[-1][0]}"
+
+
+def title_terms(title: str) -> Iterable[str]:
+    """Palavras do título úteis como searchTerm (sem o #índice nem preposições)"""
+    for word in re.findall(r"[^\W\d_][\w-]*|[TV]\d", title):
+        if word.lower() not in STOP_WORDS and len(word) > 1:
+            yield word
+
+
+# ── Espaço de pesquisa ───────────────────────────────────────────────────
+
+@dataclass
+class SearchSpace:
+    """Valores dos filtros tirados do dataset, ordenados por frequência"""
+    municipalities: List[str] = field(default_factory=list)
+    terms: List[str] = field(default_factory=list)
+    types: List[int] = field(default_factory=list)
+    # transactionType -> preços ordenados (amostra)
+    prices: Dict[int, List[float]] = field(default_factory=dict)
+    agent_ids: List[str] = field(default_factory=list)
+    properties: int = 0
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]], agent_ids: Sequence[str] = (),
+                     seed: int = 0) -> "SearchSpace":
+        """Uma passagem em streaming; os preços ficam numa amostra de reservatório por tipo de transação"""
+        rng = random.Random(seed)
+        municipalities: Counter = Counter()
+        terms: Counter = Counter()
+        types: Counter = Counter()
+        samples: Dict[int, List[float]] = {}
+        seen: Counter = Counter()
+        count = 0
+        for record in records:
+            count += 1
+            municipalities[record.get("municipality")] += 1
+            types[record.get("type")] += 1
+            terms.update(title_terms(record.get("title") or ""))
+            transaction = record.get("transactionType")
+            price = record.get("price")
+            if transaction is None or not price:
+                continue
+            seen[transaction] += 1
+            sample = samples.setdefault(transaction, [])
+            if len(sample) < PRICE_SAMPLE:
+                sample.append(float(price))
+            else:
+                slot = rng.randrange(seen[transaction])
+                if slot < PRICE_SAMPLE:
+                    sample[slot] = float(price)
+        municipalities.pop(None, None)
+        types.pop(None, None)
+        return cls(
+            municipalities=[name for name, _ in municipalities.most_common()],
+            terms=[term for term, _ in terms.most_common(200)],
+            types=[kind for kind, _ in types.most_common()],
+            prices={kind: sorted(values) for kind, values in samples.items()},
+            agent_ids=list(agent_ids),
+            properties=count,
+        )
+
+    def price_band(self, transaction: Optional[int], rng: random.Random) -> Tuple[float, float]:
+        """Limites de um quintil de preços (do tipo de transação, se dado)"""
+        values = self.prices.get(transaction) if transaction is not None else None
+        if not values:
+            values = max(self.prices.values(), key=len, default=[])
+        if not values:
+            return 0.0, 0.0
+        band = rng.randrange(5)
+        low = values[len(values) * band // 5]
+        high = values[min(len(values) - 1, len(values) * (band + 1) // 5)]
+        return low, high
+
+
+def load_space(dataset: Optional[str], seed: int = 42, sample: int = 5000) -> SearchSpace:
+    """
+    Espaço do dataset exportado (properties.ndjson e o mapa de ids em
+    <dataset>/ids); sem dataset, uma amostra do gerador com a mesma seed
+    """
+    path = find_dataset_file(dataset, "properties") if dataset else None
+    if path is None:
+        if dataset:
+            raise FileNotFoundError(f"{dataset}: sem ficheiro de imóveis")
+        return SearchSpace.from_records(DatasetGenerator(seed).properties(sample, 50), seed=seed)
+    id_map = IdMap(os.path.join(dataset, "ids"))
+    try:
+        agent_ids = [guid for _, guid in id_map.items("agent")]
+    finally:
+        id_map.close()
+    return SearchSpace.from_records(read_ndjson(path), agent_ids, seed=seed)
+
+
+# ── Geração de pesquisas ─────────────────────────────────────────────────
+
+class ZipfPicker:
+    """Escolhe de uma lista ordenada por frequência com P(rank r) ∝ 1 / r^s"""
+
+    def __init__(self, items: Sequence[Any], exponent: float):
+        self.items = list(items)
+        weights = [1 / (rank ** exponent) for rank in range(1, len(self.items) + 1)]
+        self.cumulative = list(itertools.accumulate(weights))
+
+    def pick(self, rng: random.Random) -> Any:
+        if not self.items:
+            return None
+        point = rng.random() * self.cumulative[-1]
+        return self.items[min(bisect.bisect_left(self.cumulative, point), len(self.items) - 1)]
+
+
+class QueryMix:
+    """Gerador determinístico (por seed) de parâmetros de GET /properties"""
+
+    def __init__(self, space: SearchSpace, rates: Optional[Dict[str, float]] = None, zipf: float = 1.1,
+                 page_size: int = 20, deep_share: float = 0.02, max_page: int = 5000):
+        self.space = space
+        self.rates = rates or dict(DEFAULT_RATES)
+        self.page_size = page_size
+        self.deep_share = deep_share
+        self.max_page = max(max_page, 11)
+        self.municipalities = ZipfPicker(space.municipalities, zipf)
+        self.terms = ZipfPicker(space.terms, zipf)
+        self.types = ZipfPicker(space.types, 1.0)
+        self._pages, weights = zip(*SHALLOW_PAGES)
+        self._page_cumulative = list(itertools.accumulate(weights))
+
+    def page(self, rng: random.Random) -> int:
+        if rng.random() < self.deep_share:
+            # Log-uniforme: tanto 50 como 5000 aparecem, com mais peso nas dezenas e centenas
+            return int(math.exp(rng.uniform(math.log(11), math.log(self.max_page))))
+        point = rng.random() * self._page_cumulative[-1]
+        return self._pages[bisect.bisect_left(self._page_cumulative, point)]
+
+    def filters(self, rng: random.Random) -> Dict[str, Any]:
+        space, rates = self.space, self.rates
+        params: Dict[str, Any] = {}
+        if space.terms and rng.random() < rates["searchTerm"]:
+            params["searchTerm"] = self.terms.pick(rng)
+        if space.types and rng.random() < rates["type"]:
+            params["type"] = self.types.pick(rng)
+        if rng.random() < rates["status"]:
+            params["status"] = rng.choice(PUBLIC_STATUSES)
+        if rng.random() < rates["transactionType"]:
+            params["transactionType"] = rng.choices((0, 1), weights=(70, 30))[0]
+        if space.prices and rng.random() < rates["price"]:
+            low, high = space.price_band(params.get("transactionType"), rng)
+            shape = rng.choices([s for s, _ in PRICE_SHAPES], weights=[w for _, w in PRICE_SHAPES])[0]
+            if shape != "max":
+                params["minPrice"] = int(low)
+            if shape != "min":
+                params["maxPrice"] = int(math.ceil(high))
+        if space.municipalities and rng.random() < rates["municipality"]:
+            params["municipality"] = self.municipalities.pick(rng)
+        if rng.random() < rates["minBedrooms"]:
+            params["minBedrooms"] = rng.choices((1, 2, 3, 4), weights=(20, 40, 30, 10))[0]
+        if rng.random() < rates["minBathrooms"]:
+            params["minBathrooms"] = rng.choice((1, 2, 3))
+        if rng.random() < rates["featuredOnly"]:
+            params["featuredOnly"] = "true"
+        if space.agent_ids and rng.random() < rates["agentId"]:
+            params["agentId"] = rng.choice(space.agent_ids)
+        return params
+
+    def query(self, rng: random.Random) -> Dict[str, Any]:
+        return {**self.filters(rng), "pageNumber": self.page(rng), "pageSize": self.page_size}
+
+    def queries(self, count: int, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+        rng = random.Random(seed)
+        return [self.query(rng) for _ in range(count)]
+
+    def isolated(self, rng: random.Random) -> Dict[str, Dict[str, Any]]:
+        """Uma pesquisa por filtro, só com esse filtro: custo de cada um sem interferência dos outros"""
+        singles = {}
+        for name in FILTERS:
+            params = {}
+            for _ in range(200):
+                params = {k: v for k, v in self.filters(random.Random(rng.random())).items() if k == name}
+                if params:
+                    break
+            if not params and name in ("status", "featuredOnly"):
+                params = {name: 0 if name == "status" else "true"}
+            if params:
+                singles[name] = params
+        return singles
+
+
+# ── Medição ──────────────────────────────────────────────────────────────
+
+@dataclass
+class MixResult:
+    combos: LatencyRecorder = field(default_factory=LatencyRecorder)
+    pages: LatencyRecorder = field(default_factory=LatencyRecorder)
+    # combinação -> [pesquisas sem resultados, soma do totalCount]
+    hits: Dict[str, List[int]] = field(default_factory=dict)
+    elapsed: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record_hits(self, combo: str, total: Optional[int]) -> None:
+        with self._lock:
+            entry = self.hits.setdefault(combo, [0, 0])
+            if total is not None:
+                entry[0] += total == 0
+                entry[1] += total
+
+
+def search(api: ApiClient, params: Dict[str, Any]) -> Tuple[float, int, Optional[int]]:
+    """(latência em s, status, totalCount) de um GET /properties"""
+    started = time.perf_counter()
+    try:
+        response = api.get("/properties", params=params)
+        status = response.status_code
+        total = response.json().get("totalCount") if status == 200 else None
+    except (requests.RequestException, ValueError):
+        status, total = 0, None
+    return time.perf_counter() - started, status, total
+
+
+def run_mix(api: ApiClient, queries: Sequence[Dict[str, Any]], concurrency: int,
+            result: Optional[MixResult] = None) -> MixResult:
+    """Corre as pesquisas com concurrency em paralelo, agrupadas por combinação e por profundidade"""
+    result = result or MixResult()
+
+    def one(params: Dict[str, Any]) -> None:
+        latency, status, total = search(api, params)
+        combo = signature(params)
+        result.combos.record(combo, latency, status)
+        result.pages.record(page_bucket(params["pageNumber"]), latency, status)
+        result.record_hits(combo, total)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="search") as executor:
+        list(executor.map(one, queries))
+    result.elapsed += time.perf_counter() - started
+    return result
+
+
+def sweep(api: ApiClient, templates: Dict[str, Dict[str, Any]], pages: Sequence[int], page_size: int,
+          repeats: int, concurrency: int) -> Dict[str, Dict[str, Any]]:
+    """Cada template repetido em cada página: {nome: {página: estatísticas}}"""
+    recorder = LatencyRecorder()
+    jobs = [(name, page) for name in templates for page in pages for _ in range(repeats)]
+
+    def one(job: Tuple[str, int]) -> None:
+        name, page = job
+        latency, status, _ = search(api, {**templates[name], "pageNumber": page, "pageSize": page_size})
+        recorder.record(f"{name}\t{page}", latency, status)
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="sweep") as executor:
+        list(executor.map(one, jobs))
+    report: Dict[str, Dict[str, Any]] = {}
+    for key, stats in recorder.summary().items():
+        name, page = key.split("\t")
+        report.setdefault(name, {})[page] = stats
+    return report
+
+
+# ── Relatório ────────────────────────────────────────────────────────────
+
+def rank_combos(result: MixResult, min_samples: int, slow_ms: float) -> List[Dict[str, Any]]:
+    """Combinações com amostras suficientes, da mais lenta para a mais rápida (p95)"""
+    summary = result.combos.summary()
+    total = sum(s["count"] for s in summary.values()) or 1
+    base = summary.get(NO_FILTERS, {}).get("p50Ms")
+    ranked = []
+    for combo, stats in summary.items():
+        if stats["count"] < min_samples:
+            continue
+        zero, hits = result.hits.get(combo, [0, 0])
+        ranked.append({
+            "combo": combo,
+            "filters": 0 if combo == NO_FILTERS else combo.count("+") + 1,
+            "share": stats["count"] / total,
+            "zeroResultRate": zero / stats["count"],
+            "meanTotal": hits / stats["count"],
+            "vsBase": stats["p50Ms"] / base if base else None,
+            # Sem filtros não há índice que ajude: aí o custo é a listagem em si
+            "indexCandidate": combo != NO_FILTERS and stats["p95Ms"] >= slow_ms,
+            **stats,
+        })
+    ranked.sort(key=lambda row: row["p95Ms"], reverse=True)
+    return ranked
+
+
+def keyset_report(deep: Dict[str, Dict[str, Any]], ratio: float) -> Dict[str, Dict[str, Any]]:
+    """Por combinação: p50 de cada página relativo à página 1 e se justifica paginação keyset"""
+    report = {}
+    for name, pages in deep.items():
+        first = pages.get("1", {}).get("p50Ms")
+        ratios = {page: stats["p50Ms"] / first for page, stats in pages.items() if first}
+        worst = max(ratios.values(), default=0.0)
+        report[name] = {"ratios": ratios, "worst": worst, "keyset": worst >= ratio}
+    return report
+
+
+def coverage(result: MixResult) -> Dict[str, Any]:
+    """Combinações distintas vistas e filtros que nunca apareceram na mistura"""
+    combos = list(result.combos.summary())
+    used = {name for combo in combos for name in combo.split("+")}
+    return {
+        "distinctCombos": len(combos),
+        "possibleCombos": 2 ** len(FILTERS),
+        "missingFilters": [name for name in FILTERS if name not in used],
+    }
@@ -0,0 +1,256 @@
+"""
+Replay em vários processos: o coordenador divide o dataset em shards por
+uma chave estável e cada worker (um processo com o seu pool de ligações,
+eventualmente contra outra instância da API) faz o replay do seu shard.
+As fases avançam em conjunto com uma barreira entre processos, porque
+propostas, visitas e notificações referenciam entidades de qualquer shard.
+
+O IdMap é o do dataset, partilhado: cada registo tem um offset fixo pelo
+seu índice, por isso os workers escrevem em posições disjuntas com pwrite e
+no fim o mapa já contém os ids de todos os shards, sem passo de junção.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import time
+import zlib
+from dataclasses import asdict
+from datetime import date
+from threading import BrokenBarrierError
+from typing import Any, Dict, IO, List, Optional, Tuple
+
+from .auth import ADMIN, TokenManager
+from .engine import SeedEngine
+from .http_client import ApiClient, HttpConfig
+from .images import ImagePool
+from .ndjson_io import IdMap, open_text
+from .profiles import read_manifest
+from .progress import Progress
+from .replay import IMAGES, KINDS, DatasetReplayer, StageStats, find_dataset_file
+from .throttle import Throttle
+from .tracing import Tracer
+
+SPLIT_VERSION = 1
+SPLIT_MARKER = "split.json"
+# Tipo -> campo com a chave do shard. Os imóveis e as visitas seguem o agente,
+# para que cada worker crie os imóveis dos agentes que ele próprio criou
+SHARD_KEYS = {
+    "clients": "key",
+    "agents": "key",
+    "properties": "agentKey",
+    "proposals": "key",
+    "visits": "agentKey",
+    "notifications": "recipientKey",
+}
+PHASES = 3
+
+
+def add_shard_arguments(parser: argparse.ArgumentParser) -> None:
+    """Regista as opções do replay em vários processos"""
+    group = parser.add_argument_group("Shards")
+    group.add_argument("--shards", type=int, default=0,
+                       help="Processos worker, cada um com o seu shard do dataset (default: 0, um só processo)")
+    group.add_argument("--api-urls", default=None,
+                       help="URLs base das instâncias da API, separados por vírgula, atribuídos aos workers "
+                            "em round-robin (default: --api-url)")
+
+
+def api_urls(args: argparse.Namespace) -> List[str]:
+    urls = [url.strip().rstrip("/") for url in (args.api_urls or "").split(",") if url.strip()]
+    return urls or [args.api_url.rstrip("/")]
+
+
+def shard_of(key: str, shards: int) -> int:
+    # crc32 e não hash(): o hash de str muda entre processos (PYTHONHASHSEED)
+    return zlib.crc32(key.encode("utf-8")) % shards
+
+
+# ── Divisão ──────────────────────────────────────────────────────────────
+
+def shard_dirs(directory: str, shards: int) -> List[str]:
+    return [os.path.join(directory, "shards", str(shards), f"{index:03d}") for index in range(shards)]
+
+
+def split_dataset(directory: str, shards: int) -> Tuple[List[str], bool]:
+    """
+    Escreve <dataset>/shards/<N>/<i>/<tipo>.ndjson numa passagem por tipo,
+    copiando as linhas tal como estão. Um split anterior é reutilizado se
+    foi feito a partir dos mesmos ficheiros (sha256 do manifesto). Devolve
+    os diretórios e se o split foi reutilizado.
+    """
+    dirs = shard_dirs(directory, shards)
+    marker_path = os.path.join(os.path.dirname(dirs[0]), SPLIT_MARKER)
+    manifest = read_manifest(directory) or {}
+    marker = {"version": SPLIT_VERSION, "shards": shards, "sha256": manifest.get("sha256")}
+    if manifest.get("sha256") and os.path.exists(marker_path):
+        with open(marker_path, encoding="utf-8") as handle:
+            previous = json.load(handle)
+        if {k: previous.get(k) for k in marker} == marker:
+            return dirs, True
+
+    for path in dirs:
+        os.makedirs(path, exist_ok=True)
+    counts: Dict[str, List[int]] = {}
+    for kind in KINDS:
+        source = find_dataset_file(directory, kind)
+        if source is None:
+            continue
+        field_name = SHARD_KEYS[kind]
+        outputs: List[IO[str]] = [open_text(os.path.join(path, f"{kind}.ndjson"), "w") for path in dirs]
+        written = [0] * shards
+        try:
+            with open_text(source, "r") as handle:
+                for line in handle:
+                    if not line.strip():
+                        continue
+                    index = shard_of(json.loads(line)[field_name], shards)
+                    outputs[index].write(line if line.endswith("\n") else line + "\n")
+                    written[index] += 1
+        finally:
+            for output in outputs:
+                output.close()
+        counts[kind] = written
+    with open(marker_path, "w", encoding="utf-8") as handle:
+        json.dump({**marker, "counts": counts}, handle, indent=2)
+    return dirs, False
+
+
+# ── Worker ───────────────────────────────────────────────────────────────
+
+def run_worker(index: int, directory: str, url: str, ids_dir: str, args: argparse.Namespace,
+               anchor: Optional[date], barrier: Any, events: Any) -> None:
+    """
+    Processo worker: login próprio, pool de ligações próprio e o replay do
+    shard. Envia ("phase", i, fase) no fim de cada fase e ("done", i,
+    stats, erros, erro) no fim; qualquer exceção parte a barreira para que
+    os outros workers não fiquem à espera.
+    """
+    stats: Dict[str, StageStats] = {}
+    progress = Progress("quiet", stream=open(os.devnull, "w"))
+    try:
+        config = HttpConfig.from_args(args)
+        config.base_url = url
+        config.pool_maxsize = max(config.pool_maxsize, args.concurrency)
+        with ApiClient(config) as api, SeedEngine(args.concurrency) as engine, IdMap(ids_dir) as id_map:
+            # O ritmo total pedido divide-se pelos workers; o trace fica um ficheiro por worker
+            if getattr(args, "max_rps", 0):
+                args.max_rps = args.max_rps / args.shards
+            throttle = Throttle.from_args(args, args.concurrency)
+            if throttle:
+                throttle.attach(api)
+            if getattr(args, "trace", None):
+                args.trace = f"{args.trace}.{index:03d}"
+            tracer = Tracer.from_args(args)
+            if tracer:
+                tracer.attach(api)
+            tokens = TokenManager(api)
+            pool = None
+            try:
+                tokens.register_admin()
+                tokens.state(ADMIN)
+                tokens.attach(api, ADMIN)
+                if args.images > 0:
+                    pool = ImagePool.from_args(args)
+                    pool.open()
+                replayer = DatasetReplayer(api, engine, id_map, pool, args.images, progress, anchor,
+                                           batch_size=args.batch_size)
+                stats = replayer.stats
+
+                def sync(phase: int) -> None:
+                    events.put(("phase", index, phase))
+                    barrier.wait()
+
+                engine.run(replayer.replay(directory, sync))
+            finally:
+                tokens.close()
+                if pool is not None:
+                    pool.close()
+                if tracer:
+                    tracer.close()
+        events.put(("done", index, {k: asdict(s) for k, s in stats.items()}, error_samples(progress), None))
+    except BaseException as e:  # o coordenador tem de saber sempre do fim do worker
+        barrier.abort()
+        if isinstance(e, BrokenBarrierError):
+            error = "parado porque outro worker falhou"
+        else:
+            error = f"{type(e).__name__}: {e}"
+        events.put(("done", index, {k: asdict(s) for k, s in stats.items()}, error_samples(progress), error))
+
+
+def error_samples(progress: Progress) -> Dict[str, List[str]]:
+    return {name: list(stage.samples) for name, stage in progress.stages.items() if stage.samples}
+
+
+# ── Coordenador ──────────────────────────────────────────────────────────
+
+def merge_stats(parts: List[Dict[str, Dict[str, Any]]]) -> Dict[str, StageStats]:
+    """Soma as estatísticas dos workers por tipo"""
+    merged = {kind: StageStats() for kind in KINDS + (IMAGES,)}
+    for part in parts:
+        for kind, values in part.items():
+            total = merged.setdefault(kind, StageStats())
+            for name in ("created", "skipped", "failed", "batches", "fallbacks"):
+                setattr(total, name, getattr(total, name) + values[name])
+            for status, n in values["errors"].items():
+                total.errors[int(status)] = total.errors.get(int(status), 0) + n
+    return merged
+
+
+def run_sharded(dirs: List[str], urls: List[str], ids_dir: str, args: argparse.Namespace,
+                anchor: Optional[date]) -> Tuple[Dict[str, StageStats], List[str]]:
+    """
+    Um processo por shard (spawn: nada do estado do coordenador passa para
+    os workers); o worker i usa urls[i % len(urls)]. Devolve as
+    estatísticas somadas e os erros fatais dos workers.
+    """
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(len(dirs))
+    events = context.Queue()
+    workers = [
+        context.Process(target=run_worker, name=f"shard-{index:03d}",
+                        args=(index, path, urls[index % len(urls)], ids_dir, args, anchor, barrier, events))
+        for index, path in enumerate(dirs)
+    ]
+    for worker in workers:
+        worker.start()
+
+    results: Dict[int, Dict[str, Dict[str, Any]]] = {}
+    failures: List[str] = []
+    phases: Dict[int, int] = {}
+    dead: set = set()
+    started = time.monotonic()
+    while len(results) < len(workers):
+        try:
+            event = events.get(timeout=1.0)
+        except queue.Empty:
+            # Um worker morto sem evento (SIGKILL, OOM) deixaria os outros presos na barreira.
+            # Só conta à segunda espera vazia: o evento final pode ainda vir a caminho
+            for index, worker in enumerate(workers):
+                if index in results or worker.is_alive():
+                    continue
+                if index in dead:
+                    barrier.abort()
+                    results[index] = {}
+                    failures.append(f"shard {index:03d}: terminou com código {worker.exitcode}")
+                dead.add(index)
+            continue
+        if event[0] == "phase":
+            _, index, phase = event
+            phases[phase] = phases.get(phase, 0) + 1
+            if phases[phase] == len(workers):
+                print(f"   ✅ fase {phase}/{PHASES} em todos os {len(workers)} workers "
+                      f"({time.monotonic() - started:.1f}s)")
+        else:
+            _, index, stats, samples, error = event
+            results[index] = stats
+            for kind, messages in samples.items():
+                for message in messages:
+                    print(f"   shard {index:03d} {kind}: {message}")
+            if error:
+                failures.append(f"shard {index:03d}: {error}")
+    for worker in workers:
+        worker.join()
+    return merge_stats(list(results.values())), failures
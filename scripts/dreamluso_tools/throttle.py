@@ -0,0 +1,246 @@
+"""
+Controlo de carga do lado do cliente: token bucket para o ritmo global e
+limite de pedidos em curso por rota ajustado em AIMD pela latência e por
+respostas 429/503
+"""
+
+import argparse
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from .metrics import percentile
+from .tracing import route_template
+
+THROTTLE_STATUSES = (429, 503)
+
+
+def add_throttle_arguments(parser: argparse.ArgumentParser) -> None:
+    """Regista as opções de limitação de ritmo e concorrência adaptativa"""
+    group = parser.add_argument_group("Controlo de carga")
+    group.add_argument("--max-rps", type=float, default=0.0,
+                       help="Teto de pedidos/s para toda a execução; 0 = sem teto (default: %(default)s)")
+    group.add_argument("--burst", type=int, default=None,
+                       help="Pedidos que podem sair de rajada acima do ritmo (default: 1s de --max-rps)")
+    group.add_argument("--adaptive", action="store_true",
+                       help="Ajusta os pedidos em curso por rota (AIMD) pela latência e por 429/503")
+    group.add_argument("--target-p99", type=float, default=500.0, metavar="MS",
+                       help="p99 por rota acima do qual a concorrência desce (default: %(default)s)")
+    group.add_argument("--min-inflight", type=int, default=1,
+                       help="Mínimo de pedidos em curso por rota (default: %(default)s)")
+
+
+class TokenBucket:
+    """
+    Ritmo médio rate/s com rajadas até burst. Quem não encontra token
+    reserva-o (o saldo fica negativo) e dorme fora do lock o tempo que
+    falta, pelo que os pedidos saem pela ordem de chegada.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate deve ser > 0")
+        self.rate = rate
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Bloqueia até haver token; devolve os segundos de espera"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+@dataclass
+class LimitStats:
+    increases: int = 0
+    decreases: int = 0
+    throttled: int = 0
+    lowest: float = 0.0
+    highest: float = 0.0
+    last_p99: float = 0.0
+    history: List[Tuple[float, float]] = field(default_factory=list)
+
+
+class AdaptiveLimit:
+    """
+    Limite de pedidos em curso de uma rota. A cada janela de window
+    respostas compara o p99 com target_p99: acima, o limite multiplica por
+    decrease; abaixo, e se o limite chegou a ser atingido, sobe increase.
+    Um 429/503 reduz logo, no máximo uma vez por "ida e volta" (limit
+    respostas), para não colapsar com uma rajada de erros da mesma janela.
+    """
+
+    def __init__(self, initial: float, minimum: float, maximum: float, target_p99: float,
+                 window: int = 50, increase: float = 1.0, decrease: float = 0.7):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = min(maximum, max(minimum, initial))
+        self.target_p99 = target_p99
+        self.window = window
+        self.increase = increase
+        self.decrease = decrease
+        self.inflight = 0
+        self.stats = LimitStats(lowest=self.limit, highest=self.limit)
+        self._latencies: List[float] = []
+        self._saturated = False
+        self._since_decrease = 0
+        self._started = time.monotonic()
+        self._condition = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._condition:
+            while self.inflight >= int(self.limit):
+                self._condition.wait()
+            self.inflight += 1
+            if self.inflight >= int(self.limit):
+                self._saturated = True
+
+    def _set(self, limit: float) -> None:
+        self.limit = min(self.maximum, max(self.minimum, limit))
+        self.stats.lowest = min(self.stats.lowest, self.limit)
+        self.stats.highest = max(self.stats.highest, self.limit)
+        self.stats.history.append((round(time.monotonic() - self._started, 3), round(self.limit, 2)))
+
+    def release(self, latency: float, throttled: bool = False) -> None:
+        with self._condition:
+            self.inflight -= 1
+            self._since_decrease += 1
+            self._latencies.append(latency)
+            if throttled:
+                self.stats.throttled += 1
+                if self._since_decrease >= self.limit:
+                    self._set(self.limit * self.decrease)
+                    self.stats.decreases += 1
+                    self._since_decrease = 0
+            if len(self._latencies) >= self.window:
+                p99 = percentile(sorted(self._latencies), 99)
+                self.stats.last_p99 = p99
+                if p99 > self.target_p99:
+                    if self._since_decrease >= self.limit:
+                        self._set(self.limit * self.decrease)
+                        self.stats.decreases += 1
+                        self._since_decrease = 0
+                elif self._saturated and not throttled:
+                    self._set(self.limit + self.increase)
+                    self.stats.increases += 1
+                self._latencies = []
+                self._saturated = False
+            self._condition.notify_all()
+
+
+def _was_throttled(response: requests.Response) -> bool:
+    """429/503 na resposta final ou em tentativas que o urllib3 repetiu"""
+    if response.status_code in THROTTLE_STATUSES:
+        return True
+    history = getattr(getattr(response.raw, "retries", None), "history", None) or ()
+    return any(attempt.status in THROTTLE_STATUSES for attempt in history)
+
+
+class Throttle:
+    """
+    Aplicado pelo ApiClient a cada pedido (ver ApiClient.throttle): primeiro
+    o lugar na rota (se adaptive), depois o token do ritmo global. Partilhado
+    por todos os clientes de uma execução.
+    """
+
+    def __init__(self, rate: float = 0.0, burst: Optional[int] = None, adaptive: bool = False,
+                 maximum: int = 8, minimum: int = 1, target_p99: float = 0.5,
+                 initial: Optional[int] = None):
+        self.bucket = TokenBucket(rate, burst) if rate > 0 else None
+        self.adaptive = adaptive
+        self.maximum = max(1, maximum)
+        self.minimum = max(1, min(minimum, self.maximum))
+        self.initial = initial if initial is not None else max(self.minimum, self.maximum // 4)
+        self.target_p99 = target_p99
+        self.limits: Dict[str, AdaptiveLimit] = {}
+        self.waited = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace, concurrency: int) -> Optional["Throttle"]:
+        """None se nenhuma das opções estiver ativa; o teto por rota é --concurrency"""
+        if not args.max_rps and not args.adaptive:
+            return None
+        return cls(rate=args.max_rps, burst=args.burst, adaptive=args.adaptive,
+                   maximum=concurrency, minimum=args.min_inflight,
+                   target_p99=args.target_p99 / 1000)
+
+    def attach(self, api: Any) -> Any:
+        api.throttle = self
+        return api
+
+    def _limit(self, route: str) -> AdaptiveLimit:
+        with self._lock:
+            limit = self.limits.get(route)
+            if limit is None:
+                limit = self.limits[route] = AdaptiveLimit(self.initial, self.minimum, self.maximum,
+                                                           self.target_p99)
+            return limit
+
+    def call(self, method: str, path: str, send: Callable[[], requests.Response]) -> requests.Response:
+        limit = self._limit(f"{method} {route_template(path)}") if self.adaptive else None
+        if limit is not None:
+            limit.acquire()
+        started = time.perf_counter()
+        throttled = False
+        try:
+            if self.bucket is not None:
+                waited = self.bucket.acquire()
+                if waited:
+                    with self._lock:
+                        self.waited += waited
+                started = time.perf_counter()
+            response = send()
+            throttled = _was_throttled(response)
+            return response
+        finally:
+            if limit is not None:
+                limit.release(time.perf_counter() - started, throttled)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            limits = dict(self.limits)
+        return {
+            route: {
+                "limit": limit.limit,
+                "lowest": limit.stats.lowest,
+                "highest": limit.stats.highest,
+                "increases": limit.stats.increases,
+                "decreases": limit.stats.decreases,
+                "throttled": limit.stats.throttled,
+                "lastP99Ms": limit.stats.last_p99 * 1000,
+                "history": limit.stats.history,
+            }
+            for route, limit in sorted(limits.items())
+        }
+
+    def print_summary(self) -> None:
+        if self.bucket is not None:
+            print(f"\n🚦 Ritmo limitado a {self.bucket.rate:g} pedidos/s "
+                  f"({self.waited:.1f}s de espera acumulada)")
+        summary = self.summary()
+        if not summary:
+            return
+        width = max(len(route) for route in summary)
+        rule = "━" * (width + 58)
+        print("\n" + rule)
+        print(f"🎚️  CONCORRÊNCIA ADAPTATIVA (p99 alvo {self.target_p99 * 1000:.0f} ms)")
+        print(rule)
+        print(f"   {'rota':<{width}} {'limite':>7} {'mín':>5} {'máx':>5} {'↑':>4} {'↓':>4} "
+              f"{'429/503':>8} {'p99 ms':>9}")
+        for route, s in summary.items():
+            print(f"   {route:<{width}} {s['limit']:>7.1f} {s['lowest']:>5.1f} {s['highest']:>5.1f} "
+                  f"{s['increases']:>4} {s['decreases']:>4} {s['throttled']:>8} {s['lastP99Ms']:>9.1f}")
+        print(rule)
@@ -0,0 +1,266 @@
+"""
+Tracing por pedido: rota, status, bytes, tempos de DNS/ligação/primeiro
+byte/total e retries, exportados em NDJSON e resumidos por rota
+"""
+
+import argparse
+import json
+import re
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from .metrics import percentile
+
+# GUIDs e ids numéricos nos segmentos do caminho passam a {id}
+_ID_SEGMENT = re.compile(
+    r"/(?:[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|\d+)(?=/|$)"
+)
+
+# Tempos da ligação do pedido em curso nesta thread (preenchidos pelo urllib3)
+_current = threading.local()
+
+
+def add_trace_arguments(parser: argparse.ArgumentParser) -> None:
+    """Regista as opções de tracing"""
+    group = parser.add_argument_group("Tracing")
+    group.add_argument("--trace", metavar="FICHEIRO",
+                       help="Escreve um evento NDJSON por pedido à API e mostra o resumo por rota")
+
+
+def route_template(path: str) -> str:
+    """'/agents/3f2a…/approve?x=1' -> '/agents/{id}/approve'"""
+    return _ID_SEGMENT.sub("/{id}", path.split("?", 1)[0])
+
+
+def _timing() -> Optional[Dict[str, float]]:
+    return getattr(_current, "timing", None)
+
+
+class _TimedConnection:
+    """Mixin das ligações urllib3: mede DNS, ligação (com TLS) e primeiro byte"""
+
+    def _new_conn(self):
+        timing = _timing()
+        if timing is not None:
+            started = time.perf_counter()
+            try:
+                socket.getaddrinfo(self._dns_host, self.port, 0, socket.SOCK_STREAM)
+            except OSError:
+                pass  # O erro real é reportado pelo urllib3 logo a seguir
+            timing["dns"] += time.perf_counter() - started
+        return super()._new_conn()
+
+    def connect(self):
+        timing = _timing()
+        started = time.perf_counter()
+        dns_before = timing["dns"] if timing is not None else 0.0
+        try:
+            super().connect()
+        finally:
+            if timing is not None:
+                timing["connect"] += time.perf_counter() - started - (timing["dns"] - dns_before)
+                timing["connections"] += 1
+
+    def getresponse(self, *args, **kwargs):
+        response = super().getresponse(*args, **kwargs)
+        timing = _timing()
+        if timing is not None:
+            # Da entrada em ApiClient.request até aos cabeçalhos da última tentativa
+            timing["ttfb"] = time.perf_counter() - timing["start"]
+        return response
+
+
+class TimedHTTPConnection(_TimedConnection, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnection, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+def instrument_session(session: requests.Session) -> None:
+    """Troca as pools dos adapters da sessão pelas versões cronometradas"""
+    for adapter in set(session.adapters.values()):
+        manager = getattr(adapter, "poolmanager", None)
+        if manager is None:
+            continue
+        manager.clear()
+        manager.pool_classes_by_scheme = {"http": TimedHTTPConnectionPool,
+                                          "https": TimedHTTPSConnectionPool}
+
+
+def _body_size(body: Any) -> int:
+    if body is None:
+        return 0
+    try:
+        return len(body)
+    except TypeError:
+        return 0
+
+
+@dataclass
+class RouteStats:
+    """Agregados de uma rota; tempos em segundos"""
+    totals: List[float] = field(default_factory=list)
+    ttfb: float = 0.0
+    connect: float = 0.0
+    errors: int = 0
+    retries: int = 0
+    connections: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    statuses: Dict[int, int] = field(default_factory=dict)
+
+    def summary(self) -> Dict[str, Any]:
+        values = sorted(self.totals)
+        count = len(values)
+        return {
+            "count": count,
+            "errors": self.errors,
+            "retries": self.retries,
+            "newConnections": self.connections,
+            "p50Ms": percentile(values, 50) * 1000,
+            "p95Ms": percentile(values, 95) * 1000,
+            "p99Ms": percentile(values, 99) * 1000,
+            "totalMs": sum(values) * 1000,
+            "meanTtfbMs": self.ttfb / count * 1000 if count else 0.0,
+            "meanConnectMs": self.connect / count * 1000 if count else 0.0,
+            "bytesSent": self.bytes_sent,
+            "bytesReceived": self.bytes_received,
+            "statuses": {str(code): n for code, n in sorted(self.statuses.items())},
+        }
+
+
+class Tracer:
+    """
+    Regista cada pedido do ApiClient (ver ApiClient.tracer). Os eventos vão
+    para path em NDJSON à medida que acontecem; o resumo por rota fica em
+    memória. Seguro entre threads.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._handle = open(path, "w", encoding="utf-8", buffering=1024 * 1024) if path else None
+        self._lock = threading.Lock()
+        self.routes: Dict[str, RouteStats] = {}
+        self.started = time.monotonic()
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace) -> Optional["Tracer"]:
+        return cls(args.trace) if getattr(args, "trace", None) else None
+
+    def attach(self, api: Any) -> Any:
+        """Liga o tracer a um ApiClient e cronometra as ligações da sua sessão"""
+        instrument_session(api.session)
+        api.tracer = self
+        return api
+
+    def call(self, method: str, path: str, send: Callable[[], requests.Response]) -> requests.Response:
+        """Executa send() cronometrado e regista o evento"""
+        timing = {"start": time.perf_counter(), "dns": 0.0, "connect": 0.0,
+                  "ttfb": 0.0, "connections": 0}
+        previous = _timing()
+        _current.timing = timing
+        response = None
+        error = None
+        try:
+            response = send()
+            return response
+        except requests.RequestException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            total = time.perf_counter() - timing["start"]
+            _current.timing = previous
+            self.record(method, path, response, timing, total, error)
+
+    def record(self, method: str, path: str, response: Optional[requests.Response],
+               timing: Dict[str, float], total: float, error: Optional[str] = None) -> None:
+        route = f"{method} {route_template(path)}"
+        status = response.status_code if response is not None else 0
+        retries = 0
+        sent = received = 0
+        if response is not None:
+            history = getattr(getattr(response.raw, "retries", None), "history", None) or ()
+            retries = len(history)
+            sent = _body_size(response.request.body)
+            received = len(response.content)
+        event = {
+            "ts": round(time.time(), 6),
+            "method": method,
+            "route": route_template(path),
+            "path": path,
+            "status": status,
+            "bytesSent": sent,
+            "bytesReceived": received,
+            "dnsMs": round(timing["dns"] * 1000, 3),
+            "connectMs": round(timing["connect"] * 1000, 3),
+            "ttfbMs": round(timing["ttfb"] * 1000, 3),
+            "totalMs": round(total * 1000, 3),
+            "retries": retries,
+            "reused": timing["connections"] == 0,
+            "thread": threading.current_thread().name,
+        }
+        if error:
+            event["error"] = error
+        with self._lock:
+            stats = self.routes.get(route)
+            if stats is None:
+                stats = self.routes[route] = RouteStats()
+            stats.totals.append(total)
+            stats.ttfb += timing["ttfb"]
+            stats.connect += timing["connect"]
+            stats.retries += retries
+            stats.connections += int(timing["connections"])
+            stats.bytes_sent += sent
+            stats.bytes_received += received
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            if status == 0 or status >= 400:
+                stats.errors += 1
+            if self._handle is not None:
+                self._handle.write(json.dumps(event, separators=(",", ":")) + "\n")
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {route: stats.summary() for route, stats in self.routes.items()}
+
+    def print_summary(self) -> None:
+        """Tabela por rota, da que mais tempo acumulou para a que menos"""
+        summary = sorted(self.summary().items(), key=lambda item: item[1]["totalMs"], reverse=True)
+        if not summary:
+            return
+        width = max([len(route) for route, _ in summary] + [8])
+        rule = "━" * (width + 82)
+        print("\n" + rule)
+        print(f"🔎 PEDIDOS POR ROTA ({time.monotonic() - self.started:.1f}s)")
+        print(rule)
+        print(f"   {'rota':<{width}} {'n':>6} {'erros':>6} {'retries':>7} {'p50 ms':>8} {'p95 ms':>8} "
+              f"{'p99 ms':>8} {'ttfb ms':>8} {'total s':>8} {'KB env':>8} {'KB rec':>8}")
+        for route, s in summary:
+            print(f"   {route:<{width}} {s['count']:>6} {s['errors']:>6} {s['retries']:>7} "
+                  f"{s['p50Ms']:>8.1f} {s['p95Ms']:>8.1f} {s['p99Ms']:>8.1f} {s['meanTtfbMs']:>8.1f} "
+                  f"{s['totalMs'] / 1000:>8.2f} {s['bytesSent'] / 1024:>8.1f} {s['bytesReceived'] / 1024:>8.1f}")
+        print(rule)
+        if self.path:
+            print(f"💾 Trace em {self.path}")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
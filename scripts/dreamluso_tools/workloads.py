@@ -0,0 +1,150 @@
+"""
+Cenários de utilizador da API DreamLuso para os testes de carga
+"""
+
+import itertools
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from .auth import TokenManager, TokenState
+from .generator import DatasetGenerator
+from .http_client import ApiClient
+from .loadgen import LoadSession, Scenario
+from .pagination import iter_items
+from .payloads import TIME_SLOTS, login_payload, proposal_payload, slot_index, visit_payload
+
+DEFAULT_WEIGHTS = {
+    "browse": 50,
+    "notifications": 20,
+    "visit": 15,
+    "proposal": 10,
+    "login": 5,
+}
+
+
+@dataclass
+class WorkloadData:
+    """Ids reais usados pelos cenários, recolhidos antes do teste"""
+    user_id: Optional[str] = None
+    properties: List[Dict[str, Any]] = field(default_factory=list)
+    client_ids: List[str] = field(default_factory=list)
+    municipalities: List[str] = field(default_factory=list)
+    # Clientes e agentes autenticados com as próprias credenciais
+    clients: List[Tuple[ApiClient, TokenState]] = field(default_factory=list)
+    agents: List[Tuple[ApiClient, TokenState]] = field(default_factory=list)
+
+    @classmethod
+    def collect(cls, api: ApiClient, user_id: Optional[str], limit: int = 1000) -> "WorkloadData":
+        properties = [
+            {"id": p["id"], "agentId": p.get("agentId"), "price": p.get("price") or 0,
+             "transactionType": p.get("transactionType"), "municipality": p.get("municipality")}
+            for p in itertools.islice(iter_items(api, "/properties"), limit)
+        ]
+        client_ids = [c["id"] for c in itertools.islice(iter_items(api, "/clients"), limit)]
+        municipalities = sorted({p["municipality"] for p in properties if p["municipality"]})
+        return cls(user_id, properties, client_ids, municipalities)
+
+    def login_seeded_users(self, tokens: TokenManager, generator: DatasetGenerator,
+                           clients: int, agents: int) -> int:
+        """
+        Autentica em paralelo os primeiros utilizadores do dataset gerado
+        (as credenciais são determinísticas); devolve quantos entraram.
+        """
+        identities = []
+        for role, count in (("Client", clients), ("RealEstateAgent", agents)):
+            for i in range(count):
+                user = generator.user(role, i)
+                identities.append(tokens.register(user["key"], user["email"], user["password"]))
+        states = tokens.login_many(identities)
+        for identity, state in states.items():
+            if state is None:
+                continue
+            if state.client_id:
+                self.clients.append((tokens.client(identity), state))
+            elif state.agent_id:
+                self.agents.append((tokens.client(identity), state))
+        return len(self.clients) + len(self.agents)
+
+
+class DreamLusoWorkload:
+    """Um método por cenário; cada um recebe a LoadSession da chegada"""
+
+    def __init__(self, data: WorkloadData, login_email: str, login_password: str):
+        self.data = data
+        self.login_email = login_email
+        self.login_password = login_password
+
+    def scenarios(self, weights: Optional[Dict[str, float]] = None) -> List[Scenario]:
+        weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        unknown = set(weights) - set(DEFAULT_WEIGHTS)
+        if unknown:
+            raise ValueError(f"cenários desconhecidos: {', '.join(sorted(unknown))}")
+        return [Scenario(name, weight, getattr(self, name)) for name, weight in weights.items()]
+
+    def browse(self, s: LoadSession) -> None:
+        """Pesquisa com filtros aleatórios e abre o detalhe de um resultado"""
+        params: Dict[str, Any] = {"pageNumber": 1, "pageSize": 20}
+        if self.data.municipalities and s.rng.random() < 0.6:
+            params["municipality"] = s.rng.choice(self.data.municipalities)
+        if s.rng.random() < 0.4:
+            params["minBedrooms"] = s.rng.randint(1, 4)
+        if s.rng.random() < 0.3:
+            params["maxPrice"] = s.rng.choice((150000, 300000, 500000, 1000000))
+        response = s.call("GET /properties", "GET", "/properties", params=params)
+        if response is None or response.status_code != 200:
+            return
+        results = response.json().get("properties") or []
+        if results:
+            s.call("GET /properties/{id}", "GET", f"/properties/{s.rng.choice(results)['id']}")
+
+    def as_client(self, s: LoadSession) -> Tuple[Optional[ApiClient], Optional[str]]:
+        """(cliente HTTP, clientId) de um cliente autenticado, ou (None, id ao acaso) como admin"""
+        if self.data.clients:
+            client, state = s.rng.choice(self.data.clients)
+            return client, state.client_id
+        return None, s.rng.choice(self.data.client_ids) if self.data.client_ids else None
+
+    def notifications(self, s: LoadSession) -> None:
+        people = self.data.clients + self.data.agents
+        if people:
+            client, state = s.rng.choice(people)
+            s.call("GET /notifications/unread-count/{userId}", "GET",
+                   f"/notifications/unread-count/{state.user_id}", client=client)
+        elif self.data.user_id:
+            s.call("GET /notifications/unread-count/{userId}", "GET",
+                   f"/notifications/unread-count/{self.data.user_id}")
+
+    def visit(self, s: LoadSession) -> None:
+        """Consulta horários livres e agenda o primeiro que sobrar"""
+        client, client_id = self.as_client(s)
+        if not self.data.properties or not client_id:
+            return
+        prop = s.rng.choice(self.data.properties)
+        visit_date = date.today() + timedelta(days=s.rng.randint(1, 30))
+        response = s.call("GET /visits/available-slots", "GET", "/visits/available-slots",
+                          params={"propertyId": prop["id"], "visitDate": visit_date.isoformat()})
+        if response is None or response.status_code != 200 or not prop.get("agentId"):
+            return
+        slots = [slot for slot in response.json().get("availableSlots") or [] if slot in TIME_SLOTS]
+        if not slots:
+            return
+        # Um 400 por horário entretanto ocupado é contenção esperada, não erro
+        s.call("POST /visits", "POST", "/visits", expect=(200, 201, 400), client=client,
+               json=visit_payload(prop["id"], client_id, prop["agentId"], visit_date,
+                                  slot_index(s.rng.choice(slots)), notes="Teste de carga"))
+
+    def proposal(self, s: LoadSession) -> None:
+        client, client_id = self.as_client(s)
+        if not self.data.properties or not client_id:
+            return
+        prop = s.rng.choice(self.data.properties)
+        is_rent = prop.get("transactionType") == "Rent"
+        s.call("POST /proposals", "POST", "/proposals", client=client, json=proposal_payload(
+            client_id, prop["id"],
+            round(float(prop["price"]) * s.rng.uniform(0.85, 0.98), 2),
+            proposal_type="Rent" if is_rent else "Purchase", notes="Teste de carga"))
+
+    def login(self, s: LoadSession) -> None:
+        s.call("POST /accounts/login", "POST", "/accounts/login", auth=False,
+               json=login_payload(self.login_email, self.login_password))
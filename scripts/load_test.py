@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+DreamLuso - Teste de carga com cenários ponderados em malha aberta
+
+    python3 scripts/load_test.py --rps 50 --duration 60
+    python3 scripts/load_test.py --rps 200 --weight browse=80 --weight proposal=0 --json-out carga.json
+"""
+
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+from dreamluso_tools.auth import ADMIN, AuthError, TokenManager
+from dreamluso_tools.generator import DatasetGenerator
+from dreamluso_tools.http_client import ApiClient, HttpConfig, add_http_arguments
+from dreamluso_tools.loadgen import OpenLoopRunner, add_load_arguments, parse_weights
+from dreamluso_tools.payloads import ADMIN_EMAIL, ADMIN_PASSWORD
+from dreamluso_tools.workloads import DEFAULT_WEIGHTS, DreamLusoWorkload, WorkloadData
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Teste de carga da API DreamLuso")
+    add_http_arguments(parser)
+    add_load_arguments(parser)
+    # Retries escondiam erros e inflacionavam latências: desligados por omissão
+    parser.set_defaults(retries=0)
+    parser.add_argument("--email", default=ADMIN_EMAIL, help="Utilizador dos cenários autenticados")
+    parser.add_argument("--password", default=ADMIN_PASSWORD)
+    parser.add_argument("--as-clients", type=int, default=0, metavar="N",
+                        help="Autentica os primeiros N clientes do dataset gerado e age como eles")
+    parser.add_argument("--as-agents", type=int, default=0, metavar="N",
+                        help="Idem para os primeiros N agentes")
+    parser.add_argument("--dataset-seed", type=int, default=42,
+                        help="Seed do dataset (seed_dataset.py export --seed) de onde vêm as credenciais")
+    parser.add_argument("--weight", action="append", default=[], metavar="CENARIO=PESO",
+                        help=f"Altera o peso de um cenário ({', '.join(DEFAULT_WEIGHTS)})")
+    parser.add_argument("--json-out", help="Escreve o relatório em JSON neste ficheiro")
+    return parser.parse_args(argv)
+
+
+def main() -> int:
+    args = parse_args()
+    config = HttpConfig.from_args(args)
+    config.pool_maxsize = max(config.pool_maxsize, args.max_inflight)
+
+    with ApiClient(config) as api:
+        tokens = TokenManager(api, workers=max(8, args.max_inflight // 4))
+        try:
+            return run_load(args, api, tokens)
+        finally:
+            tokens.close()
+
+
+def run_load(args: argparse.Namespace, api: ApiClient, tokens: TokenManager) -> int:
+    print("🔐 Fazendo login...")
+    tokens.register_admin(args.email, args.password)
+    try:
+        admin = tokens.state(ADMIN)
+    except AuthError as e:
+        print(f"❌ Erro no login: {e}")
+        return 1
+    tokens.attach(api, ADMIN)
+
+    print("📋 A recolher propriedades e clientes para os cenários...")
+    data = WorkloadData.collect(api, admin.user_id)
+    print(f"   {len(data.properties)} propriedades, {len(data.client_ids)} clientes")
+
+    if args.as_clients or args.as_agents:
+        print(f"👥 A autenticar {args.as_clients} clientes e {args.as_agents} agentes do dataset...")
+        logged = data.login_seeded_users(tokens, DatasetGenerator(args.dataset_seed),
+                                         args.as_clients, args.as_agents)
+        print(f"   {logged} sessões ativas ({len(data.clients)} clientes, {len(data.agents)} agentes)")
+
+    workload = DreamLusoWorkload(data, args.email, args.password)
+    scenarios = workload.scenarios(parse_weights(args.weight))
+    mix = ", ".join(f"{s.name}={s.weight:g}" for s in scenarios)
+    print(f"\n🚀 {args.rps:g} cenários/s durante {args.duration:g}s ({args.arrival}) - {mix}")
+
+    runner = OpenLoopRunner(api, scenarios, args.rps, args.duration,
+                            max_inflight=args.max_inflight, arrival=args.arrival, seed=args.seed)
+    report = runner.run()
+
+    report.recorder.print_table(report.elapsed)
+    summary = report.to_dict()
+    print(f"   Chegadas: {report.offered}  descartadas: {report.dropped}  "
+          f"ritmo atingido: {summary['achievedRps']:.1f}/s em {report.elapsed:.1f}s")
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as handle:
+            json.dump(summary, handle, indent=2)
+        print(f"💾 Relatório guardado em {args.json_out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+DreamLuso - Carga de fan-out de notificações
+
+Cria backlogs de milhares de notificações por utilizador e simula frontends
+abertos a fazer polling de /notifications/unread-count enquanto corre
+mark-all-read e chegam notificações novas. Mede o QPS sustentado e a cauda
+de latência do contador, para decidir se precisa de cache ou de entrega por
+push.
+
+    python3 scripts/notification_fanout.py --users 50 --backlog 2000 --frontends 500 --poll-interval 10
+    python3 scripts/notification_fanout.py --backlog 0 --frontends 2000 --duration 300 --as-users 20 --json-out fanout.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import List, Optional
+
+from dreamluso_tools.auth import ADMIN, AuthError, TokenManager
+from dreamluso_tools.engine import SeedEngine, add_engine_arguments
+from dreamluso_tools.fanout import FanoutUser, FanoutWorkload, add_fanout_arguments, collect_users
+from dreamluso_tools.generator import DatasetGenerator
+from dreamluso_tools.http_client import ApiClient, HttpConfig, add_http_arguments
+from dreamluso_tools.payloads import ADMIN_EMAIL, ADMIN_PASSWORD
+from dreamluso_tools.progress import Progress, add_progress_arguments
+from dreamluso_tools.tracing import Tracer, add_trace_arguments
+from dreamluso_tools.workloads import WorkloadData
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Carga de fan-out de notificações DreamLuso")
+    add_http_arguments(parser)
+    add_engine_arguments(parser)
+    add_fanout_arguments(parser)
+    add_progress_arguments(parser, default="quiet")
+    add_trace_arguments(parser)
+    # Um lote repetido duplicaria o backlog; um poll falhado conta como erro, não se repete
+    parser.set_defaults(retries=0)
+    parser.add_argument("--email", default=ADMIN_EMAIL)
+    parser.add_argument("--password", default=ADMIN_PASSWORD)
+    parser.add_argument("--as-users", type=int, default=0, metavar="N",
+                        help="Autentica os primeiros N clientes do dataset gerado e faz o polling como eles")
+    parser.add_argument("--dataset-seed", type=int, default=42,
+                        help="Seed do dataset (seed_dataset.py export --seed) de onde vêm as credenciais")
+    parser.add_argument("--seed", type=int, default=None, help="Semente do RNG dos intervalos e das ações")
+    parser.add_argument("--json-out", help="Escreve o relatório em JSON neste ficheiro")
+    return parser.parse_args(argv)
+
+
+def print_report(summary: dict, elapsed: float, slo_ms: float) -> None:
+    unread = summary["unread"]
+    qps = summary["sustainedQps"]
+    print("\n" + "━" * 70)
+    print(f"🔔 FAN-OUT: {summary['frontends']} frontends sobre {summary['users']} utilizadores, "
+          f"poll a cada {summary['pollInterval']:g}s ({elapsed:.1f}s)")
+    print("━" * 70)
+    backlog = summary["backlog"]
+    if backlog["created"] or backlog["failed"]:
+        print(f"   Backlog: {backlog['created']} notificações criadas, {backlog['failed']} falhadas")
+    print(f"   QPS sustentado: mediana {qps['median']:.1f}  mín {qps['min']:.1f}  máx {qps['max']:.1f}  "
+          f"(polls oferecidos: {summary['offeredPollRate']:.1f}/s)")
+    print(f"   unread-count: n={unread['count']}  p50 {unread['p50Ms']:.1f}  p95 {unread['p95Ms']:.1f}  "
+          f"p99 {unread['p99Ms']:.1f}  p99.9 {unread['p999Ms']:.1f}  máx {unread['maxMs']:.1f} ms")
+    print(f"   Pior janela (p99): {unread['worstWindowP99Ms']:.1f} ms  "
+          f"contador visto: média {unread['meanCountSeen']:.0f}, máx {unread['maxCountSeen']}")
+    print(f"   mark-all-read: {summary['markAllCleared']} backlogs limpos")
+    if summary["dropped"]:
+        print("   ⚠️  Ações descartadas (acima de --max-inflight): "
+              + ", ".join(f"{action}={n}" for action, n in sorted(summary["dropped"].items())))
+    print("\n   janela      req/s  unread/s  unread p99 ms")
+    for row in summary["series"]:
+        print(f"   {row['start']:>6.0f}s {row['qps']:>9.1f} {row['unreadQps']:>9.1f} {row['unreadP99Ms']:>14.1f}")
+
+    # O contador aguenta se serve os polls oferecidos em todas as janelas dentro do SLO
+    keeps_up = not summary["dropped"] and unread["worstWindowP99Ms"] <= slo_ms
+    if keeps_up:
+        print(f"\n   ✅ O contador aguenta esta carga com p99 ≤ {slo_ms:g} ms em todas as janelas")
+    else:
+        print(f"\n   ⚠️  O contador não aguenta esta carga dentro de {slo_ms:g} ms: "
+              f"considere cache do contador ou entrega por push")
+    print("━" * 70)
+
+
+def run_fanout(args: argparse.Namespace, api: ApiClient, tokens: TokenManager) -> int:
+    print("🔐 Fazendo login...")
+    tokens.register_admin(args.email, args.password)
+    try:
+        tokens.state(ADMIN)
+    except AuthError as e:
+        print(f"❌ Erro no login: {e}")
+        return 1
+    tokens.attach(api, ADMIN)
+
+    if args.as_users:
+        print(f"👥 A autenticar {args.as_users} clientes do dataset...")
+        data = WorkloadData()
+        data.login_seeded_users(tokens, DatasetGenerator(args.dataset_seed), args.as_users, 0)
+        users = [FanoutUser(state.user_id, client) for client, state in data.clients if state.user_id]
+        print(f"   {len(users)} sessões de cliente ativas")
+    else:
+        print("📋 A recolher utilizadores de clientes e agentes...")
+        users = collect_users(api, args.users)
+        print(f"   {len(users)} utilizadores")
+    try:
+        workload = FanoutWorkload.from_args(args, api, users)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    if args.backlog > 0:
+        jobs = list(workload.backlog_jobs(args.backlog, args.batch_size))
+        print(f"\n📨 Backlog: {args.backlog} notificações × {len(users)} utilizadores "
+              f"em {len(jobs)} lotes, {args.concurrency} em paralelo")
+        progress = Progress.from_args(args)
+        progress.stage("backlog", len(jobs))
+        engine = SeedEngine(args.concurrency)
+
+        async def drive() -> None:
+            async for (user_id, count, _), created in engine.stream(workload.send_backlog, jobs):
+                if created == count:
+                    progress.ok("backlog", f"✅ {user_id}: +{created}")
+                else:
+                    progress.fail("backlog", f"❌ {user_id}: {created}/{count}")
+
+        started = time.monotonic()
+        try:
+            engine.run(drive())
+        finally:
+            engine.close()
+            progress.finish("backlog")
+            progress.close()
+        elapsed = time.monotonic() - started
+        print(f"   {workload.backlog_created} criadas em {elapsed:.1f}s "
+              f"({workload.backlog_created / elapsed if elapsed else 0:.0f}/s), {workload.backlog_failed} falhadas")
+
+    mark_all = f"mark-all-read a cada {args.mark_all_interval:g}s" if args.mark_all_interval > 0 else "sem mark-all-read"
+    print(f"\n🚀 {len(workload.frontends)} frontends, poll a cada {args.poll_interval:g}s "
+          f"(~{workload.offered_poll_rate:.1f}/s), {mark_all}, {args.send_rps:g} notificações novas/s "
+          f"durante {args.duration:g}s")
+    elapsed = workload.run(args.duration)
+
+    summary = workload.summary(elapsed)
+    workload.recorder.print_table(elapsed)
+    print_report(summary, elapsed, args.slo_ms)
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as handle:
+            json.dump({"elapsed": elapsed, "sloMs": args.slo_ms, **summary}, handle, indent=2)
+        print(f"💾 Relatório guardado em {args.json_out}")
+    return 0
+
+
+def main() -> int:
+    args = parse_args()
+    config = HttpConfig.from_args(args)
+    config.pool_maxsize = max(config.pool_maxsize, args.concurrency, args.max_inflight)
+    tracer = Tracer.from_args(args)
+
+    with ApiClient(config) as api:
+        if tracer:
+            tracer.attach(api)
+        tokens = TokenManager(api)
+        try:
+            return run_fanout(args, api, tokens)
+        finally:
+            tokens.close()
+            if tracer:
+                tracer.print_summary()
+                tracer.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+DreamLuso - Perfil do tamanho das respostas de listagem
+
+Para cada endpoint de listagem e tamanho de página mede os bytes da
+resposta, a estrutura do JSON (profundidade, campos por item, campos mais
+pesados), o que gzip e brotli poupariam, o que o servidor comprime de facto
+quando o cliente o pede e o tempo de parse no cliente. Termina com os
+endpoints que mais ganham com DTOs de projeção, compressão ou seleção de
+campos.
+
+    python3 scripts/payload_profile.py
+    python3 scripts/payload_profile.py --endpoints /properties,/users --page-sizes 20,100,500 --json-out payloads.json
+"""
+
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+from dreamluso_tools.auth import ADMIN, AuthError, TokenManager
+from dreamluso_tools.http_client import ApiClient, HttpConfig, add_http_arguments
+from dreamluso_tools.payload_profile import (
+    DEFAULT_PAGE_SIZES,
+    LIST_ENDPOINTS,
+    print_profiles,
+    print_recommendations,
+    profile_all,
+    recommend,
+)
+from dreamluso_tools.payloads import ADMIN_EMAIL, ADMIN_PASSWORD
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Perfil do tamanho das respostas de listagem DreamLuso")
+    add_http_arguments(parser)
+    parser.add_argument("--email", default=ADMIN_EMAIL)
+    parser.add_argument("--password", default=ADMIN_PASSWORD)
+    parser.add_argument("--endpoints", default=",".join(LIST_ENDPOINTS),
+                        help="Endpoints de listagem a medir (default: %(default)s)")
+    parser.add_argument("--page-sizes", default=",".join(str(size) for size in DEFAULT_PAGE_SIZES),
+                        help="Tamanhos de página dos endpoints paginados (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Pedidos por combinação (mediana da latência) e repetições das medições "
+                             "locais (default: %(default)s)")
+    parser.add_argument("--json-out", help="Escreve o relatório em JSON neste ficheiro")
+    return parser.parse_args(argv)
+
+
+def main() -> int:
+    args = parse_args()
+    endpoints = ["/" + path.strip().strip("/") for path in args.endpoints.split(",") if path.strip()]
+    unknown = [path for path in endpoints if path not in LIST_ENDPOINTS]
+    if unknown:
+        print(f"❌ Endpoints desconhecidos: {', '.join(unknown)} (disponíveis: {', '.join(LIST_ENDPOINTS)})")
+        return 1
+    try:
+        page_sizes = [int(size) for size in args.page_sizes.split(",") if size.strip()]
+    except ValueError:
+        print(f"❌ --page-sizes inválido: {args.page_sizes}")
+        return 1
+
+    with ApiClient(HttpConfig.from_args(args)) as api:
+        tokens = TokenManager(api)
+        try:
+            print("🔐 Fazendo login...")
+            tokens.register_admin(args.email, args.password)
+            try:
+                tokens.state(ADMIN)
+            except AuthError as e:
+                print(f"❌ Erro no login: {e}")
+                return 1
+            tokens.attach(api, ADMIN)
+
+            print(f"📏 A medir {len(endpoints)} endpoints com páginas de {', '.join(map(str, page_sizes))}...")
+            profiles = profile_all(api, endpoints, page_sizes, args.repeat)
+        finally:
+            tokens.close()
+
+    print_profiles(profiles)
+    recommendations = recommend(profiles)
+    print_recommendations(recommendations)
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as handle:
+            json.dump({"profiles": [p.to_dict() for p in profiles], "recommendations": recommendations},
+                      handle, indent=2, ensure_ascii=False)
+        print(f"💾 Relatório guardado em {args.json_out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
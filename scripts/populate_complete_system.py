@@ -4,76 +4,186 @@ Script completo para popular o sistema DreamLuso com dados realistas
 Inclui: Usuários, Clientes, Agentes, Propriedades, Propostas, Visitas e Contratos
 """
 
-import requests
+import argparse
 import json
-import time
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
 
-API_URL = "http://localhost:5149/api"
+from dreamluso_tools.auth import ADMIN, AuthError, TokenManager
+from dreamluso_tools.engine import SeedEngine, add_engine_arguments
+from dreamluso_tools.http_client import ApiClient, HttpConfig, add_http_arguments
+from dreamluso_tools.indexes import RecordIndex
+from dreamluso_tools.pagination import PageError, iter_items
+from dreamluso_tools.payloads import proposal_payload, slot_index, visit_payload
+from dreamluso_tools.progress import Progress, add_progress_arguments
+from dreamluso_tools.schema import INVALID, PayloadError, PropertyPayload
+from dreamluso_tools.scheduler import Edge, TaskGraph
+from dreamluso_tools.throttle import Throttle, add_throttle_arguments
+from dreamluso_tools.tracing import Tracer, add_trace_arguments
+
+NEW_AGENT = {
+    "first_name": "Ricardo",
+    "last_name": "Fernandes",
+    "email": "ricardo.fernandes@dreamluso.pt",
+    "password": "Agente123!",
+    "license": "AMI-45678",
+    "specialization": "Luxury & Premium",
+    "commission": 0.045,
+}
+
+PROPERTIES_DATA = [
+    {
+        "title": "Penthouse Luxo na Avenida da Liberdade",
+        "description": "Penthouse exclusiva com 300m², terraço panorâmico, vista para o Tejo, acabamentos de luxo.",
+        "price": 1200000.00,
+        "size": 300.0,
+        "bedrooms": 4,
+        "bathrooms": 3,
+        "type": 0,  # Apartment
+        "status": 0,  # Available
+        "transactionType": 0,  # Sale
+        "street": "Avenida da Liberdade",
+        "number": "180",
+        "parish": "Santo António",
+        "municipality": "Lisboa",
+        "district": "Lisboa",
+        "postalCode": "1250-146",
+        "grossArea": 350.0,
+        "floor": 10,
+        "parkingSpaces": 3,
+        "hasElevator": True,
+        "hasPool": True,
+        "isFurnished": True,
+        "energyRating": "A+",
+        "yearBuilt": 2020
+    },
+    {
+        "title": "Moradia de Luxo em Cascais com Vista Mar",
+        "description": "Moradia isolada com 5 quartos, piscina infinity, jardim privativo, garagem para 4 carros.",
+        "price": 2500000.00,
+        "size": 450.0,
+        "bedrooms": 5,
+        "bathrooms": 4,
+        "type": 1,  # House
+        "status": 0,
+        "transactionType": 0,
+        "street": "Rua das Flores",
+        "number": "25",
+        "parish": "Cascais",
+        "municipality": "Cascais",
+        "district": "Lisboa",
+        "postalCode": "2750-283",
+        "grossArea": 550.0,
+        "landArea": 800.0,
+        "parkingSpaces": 4,
+        "hasPool": True,
+        "isFurnished": False,
+        "energyRating": "A",
+        "yearBuilt": 2019
+    },
+    {
+        "title": "Apartamento T3 Moderno no Parque das Nações",
+        "description": "Apartamento novo com 3 quartos, varanda, condomínio com ginásio e jardim.",
+        "price": 485000.00,
+        "size": 135.0,
+        "bedrooms": 3,
+        "bathrooms": 2,
+        "type": 0,
+        "status": 0,
+        "transactionType": 0,
+        "street": "Alameda dos Oceanos",
+        "number": "45",
+        "parish": "Parque das Nações",
+        "municipality": "Lisboa",
+        "district": "Lisboa",
+        "postalCode": "1990-207",
+        "grossArea": 145.0,
+        "floor": 5,
+        "parkingSpaces": 2,
+        "hasElevator": True,
+        "isFurnished": False,
+        "energyRating": "A",
+        "yearBuilt": 2021
+    }
+]
+
+# Clientes criados pelo seed_database.py; se um email não existir, usa-se o
+# cliente na mesma posição da listagem
+PLAN_CLIENTS = ["ana.rodrigues@email.com", "carlos.ferreira@email.com", "sofia.almeida@email.com"]
+
+# (cliente, propriedade, valor): cada cliente faz proposta abaixo do preço pedido
+PROPOSAL_PLAN = [
+    (0, 0, 1100000.00),  # 100k abaixo do preço
+    (1, 1, 2400000.00),  # 100k abaixo
+    (2, 2, 480000.00),   # 5k abaixo
+    (0, 2, 475000.00),   # Cliente 1 também faz proposta na propriedade 3
+]
+
+# (cliente, propriedade, dias de antecedência)
+VISIT_PLAN = [(0, 0, 3), (1, 1, 5), (2, 2, 7)]
+
+
+def plan_client_id(clients: RecordIndex, position: int) -> str:
+    return clients.pick(PLAN_CLIENTS[position], position)["id"]
 
 class SystemPopulator:
-    def __init__(self):
-        self.admin_token = None
+    def __init__(self, api: Optional[ApiClient] = None, engine: Optional[SeedEngine] = None,
+                 progress: Optional[Progress] = None):
+        self.api = api or ApiClient()
+        self.engine = engine or SeedEngine()
+        self.progress = progress or Progress()
+        self.tokens = TokenManager(self.api)
         self.users = {}
         self.clients = {}
         self.agents = {}
         self.properties = {}
 
-    def get_headers(self):
-        headers = {"Content-Type": "application/json"}
-        if self.admin_token:
-            headers["Authorization"] = f"Bearer {self.admin_token}"
-        return headers
-
     def login_admin(self):
         print("🔐 Fazendo login como Admin...")
-        response = requests.post(f"{API_URL}/accounts/login", json={
-            "email": "admin@gmail.com",
-            "password": "Admin123!"
-        })
-        if response.status_code == 200:
-            data = response.json()
-            self.admin_token = data.get("accessToken") or data.get("token")
-            print(f"✅ Login bem-sucedido! Token: {self.admin_token[:30]}...")
-            return True
-        else:
-            print(f"❌ Erro no login: {response.status_code} - {response.text}")
+        self.tokens.register_admin()
+        try:
+            token = self.tokens.token(ADMIN)
+        except AuthError as e:
+            print(f"❌ Erro no login: {e}")
             return False
+        self.tokens.attach(self.api, ADMIN)
+        print(f"✅ Login bem-sucedido! Token: {token[:30]}...")
+        return True
 
-    def create_agent_with_password(self, first_name: str, last_name: str, email: str, password: str, 
-                                   license: str, specialization: str, commission: float) -> Optional[str]:
-        """Cria um novo agente com senha"""
-        print(f"\n👔 Criando agente: {first_name} {last_name}")
+    def register_user(self, first_name: str, last_name: str, email: str, password: str,
+                      role: str = "RealEstateAgent") -> Optional[str]:
+        """Regista um utilizador com senha"""
+        self.progress.info(f"\n👔 Registando utilizador: {first_name} {last_name}")
         
-        # 1. Registrar usuário
-        reg_response = requests.post(f"{API_URL}/accounts/register", json={
+        reg_response = self.api.post("/accounts/register", auth=False, json={
             "firstName": first_name,
             "lastName": last_name,
             "email": email,
             "password": password,
             "confirmPassword": password,
             "phone": "+351 91 000 0000",
-            "role": "RealEstateAgent"
+            "role": role
         })
         
         if reg_response.status_code not in [200, 201]:
-            print(f"   ⚠️  Erro ao registrar: {reg_response.status_code}")
+            self.progress.fail("users", f"⚠️  Erro ao registrar: {reg_response.status_code}",
+                               reg_response.status_code)
             return None
         
         reg_data = reg_response.json()
         user_id = reg_data.get("userId") or reg_data.get("user", {}).get("id")
         
         if not user_id:
-            print(f"   ⚠️  UserID não retornado no registro")
+            self.progress.fail("users", "⚠️  UserID não retornado no registro", reg_response.status_code)
             return None
         
-        print(f"   ✅ Usuário criado: {user_id}")
-        time.sleep(1)
-        
-        # 2. Criar perfil de agente
-        agent_response = requests.post(f"{API_URL}/agents",
-            headers=self.get_headers(),
+        self.progress.ok("users", f"✅ Usuário criado: {user_id}")
+        return user_id
+
+    def create_agent_profile(self, user_id: str, email: str, password: str,
+                             license: str, specialization: str, commission: float) -> Optional[str]:
+        """Cria o perfil de agente para um utilizador registado"""
+        agent_response = self.api.post("/agents",
             json={
                 "userId": user_id,
                 "licenseNumber": license,
@@ -89,84 +199,147 @@ class SystemPopulator:
         if agent_response.status_code in [200, 201]:
             agent_data = agent_response.json()
             agent_id = agent_data.get("agentId") or agent_data.get("id")
-            print(f"   ✅ Agente criado: {agent_id}")
+            self.progress.ok("agents", f"✅ Agente criado: {agent_id}")
             self.agents[email] = {"id": agent_id, "user_id": user_id, "password": password}
             return agent_id
         else:
-            print(f"   ⚠️  Erro ao criar agente: {agent_response.status_code} - {agent_response.text[:100]}")
+            self.progress.fail("agents", f"⚠️  Erro ao criar agente: {agent_response.status_code} - "
+                                         f"{agent_response.text[:100]}", agent_response.status_code)
             return None
 
-    def approve_agent(self, agent_id: str):
-        """Aprova um agente"""
-        response = requests.put(f"{API_URL}/agents/{agent_id}/approve",
-            headers=self.get_headers(),
+    def approve_agent(self, agent_id: str) -> Optional[str]:
+        """Aprova um agente; devolve o id em caso de sucesso"""
+        response = self.api.put(f"/agents/{agent_id}/approve",
             json={"isApproved": True})
         
         if response.status_code in [200, 204]:
-            print(f"   ✅ Agente aprovado!")
-            return True
+            self.progress.ok("approvals", "✅ Agente aprovado!")
+            return agent_id
         else:
-            print(f"   ⚠️  Erro ao aprovar agente: {response.status_code}")
-            return False
+            self.progress.fail("approvals", f"⚠️  Erro ao aprovar agente: {response.status_code}",
+                               response.status_code)
+            return None
+
+    def user_exists(self, user_id: str) -> bool:
+        """Sonda de prontidão: o utilizador já é visível na API"""
+        return self.api.get(f"/accounts/profile/{user_id}").status_code == 200
+
+    def agent_is_approved(self, agent_id: str) -> bool:
+        """Sonda de prontidão: a aprovação do agente já foi persistida"""
+        # GET /agents/{id} não preenche approvalStatus (fica sempre "Pending"); a aprovação ativa o agente
+        response = self.api.get(f"/agents/{agent_id}")
+        return response.status_code == 200 and response.json().get("isActive") is True
+
+    def property_exists(self, property_id: str) -> bool:
+        """Sonda de prontidão: a propriedade já pode receber propostas e visitas"""
+        return self.api.get(f"/properties/{property_id}").status_code == 200
+
+    def fetch_clients(self) -> Optional[RecordIndex]:
+        """Busca os clientes existentes, indexados por email"""
+        try:
+            clients = RecordIndex(iter_items(self.api, "/clients"), partition=None)
+        except PageError as e:
+            print(f"   ⚠️  Erro ao buscar clientes: {e}")
+            return None
+        print(f"   Encontrados {len(clients)} clientes")
+        return clients
 
     def create_property(self, agent_id: str, data: Dict) -> Optional[str]:
         """Cria uma propriedade"""
-        response = requests.post(f"{API_URL}/properties",
-            headers=self.get_headers(),
-            json=data)
+        try:
+            payload = PropertyPayload.from_record({**data, "realEstateAgentId": agent_id})
+        except PayloadError as e:
+            self.progress.fail("properties", f"❌ {data.get('title')}: {e}", INVALID)
+            return None
+        # O endpoint só aceita form (multipart ou urlencoded), não JSON
+        response = self.api.post("/properties", data=payload.to_form())
         
         if response.status_code in [200, 201]:
             prop_data = response.json()
             prop_id = prop_data.get("id")
-            print(f"   ✅ Propriedade criada: {data['title']}")
+            self.progress.ok("properties", f"✅ Propriedade criada: {data['title']}")
             return prop_id
         else:
-            print(f"   ⚠️  Erro ao criar propriedade: {response.status_code}")
+            self.progress.fail("properties", f"⚠️  Erro ao criar propriedade: {response.status_code}",
+                               response.status_code)
             return None
 
     def create_proposal(self, client_id: str, property_id: str, value: float) -> Optional[str]:
         """Cria uma proposta"""
-        response = requests.post(f"{API_URL}/proposals",
-            headers=self.get_headers(),
-            json={
-                "clientId": client_id,
-                "propertyId": property_id,
-                "proposedValue": value,
-                "type": 0,  # Purchase
-                "paymentMethod": 0,  # Cash
-                "additionalNotes": "Proposta criada via script de população"
-            })
+        response = self.api.post("/proposals",
+            json=proposal_payload(client_id, property_id, value,
+                                  notes="Proposta criada via script de população"))
         
         if response.status_code in [200, 201]:
             prop_data = response.json()
-            print(f"   ✅ Proposta criada: €{value:,.0f}")
+            self.progress.ok("proposals", f"✅ Proposta criada: €{value:,.0f}")
             return str(prop_data) if isinstance(prop_data, str) else prop_data.get("id")
         else:
-            print(f"   ⚠️  Erro ao criar proposta: {response.status_code}")
+            self.progress.fail("proposals", f"⚠️  Erro ao criar proposta: {response.status_code}",
+                               response.status_code)
             return None
 
     def schedule_visit(self, client_id: str, property_id: str, agent_id: str, days_ahead: int = 3) -> Optional[str]:
-        """Agenda uma visita"""
-        visit_date = (datetime.now() + timedelta(days=days_ahead)).strftime("%Y-%m-%d")
+        """Agenda uma visita (14h-16h)"""
+        visit_date = (datetime.now() + timedelta(days=days_ahead)).date()
         
-        response = requests.post(f"{API_URL}/visits/schedule",
-            headers=self.get_headers(),
-            json={
-                "propertyId": property_id,
-                "clientId": client_id,
-                "realEstateAgentId": agent_id,
-                "visitDate": f"{visit_date}T00:00:00",
-                "timeSlot": "14:00-15:00",
-                "notes": "Visita agendada via script"
-            })
+        response = self.api.post("/visits",
+            json=visit_payload(property_id, client_id, agent_id, visit_date,
+                               slot_index("Afternoon_2PM_4PM"), notes="Visita agendada via script"))
         
         if response.status_code in [200, 201]:
-            print(f"   ✅ Visita agendada para {visit_date}")
-            return "success"
+            self.progress.ok("visits", f"✅ Visita agendada para {visit_date.isoformat()}")
+            return response.json().get("visitId") or "success"
         else:
-            print(f"   ⚠️  Erro ao agendar visita: {response.status_code}")
+            self.progress.fail("visits", f"⚠️  Erro ao agendar visita: {response.status_code}",
+                               response.status_code)
             return None
 
+    def build_population_graph(self, agent: Dict[str, Any], properties_data: List[Dict]) -> TaskGraph:
+        """
+        Modela os PASSOS 1-6 como grafo: register → createAgent → approve →
+        createProperty → createProposal/scheduleVisit. fetchClients não tem
+        dependências e corre logo no arranque.
+        """
+        graph = TaskGraph(self.engine)
+
+        graph.add("register", self.register_user,
+                  agent["first_name"], agent["last_name"], agent["email"], agent["password"],
+                  ready=self.user_exists)
+        graph.add("createAgent", self.create_agent_profile,
+                  inputs={"user_id": "register"},
+                  email=agent["email"], password=agent["password"], license=agent["license"],
+                  specialization=agent["specialization"], commission=agent["commission"])
+        graph.add("approve", self.approve_agent,
+                  inputs={"agent_id": "createAgent"},
+                  ready=self.agent_is_approved)
+
+        for idx, prop in enumerate(properties_data):
+            graph.add(f"createProperty:{idx}", self.create_property,
+                      inputs={"agent_id": "approve"}, data=prop,
+                      ready=self.property_exists)
+
+        graph.add("fetchClients", self.fetch_clients)
+
+        for k, (c, p, value) in enumerate(PROPOSAL_PLAN):
+            graph.add(f"createProposal:{k}", self.create_proposal,
+                      inputs={
+                          "client_id": Edge("fetchClients", lambda clients, c=c: plan_client_id(clients, c)),
+                          "property_id": f"createProperty:{p}",
+                      },
+                      value=value)
+
+        for k, (c, p, days) in enumerate(VISIT_PLAN):
+            graph.add(f"scheduleVisit:{k}", self.schedule_visit,
+                      inputs={
+                          "client_id": Edge("fetchClients", lambda clients, c=c: plan_client_id(clients, c)),
+                          "property_id": f"createProperty:{p}",
+                          "agent_id": "approve",
+                      },
+                      days_ahead=days)
+
+        return graph
+
     def run_population(self):
         if not self.login_admin():
             return
@@ -175,178 +348,28 @@ class SystemPopulator:
         print("🚀 INICIANDO POPULAÇÃO COMPLETA DO SISTEMA")
         print("="*70)
 
-        # 1. Criar novo agente com senha
-        print("\n📋 PASSO 1: Criando Novo Agente Imobiliário")
+        print("\n📋 PASSOS 1-6: register → createAgent → approve → createProperty → createProposal/scheduleVisit")
         print("-" * 70)
-        agent_id = self.create_agent_with_password(
-            "Ricardo", 
-            "Fernandes",
-            "ricardo.fernandes@dreamluso.pt",
-            "Agente123!",
-            "AMI-45678",
-            "Luxury & Premium",
-            0.045
-        )
-        
-        if agent_id:
-            # 2. Aprovar agente
-            print("\n📋 PASSO 2: Aprovando Agente")
-            print("-" * 70)
-            self.approve_agent(agent_id)
-            time.sleep(2)
-
-            # 3. Criar propriedades para este agente
-            print("\n📋 PASSO 3: Criando Propriedades do Agente")
-            print("-" * 70)
-            
-            properties_data = [
-                {
-                    "title": "Penthouse Luxo na Avenida da Liberdade",
-                    "description": "Penthouse exclusiva com 300m², terraço panorâmico, vista para o Tejo, acabamentos de luxo.",
-                    "realEstateAgentId": agent_id,
-                    "price": 1200000.00,
-                    "size": 300.0,
-                    "bedrooms": 4,
-                    "bathrooms": 3,
-                    "type": 0,  # Apartment
-                    "status": 0,  # Available
-                    "transactionType": 0,  # Sale
-                    "street": "Avenida da Liberdade",
-                    "number": "180",
-                    "parish": "Santo António",
-                    "municipality": "Lisboa",
-                    "district": "Lisboa",
-                    "postalCode": "1250-146",
-                    "grossArea": 350.0,
-                    "floor": 10,
-                    "parkingSpaces": 3,
-                    "hasElevator": True,
-                    "hasPool": True,
-                    "isFurnished": True,
-                    "energyRating": "A+",
-                    "yearBuilt": 2020
-                },
-                {
-                    "title": "Moradia de Luxo em Cascais com Vista Mar",
-                    "description": "Moradia isolada com 5 quartos, piscina infinity, jardim privativo, garagem para 4 carros.",
-                    "realEstateAgentId": agent_id,
-                    "price": 2500000.00,
-                    "size": 450.0,
-                    "bedrooms": 5,
-                    "bathrooms": 4,
-                    "type": 1,  # House
-                    "status": 0,
-                    "transactionType": 0,
-                    "street": "Rua das Flores",
-                    "number": "25",
-                    "parish": "Cascais",
-                    "municipality": "Cascais",
-                    "district": "Lisboa",
-                    "postalCode": "2750-283",
-                    "grossArea": 550.0,
-                    "landArea": 800.0,
-                    "parkingSpaces": 4,
-                    "hasPool": True,
-                    "hasGarden": True,
-                    "isFurnished": False,
-                    "energyRating": "A",
-                    "yearBuilt": 2019
-                },
-                {
-                    "title": "Apartamento T3 Moderno no Parque das Nações",
-                    "description": "Apartamento novo com 3 quartos, varanda, condomínio com ginásio e jardim.",
-                    "realEstateAgentId": agent_id,
-                    "price": 485000.00,
-                    "size": 135.0,
-                    "bedrooms": 3,
-                    "bathrooms": 2,
-                    "type": 0,
-                    "status": 0,
-                    "transactionType": 0,
-                    "street": "Alameda dos Oceanos",
-                    "number": "45",
-                    "parish": "Parque das Nações",
-                    "municipality": "Lisboa",
-                    "district": "Lisboa",
-                    "postalCode": "1990-207",
-                    "grossArea": 145.0,
-                    "floor": 5,
-                    "parkingSpaces": 2,
-                    "hasElevator": True,
-                    "isFurnished": False,
-                    "energyRating": "A",
-                    "yearBuilt": 2021
-                }
-            ]
-
-            created_props = []
-            for prop in properties_data:
-                prop_id = self.create_property(agent_id, prop)
-                if prop_id:
-                    created_props.append(prop_id)
-                    self.properties[prop_id] = prop
-                time.sleep(1)
-
-            # 4. Obter clientes existentes
-            print("\n📋 PASSO 4: Buscando Clientes Existentes")
-            print("-" * 70)
-            clients_response = requests.get(f"{API_URL}/clients?pageSize=10", headers=self.get_headers())
-            if clients_response.status_code == 200:
-                clients_data = clients_response.json()
-                existing_clients = clients_data.get("clients", [])
-                print(f"   Encontrados {len(existing_clients)} clientes")
-                
-                # 5. Criar propostas dos clientes para as propriedades
-                if len(existing_clients) > 0 and len(created_props) > 0:
-                    print("\n📋 PASSO 5: Criando Propostas")
-                    print("-" * 70)
-                    
-                    # Cliente 1 faz proposta na propriedade 1
-                    if len(existing_clients) >= 1 and len(created_props) >= 1:
-                        self.create_proposal(
-                            existing_clients[0]["id"],
-                            created_props[0],
-                            1100000.00  # 100k abaixo do preço
-                        )
-                    
-                    # Cliente 2 faz proposta na propriedade 2
-                    if len(existing_clients) >= 2 and len(created_props) >= 2:
-                        self.create_proposal(
-                            existing_clients[1]["id"],
-                            created_props[1],
-                            2400000.00  # 100k abaixo
-                        )
-                    
-                    # Cliente 3 faz proposta na propriedade 3
-                    if len(existing_clients) >= 3 and len(created_props) >= 3:
-                        self.create_proposal(
-                            existing_clients[2]["id"],
-                            created_props[2],
-                            480000.00  # 5k abaixo
-                        )
-                    
-                    # Cliente 1 também faz proposta na propriedade 3
-                    if len(existing_clients) >= 1 and len(created_props) >= 3:
-                        self.create_proposal(
-                            existing_clients[0]["id"],
-                            created_props[2],
-                            475000.00  # 10k abaixo
-                        )
-
-                    time.sleep(2)
-
-                    # 6. Agendar visitas
-                    print("\n📋 PASSO 6: Agendando Visitas")
-                    print("-" * 70)
-                    
-                    if len(existing_clients) >= 1 and len(created_props) >= 1:
-                        self.schedule_visit(existing_clients[0]["id"], created_props[0], agent_id, 3)
-                    
-                    if len(existing_clients) >= 2 and len(created_props) >= 2:
-                        self.schedule_visit(existing_clients[1]["id"], created_props[1], agent_id, 5)
-                    
-                    if len(existing_clients) >= 3 and len(created_props) >= 3:
-                        self.schedule_visit(existing_clients[2]["id"], created_props[2], agent_id, 7)
+        graph = self.build_population_graph(NEW_AGENT, PROPERTIES_DATA)
+        for stage, total in (("users", 1), ("agents", 1), ("approvals", 1),
+                             ("properties", len(PROPERTIES_DATA)),
+                             ("proposals", len(PROPOSAL_PLAN)), ("visits", len(VISIT_PLAN))):
+            self.progress.stage(stage, total)
+        results = self.engine.run(graph.run())
+        for stage in self.progress.stages:
+            self.progress.finish(stage)
+        self.progress.close()
+
+        created_props = []
+        for idx, prop in enumerate(PROPERTIES_DATA):
+            prop_id = results.get(f"createProperty:{idx}")
+            if prop_id:
+                created_props.append(prop_id)
+                self.properties[prop_id] = prop
+
+        print("\n⏱️  Linha temporal (início → fim, segundos):")
+        for name, (start, end) in graph.timings.items():
+            print(f"   {name:<20} {start:6.2f} → {end:6.2f}")
 
         # Summary
         print("\n" + "="*70)
@@ -357,14 +380,41 @@ class SystemPopulator:
         print(f"   • {len(created_props)} Propriedades criadas")
         print(f"   • Propostas e Visitas criadas")
         print(f"\n🔑 CREDENCIAIS DO NOVO AGENTE:")
-        print(f"   Email: ricardo.fernandes@dreamluso.pt")
-        print(f"   Senha: Agente123!")
+        print(f"   Email: {NEW_AGENT['email']}")
+        print(f"   Senha: {NEW_AGENT['password']}")
         print(f"\n🌐 ACESSE:")
         print(f"   Admin: http://localhost:4200/admin/dashboard")
         print(f"   Agente: http://localhost:4200/agent/dashboard")
         print(f"   Cliente: http://localhost:4200/client/dashboard")
 
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="População completa do sistema DreamLuso")
+    add_http_arguments(parser)
+    add_engine_arguments(parser)
+    add_trace_arguments(parser)
+    add_progress_arguments(parser)
+    add_throttle_arguments(parser)
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
-    populator = SystemPopulator()
-    populator.run_population()
+    args = parse_args()
+    config = HttpConfig.from_args(args)
+    config.pool_maxsize = max(config.pool_maxsize, args.concurrency)
+    tracer = Tracer.from_args(args)
+    throttle = Throttle.from_args(args, args.concurrency)
+    with ApiClient(config) as api, SeedEngine(args.concurrency) as engine:
+        if tracer:
+            tracer.attach(api)
+        if throttle:
+            throttle.attach(api)
+        populator = SystemPopulator(api, engine, Progress.from_args(args))
+        try:
+            populator.run_population()
+        finally:
+            populator.tokens.close()
+            if tracer:
+                tracer.print_summary()
+                tracer.close()
+            if throttle:
+                throttle.print_summary()
 
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+DreamLuso - Mistura de pesquisas de imóveis
+
+Gera pesquisas realistas a partir do dataset de seed (concelhos com
+distribuição Zipf, faixas de preço por tipo de transação, cauda de páginas
+profundas), corre-as em paralelo contra GET /properties e ordena as
+combinações de filtros pela latência. Uma varredura à parte mede páginas
+profundas (até 5000) e cada filtro isolado, para separar o custo do filtro
+do custo do OFFSET.
+
+    python3 scripts/property_search_mix.py --dataset data/medium --queries 5000 --concurrency 16
+    python3 scripts/property_search_mix.py --queries 2000 --zipf 1.3 --rate searchTerm=0.3 --json-out pesquisas.json
+"""
+
+import argparse
+import json
+import random
+import sys
+from typing import Any, Dict, List, Optional
+
+from dreamluso_tools.http_client import ApiClient, HttpConfig, add_http_arguments
+from dreamluso_tools.search_mix import (
+    FILTERS,
+    NO_FILTERS,
+    QueryMix,
+    add_search_arguments,
+    coverage,
+    keyset_report,
+    load_space,
+    parse_rates,
+    rank_combos,
+    run_mix,
+    signature,
+    sweep,
+)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Mistura de pesquisas de imóveis DreamLuso")
+    add_http_arguments(parser)
+    add_search_arguments(parser)
+    parser.add_argument("--dataset",
+                        help="Diretório do dataset exportado (properties.ndjson e ids/); "
+                             "sem ele usa uma amostra do gerador com a mesma --seed")
+    parser.add_argument("--concurrency", type=int, default=16,
+                        help="Pesquisas em paralelo (default: %(default)s)")
+    parser.add_argument("--warmup", type=int, default=20,
+                        help="Pesquisas descartadas antes da medição, em série (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=42, help="Semente da mistura (default: %(default)s)")
+    parser.add_argument("--skip-sweep", action="store_true",
+                        help="Só a mistura: sem varredura de páginas profundas nem de filtros isolados")
+    parser.add_argument("--json-out", help="Escreve o relatório em JSON neste ficheiro")
+    args = parser.parse_args(argv)
+    try:
+        args.rates = parse_rates(args.rate)
+        args.deep_pages = sorted({int(page) for page in args.deep_pages.split(",") if page.strip()})
+    except ValueError as e:
+        parser.error(str(e))
+    if 1 not in args.deep_pages:
+        # A página 1 é a referência dos rácios
+        args.deep_pages.insert(0, 1)
+    return args
+
+
+def print_ranking(ranked: List[Dict[str, Any]], cover: Dict[str, Any], elapsed: float, slow_ms: float) -> None:
+    print("\n" + "━" * 100)
+    print(f"🔎 COMBINAÇÕES DE FILTROS ({elapsed:.1f}s, {cover['distinctCombos']} combinações distintas "
+          f"de {cover['possibleCombos']})")
+    print("━" * 100)
+    width = max([len(row["combo"]) for row in ranked] + [12])
+    print(f"   {'combinação':<{width}} {'n':>6} {'%mix':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'×base':>6} {'vazias':>6} {'total':>8}")
+    for row in ranked:
+        flag = " 🐢" if row["indexCandidate"] else ""
+        vs_base = f"{row['vsBase']:.1f}" if row["vsBase"] else "-"
+        print(f"   {row['combo']:<{width}} {row['count']:>6} {row['share'] * 100:>5.1f} {row['p50Ms']:>8.1f} "
+              f"{row['p95Ms']:>8.1f} {row['p99Ms']:>8.1f} {vs_base:>6} {row['zeroResultRate'] * 100:>5.1f}% "
+              f"{row['meanTotal']:>8.0f}{flag}")
+    if cover["missingFilters"]:
+        print(f"   ⚠️  Filtros que nunca apareceram: {', '.join(cover['missingFilters'])}")
+    slow = [row["combo"] for row in ranked if row["indexCandidate"]]
+    if slow:
+        print(f"   🐢 p95 ≥ {slow_ms:.0f} ms, candidatos a índice: {', '.join(slow)}")
+    print("━" * 100)
+
+
+def print_sweep(title: str, report: Dict[str, Dict[str, Any]], keyset: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+    print("\n" + "━" * 100)
+    print(title)
+    print("━" * 100)
+    width = max([len(name) for name in report] + [12])
+    for name, pages in report.items():
+        cells = "  ".join(f"p{page}={stats['p50Ms']:.1f}/{stats['p95Ms']:.1f}"
+                          for page, stats in sorted(pages.items(), key=lambda item: int(item[0])))
+        line = f"   {name:<{width}} {cells}"
+        if keyset and name in keyset:
+            line += f"  (pior ×{keyset[name]['worst']:.1f}{', keyset' if keyset[name]['keyset'] else ''})"
+        print(line)
+    print("   (p50/p95 em ms)")
+    print("━" * 100)
+
+
+def main() -> int:
+    args = parse_args()
+    config = HttpConfig.from_args(args)
+    config.pool_maxsize = max(config.pool_maxsize, args.concurrency)
+
+    print("📋 A montar o espaço de pesquisa...")
+    try:
+        space = load_space(args.dataset, args.seed)
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        return 1
+    print(f"   {space.properties} imóveis, {len(space.municipalities)} concelhos, {len(space.terms)} termos, "
+          f"{len(space.agent_ids)} agentes")
+    mix = QueryMix(space, args.rates, args.zipf, args.page_size, args.deep_share, args.max_page)
+    queries = mix.queries(args.queries, args.seed)
+
+    with ApiClient(config) as api:
+        for params in mix.queries(args.warmup, args.seed + 1):
+            api.get("/properties", params=params)
+        print(f"\n🚀 {len(queries)} pesquisas com {args.concurrency} em paralelo")
+        result = run_mix(api, queries, args.concurrency)
+        ranked = rank_combos(result, args.min_samples, args.slow_ms)
+        cover = coverage(result)
+
+        deep: Dict[str, Dict[str, Any]] = {}
+        keyset: Dict[str, Dict[str, Any]] = {}
+        isolated: Dict[str, Dict[str, Any]] = {}
+        if not args.skip_sweep:
+            rng = random.Random(args.seed)
+            # Para cada combinação mais frequente, os parâmetros de uma pesquisa real dela
+            common = [row["combo"] for row in sorted(ranked, key=lambda row: -row["count"])
+                      if row["combo"] != NO_FILTERS][:args.deep_combos]
+            templates: Dict[str, Dict[str, Any]] = {NO_FILTERS: {}}
+            for params in queries:
+                combo = signature(params)
+                if combo in common and combo not in templates:
+                    templates[combo] = {k: v for k, v in params.items() if k in FILTERS}
+            print(f"🕳️  Páginas {', '.join(map(str, args.deep_pages))} × {len(templates)} combinações")
+            deep = sweep(api, templates, args.deep_pages, args.page_size, args.repeats, args.concurrency)
+            keyset = keyset_report(deep, args.keyset_ratio)
+            print(f"🧪 Filtros isolados ({args.repeats} pedidos cada, página 1)")
+            singles = {NO_FILTERS: {}, **mix.isolated(rng)}
+            isolated = sweep(api, singles, [1], args.page_size, args.repeats, args.concurrency)
+
+    result.combos.print_table(result.elapsed, title="📊 LATÊNCIA POR COMBINAÇÃO")
+    result.pages.print_table(result.elapsed, title="📊 LATÊNCIA POR PROFUNDIDADE DE PÁGINA")
+    print_ranking(ranked, cover, result.elapsed, args.slow_ms)
+    if deep:
+        print_sweep("🕳️  PÁGINAS PROFUNDAS (rácio do p50 face à página 1)", deep, keyset)
+        print_sweep("🧪 FILTROS ISOLADOS", isolated)
+        deep_combos = [name for name, report in keyset.items() if report["keyset"]]
+        if deep_combos:
+            # Skip/Take sobre a lista inteira: o custo cresce com a página, não com o filtro
+            print(f"   ⚠️  Candidatos a paginação keyset (×{args.keyset_ratio:g} na pior página): "
+                  f"{', '.join(deep_combos)}")
+
+    if args.json_out:
+        report = {
+            "elapsed": result.elapsed, "queries": len(queries), "concurrency": args.concurrency,
+            "seed": args.seed, "rates": args.rates, "zipf": args.zipf, "coverage": cover,
+            "combos": ranked, "pageBuckets": result.pages.summary(result.elapsed),
+            "deepPages": deep, "keyset": keyset, "isolatedFilters": isolated,
+        }
+        with open(args.json_out, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+        print(f"💾 Relatório guardado em {args.json_out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+DreamLuso - Carga de negociação de propostas
+
+Cria propostas e leva cada uma, em paralelo, pela análise, rondas de
+contraproposta e decisão final, deixando histórico de negociação na base de
+dados e medindo a latência de cada transição.
+
+    python3 scripts/proposal_negotiation.py --proposals 500 --concurrency 16
+    python3 scripts/proposal_negotiation.py --proposals 2000 --max-rounds 10 --branch negotiation.negotiate=0.9 --json-out negociacao.json
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from typing import List, Optional
+
+from dreamluso_tools.auth import ADMIN, AuthError, TokenManager
+from dreamluso_tools.engine import SeedEngine, add_engine_arguments
+from dreamluso_tools.http_client import ApiClient, HttpConfig, add_http_arguments
+from dreamluso_tools.negotiation import NegotiationData, NegotiationWorkload, add_negotiation_arguments
+from dreamluso_tools.payloads import ADMIN_EMAIL, ADMIN_PASSWORD
+from dreamluso_tools.progress import Progress, add_progress_arguments
+from dreamluso_tools.throttle import Throttle, add_throttle_arguments
+from dreamluso_tools.tracing import Tracer, add_trace_arguments
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Carga de negociação de propostas DreamLuso")
+    add_http_arguments(parser)
+    add_engine_arguments(parser)
+    add_negotiation_arguments(parser)
+    add_progress_arguments(parser, default="quiet")
+    add_trace_arguments(parser)
+    add_throttle_arguments(parser)
+    # Um POST /negotiate repetido cria uma ronda a mais no histórico
+    parser.set_defaults(retries=0)
+    parser.add_argument("--email", default=ADMIN_EMAIL)
+    parser.add_argument("--password", default=ADMIN_PASSWORD)
+    parser.add_argument("--seed", type=int, default=None, help="Semente do RNG dos pares e dos ramos")
+    parser.add_argument("--json-out", help="Escreve o relatório em JSON neste ficheiro")
+    return parser.parse_args(argv)
+
+
+def print_report(summary: dict, elapsed: float) -> None:
+    print("\n" + "━" * 70)
+    print(f"🤝 NEGOCIAÇÃO ({elapsed:.1f}s)")
+    print("━" * 70)
+    print("   Estados finais: " + ", ".join(f"{state}={n}" for state, n in sorted(summary["finalStates"].items())))
+    print(f"   Rondas de negociação: {summary['negotiations']}  histograma: "
+          + ", ".join(f"{k}={v}" for k, v in summary["roundsHistogram"].items()))
+    for error, n in list(summary["errors"].items())[:5]:
+        print(f"   ❌ {error}: {n}")
+    width = max([len(name) for name in summary["transitions"]] + [10])
+    print(f"\n   {'transição':<{width}} {'n':>7} {'erros':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, s in summary["transitions"].items():
+        print(f"   {name:<{width}} {s['count']:>7} {s['errors']:>6} {s['p50Ms']:>9.1f} "
+              f"{s['p95Ms']:>9.1f} {s['p99Ms']:>9.1f}")
+    print("━" * 70)
+
+
+def run_negotiation(args: argparse.Namespace, api: ApiClient, tokens: TokenManager) -> int:
+    print("🔐 Fazendo login...")
+    tokens.register_admin(args.email, args.password)
+    try:
+        tokens.state(ADMIN)
+    except AuthError as e:
+        print(f"❌ Erro no login: {e}")
+        return 1
+    tokens.attach(api, ADMIN)
+
+    print("📋 A recolher imóveis disponíveis, clientes e agentes...")
+    data = NegotiationData.collect(api)
+    print(f"   {len(data.properties)} imóveis, {len(data.clients)} clientes, {len(data.agent_users)} agentes")
+    if not data.properties or not data.clients:
+        print("❌ São precisos imóveis disponíveis e clientes (corra o seed primeiro)")
+        return 1
+    try:
+        workload = NegotiationWorkload.from_args(args, api, data)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    rng = random.Random(args.seed)
+    jobs = [(client, prop, rng.getrandbits(32))
+            for _, (client, prop) in zip(range(args.proposals), data.pairs(rng))]
+    print(f"\n🚀 {len(jobs)} propostas com {args.concurrency} em paralelo "
+          f"(até {args.max_rounds} rondas cada)")
+
+    progress = Progress.from_args(args)
+    progress.stage("proposals", len(jobs))
+    engine = SeedEngine(args.concurrency)
+
+    async def drive() -> None:
+        async for _, run in engine.stream(workload.walk, jobs):
+            if run.error:
+                progress.fail("proposals", f"❌ {run.proposal_id or 'nova'}: {run.error}")
+            else:
+                progress.ok("proposals", f"✅ {run.proposal_id}: {' → '.join(run.path)}")
+
+    started = time.monotonic()
+    try:
+        engine.run(drive())
+    finally:
+        engine.close()
+        progress.finish("proposals")
+        progress.close()
+    elapsed = time.monotonic() - started
+
+    summary = workload.summary()
+    workload.recorder.print_table(elapsed)
+    print_report(summary, elapsed)
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as handle:
+            json.dump({"elapsed": elapsed, **summary}, handle, indent=2)
+        print(f"💾 Relatório guardado em {args.json_out}")
+    return 0
+
+
+def main() -> int:
+    args = parse_args()
+    config = HttpConfig.from_args(args)
+    config.pool_maxsize = max(config.pool_maxsize, args.concurrency)
+    tracer = Tracer.from_args(args)
+    throttle = Throttle.from_args(args, args.concurrency)
+
+    with ApiClient(config) as api:
+        if tracer:
+            tracer.attach(api)
+        if throttle:
+            throttle.attach(api)
+        tokens = TokenManager(api)
+        try:
+            return run_negotiation(args, api, tokens)
+        finally:
+            tokens.close()
+            if throttle:
+                throttle.print_summary()
+            if tracer:
+                tracer.print_summary()
+                tracer.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,68 +4,176 @@ DreamLuso - Script Completo de Seed de Dados
 Popula o banco de dados com usuários, perfis, propriedades, propostas e visitas
 """
 
-import requests
+import argparse
+import asyncio
 import json
 import sys
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 
-API_URL = "http://localhost:5149/api"
+from dreamluso_tools.auth import ADMIN, AuthError, TokenManager
+from dreamluso_tools.checkpoint import CheckpointStore, add_checkpoint_arguments, property_key
+from dreamluso_tools.engine import SeedEngine, add_engine_arguments
+from dreamluso_tools.http_client import ApiClient, HttpConfig, add_http_arguments
+from dreamluso_tools.indexes import RecordIndex, index_specs
+from dreamluso_tools.pagination import PageError, iter_items
+from dreamluso_tools.progress import Progress, add_progress_arguments
+from dreamluso_tools.schema import INVALID, PayloadError, PropertyPayload
+from dreamluso_tools.throttle import Throttle, add_throttle_arguments
+from dreamluso_tools.tracing import Tracer, add_trace_arguments
+
+CLIENTS_DATA = [
+    ("ana.rodrigues@email.com", "123456789", 200000, 400000),
+    ("carlos.ferreira@email.com", "234567890", 300000, 600000),
+    ("sofia.almeida@email.com", "345678901", 150000, 300000),
+    ("miguel.oliveira@email.com", "456789012", 100000, 250000),
+    ("beatriz.lopes@email.com", "567890123", 250000, 500000),
+]
+
+AGENTS_DATA = [
+    ("joao.silva@dreamluso.pt", "AMI-12345", "Residencial", 3.5),
+    ("maria.santos@dreamluso.pt", "AMI-23456", "Luxury", 4.0),
+    ("pedro.costa@dreamluso.pt", "AMI-34567", "Comercial", 3.0),
+]
+
+PROPERTIES_DATA = [
+    {
+        "title": "Apartamento T3 Moderno em Lisboa",
+        "price": 385000,
+        "type": "Apartment",
+        "transaction": "Sale",
+        "bedrooms": 3,
+        "size": 120.5,
+        "address": {
+            "street": "Avenida da República",
+            "number": "125",
+            "postalCode": "1050-190",
+            "parish": "Alvalade",
+            "municipality": "Lisboa",
+            "district": "Lisboa"
+        }
+    },
+    {
+        "title": "Moradia V4 com Jardim no Porto",
+        "price": 650000,
+        "type": "House",
+        "transaction": "Sale",
+        "bedrooms": 4,
+        "size": 280,
+        "address": {
+            "street": "Rua do Ouro",
+            "number": "45",
+            "postalCode": "4150-553",
+            "parish": "Foz do Douro",
+            "municipality": "Porto",
+            "district": "Porto"
+        }
+    },
+    {
+        "title": "T2 Arrendamento em Cascais",
+        "price": 1200,
+        "type": "Apartment",
+        "transaction": "Rent",
+        "bedrooms": 2,
+        "size": 85,
+        "address": {
+            "street": "Avenida Marginal",
+            "number": "2050",
+            "postalCode": "2750-001",
+            "parish": "Cascais",
+            "municipality": "Cascais",
+            "district": "Lisboa"
+        }
+    },
+    {
+        "title": "Loja Comercial Centro de Braga",
+        "price": 1800,
+        "type": "Commercial",
+        "transaction": "Rent",
+        "bedrooms": 0,
+        "size": 150,
+        "address": {
+            "street": "Rua do Souto",
+            "number": "88",
+            "postalCode": "4700-329",
+            "parish": "Braga (Maximinos)",
+            "municipality": "Braga",
+            "district": "Braga"
+        }
+    },
+    {
+        "title": "T1 Estudante em Coimbra",
+        "price": 550,
+        "type": "Apartment",
+        "transaction": "Rent",
+        "bedrooms": 1,
+        "size": 55,
+        "address": {
+            "street": "Rua da Sofia",
+            "number": "142",
+            "postalCode": "3000-392",
+            "parish": "Coimbra (Sé Nova)",
+            "municipality": "Coimbra",
+            "district": "Coimbra"
+        }
+    }
+]
 
 class DreamLusoSeeder:
-    def __init__(self):
-        self.admin_token: Optional[str] = None
+    def __init__(self, api: Optional[ApiClient] = None, engine: Optional[SeedEngine] = None,
+                 checkpoint: Optional[CheckpointStore] = None, progress: Optional[Progress] = None):
+        self.api = api or ApiClient()
+        self.engine = engine or SeedEngine()
+        self.progress = progress or Progress()
+        # Sem ficheiro de checkpoint o progresso só vive durante a execução
+        self.checkpoint = checkpoint or CheckpointStore(":memory:")
+        self.tokens = TokenManager(self.api)
+        self.resumed = 0
         self.user_ids: Dict[str, str] = {}
         self.client_ids: Dict[str, str] = {}
         self.agent_ids: Dict[str, str] = {}
         self.property_ids: List[str] = []
         
     def login_admin(self) -> bool:
-        """Faz login como admin e obtém token"""
+        """Faz login como admin; o token fica em cache e é renovado antes de expirar"""
         print("🔐 Fazendo login como Admin...")
         
-        response = requests.post(f"{API_URL}/accounts/login", json={
-            "email": "admin@gmail.com",
-            "password": "Admin123!"
-        })
-        
-        if response.status_code == 200:
-            data = response.json()
-            self.admin_token = data.get("accessToken")
-            print(f"✅ Login bem-sucedido! Token obtido.")
-            return True
-        else:
-            print(f"❌ Erro no login: {response.status_code}")
-            print(response.text)
+        self.tokens.register_admin()
+        try:
+            self.tokens.state(ADMIN)
+        except AuthError as e:
+            print(f"❌ Erro no login: {e}")
             return False
-    
-    def get_headers(self) -> Dict[str, str]:
-        """Retorna headers com autenticação"""
-        return {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.admin_token}"
-        }
+        
+        self.tokens.attach(self.api, ADMIN)
+        print(f"✅ Login bem-sucedido! Token obtido.")
+        return True
     
     def get_all_users(self) -> List[Dict]:
         """Busca todos os usuários"""
         print("\n📋 Buscando usuários existentes...")
         
-        response = requests.get(f"{API_URL}/users", headers=self.get_headers())
-        
-        if response.status_code == 200:
-            users = response.json()
-            print(f"   Encontrados {len(users)} usuários")
-            return users
-        else:
-            print(f"   ⚠️  Erro ao buscar usuários: {response.status_code}")
+        # /users não é paginado: o iterador faz um único pedido
+        try:
+            users = list(iter_items(self.api, "/users"))
+        except PageError as e:
+            print(f"   ⚠️  Erro ao buscar usuários: {e}")
             return []
+        
+        print(f"   Encontrados {len(users)} usuários")
+        return users
     
     def create_client_profile(self, user_id: str, email: str, nif: str, 
                              min_budget: float, max_budget: float) -> Optional[str]:
         """Cria perfil de cliente"""
         
-        response = requests.post(f"{API_URL}/clients", 
-            headers=self.get_headers(),
+        existing = self.checkpoint.get("client", nif)
+        if existing:
+            self.resumed += 1
+            self.progress.skip("clients")
+            return existing
+        
+        response = self.api.post("/clients",
             json={
                 "userId": user_id,
                 "nif": nif,
@@ -79,7 +187,9 @@ class DreamLusoSeeder:
         if response.status_code in [200, 201]:
             data = response.json()
             client_id = data.get("clientId") or data.get("id")
-            print(f"   ✅ Cliente criado para {email}")
+            if client_id:
+                self.checkpoint.put("client", nif, client_id)
+            self.progress.ok("clients", f"✅ Cliente criado para {email}")
             return client_id
         else:
             try:
@@ -87,15 +197,21 @@ class DreamLusoSeeder:
                 error_msg = error_data.get("description", str(error_data))
             except:
                 error_msg = response.text[:100]
-            print(f"   ⚠️  {email}: [{response.status_code}] {error_msg}")
+            self.progress.fail("clients", f"⚠️  {email}: [{response.status_code}] {error_msg}",
+                               response.status_code)
             return None
     
     def create_agent_profile(self, user_id: str, email: str, license: str, 
                             specialization: str, commission: float) -> Optional[str]:
         """Cria perfil de agente imobiliário"""
         
-        response = requests.post(f"{API_URL}/agents",
-            headers=self.get_headers(),
+        existing = self.checkpoint.get("agent", license)
+        if existing:
+            self.resumed += 1
+            self.progress.skip("agents")
+            return existing
+        
+        response = self.api.post("/agents",
             json={
                 "userId": user_id,
                 "licenseNumber": license,
@@ -111,7 +227,9 @@ class DreamLusoSeeder:
         if response.status_code in [200, 201]:
             data = response.json()
             agent_id = data.get("agentId") or data.get("id")
-            print(f"   ✅ Agente criado para {email} - Licença: {license}")
+            if agent_id:
+                self.checkpoint.put("agent", license, agent_id)
+            self.progress.ok("agents", f"✅ Agente criado para {email} - Licença: {license}")
             return agent_id
         else:
             try:
@@ -119,7 +237,8 @@ class DreamLusoSeeder:
                 error_msg = error_data.get("description", str(error_data))
             except:
                 error_msg = response.text[:100]
-            print(f"   ⚠️  {email}: [{response.status_code}] {error_msg}")
+            self.progress.fail("agents", f"⚠️  {email}: [{response.status_code}] {error_msg}",
+                               response.status_code)
             return None
     
     def create_property(self, agent_id: str, title: str, price: float, 
@@ -127,9 +246,16 @@ class DreamLusoSeeder:
                        bedrooms: int, size: float, address: Dict) -> Optional[str]:
         """Cria uma propriedade"""
         
-        response = requests.post(f"{API_URL}/properties",
-            headers=self.get_headers(),
-            json={
+        key = property_key(title, address)
+        existing = self.checkpoint.get("property", key)
+        if existing:
+            self.resumed += 1
+            self.progress.skip("properties")
+            return existing
+        
+        try:
+            # Morada aninhada e enums por nome: o schema converte no form plano que o endpoint lê
+            payload = PropertyPayload.from_record({
                 "title": title,
                 "description": f"Excelente {property_type.lower()} localizado em {address['municipality']}. Imóvel em ótimo estado de conservação.",
                 "type": property_type,
@@ -147,16 +273,105 @@ class DreamLusoSeeder:
                 "energyRating": "B",
                 "amenities": ["Aquecimento Central", "Ar Condicionado", "Cozinha Equipada"]
             })
+        except PayloadError as e:
+            self.progress.fail("properties", f"❌ {title}: {e}", INVALID)
+            return None
+        
+        response = self.api.post("/properties", data=payload.to_form())
         
         if response.status_code in [200, 201]:
             data = response.json()
             property_id = data.get("propertyId") or data.get("id")
-            print(f"   ✅ Propriedade criada: {title} - €{price:,.0f}")
+            if property_id:
+                self.checkpoint.put("property", key, property_id)
+            self.progress.ok("properties", f"✅ Propriedade criada: {title} - €{price:,.0f}")
             return property_id
         else:
-            print(f"   ⚠️  Erro ao criar {title}: {response.status_code}")
+            try:
+                error_msg = response.json().get("description", response.text[:100])
+            except ValueError:
+                error_msg = response.text[:100]
+            self.progress.fail("properties", f"⚠️  Erro ao criar {title}: [{response.status_code}] {error_msg}",
+                               response.status_code)
             return None
     
+    async def seed_entities(self, users: List[Dict]):
+        """Cria clientes em paralelo com agentes; as propriedades aguardam os agentes"""
+        # Índices por email construídos uma vez: a junção é linear no número de utilizadores
+        user_index = RecordIndex(users)
+        client_specs = index_specs(CLIENTS_DATA, key=lambda spec: spec[0])
+        agent_specs = index_specs(AGENTS_DATA, key=lambda spec: spec[0])
+        
+        client_jobs = []
+        for user, (_, nif, min_b, max_b) in user_index.join(client_specs, partition="Client"):
+            # Perfil criado numa execução anterior que falhou antes do checkpoint
+            if user.get("clientId"):
+                self.checkpoint.put("client", nif, user["clientId"])
+            client_jobs.append((user["id"], user["email"], nif, min_b, max_b))
+        
+        agent_jobs = []
+        for user, (_, license, spec, commission) in user_index.join(agent_specs, partition="RealEstateAgent"):
+            if user.get("agentId"):
+                self.checkpoint.put("agent", license, user["agentId"])
+            agent_jobs.append((user["id"], user["email"], license, spec, commission))
+        
+        self.progress.info("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        self.progress.info(f"👥 Criando perfis de Clientes e Agentes (concorrência {self.engine.concurrency})...")
+        self.progress.info("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        self.progress.stage("clients", len(client_jobs))
+        self.progress.stage("agents", len(agent_jobs))
+        
+        await asyncio.gather(
+            self.seed_clients(client_jobs),
+            self.seed_agents_and_properties(agent_jobs),
+        )
+    
+    async def seed_clients(self, client_jobs: List[Tuple]):
+        """Cria perfis de cliente em paralelo"""
+        results = await self.engine.map(self.create_client_profile, client_jobs)
+        for (_, email, *_), client_id in zip(client_jobs, results):
+            if client_id:
+                self.client_ids[email] = client_id
+        self.progress.finish("clients")
+    
+    async def seed_agents_and_properties(self, agent_jobs: List[Tuple]):
+        """Cria perfis de agente e, quando os ids estiverem resolvidos, as suas propriedades"""
+        results = await self.engine.map(self.create_agent_profile, agent_jobs)
+        for (user_id, email, *_), agent_id in zip(agent_jobs, results):
+            if agent_id:
+                self.agent_ids[email] = agent_id
+                self.user_ids[email] = user_id
+        self.progress.finish("agents")
+        
+        self.progress.info("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        self.progress.info("🏠 Criando Propriedades...")
+        self.progress.info("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        
+        if not self.agent_ids:
+            return
+        
+        # Distribuir propriedades entre agentes
+        agent_list = list(self.agent_ids.values())
+        property_jobs = [
+            (
+                agent_list[idx % len(agent_list)],
+                prop_data["title"],
+                prop_data["price"],
+                prop_data["type"],
+                prop_data["transaction"],
+                prop_data["bedrooms"],
+                prop_data["size"],
+                prop_data["address"]
+            )
+            for idx, prop_data in enumerate(PROPERTIES_DATA)
+        ]
+        
+        self.progress.stage("properties", len(property_jobs))
+        for prop_id in await self.engine.map(self.create_property, property_jobs):
+            if prop_id:
+                self.property_ids.append(prop_id)
+        self.progress.finish("properties")
+    
     def run_seed(self):
         """Executa o seed completo"""
         
@@ -171,166 +386,9 @@ class DreamLusoSeeder:
             print("❌ Nenhum usuário encontrado!")
             return False
         
-        # 3. Criar perfis de Clientes
-        print("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
-        print("👥 Criando perfis de Clientes...")
-        print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
-        
-        clients_data = [
-            ("ana.rodrigues@email.com", "123456789", 200000, 400000),
-            ("carlos.ferreira@email.com", "234567890", 300000, 600000),
-            ("sofia.almeida@email.com", "345678901", 150000, 300000),
-            ("miguel.oliveira@email.com", "456789012", 100000, 250000),
-            ("beatriz.lopes@email.com", "567890123", 250000, 500000),
-        ]
-        
-        for user in users:
-            if user["role"] == "Client":
-                email = user["email"]
-                for client_email, nif, min_b, max_b in clients_data:
-                    if client_email == email:
-                        client_id = self.create_client_profile(
-                            user["id"], email, nif, min_b, max_b
-                        )
-                        if client_id:
-                            self.client_ids[email] = client_id
-                        break
-        
-        # 4. Criar perfis de Agentes
-        print("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
-        print("👔 Criando perfis de Agentes...")
-        print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
-        
-        agents_data = [
-            ("joao.silva@dreamluso.pt", "AMI-12345", "Residencial", 3.5),
-            ("maria.santos@dreamluso.pt", "AMI-23456", "Luxury", 4.0),
-            ("pedro.costa@dreamluso.pt", "AMI-34567", "Comercial", 3.0),
-        ]
-        
-        for user in users:
-            if user["role"] == "RealEstateAgent":
-                email = user["email"]
-                for agent_email, license, spec, commission in agents_data:
-                    if agent_email == email:
-                        agent_id = self.create_agent_profile(
-                            user["id"], email, license, spec, commission
-                        )
-                        if agent_id:
-                            self.agent_ids[email] = agent_id
-                            self.user_ids[email] = user["id"]
-                        break
-        
-        # 5. Criar Propriedades
-        print("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
-        print("🏠 Criando Propriedades...")
-        print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
-        
-        if self.agent_ids:
-            # Usar o primeiro agente disponível
-            first_agent_id = list(self.agent_ids.values())[0]
-            
-            properties_data = [
-                {
-                    "title": "Apartamento T3 Moderno em Lisboa",
-                    "price": 385000,
-                    "type": "Apartment",
-                    "transaction": "Sale",
-                    "bedrooms": 3,
-                    "size": 120.5,
-                    "address": {
-                        "street": "Avenida da República",
-                        "number": "125",
-                        "postalCode": "1050-190",
-                        "parish": "Alvalade",
-                        "municipality": "Lisboa",
-                        "district": "Lisboa"
-                    }
-                },
-                {
-                    "title": "Moradia V4 com Jardim no Porto",
-                    "price": 650000,
-                    "type": "House",
-                    "transaction": "Sale",
-                    "bedrooms": 4,
-                    "size": 280,
-                    "address": {
-                        "street": "Rua do Ouro",
-                        "number": "45",
-                        "postalCode": "4150-553",
-                        "parish": "Foz do Douro",
-                        "municipality": "Porto",
-                        "district": "Porto"
-                    }
-                },
-                {
-                    "title": "T2 Arrendamento em Cascais",
-                    "price": 1200,
-                    "type": "Apartment",
-                    "transaction": "Rent",
-                    "bedrooms": 2,
-                    "size": 85,
-                    "address": {
-                        "street": "Avenida Marginal",
-                        "number": "2050",
-                        "postalCode": "2750-001",
-                        "parish": "Cascais",
-                        "municipality": "Cascais",
-                        "district": "Lisboa"
-                    }
-                },
-                {
-                    "title": "Loja Comercial Centro de Braga",
-                    "price": 1800,
-                    "type": "Commercial",
-                    "transaction": "Rent",
-                    "bedrooms": 0,
-                    "size": 150,
-                    "address": {
-                        "street": "Rua do Souto",
-                        "number": "88",
-                        "postalCode": "4700-329",
-                        "parish": "Braga (Maximinos)",
-                        "municipality": "Braga",
-                        "district": "Braga"
-                    }
-                },
-                {
-                    "title": "T1 Estudante em Coimbra",
-                    "price": 550,
-                    "type": "Apartment",
-                    "transaction": "Rent",
-                    "bedrooms": 1,
-                    "size": 55,
-                    "address": {
-                        "street": "Rua da Sofia",
-                        "number": "142",
-                        "postalCode": "3000-392",
-                        "parish": "Coimbra (Sé Nova)",
-                        "municipality": "Coimbra",
-                        "district": "Coimbra"
-                    }
-                }
-            ]
-            
-            # Distribuir propriedades entre agentes
-            agent_list = list(self.agent_ids.values())
-            
-            for idx, prop_data in enumerate(properties_data):
-                agent_id = agent_list[idx % len(agent_list)] if agent_list else first_agent_id
-                
-                prop_id = self.create_property(
-                    agent_id,
-                    prop_data["title"],
-                    prop_data["price"],
-                    prop_data["type"],
-                    prop_data["transaction"],
-                    prop_data["bedrooms"],
-                    prop_data["size"],
-                    prop_data["address"]
-                )
-                
-                if prop_id:
-                    self.property_ids.append(prop_id)
+        # 3-5. Perfis e propriedades, em paralelo
+        self.engine.run(self.seed_entities(users))
+        self.progress.close()
         
         # 6. Resumo
         print("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
@@ -340,6 +398,8 @@ class DreamLusoSeeder:
         print(f"   • {len(self.client_ids)} Perfis de Clientes criados")
         print(f"   • {len(self.agent_ids)} Perfis de Agentes criados")
         print(f"   • {len(self.property_ids)} Propriedades criadas")
+        if self.resumed:
+            print(f"   • {self.resumed} retomados do checkpoint ({self.checkpoint.path})")
         print(f"\n🔑 LOGIN:")
         print(f"   Email: admin@gmail.com")
         print(f"   Senha: Admin123!")
@@ -348,20 +408,55 @@ class DreamLusoSeeder:
         
         return True
 
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Seed completo da base de dados DreamLuso")
+    add_http_arguments(parser)
+    add_engine_arguments(parser)
+    add_checkpoint_arguments(parser)
+    add_trace_arguments(parser)
+    add_progress_arguments(parser)
+    add_throttle_arguments(parser)
+    return parser.parse_args(argv)
+
 def main():
-    seeder = DreamLusoSeeder()
+    args = parse_args()
+    config = HttpConfig.from_args(args)
+    # Cada worker precisa de uma ligação própria no pool
+    config.pool_maxsize = max(config.pool_maxsize, args.concurrency)
+    checkpoint = CheckpointStore(args.checkpoint)
+    if args.fresh:
+        checkpoint.reset()
+    elif checkpoint.count():
+        print(f"♻️  A retomar: {checkpoint.count()} entidades já registadas em {args.checkpoint}")
+    api = ApiClient(config)
+    tracer = Tracer.from_args(args)
+    if tracer:
+        tracer.attach(api)
+    throttle = Throttle.from_args(args, args.concurrency)
+    if throttle:
+        throttle.attach(api)
+    seeder = DreamLusoSeeder(api, SeedEngine(args.concurrency), checkpoint, Progress.from_args(args))
     
     try:
-        if not seeder.login_admin():
+        # run_seed já faz o login de admin
+        if not seeder.run_seed():
             sys.exit(1)
         
-        seeder.run_seed()
-        
     except Exception as e:
         print(f"\n❌ Erro durante seed: {str(e)}")
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        seeder.tokens.close()
+        seeder.engine.close()
+        seeder.api.close()
+        checkpoint.close()
+        if tracer:
+            tracer.print_summary()
+            tracer.close()
+        if throttle:
+            throttle.print_summary()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+DreamLuso - Exportação e replay de datasets de seed em NDJSON
+
+    python3 scripts/seed_dataset.py export --out data/seed --properties 50000
+    python3 scripts/seed_dataset.py export --out data/xl --profile xl --gzip
+    python3 scripts/seed_dataset.py replay data/medium --profile medium
+    python3 scripts/seed_dataset.py replay data/seed --concurrency 16 --images 3
+    python3 scripts/seed_dataset.py replay data/large --profile large --batch-size 500
+    python3 scripts/seed_dataset.py replay data/xl --profile xl --shards 16 --api-urls http://api1:5149/api,http://api2:5149/api
+    python3 scripts/seed_dataset.py images data/seed --images 5 --image-format webp
+    python3 scripts/seed_dataset.py validate data/large
+"""
+
+import argparse
+import os
+import sys
+import time
+from dataclasses import asdict
+from datetime import date
+from typing import List, Optional
+
+from dreamluso_tools.auth import ADMIN, AuthError, TokenManager
+from dreamluso_tools.engine import SeedEngine, add_engine_arguments
+from dreamluso_tools.generator import DatasetCounts, DatasetGenerator
+from dreamluso_tools.http_client import ApiClient, HttpConfig, add_http_arguments
+from dreamluso_tools.images import ImagePool, add_image_arguments
+from dreamluso_tools.ndjson_io import IdMap
+from dreamluso_tools.profiles import PROFILES, SeedProfile, get_profile, read_manifest, write_manifest
+from dreamluso_tools.progress import Progress, add_progress_arguments
+from dreamluso_tools.replay import IMAGES, KINDS, MAX_BATCH_SIZE, DatasetReplayer, export_dataset, validate_dataset
+from dreamluso_tools.schema import INVALID, orjson
+from dreamluso_tools.sharding import add_shard_arguments, api_urls, run_sharded, split_dataset
+from dreamluso_tools.throttle import Throttle, add_throttle_arguments
+from dreamluso_tools.tracing import Tracer, add_trace_arguments
+
+
+def login_admin(tokens: TokenManager) -> bool:
+    """Autentica o ApiClient do gestor como admin; replays longos renovam o token sozinhos"""
+    print("🔐 Fazendo login como Admin...")
+    tokens.register_admin()
+    try:
+        tokens.state(ADMIN)
+    except AuthError as e:
+        print(f"❌ Erro no login: {e}")
+        return False
+    tokens.attach(tokens.api, ADMIN)
+    print("✅ Login bem-sucedido!")
+    return True
+
+
+COUNT_KINDS = ("clients", "agents", "properties", "proposals", "visits", "notifications")
+
+
+def export(directory: str, seed: int, counts: DatasetCounts, compress: bool = False,
+           anchor: Optional[date] = None, profile: Optional[SeedProfile] = None) -> None:
+    label = profile.label if profile else "personalizado"
+    print(f"📝 A exportar dataset {label} (seed={seed}) para {directory}")
+    started = time.monotonic()
+    checksums = {}
+    written = export_dataset(DatasetGenerator(seed), counts, directory, compress=compress,
+                             checksums=checksums)
+    for kind, count in written.items():
+        print(f"   ✅ {kind:<13} {count:>9}  sha256 {checksums[kind][:16]}")
+    write_manifest(directory, seed, counts, anchor or date.today(), checksums, profile)
+    print(f"⏱️  {time.monotonic() - started:.1f}s")
+
+
+def run_export(args: argparse.Namespace) -> int:
+    explicit = {kind: getattr(args, kind) for kind in COUNT_KINDS if getattr(args, kind) is not None}
+    if args.profile:
+        if explicit or args.seed is not None:
+            print("❌ --profile fixa a seed e as cardinalidades; não as combine com --seed/--clients/...")
+            return 1
+        profile = get_profile(args.profile)
+        export(args.out, profile.seed, profile.counts(), args.gzip, args.anchor_date, profile)
+        return 0
+    counts = DatasetCounts(**{**asdict(DatasetCounts()), **explicit})
+    try:
+        counts.validate()
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    export(args.out, 42 if args.seed is None else args.seed, counts, args.gzip, args.anchor_date)
+    return 0
+
+
+def run_profiles(args: argparse.Namespace) -> int:
+    print(f"   {'perfil':<12} {'seed':>5} " + " ".join(f"{kind:>13}" for kind in COUNT_KINDS))
+    for profile in PROFILES.values():
+        counts = profile.counts()
+        print(f"   {profile.label:<12} {profile.seed:>5} "
+              + " ".join(f"{getattr(counts, kind):>13,}" for kind in COUNT_KINDS))
+    return 0
+
+
+def prepare_dataset(args: argparse.Namespace) -> Optional[date]:
+    """
+    Com --profile exporta o perfil se o diretório ainda não o tiver e recusa
+    datasets de outro perfil/versão. Devolve a data base das visitas
+    registada no manifesto (hoje, se já passou ou não há manifesto).
+    """
+    manifest = read_manifest(args.dataset)
+    if args.profile:
+        profile = get_profile(args.profile)
+        if manifest is None:
+            export(args.dataset, profile.seed, profile.counts(), profile=profile)
+            manifest = read_manifest(args.dataset)
+        elif (manifest.get("profile"), manifest.get("profileVersion")) != (profile.name, profile.version):
+            print(f"❌ {args.dataset} foi gerado com {manifest.get('profile')}@v{manifest.get('profileVersion')}, "
+                  f"não {profile.label}")
+            return None
+    if manifest is None:
+        return date.today()
+    anchor = date.fromisoformat(manifest["anchorDate"])
+    if anchor < date.today():
+        # A API recusa visitas no passado: só as datas das visitas mudam
+        print(f"⚠️  Data base {anchor} já passou: visitas a contar de hoje")
+        return date.today()
+    return anchor
+
+
+def open_image_pool(args: argparse.Namespace) -> Optional[ImagePool]:
+    """Gera o que faltar no pool e faz mmap das imagens; None se --images 0"""
+    if args.images <= 0:
+        return None
+    pool = ImagePool.from_args(args)
+    if pool.format != args.image_format:
+        print(f"⚠️  Pillow não instalado: imagens geradas em {pool.format}")
+    created = pool.ensure()
+    pool.open()
+    print(f"🖼️  Pool {args.image_dir}: {len(pool.images)} imagens "
+          f"({pool.total_bytes() / 1024 / 1024:.1f} MB, {created} geradas agora)")
+    return pool
+
+
+ERROR_LABELS = {0: "dependência", INVALID: "inválido"}
+
+
+def print_summary(stats, elapsed: float, kinds=KINDS) -> None:
+    print("\n" + "━" * 50)
+    print("📊 RESUMO DO REPLAY")
+    print("━" * 50)
+    for kind in kinds:
+        s = stats[kind]
+        errors = ", ".join(f"{ERROR_LABELS.get(code, code)}×{n}" for code, n in sorted(s.errors.items()))
+        line = f"   {kind:<13} criados={s.created:<7} existentes={s.skipped:<7} falhados={s.failed}"
+        if s.batches:
+            line += f"  lotes={s.batches} (recusados={s.fallbacks})"
+        print(line + (f"  ({errors})" if errors else ""))
+    print(f"⏱️  {elapsed:.1f}s")
+    print("━" * 50)
+
+
+def run_sharded_replay(args: argparse.Namespace) -> int:
+    """Divide o dataset e faz o replay com um processo por shard (ver dreamluso_tools.sharding)"""
+    anchor = prepare_dataset(args)
+    if anchor is None:
+        return 1
+    if args.images > 0:
+        # Gera o pool uma vez aqui: os workers só fazem mmap dos ficheiros
+        ImagePool.from_args(args).ensure()
+    ids_dir = args.ids or os.path.join(args.dataset, "ids")
+    urls = api_urls(args)
+    started = time.monotonic()
+    dirs, reused = split_dataset(args.dataset, args.shards)
+    print(f"🧩 {args.shards} shards em {os.path.dirname(dirs[0])} "
+          f"({'reutilizados' if reused else f'divididos em {time.monotonic() - started:.1f}s'})")
+    print(f"🚀 Replay de {args.dataset} com {args.shards} processos × {args.concurrency} pedidos "
+          f"em {len(urls)} instância(s) (ids em {ids_dir})")
+    if args.batch_size:
+        print(f"📦 Lotes de {args.batch_size} registos pelos endpoints /bulk")
+    stats, failures = run_sharded(dirs, urls, ids_dir, args, anchor)
+    for failure in failures:
+        print(f"❌ {failure}")
+    print_summary(stats, time.monotonic() - started, kinds=KINDS + ((IMAGES,) if args.images > 0 else ()))
+    return 1 if failures else 0 if not any(s.failed for s in stats.values()) else 2
+
+
+def run_replay(args: argparse.Namespace) -> int:
+    if not 0 <= args.batch_size <= MAX_BATCH_SIZE:
+        print(f"❌ --batch-size deve estar entre 0 e {MAX_BATCH_SIZE}")
+        return 1
+    if args.shards < 0:
+        print("❌ --shards deve ser >= 0")
+        return 1
+    if args.shards:
+        return run_sharded_replay(args)
+    config = HttpConfig.from_args(args)
+    config.pool_maxsize = max(config.pool_maxsize, args.concurrency)
+    ids_dir = args.ids or os.path.join(args.dataset, "ids")
+
+    with ApiClient(config) as api, SeedEngine(args.concurrency) as engine, IdMap(ids_dir) as id_map:
+        tracer = Tracer.from_args(args)
+        if tracer:
+            tracer.attach(api)
+        throttle = Throttle.from_args(args, args.concurrency)
+        if throttle:
+            throttle.attach(api)
+        tokens = TokenManager(api)
+        pool = open_image_pool(args)
+        try:
+            if not login_admin(tokens):
+                return 1
+
+            anchor = prepare_dataset(args)
+            if anchor is None:
+                return 1
+            print(f"🚀 Replay de {args.dataset} (ids em {ids_dir})")
+            started = time.monotonic()
+            progress = Progress.from_args(args)
+            if args.batch_size:
+                print(f"📦 Lotes de {args.batch_size} registos pelos endpoints /bulk")
+            replayer = DatasetReplayer(api, engine, id_map, pool, args.images, progress, anchor,
+                                       batch_size=args.batch_size)
+            stats = engine.run(replayer.replay(args.dataset))
+            progress.close()
+            print_summary(stats, time.monotonic() - started)
+            return 0 if not any(s.failed for s in stats.values()) else 2
+        finally:
+            tokens.close()
+            if pool is not None:
+                pool.close()
+            if tracer:
+                tracer.print_summary()
+                tracer.close()
+            if throttle:
+                throttle.print_summary()
+
+
+def run_validate(args: argparse.Namespace) -> int:
+    """Valida e serializa o dataset inteiro sem rede, como o replay o enviaria"""
+    anchor = prepare_dataset(args)
+    encoder = "orjson" if orjson is not None else "json"
+    print(f"🔍 A validar {args.dataset} (serialização com {encoder})")
+    started = time.monotonic()
+    report = validate_dataset(args.dataset, anchor, args.samples)
+    print("\n" + "━" * 70)
+    print("🔍 VALIDAÇÃO OFFLINE")
+    print("━" * 70)
+    for kind, result in report.items():
+        per_record = result["seconds"] / result["records"] * 1e6 if result["records"] else 0.0
+        print(f"   {kind:<13} registos={result['records']:<8} inválidos={result['invalid']:<6} "
+              f"{per_record:>6.1f} µs/registo  {result['bytes'] / 1024 / 1024:>8.1f} MB")
+        if result["fields"]:
+            print("      campos: " + ", ".join(f"{name}×{n}" for name, n in sorted(result["fields"].items())))
+        for example in result["examples"]:
+            print(f"      ❌ {example}")
+    print(f"⏱️  {time.monotonic() - started:.1f}s")
+    print("━" * 70)
+    return 0 if not any(result["invalid"] for result in report.values()) else 2
+
+
+def run_images(args: argparse.Namespace) -> int:
+    """Imagens para as propriedades de um replay anterior"""
+    config = HttpConfig.from_args(args)
+    config.pool_maxsize = max(config.pool_maxsize, args.concurrency)
+    ids_dir = args.ids or os.path.join(args.dataset, "ids")
+    if args.images <= 0:
+        print("❌ --images deve ser > 0")
+        return 1
+
+    with ApiClient(config) as api, SeedEngine(args.concurrency) as engine, IdMap(ids_dir) as id_map:
+        tracer = Tracer.from_args(args)
+        if tracer:
+            tracer.attach(api)
+        throttle = Throttle.from_args(args, args.concurrency)
+        if throttle:
+            throttle.attach(api)
+        tokens = TokenManager(api)
+        pool = open_image_pool(args)
+        try:
+            if not login_admin(tokens):
+                return 1
+
+            target = "/images/upload" if args.upload_only else "PUT /properties/{id}"
+            print(f"📤 {args.images} imagens por propriedade via {target}")
+            started = time.monotonic()
+            progress = Progress.from_args(args)
+            replayer = DatasetReplayer(api, engine, id_map, pool, args.images, progress)
+            engine.run(replayer.replay_images(args.dataset, args.upload_only, args.manifest))
+            progress.close()
+            print_summary(replayer.stats, time.monotonic() - started, kinds=(IMAGES,))
+            return 0 if not replayer.stats[IMAGES].failed else 2
+        finally:
+            tokens.close()
+            pool.close()
+            if tracer:
+                tracer.print_summary()
+                tracer.close()
+            if throttle:
+                throttle.print_summary()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Exportação/replay de datasets NDJSON do DreamLuso")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="Gera o dataset para ficheiros NDJSON")
+    export.add_argument("--out", required=True, help="Diretório de destino")
+    export.add_argument("--profile", choices=list(PROFILES), help="Perfil com seed e cardinalidades fixas")
+    export.add_argument("--seed", type=int, default=None, help="Seed do RNG (default: 42)")
+    export.add_argument("--gzip", action="store_true", help="Comprime os ficheiros (.ndjson.gz)")
+    export.add_argument("--anchor-date", type=date.fromisoformat, default=None,
+                        help="Data base das visitas, AAAA-MM-DD (default: hoje)")
+    defaults = DatasetCounts()
+    for kind in COUNT_KINDS:
+        export.add_argument(f"--{kind}", type=int, default=None,
+                            help=f"(default: {getattr(defaults, kind)})")
+
+    commands.add_parser("profiles", help="Lista os perfis e as suas cardinalidades")
+
+    replay = commands.add_parser("replay", help="Envia um dataset NDJSON para a API")
+    replay.add_argument("dataset", help="Diretório com os ficheiros NDJSON")
+    replay.add_argument("--ids", help="Diretório do mapa de ids (default: <dataset>/ids)")
+    replay.add_argument("--profile", choices=list(PROFILES),
+                        help="Exporta o perfil para o diretório se ainda lá não estiver")
+    replay.add_argument("--batch-size", type=int, default=0,
+                        help=f"Registos por pedido aos endpoints /bulk (máx. {MAX_BATCH_SIZE}); um lote recusado "
+                             "é reenviado item a item (default: 0, um pedido por registo)")
+    add_http_arguments(replay)
+    add_engine_arguments(replay)
+    add_shard_arguments(replay)
+    add_image_arguments(replay)
+    add_trace_arguments(replay)
+    add_throttle_arguments(replay)
+    add_progress_arguments(replay, default="quiet")
+
+    check = commands.add_parser("validate", help="Valida os payloads do dataset sem os enviar")
+    check.add_argument("dataset", help="Diretório com os ficheiros NDJSON")
+    check.add_argument("--samples", type=int, default=5, help="Exemplos de erro por tipo (default: %(default)s)")
+    check.set_defaults(profile=None)
+
+    images = commands.add_parser("images", help="Envia imagens para as propriedades já criadas")
+    images.add_argument("dataset", help="Diretório com os ficheiros NDJSON")
+    images.add_argument("--ids", help="Diretório do mapa de ids (default: <dataset>/ids)")
+    images.add_argument("--upload-only", action="store_true",
+                        help="Só /images/upload (mede armazenamento) e regista os URLs num manifesto")
+    images.add_argument("--manifest", help="Manifesto NDJSON dos URLs (default: <dataset>/image_urls.ndjson)")
+    add_http_arguments(images)
+    add_engine_arguments(images)
+    add_image_arguments(images, per_property_default=3)
+    add_trace_arguments(images)
+    add_throttle_arguments(images)
+    add_progress_arguments(images, default="quiet")
+
+    return parser.parse_args(argv)
+
+
+def main() -> int:
+    args = parse_args()
+    if args.command == "export":
+        return run_export(args)
+    if args.command == "profiles":
+        return run_profiles(args)
+    if args.command == "images":
+        return run_images(args)
+    if args.command == "validate":
+        return run_validate(args)
+    return run_replay(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
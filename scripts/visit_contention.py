@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+DreamLuso - Teste de contenção no agendamento de visitas
+
+Concentra marcações, confirmações e cancelamentos em poucos agentes e
+imóveis, mede conflitos e latência sob disputa e audita no fim os horários
+com mais de uma visita ativa.
+
+    python3 scripts/visit_contention.py --rps 30 --duration 60 --as-clients 40
+    python3 scripts/visit_contention.py --duration 0 --hot-agents 1 --hot-properties 1 --race-rounds 20 --racers 16
+"""
+
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+from dreamluso_tools.auth import ADMIN, AuthError, TokenManager
+from dreamluso_tools.contention import (
+    CONTENTION_WEIGHTS,
+    VisitContentionWorkload,
+    add_contention_arguments,
+    pick_hot_targets,
+)
+from dreamluso_tools.generator import DatasetGenerator
+from dreamluso_tools.http_client import ApiClient, HttpConfig, add_http_arguments
+from dreamluso_tools.loadgen import OpenLoopRunner, add_load_arguments, parse_weights
+from dreamluso_tools.metrics import LatencyRecorder
+from dreamluso_tools.payloads import ADMIN_EMAIL, ADMIN_PASSWORD
+from dreamluso_tools.workloads import WorkloadData
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Teste de contenção no agendamento de visitas")
+    add_http_arguments(parser)
+    add_load_arguments(parser)
+    add_contention_arguments(parser)
+    # Um retry de um POST /visits que chegou a gravar transforma-se num conflito falso
+    parser.set_defaults(retries=0)
+    parser.add_argument("--email", default=ADMIN_EMAIL)
+    parser.add_argument("--password", default=ADMIN_PASSWORD)
+    parser.add_argument("--as-clients", type=int, default=0, metavar="N",
+                        help="Autentica os primeiros N clientes do dataset gerado e marca como eles")
+    parser.add_argument("--dataset-seed", type=int, default=42,
+                        help="Seed do dataset (seed_dataset.py export --seed) de onde vêm as credenciais")
+    parser.add_argument("--weight", action="append", default=[], metavar="CENARIO=PESO",
+                        help=f"Altera o peso de um cenário ({', '.join(CONTENTION_WEIGHTS)})")
+    parser.add_argument("--json-out", help="Escreve o relatório em JSON neste ficheiro")
+    return parser.parse_args(argv)
+
+
+def main() -> int:
+    args = parse_args()
+    config = HttpConfig.from_args(args)
+    config.pool_maxsize = max(config.pool_maxsize, args.max_inflight, args.racers)
+
+    with ApiClient(config) as api:
+        tokens = TokenManager(api, workers=max(8, args.max_inflight // 4))
+        try:
+            return run_contention(args, api, tokens)
+        finally:
+            tokens.close()
+
+
+def print_report(summary: dict) -> None:
+    booking = summary["booking"]
+    print("\n" + "━" * 70)
+    print(f"📅 CONTENÇÃO: {summary['targets']} imóveis de {summary['agents']} agentes, "
+          f"{len(summary['dates'])} dias, {summary['slots']} horários")
+    print("━" * 70)
+    print(f"   Tentativas de marcação: {booking['attempts']}  "
+          f"(+{booking['soldOut']} sem horários livres)")
+    print(f"   ✅ marcadas {booking['booked']}  ⚔️  conflitos {booking['conflict']} "
+          f"({booking['conflictRate'] * 100:.1f}%)  ❌ rejeitadas {booking['rejected']}  "
+          f"💥 falhadas {booking['failed']}")
+    if booking["errorCodes"]:
+        codes = ", ".join(f"{code}={n}" for code, n in sorted(booking["errorCodes"].items()))
+        print(f"   Códigos de erro: {codes}")
+    if summary["transitions"]:
+        print("   Transições: " + ", ".join(f"{t}={n}" for t, n in sorted(summary["transitions"].items())))
+    race = summary.get("race")
+    if race:
+        winners = ", ".join(f"{k} vencedor(es)={n}" for k, n in race["winnersPerRound"].items())
+        print(f"   🏁 Corrida: {race['rounds']} rondas × {race['racers']} clientes - {winners or '-'}"
+              + (f" ({race['soldOutRounds']} sem horários livres)" if race["soldOutRounds"] else ""))
+        print(f"      Rondas com marcação duplicada: {race['doubleBookedRounds']} "
+              f"({race['doubleBookingRate'] * 100:.1f}%)")
+    audit = summary.get("audit")
+    if audit:
+        icon = "⚠️ " if audit["duplicateSlots"] else "✅"
+        print(f"   {icon} Auditoria: {audit['occupiedSlots']}/{audit['totalSlots']} horários ocupados "
+              f"({audit['occupancy'] * 100:.0f}%), {audit['duplicateSlots']} com visitas duplicadas "
+              f"({audit['duplicateVisits']} visitas a mais)")
+        for example in audit["examples"]:
+            print(f"      {example}")
+    print("━" * 70)
+
+
+def run_contention(args: argparse.Namespace, api: ApiClient, tokens: TokenManager) -> int:
+    print("🔐 Fazendo login...")
+    tokens.register_admin(args.email, args.password)
+    try:
+        admin = tokens.state(ADMIN)
+    except AuthError as e:
+        print(f"❌ Erro no login: {e}")
+        return 1
+    tokens.attach(api, ADMIN)
+
+    print("📋 A recolher imóveis e clientes...")
+    data = WorkloadData.collect(api, admin.user_id)
+    if args.as_clients:
+        print(f"👥 A autenticar {args.as_clients} clientes do dataset...")
+        data.login_seeded_users(tokens, DatasetGenerator(args.dataset_seed), args.as_clients, 0)
+        print(f"   {len(data.clients)} sessões de cliente ativas")
+    if not data.clients and not data.client_ids:
+        print("❌ Nenhum cliente para marcar visitas")
+        return 1
+
+    targets = pick_hot_targets(data, args.hot_agents, args.hot_properties)
+    try:
+        workload = VisitContentionWorkload(data, targets, days=args.days)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    print(f"🎯 {len(targets)} imóveis disputados, {workload.slot_count} horários "
+          f"({workload.dates[0]} a {workload.dates[-1]})")
+
+    runner = None
+    if args.duration > 0:
+        scenarios = workload.scenarios(parse_weights(args.weight))
+        mix = ", ".join(f"{s.name}={s.weight:g}" for s in scenarios)
+        print(f"\n🚀 {args.rps:g} cenários/s durante {args.duration:g}s ({args.arrival}) - {mix}")
+        runner = OpenLoopRunner(api, scenarios, args.rps, args.duration,
+                                max_inflight=args.max_inflight, arrival=args.arrival, seed=args.seed)
+        report = runner.run()
+        report.recorder.print_table(report.elapsed)
+        print(f"   Chegadas: {report.offered}  descartadas: {report.dropped}  em {report.elapsed:.1f}s")
+
+    race = None
+    if args.race_rounds:
+        print(f"\n🏁 {args.race_rounds} rondas de {args.racers} marcações simultâneas do mesmo horário...")
+        recorder = runner.recorder if runner else LatencyRecorder()
+        race = workload.race(api, recorder, args.race_rounds, args.racers, seed=args.seed)
+
+    summary = workload.to_dict()
+    if race:
+        summary["race"] = race
+    print("\n🔍 A auditar as visitas dos agentes disputados...")
+    summary["audit"] = workload.audit(api)
+    if args.cleanup:
+        print(f"🧹 {workload.cleanup(api)} visitas canceladas")
+    if runner:
+        summary["endpoints"] = runner.recorder.summary()
+    print_report(summary)
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as handle:
+            json.dump(summary, handle, indent=2)
+        print(f"💾 Relatório guardado em {args.json_out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())